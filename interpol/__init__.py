@@ -0,0 +1,3 @@
+"""
+Briques communes aux scrapers Interpol (main.py, yelllow_notice.py).
+"""
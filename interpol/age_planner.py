@@ -0,0 +1,149 @@
+"""
+Planificateur de tranches d'âge pour les partitions trop grosses (> 160)
+- au lieu d'une bissection aveugle de 0–120, prévoit directement des
+  fenêtres d'âge contiguës remplies juste sous le plafond de 160 résultats
+- s'appuie sur la distribution âge/sexe apprise au run précédent (fichier
+  JSON), à défaut sur une distribution a priori
+- chaque fenêtre reste une partition ordinaire : si elle dépasse quand même
+  le plafond, la bissection habituelle prend le relais
+Les partitions « feuilles » (<= 160 ou un seul âge) observées pendant le run
+forment l'histogramme sauvegardé pour démarrer le plan suivant à chaud.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, Optional, Tuple
+
+API_CAP = 160
+MIN_AGE = 0
+MAX_AGE = 120
+
+# Tranche observée : (âge_min, âge_max inclus, nombre de notices)
+Bucket = Tuple[int, int, int]
+Window = Tuple[int, int]
+
+
+def prior_weight(age: int) -> float:
+    """Distribution a priori des âges (forme grossière : pic entre 25 et 50 ans)."""
+    if age < 12:
+        return 0.02
+    if age < 18:
+        return 0.3
+    if age < 30:
+        return 0.6 + 0.4 * (age - 18) / 12
+    if age < 50:
+        return 1.0
+    if age < 70:
+        return 1.0 - 0.7 * (age - 50) / 20
+    if age < 90:
+        return 0.3 - 0.25 * (age - 70) / 20
+    return 0.01
+
+
+def pack_windows(expected: List[float], age_min: int, budget: float) -> List[Window]:
+    """Regroupe des âges consécutifs tant que l'effectif attendu reste sous `budget`."""
+    windows: List[Window] = []
+    start = age_min
+    acc = 0.0
+    for i, count in enumerate(expected):
+        age = age_min + i
+        if age > start and acc + count > budget:
+            windows.append((start, age - 1))
+            start, acc = age, 0.0
+        acc += count
+    windows.append((start, age_min + len(expected) - 1))
+    return windows
+
+
+def hist_key(country: Optional[str], sex_id: Optional[str]) -> str:
+    return f"{country or ''}|{sex_id or ''}"
+
+
+class AgePlanner:
+    """Plans de fenêtres d'âge par (pays, sexe), appris d'un run à l'autre ; sûr entre threads."""
+
+    def __init__(self, path: Optional[str] = None, cap: int = API_CAP,
+                 learned_fill: float = 0.9, prior_fill: float = 0.6):
+        self.path = path
+        self.cap = cap
+        self.learned_fill = learned_fill
+        self.prior_fill = prior_fill
+        self.histograms: Dict[str, List[Bucket]] = {}
+        self._observed: DefaultDict[str, List[Bucket]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.stats = {"planned_learned": 0, "planned_prior": 0, "windows": 0}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                self.histograms = {k: [tuple(b) for b in v] for k, v in raw.get("histograms", {}).items()}
+            except (OSError, ValueError) as e:
+                print(f"[Avertissement] Plan d'âges illisible ({path}): {e}")
+
+    def _expected(self, country: Optional[str], sex_id: Optional[str], total: int,
+                  age_min: int, age_max: int) -> Tuple[List[float], bool]:
+        """Effectif attendu par âge et indicateur « histogramme appris »."""
+        span = age_max - age_min + 1
+        buckets = self.histograms.get(hist_key(country, sex_id))
+        if buckets:
+            per_age = [0.0] * span
+            for lo, hi, count in buckets:
+                lo, hi = max(lo, age_min), min(hi, age_max)
+                if lo > hi:
+                    continue
+                width = hi - lo + 1
+                for age in range(lo, hi + 1):
+                    per_age[age - age_min] += count / width
+            learned_total = sum(per_age)
+            if learned_total > 0:
+                # Le pays a pu grossir depuis : on garde la forme, on recale le volume
+                scale = total / learned_total
+                return [c * scale for c in per_age], True
+        weights = [prior_weight(age) for age in range(age_min, age_max + 1)]
+        norm = sum(weights)
+        return [total * w / norm for w in weights], False
+
+    def plan(self, country: Optional[str], sex_id: Optional[str], total: int,
+             age_min: int = MIN_AGE, age_max: int = MAX_AGE) -> List[Window]:
+        expected, learned = self._expected(country, sex_id, total, age_min, age_max)
+        budget = self.cap * (self.learned_fill if learned else self.prior_fill)
+        windows = pack_windows(expected, age_min, budget)
+        with self._lock:
+            self.stats["planned_learned" if learned else "planned_prior"] += 1
+            self.stats["windows"] += len(windows)
+        return windows
+
+    def observe(self, country: Optional[str], sex_id: Optional[str], age_min: int, age_max: int, total: int) -> None:
+        """Enregistre une partition feuille (non découpée) et son total."""
+        with self._lock:
+            self._observed[hist_key(country, sex_id)].append((age_min, age_max, total))
+
+    def _complete(self, buckets: List[Bucket]) -> bool:
+        """Vrai si les tranches couvrent MIN_AGE..MAX_AGE sans trou."""
+        expected_lo = MIN_AGE
+        for lo, hi, _ in sorted(buckets):
+            if lo > expected_lo:
+                return False
+            expected_lo = max(expected_lo, hi + 1)
+        return expected_lo > MAX_AGE
+
+    def save(self) -> None:
+        """Remplace l'histogramme des (pays, sexe) entièrement observés, puis écrit le fichier."""
+        if not self.path:
+            return
+        with self._lock:
+            for key, buckets in self._observed.items():
+                if self._complete(buckets):
+                    self.histograms[key] = sorted(set(buckets))
+            payload = {"version": 1, "histograms": {k: [list(b) for b in v] for k, v in sorted(self.histograms.items())}}
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def describe(self) -> str:
+        s = self.stats
+        return (f"{s['planned_learned']} plans appris, {s['planned_prior']} plans a priori, "
+                f"{s['windows']} fenêtres d'âge")
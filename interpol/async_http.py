@@ -0,0 +1,196 @@
+"""
+Client HTTP/1.1 asynchrone (asyncio) à connexions persistantes
+- pool de connexions keep-alive par hôte, partagé par toutes les coroutines
+- contexte SSL unique, décodage gzip/deflate
+- mêmes conventions d'erreur que HTTPClient (HTTPError pour un statut >= 400)
+Sans dépendance externe : seul le sous-ensemble HTTP utile à l'API est géré
+(GET, Content-Length, chunked, redirections).
+"""
+
+import asyncio
+import http.client
+import io
+import json
+import socket
+import ssl
+import time
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, List, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+
+from interpol.http_pool import MAX_REDIRECTS, build_url, decode_body
+from interpol.metrics import METRICS, endpoint_label, observe_request
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class StaleConnection(ConnectionError):
+    """La connexion réutilisée a été fermée par le serveur avant la réponse."""
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    out = bytearray()
+    while True:
+        line = await reader.readline()
+        size = int(line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            # En-têtes de fin (trailers) jusqu'à la ligne vide
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return bytes(out)
+        out += await reader.readexactly(size)
+        await reader.readline()
+
+
+async def read_response(reader: asyncio.StreamReader) -> Tuple[int, str, http.client.HTTPMessage, bytes, bool]:
+    """Lit une réponse complète : (statut, raison, en-têtes, corps brut, fermeture_requise)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise StaleConnection("connexion fermée par le serveur")
+    version, _, rest = status_line.decode("latin-1").strip().partition(" ")
+    status_str, _, reason = rest.partition(" ")
+    status = int(status_str)
+
+    raw_headers = bytearray()
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        raw_headers += line
+    headers = http.client.parse_headers(io.BytesIO(bytes(raw_headers) + b"\r\n"))
+
+    conn_header = (headers.get("Connection") or "").lower()
+    will_close = conn_header == "close" or (version == "HTTP/1.0" and conn_header != "keep-alive")
+
+    if status in (204, 304) or 100 <= status < 200:
+        body = b""
+    elif (headers.get("Transfer-Encoding") or "").lower() == "chunked":
+        body = await _read_chunked(reader)
+    elif headers.get("Content-Length") is not None:
+        body = await reader.readexactly(int(headers["Content-Length"]))
+    else:
+        body = await reader.read()
+        will_close = True
+    return status, reason, headers, body, will_close
+
+
+class AsyncHTTPClient:
+    """Pool de connexions keep-alive pour asyncio, une file de connexions libres par hôte."""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+                 insecure: bool = False, compress: bool = True, max_idle_per_host: int = 512):
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.compress = compress
+        self.max_idle_per_host = max_idle_per_host
+        if insecure:
+            self.ssl_context = ssl._create_unverified_context()
+        else:
+            self.ssl_context = ssl.create_default_context()
+        self._idle: DefaultDict[Tuple[str, str], List[Connection]] = defaultdict(list)
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    async def _open(self, scheme: str, netloc: str) -> Connection:
+        parts = urlsplit(f"{scheme}://{netloc}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        ctx = self.ssl_context if scheme == "https" else None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(parts.hostname, port, ssl=ctx, limit=2 ** 20), self.timeout)
+        except asyncio.TimeoutError:
+            # Même erreur que HTTPClient : le limiteur la traite comme une saturation et rejoue
+            raise socket.timeout(f"connexion: délai de {self.timeout:g} s dépassé ({netloc})") from None
+        self.connections_opened += 1
+        return reader, writer
+
+    def _release(self, key: Tuple[str, str], conn: Connection, reusable: bool) -> None:
+        idle = self._idle[key]
+        if reusable and len(idle) < self.max_idle_per_host:
+            idle.append(conn)
+        else:
+            conn[1].close()
+
+    async def _send(self, url: str, headers: Dict[str, str]) -> Tuple[int, str, http.client.HTTPMessage, bytes]:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        lines = [f"GET {path} HTTP/1.1", f"Host: {parts.netloc}"]
+        lines += [f"{k}: {v}" for k, v in headers.items() if k.lower() not in ("host", "connection")]
+        lines.append("Connection: keep-alive")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        for attempt in range(2):
+            reused = bool(self._idle[key]) and attempt == 0
+            conn = self._idle[key].pop() if reused else await self._open(*key)
+            reader, writer = conn
+            start = time.perf_counter()
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, reason, resp_headers, body, will_close = await asyncio.wait_for(
+                    read_response(reader), self.timeout)
+            except (StaleConnection, ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    METRICS.inc("interpol_http_retries_total", endpoint=endpoint_label(url))
+                    continue
+                observe_request(url, "error", time.perf_counter() - start)
+                raise
+            except asyncio.TimeoutError:
+                writer.close()
+                observe_request(url, "error", time.perf_counter() - start)
+                raise socket.timeout(f"réponse: délai de {self.timeout:g} s dépassé ({url})") from None
+            except BaseException:
+                writer.close()
+                observe_request(url, "error", time.perf_counter() - start)
+                raise
+            observe_request(url, status, time.perf_counter() - start, len(body))
+            self.requests_sent += 1
+            self._release(key, conn, not will_close)
+            return status, reason, resp_headers, body
+        raise http.client.HTTPException(f"connexion impossible: {url}")
+
+    async def request(self, url: str, params: Optional[Dict[str, str]] = None,
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """GET complet : (statut, en-têtes, corps décodé). Lève HTTPError pour un statut >= 400.
+
+        Un 304 (requête conditionnelle If-None-Match / If-Modified-Since) est
+        retourné tel quel avec un corps vide.
+        """
+        url = build_url(url, params)
+        hdrs = dict(headers if headers is not None else self.headers)
+        if self.compress and not any(k.lower() == "accept-encoding" for k in hdrs):
+            hdrs["accept-encoding"] = "gzip, deflate"
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, resp_headers, body = await self._send(url, hdrs)
+            if status in (301, 302, 303, 307, 308) and resp_headers.get("Location"):
+                url = urljoin(url, resp_headers["Location"])
+                continue
+            body = decode_body(body, resp_headers.get("Content-Encoding", ""))
+            if status >= 400:
+                raise HTTPError(url, status, reason, resp_headers, io.BytesIO(body))
+            return status, resp_headers, body
+        raise HTTPError(url, 310, "Trop de redirections", None, None)
+
+    async def get(self, url: str, params: Optional[Dict[str, str]] = None,
+                  headers: Optional[Dict[str, str]] = None) -> bytes:
+        """GET et retourne le corps décodé ; lève HTTPError pour un statut >= 400."""
+        return (await self.request(url, params, headers))[2]
+
+    async def get_json(self, url: str, params: Optional[Dict[str, str]] = None,
+                       headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        data = (await self.get(url, params, headers)).decode("utf-8", errors="replace")
+        try:
+            return json.loads(data)
+        except Exception:
+            return {}
+
+    async def close(self) -> None:
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
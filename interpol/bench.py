@@ -0,0 +1,233 @@
+"""
+Banc de mesure reproductible des scrapers contre l'API simulée (interpol/mock_api.py)
+- le serveur simulé tourne dans son propre processus (pas de GIL partagé)
+- chaque mesure tourne dans un processus neuf, dans un dossier de travail
+  vide : RSS de pointe propre, état global des modules (LIMITER, PROBES,
+  plan d'âges…) remis à zéro, aucun cache
+- grille scénarios × --workers × --rps, même jeu de données (graine)
+- rapport : requêtes/s, notices/min, durée par phase, RSS de pointe,
+  amplification (requêtes émises ÷ notices obtenues), couverture, 429/5xx
+
+Exemples :
+  python -m interpol.bench --size 5000 --scenarios red,red-stream,yellow --workers 10,20 --rps 50
+  python -m interpol.bench --latency 0.1 --throttle 0.02 --rps 20,40,80 --json bench.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+from urllib.request import urlopen
+
+try:
+    import resource
+except ImportError:  # Windows : pas de RSS de pointe
+    resource = None
+
+# Scénario → (scraper, options de main.run)
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "red": {"kind": "red"},
+    "red-stream": {"kind": "red", "stream": True},
+    "red-asyncio": {"kind": "red", "engine": "asyncio"},
+    "yellow": {"kind": "yellow"},
+}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Ko sous Linux, octets sous macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# --- côté mesure (processus enfant) ---
+def run_red(spec: Dict[str, Any]) -> Dict[str, Any]:
+    import main
+    main.MAX_WORKERS = spec["workers"]
+    summary = main.run(None, "out.csv", rps=spec["rps"], burst=spec["rps"], collect_workers=spec["collect_workers"],
+                       engine=spec.get("engine", "threads"), stream=spec.get("stream", False),
+                       async_concurrency=spec["workers"], state_path=None, cache_path=None,
+                       age_plan_path="age_plan.json")
+    phases = {"globale": summary["phase0"], "pays": summary["phase1"], "détails": summary["phase2"],
+              "écriture": summary["write"]}
+    return {"rows": summary["rows"], "phases": phases, "client_requests": summary["requests"]}
+
+
+def run_yellow(spec: Dict[str, Any]) -> Dict[str, Any]:
+    import yelllow_notice as y
+    y.LIMITER = y.RateLimiter(spec["rps"], spec["rps"], max_concurrency=spec["workers"])
+    phases: Dict[str, float] = {}
+    start = time.time()
+    y.run()
+    phases["collecte"] = time.time() - start
+    start = time.time()
+    y.verify_scraping()
+    phases["vérification"] = time.time() - start
+    start = time.time()
+    y.auto_rattrapage()
+    phases["rattrapage"] = time.time() - start
+    store = y.open_store()
+    store.commit()
+    return {"rows": store.stats().get("yellow", 0), "phases": phases, "client_requests": y.CLIENT.requests_sent}
+
+
+def run_child(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Une mesure ; la sortie du scraper part dans scraper.log (dossier de travail)."""
+    start = time.time()
+    with open("scraper.log", "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        try:
+            result = run_red(spec) if spec["kind"] == "red" else run_yellow(spec)
+        except ImportError as e:
+            return {"error": f"dépendance manquante: {e}"}
+    result["wall"] = time.time() - start
+    result["rss_mb"] = peak_rss_mb()
+    return result
+
+
+# --- côté orchestration ---
+class MockServer:
+    """Serveur simulé lancé dans un sous-processus (python -m interpol.mock_api --port 0)."""
+
+    def __init__(self, args: argparse.Namespace):
+        cmd = [sys.executable, "-m", "interpol.mock_api", "--port", "0", "--size", str(args.size),
+               "--seed", str(args.seed), "--skew", str(args.skew), "--latency", str(args.latency),
+               "--jitter", str(args.jitter), "--throttle", str(args.throttle), "--errors", str(args.errors),
+               "--rps-limit", str(args.rps_limit)]
+        if args.yellow_size is not None:
+            cmd += ["--yellow-size", str(args.yellow_size)]
+        self.proc = subprocess.Popen(cmd, cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+        self.base = ""
+        for line in self.proc.stdout:
+            print(line.rstrip())
+            if line.startswith("URL "):
+                self.base = line.split(None, 1)[1].strip()
+                break
+        if not self.base:
+            raise RuntimeError("Le serveur simulé n'a pas démarré")
+        self.root = self.base[:-len("/notices/v1")]
+
+    def stats(self, reset: bool = False) -> Dict[str, Any]:
+        with urlopen(f"{self.root}/_mock/{'reset' if reset else 'stats'}", timeout=10) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    def close(self) -> None:
+        self.proc.terminate()
+        self.proc.wait(timeout=10)
+
+
+def measure(server: MockServer, scenario: str, workers: int, rps: float, collect_workers: int,
+            keep: bool) -> Dict[str, Any]:
+    spec = dict(SCENARIOS[scenario], workers=workers, rps=rps, collect_workers=collect_workers)
+    workdir = tempfile.mkdtemp(prefix=f"bench_{scenario}_")
+    env = {k: v for k, v in os.environ.items() if k not in ("SCRAPER_CACHE", "YELLOW_DEDUP", "YELLOW_STORE")}
+    env["SCRAPER_API_BASE"] = server.base
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    server.stats(reset=True)
+    proc = subprocess.run([sys.executable, "-m", "interpol.bench", "--child", json.dumps(spec)],
+                          cwd=workdir, env=env, capture_output=True, text=True)
+    srv = server.stats()
+    result: Dict[str, Any] = {"scenario": scenario, "workers": workers, "rps": rps, "workdir": workdir}
+    try:
+        result.update(json.loads(proc.stdout.strip().splitlines()[-1]))
+    except (IndexError, ValueError):
+        result["error"] = (proc.stderr.strip().splitlines() or ["sortie illisible"])[-1]
+    if "error" not in result:
+        expected = srv["sizes"].get(spec["kind"], 0)
+        requests = srv["requests"]
+        wall = max(1e-9, result["wall"])
+        result.update({
+            "requests": requests, "req_per_s": requests / wall,
+            "notices_per_min": result["rows"] / (wall / 60),
+            "amplification": requests / result["rows"] if result["rows"] else float("inf"),
+            "coverage": 100.0 * result["rows"] / expected if expected else 0.0,
+            "expected": expected, "throttled": srv["throttled"], "errors": srv["errors"],
+            "server": {k: srv[k] for k in ("list", "probes", "detail", "not_modified", "bytes")},
+        })
+    if not keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return result
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    print("\n" + "=" * 118)
+    print(f"{'scénario':<12}{'workers':>8}{'rps':>7}{'notices':>9}{'couv.%':>8}{'durée s':>9}{'req':>8}"
+          f"{'req/s':>8}{'not/min':>9}{'ampl.':>7}{'429':>6}{'5xx':>6}{'RSS Mo':>8}  phases")
+    print("-" * 118)
+    for r in results:
+        if "error" in r:
+            print(f"{r['scenario']:<12}{r['workers']:>8}{r['rps']:>7g}  ignoré : {r['error']}")
+            continue
+        phases = " ".join(f"{k}={v:.1f}s" for k, v in r["phases"].items())
+        print(f"{r['scenario']:<12}{r['workers']:>8}{r['rps']:>7g}{r['rows']:>9}{r['coverage']:>8.1f}"
+              f"{r['wall']:>9.1f}{r['requests']:>8}{r['req_per_s']:>8.1f}{r['notices_per_min']:>9.0f}"
+              f"{r['amplification']:>7.2f}{r['throttled']:>6}{r['errors']:>6}{r['rss_mb']:>8.1f}  {phases}")
+    print("=" * 118)
+
+
+def parse_list(value: str, cast) -> List[Any]:
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) > 2 and argv[1] == "--child":
+        print(json.dumps(run_child(json.loads(argv[2]))))
+        return 0
+
+    p = argparse.ArgumentParser("python -m interpol.bench", description="Banc de mesure contre l'API simulée")
+    p.add_argument("--scenarios", type=str, default="red,red-stream", help=f"Scénarios ({', '.join(SCENARIOS)})")
+    p.add_argument("--workers", type=str, default="20", help="Valeurs de --workers à mesurer (ex. 10,20,40)")
+    p.add_argument("--rps", type=str, default="50", help="Débits à mesurer (ex. 10,50)")
+    p.add_argument("--collect-workers", type=int, default=8, help="Threads de collecte (notices rouges)")
+    p.add_argument("--repeat", type=int, default=1, help="Répétitions de chaque mesure")
+    p.add_argument("--size", type=int, default=3000, help="Notices rouges du jeu simulé")
+    p.add_argument("--yellow-size", type=int, default=None, help="Notices jaunes (défaut: size/4)")
+    p.add_argument("--seed", type=int, default=1, help="Graine du jeu de données et des pannes")
+    p.add_argument("--skew", type=float, default=1.0, help="Concentration par pays (exposant de Zipf)")
+    p.add_argument("--latency", type=float, default=0.05, help="Latence simulée par requête (s)")
+    p.add_argument("--jitter", type=float, default=0.02, help="Gigue de la latence (s)")
+    p.add_argument("--throttle", type=float, default=0.0, help="Proportion de 429 aléatoires")
+    p.add_argument("--errors", type=float, default=0.0, help="Proportion d'erreurs 5xx aléatoires")
+    p.add_argument("--rps-limit", type=float, default=0.0, help="Débit au-delà duquel le serveur répond 429")
+    p.add_argument("--json", type=str, default=None, help="Écrire les résultats détaillés dans ce fichier JSON")
+    p.add_argument("--keep", action="store_true", help="Garder les dossiers de travail (sorties, scraper.log)")
+    args = p.parse_args(argv[1:])
+
+    scenarios = parse_list(args.scenarios, str)
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        p.error(f"Scénario(s) inconnu(s): {', '.join(unknown)} (choix: {', '.join(SCENARIOS)})")
+
+    server = MockServer(args)
+    results: List[Dict[str, Any]] = []
+    try:
+        for scenario in scenarios:
+            for workers in parse_list(args.workers, int):
+                for rps in parse_list(args.rps, float):
+                    for _ in range(args.repeat):
+                        r = measure(server, scenario, workers, rps, args.collect_workers, args.keep)
+                        results.append(r)
+                        state = r.get("error") or f"{r['rows']} notices en {r['wall']:.1f}s, {r['requests']} requêtes"
+                        print(f"[Bench] {scenario} workers={workers} rps={rps:g}: {state}")
+    finally:
+        server.close()
+
+    print_report(results)
+    if args.json:
+        config = {k: v for k, v in vars(args).items() if k not in ("json", "keep")}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"[Info] Résultats détaillés → {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,402 @@
+"""
+Capture des réponses brutes de l'API (listes et détails) et renormalisation hors ligne
+- chaque réponse JSON reçue est ajoutée à des segments compressés, en ajout
+  seul (seg-000001.gz…) : un segment est une suite de blocs gzip indépendants
+  de quelques centaines de Ko (lisible tel quel par zcat, une réponse par ligne)
+- index SQLite (index.sqlite) : emplacement de chaque bloc et, par type et
+  entity_id, le bloc et le rang de la réponse de liste et du détail
+- un bloc et ses entrées d'index sont validés ensemble : après un arrêt brutal,
+  seul le bloc en cours est perdu ; une nouvelle session ouvre un nouveau segment
+  (créé en exclusivité : plusieurs processus peuvent capturer dans le même dossier)
+- dernière capture gagnante d'une session à l'autre ; dans une session, la
+  première notice de liste vue l'emporte, comme le dédoublonnage du crawl
+- replay : relit les segments dans plusieurs processus, réapparie chaque
+  détail à sa notice de liste et repasse le tout dans la normalisation du
+  type → nouvelle sortie sans aucun appel à l'API
+
+Exemples :
+  python3 main.py --capture capture_red/
+  python -m interpol.capture capture_red/ stats
+  python -m interpol.capture capture_red/ replay --type red --output red_v2.csv --workers 4
+  python -m interpol.capture capture_red/ show 2024/12345
+"""
+
+import glob
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from interpol.metrics import endpoint_label
+from interpol.notice_store import Filters
+from interpol.notice_types import NOTICE_TYPES, iter_notices, notice_self_url
+from interpol.records import compact_item
+from interpol.writers import OUTPUT_FORMATS, open_row_writer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    records INTEGER NOT NULL,
+    PRIMARY KEY (segment, offset)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    type TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    PRIMARY KEY (type, kind, entity_id)
+);
+"""
+
+BLOCK_BYTES = 256 * 1024        # données non compressées par bloc gzip
+SEGMENT_BYTES = 256 * 2 ** 20   # taille compressée au-delà de laquelle un segment est fermé
+INDEX_NAME = "index.sqlite"
+
+# Emplacement d'une réponse : (segment, décalage du bloc, rang dans le bloc)
+Location = Tuple[int, int, int]
+
+
+def segment_path(directory: str, segment: int) -> str:
+    return os.path.join(directory, f"seg-{segment:06d}.gz")
+
+
+def classify_url(url: str) -> Tuple[str, str]:
+    """(type, kind) d'une URL de l'API : ("red", "detail"), ("yellow", "list")…"""
+    notice_type, _, kind = endpoint_label(url).partition(":")
+    return notice_type, kind
+
+
+def notice_eid(item: Dict[str, Any]) -> str:
+    return str(item.get("entity_id") or item.get("id") or "").strip()
+
+
+def filters_from_params(params: Optional[Dict[str, Any]]) -> Optional[Filters]:
+    """Filtres de la requête de liste (inverse de engine.filter_params)."""
+    if not params:
+        return None
+
+    def as_int(value: Any) -> Optional[int]:
+        return int(value) if value not in (None, "") else None
+
+    return (params.get("nationality") or None, as_int(params.get("ageMin")), as_int(params.get("ageMax")),
+            params.get("sexId") or None, params.get("forename") or None, params.get("country_of_birth_id") or None)
+
+
+class CaptureWriter:
+    """Ajoute les réponses JSON aux segments ; sûr entre threads."""
+
+    def __init__(self, directory: str, block_bytes: int = BLOCK_BYTES, segment_bytes: int = SEGMENT_BYTES,
+                 compress_level: int = 6):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.block_bytes = block_bytes
+        self.segment_bytes = segment_bytes
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, INDEX_NAME), timeout=60.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._open_segment()
+        self._lines: List[bytes] = []
+        self._pending = 0
+        self._entries: List[Tuple[str, str, str, int]] = []
+        # Notices de liste déjà indexées dans cette session (première vue gagnante)
+        self._listed: Set[Tuple[str, str]] = set()
+        self.stats = {"responses": 0, "blocks": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def _open_segment(self) -> None:
+        """Ajout seul : une session n'écrit jamais dans un segment existant."""
+        while True:
+            existing = [int(os.path.basename(p)[4:10]) for p in glob.glob(os.path.join(self.directory, "seg-*.gz"))]
+            self.segment = max(existing, default=0) + 1
+            try:
+                self._file = open(segment_path(self.directory, self.segment), "xb")
+            except FileExistsError:
+                # Pris entre-temps par un autre processus
+                continue
+            self._offset = 0
+            return
+
+    def add(self, url: str, params: Optional[Dict[str, Any]], data: Any) -> None:
+        """Ajoute une réponse ; les URL hors API (type inconnu) sont ignorées."""
+        if not data:
+            return
+        notice_type, kind = classify_url(url)
+        if notice_type not in NOTICE_TYPES:
+            return
+        record = {"type": notice_type, "kind": kind, "url": url, "params": params, "at": round(time.time(), 3),
+                  "data": data}
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            slot = len(self._lines)
+            if kind == "detail":
+                eid = notice_eid(data) if isinstance(data, dict) else ""
+                if eid:
+                    self._entries.append((notice_type, kind, eid, slot))
+            elif isinstance(data, dict):
+                for item in iter_notices(data):
+                    eid = notice_eid(item)
+                    if eid and (notice_type, eid) not in self._listed:
+                        self._listed.add((notice_type, eid))
+                        self._entries.append((notice_type, kind, eid, slot))
+            self._lines.append(line)
+            self._pending += len(line)
+            self.stats["responses"] += 1
+            if self._pending >= self.block_bytes:
+                self._flush_block()
+
+    def _flush_block(self) -> None:
+        if not self._lines:
+            return
+        raw = b"".join(self._lines)
+        block = gzip.compress(raw, self.compress_level)
+        offset = self._offset
+        self._file.write(block)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        with self._conn:
+            self._conn.execute("INSERT INTO blocks (segment, offset, length, records) VALUES (?, ?, ?, ?)",
+                               (self.segment, offset, len(block), len(self._lines)))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (type, kind, entity_id, segment, offset, slot) VALUES (?, ?, ?, ?, ?, ?)",
+                [(t, k, eid, self.segment, offset, slot) for t, k, eid, slot in self._entries])
+        self._offset += len(block)
+        self.stats["blocks"] += 1
+        self.stats["bytes_in"] += len(raw)
+        self.stats["bytes_out"] += len(block)
+        self._lines = []
+        self._pending = 0
+        self._entries = []
+        if self._offset >= self.segment_bytes:
+            self._file.close()
+            self._open_segment()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_block()
+
+    def describe(self) -> str:
+        s = self.stats
+        ratio = s["bytes_in"] / s["bytes_out"] if s["bytes_out"] else 0.0
+        return (f"{s['responses']} réponses en {s['blocks']} blocs, {s['bytes_out'] / 2 ** 20:.1f} Mo "
+                f"(compression ×{ratio:.1f}) → {self.directory}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_block()
+            self._file.close()
+            empty = self._offset == 0
+            self._conn.close()
+        if empty:
+            # Segment ouvert mais jamais écrit
+            os.remove(segment_path(self.directory, self.segment))
+
+
+# --- lecture ---
+class CaptureReader:
+    """Accès aux blocs et aux réponses d'une capture (un lecteur par processus)."""
+
+    def __init__(self, directory: str, cached_blocks: int = 64):
+        self.directory = directory
+        self._conn = sqlite3.connect(f"file:{os.path.join(directory, INDEX_NAME)}?mode=ro", uri=True)
+        self._files: Dict[int, Any] = {}
+        self._blocks: "OrderedDict[Tuple[int, int], List[Dict[str, Any]]]" = OrderedDict()
+        self._cached_blocks = cached_blocks
+
+    def blocks(self) -> List[Tuple[int, int, int]]:
+        """(segment, décalage, longueur) de tous les blocs, dans l'ordre d'écriture."""
+        return self._conn.execute("SELECT segment, offset, length FROM blocks ORDER BY segment, offset").fetchall()
+
+    def locations(self, notice_type: str) -> Dict[Tuple[str, str], Location]:
+        """(kind, entity_id) → emplacement de la réponse retenue, pour un type."""
+        rows = self._conn.execute("SELECT kind, entity_id, segment, offset, slot FROM entries WHERE type = ?",
+                                  (notice_type,))
+        return {(kind, eid): (segment, offset, slot) for kind, eid, segment, offset, slot in rows}
+
+    def location(self, notice_type: str, kind: str, entity_id: str) -> Optional[Location]:
+        return self._conn.execute("SELECT segment, offset, slot FROM entries WHERE type = ? AND kind = ? AND entity_id = ?",
+                                  (notice_type, kind, entity_id)).fetchone()
+
+    def read_block(self, segment: int, offset: int, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        key = (segment, offset)
+        cached = self._blocks.get(key)
+        if cached is not None:
+            self._blocks.move_to_end(key)
+            return cached
+        if length is None:
+            length = self._conn.execute("SELECT length FROM blocks WHERE segment = ? AND offset = ?",
+                                        key).fetchone()[0]
+        f = self._files.get(segment)
+        if f is None:
+            f = self._files[segment] = open(segment_path(self.directory, segment), "rb")
+        f.seek(offset)
+        records = [json.loads(line) for line in gzip.decompress(f.read(length)).splitlines()]
+        self._blocks[key] = records
+        if len(self._blocks) > self._cached_blocks:
+            self._blocks.popitem(last=False)
+        return records
+
+    def record(self, location: Location) -> Dict[str, Any]:
+        segment, offset, slot = location
+        return self.read_block(segment, offset)[slot]
+
+    def counts(self) -> Dict[str, Any]:
+        blocks = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(records), 0), COALESCE(SUM(length), 0), "
+                                    "COUNT(DISTINCT segment) FROM blocks").fetchone()
+        entries = self._conn.execute("SELECT type, kind, COUNT(*) FROM entries GROUP BY type, kind").fetchall()
+        return {"blocks": blocks[0], "responses": blocks[1], "bytes": blocks[2], "segments": blocks[3],
+                "notices": {f"{t}:{k}": n for t, k, n in entries}}
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._conn.close()
+
+
+def list_item(record: Dict[str, Any], eid: str) -> Optional[Dict[str, Any]]:
+    for item in iter_notices(record.get("data") or {}):
+        if notice_eid(item) == eid:
+            return item
+    return None
+
+
+def replay_blocks(directory: str, notice_type: str, blocks: List[Tuple[int, int, int]]) -> List[Dict[str, Any]]:
+    """Renormalise les notices dont la réponse retenue se trouve dans `blocks` (un processus)."""
+    nt = NOTICE_TYPES[notice_type]
+    reader = CaptureReader(directory)
+    locations = reader.locations(notice_type)
+    rows: List[Dict[str, Any]] = []
+
+    def prepare(item: Dict[str, Any]) -> Dict[str, Any]:
+        return compact_item(item, notice_self_url(item), nt.list_fields) if nt.list_fields else item
+
+    try:
+        for segment, offset, length in blocks:
+            for slot, record in enumerate(reader.read_block(segment, offset, length)):
+                if record.get("type") != notice_type:
+                    continue
+                here = (segment, offset, slot)
+                data = record.get("data") or {}
+                if record.get("kind") == "detail":
+                    eid = notice_eid(data)
+                    if not eid or locations.get(("detail", eid)) != here:
+                        continue
+                    where = locations.get(("list", eid))
+                    item = list_item(reader.record(where), eid) if where else None
+                    rows.append(nt.mapper(prepare(item or {}), data, None))
+                    continue
+                filters = None if nt.fetch_details else filters_from_params(record.get("params"))
+                for item in iter_notices(data):
+                    eid = notice_eid(item)
+                    if locations.get(("list", eid)) != here:
+                        continue
+                    if nt.fetch_details and ("detail", eid) in locations:
+                        # Normalisée avec son détail, au passage du détail
+                        continue
+                    rows.append(nt.mapper(prepare(item), None, filters))
+    finally:
+        reader.close()
+    return rows
+
+
+def replay(directory: str, notice_type: str, output: str, fmt: str = "csv", workers: int = 0,
+           chunk_blocks: int = 16) -> int:
+    """Réécrit `output` à partir de la capture ; retourne le nombre de lignes."""
+    nt = NOTICE_TYPES[notice_type]
+    reader = CaptureReader(directory)
+    blocks = reader.blocks()
+    reader.close()
+    chunks = [blocks[i:i + chunk_blocks] for i in range(0, len(blocks), chunk_blocks)]
+    workers = workers or os.cpu_count() or 1
+    start = time.time()
+    count = 0
+    with open_row_writer(output, nt.fieldnames, fmt, nt.typed_columns) as writer:
+        if workers == 1:
+            for chunk in chunks:
+                for row in replay_blocks(directory, notice_type, chunk):
+                    writer.write(row)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # map garde l'ordre des blocs : même sortie quel que soit le nombre de processus
+                for rows in pool.map(replay_blocks, [directory] * len(chunks), [notice_type] * len(chunks), chunks):
+                    for row in rows:
+                        writer.write(row)
+        count = writer.count
+    elapsed = time.time() - start
+    print(f"[Info] Replay {notice_type}: {count} lignes depuis {len(blocks)} blocs en {elapsed:.1f}s "
+          f"({count / max(elapsed, 1e-9):.0f} lignes/s, {workers} processus) → {output}")
+    return count
+
+
+def show(directory: str, entity_id: str, notice_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Réponses retenues (liste et détail) d'une notice."""
+    reader = CaptureReader(directory)
+    found = []
+    try:
+        types = [notice_type] if notice_type else list(NOTICE_TYPES)
+        for t in types:
+            for kind in ("list", "detail"):
+                got = reader.location(t, kind, entity_id)
+                if got is None:
+                    continue
+                record = reader.record(got)
+                payload = list_item(record, entity_id) if kind == "list" else record["data"]
+                found.append({"type": t, "kind": kind, "url": record["url"], "params": record.get("params"),
+                              "at": record.get("at"), "data": payload})
+    finally:
+        reader.close()
+    return found
+
+
+def main(argv: List[str]) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser("python -m interpol.capture", description="Capture brute de l'API : relecture et renormalisation")
+    p.add_argument("directory", help="Dossier de capture (--capture de main.py, SCRAPER_CAPTURE…)")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="Segments, blocs, réponses et notices indexées")
+    r = sub.add_parser("replay", help="Renormaliser la capture vers une nouvelle sortie, sans réseau")
+    r.add_argument("--type", dest="notice_type", choices=sorted(NOTICE_TYPES), default="red")
+    r.add_argument("--output", required=True, help="Fichier de sortie")
+    r.add_argument("--format", choices=OUTPUT_FORMATS, default="csv")
+    r.add_argument("--workers", type=int, default=0, help="Processus de normalisation (défaut: nombre de cœurs)")
+    s = sub.add_parser("show", help="Réponses brutes retenues pour une notice (JSON)")
+    s.add_argument("entity_id")
+    s.add_argument("--type", dest="notice_type", choices=sorted(NOTICE_TYPES), default=None)
+    args = p.parse_args(argv[1:])
+
+    if not os.path.exists(os.path.join(args.directory, INDEX_NAME)):
+        print(f"[Erreur] Pas de capture dans {args.directory} ({INDEX_NAME} absent)")
+        return 1
+    if args.cmd == "stats":
+        reader = CaptureReader(args.directory)
+        c = reader.counts()
+        reader.close()
+        print(f"{c['segments']} segments, {c['blocks']} blocs, {c['responses']} réponses, {c['bytes'] / 2 ** 20:.1f} Mo")
+        for key, n in sorted(c["notices"].items()):
+            print(f"  {key:<14}{n:>9}")
+    elif args.cmd == "replay":
+        replay(args.directory, args.notice_type, args.output, args.format, args.workers)
+    else:
+        found = show(args.directory, args.entity_id, args.notice_type)
+        if not found:
+            print(f"[Info] {args.entity_id}: absent de la capture")
+            return 1
+        print(json.dumps(found, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,97 @@
+"""
+Rattrapage ciblé des partitions incomplètes
+Au lieu de re-télécharger un pays entier sans filtre (plafonné aux mêmes
+160 résultats), chaque fenêtre en défaut est affinée sur d'autres dimensions
+jusqu'à passer sous le plafond :
+  sexe → tranches d'âge (bissection) → initiale du prénom
+Pour chaque sous-fenêtre, le total de l'API (sonde de comptage) est comparé
+aux notices déjà en base : seules les fenêtres où il en manque sont
+téléchargées, et les fiches reçues sont fusionnées dans la base au fil de l'eau.
+"""
+
+import string
+from typing import Callable, List, Sequence, Tuple
+
+from interpol.notice_store import Filters, NoticeStore
+
+API_CAP = 160
+SEX_IDS = ("M", "F", "U")
+MIN_AGE = 0
+MAX_AGE = 120
+FORENAME_INITIALS = tuple(string.ascii_uppercase)
+SPLIT_DIMS = ("sex", "age", "forename")
+
+# Télécharge une fenêtre : (nouvelles fiches (clé, ligne), toutes les clés reçues)
+WindowFetch = Callable[[Filters], Tuple[List[Tuple[str, dict]], List[str]]]
+
+
+def split_window(filters: Filters, dims: Sequence[str] = SPLIT_DIMS) -> List[Filters]:
+    """Sous-fenêtres disjointes couvrant `filters` sur la dimension suivante, [] si plus rien à affiner.
+
+    `dims` : dimensions acceptées par le point d'accès, dans l'ordre d'essai.
+    """
+    nationality, age_min, age_max, sex, forename, country_of_birth = filters
+    if "sex" in dims and not sex:
+        return [(nationality, age_min, age_max, s, forename, country_of_birth) for s in SEX_IDS]
+    lo = MIN_AGE if age_min is None else age_min
+    hi = MAX_AGE if age_max is None else age_max
+    if "age" in dims and lo < hi:
+        mid = (lo + hi) // 2
+        return [(nationality, lo, mid, sex, forename, country_of_birth),
+                (nationality, mid + 1, hi, sex, forename, country_of_birth)]
+    if "forename" in dims and not forename:
+        return [(nationality, age_min, age_max, sex, initial, country_of_birth) for initial in FORENAME_INITIALS]
+    return []
+
+
+class CatchUp:
+    """Couvre des fenêtres incomplètes par des requêtes plus fines ; fusionne dans la base."""
+
+    def __init__(self, store: NoticeStore, notice_type: str, count_total: Callable[[Filters], int],
+                 fetch_window: WindowFetch, cap: int = API_CAP, split_dims: Sequence[str] = SPLIT_DIMS):
+        self.store = store
+        self.notice_type = notice_type
+        self.count_total = count_total
+        self.fetch_window = fetch_window
+        self.cap = cap
+        self.split_dims = split_dims
+        self.stats = {"windows": 0, "skipped": 0, "fetched": 0, "new": 0, "unreachable": 0}
+
+    def cover(self, filters: Filters) -> List[Tuple[str, dict]]:
+        """Nouvelles fiches trouvées sous `filters` ; les clés reçues sont rattachées à la partition."""
+        new_rows, received = self._cover(filters)
+        if received:
+            self.store.add_members(filters, received, self.notice_type)
+        return new_rows
+
+    def _cover(self, filters: Filters) -> Tuple[List[Tuple[str, dict]], List[str]]:
+        self.stats["windows"] += 1
+        total = self.count_total(filters)
+        if total == 0:
+            return [], []
+        held = self.store.matching_keys(filters, self.notice_type)
+        if len(held) >= total:
+            self.stats["skipped"] += 1
+            return [], held
+        children = split_window(filters, self.split_dims) if total > self.cap else []
+        if not children:
+            rows, received = self.fetch_window(filters)
+            self.stats["fetched"] += 1
+            self.stats["new"] += len(rows)
+            self.stats["unreachable"] += max(total - len(received), 0)
+            if rows:
+                self.store.upsert_many(rows, self.notice_type)
+            return rows, received
+        new_rows: List[Tuple[str, dict]] = []
+        received: List[str] = []
+        for child in children:
+            rows, keys = self._cover(child)
+            new_rows += rows
+            received += keys
+        return new_rows, received
+
+    def describe(self) -> str:
+        s = self.stats
+        return (f"{s['windows']} fenêtres sondées, {s['skipped']} déjà complètes en base, "
+                f"{s['fetched']} téléchargées, {s['new']} nouvelles notices, "
+                f"{s['unreachable']} hors d'atteinte (fenêtres indivisibles au-delà du plafond)")
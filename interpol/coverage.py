@@ -0,0 +1,118 @@
+"""
+Vérification de complétude en bloc
+- effectifs locaux : un seul GROUP BY sur la base (partitions × clés reçues)
+- totaux API : d'abord ceux déjà connus (mémo des sondes de la collecte,
+  puis totaux enregistrés en base s'ils sont récents) ; les autres sont
+  demandés en parallèle, chaque requête passant par le limiteur partagé
+- un total nul n'est jamais repris tel quel : il est re-sondé, comme les
+  totaux inconnus ; une sonde en échec laisse la partition « inconnue »
+  (comptée en défaut, donc reprise par le rattrapage) au lieu de valoir 0
+- granularité : chaque partition feuille (pays × sexe × fenêtre d'âge…) est
+  comparée à son total, pour que le rattrapage ne vise que les fenêtres en défaut
+- rapport par pays : tous les pays parcourus, y compris ceux sans aucune
+  ligne locale (pays dont la collecte a échoué ou n'a rien rendu)
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from interpol.notice_store import PARTITION_DIMS, Filters, NoticeStore
+
+TotalLookup = Callable[[Filters], Optional[int]]
+TotalFetch = Callable[[Filters], int]
+
+# Colonnes d'une ligne de rapport dont la sonde a échoué
+UNKNOWN = {"total_api": None, "missing": None, "coverage_%": None}
+
+
+def country_filters(country: str) -> Filters:
+    return (country, None, None, None, None, None)
+
+
+def coverage_row(api_total: Optional[int], local_count: int) -> Dict[str, Any]:
+    """Ligne de rapport ; total inconnu (sonde en échec) → total, manque et couverture à None."""
+    if api_total is None:
+        return dict(UNKNOWN, local_count=local_count)
+    return {
+        "total_api": api_total,
+        "local_count": local_count,
+        "missing": max(api_total - local_count, 0),
+        # Rien à collecter : complet
+        "coverage_%": 100.0 if api_total == 0 else round(local_count / api_total * 100, 1),
+    }
+
+
+class CoverageCheck:
+    """Compare les effectifs locaux aux totaux de l'API, par pays et par partition feuille."""
+
+    def __init__(self, store: NoticeStore, notice_type: str, known_total: TotalLookup,
+                 fetch_total: TotalFetch, workers: int = 4, max_age: float = 3600.0,
+                 countries: Sequence[str] = ()):
+        self.store = store
+        self.notice_type = notice_type
+        self.known_total = known_total
+        self.fetch_total = fetch_total
+        self.workers = max(1, workers)
+        self.max_age = max_age
+        self.countries = list(countries)
+        self.stats = {"reused": 0, "fetched": 0, "failed": 0, "partitions": 0, "short": 0}
+
+    def _fetch(self, key: Filters) -> Optional[int]:
+        try:
+            return self.fetch_total(key)
+        except Exception as e:
+            print(f"[Erreur] Sonde de vérification {key}: {e}")
+            return None
+
+    def resolve_totals(self, keys: List[Filters],
+                       recorded: Optional[Dict[Filters, Tuple[int, float]]] = None) -> Dict[Filters, Optional[int]]:
+        """Totaux API des `keys` : déjà connus (et non nuls) si possible, sinon sondés en parallèle.
+
+        None pour une clé dont la sonde a échoué.
+        """
+        recorded = recorded or {}
+        now = time.time()
+        totals: Dict[Filters, Optional[int]] = {}
+        missing: List[Filters] = []
+        for key in dict.fromkeys(keys):
+            total = self.known_total(key)
+            if not total and key in recorded and now - recorded[key][1] <= self.max_age:
+                total = recorded[key][0]
+            if total:
+                totals[key] = total
+            else:
+                missing.append(key)
+        self.stats["reused"] += len(totals)
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as pool:
+                for key, total in zip(missing, pool.map(self._fetch, missing)):
+                    totals[key] = total
+                    if total is None:
+                        self.stats["failed"] += 1
+            self.stats["fetched"] += len(missing)
+        return totals
+
+    def run(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(rapport par pays, partitions en défaut)."""
+        coverage = self.store.partition_coverage(self.notice_type)
+        recorded = {filters: (api_total, fetched_at) for filters, api_total, fetched_at, _ in coverage}
+        local_by_country = self.store.members_by("nationality", self.notice_type)
+        countries = sorted(set(self.countries) | set(local_by_country))
+        totals = self.resolve_totals([f for f, _, _, _ in coverage] + [country_filters(c) for c in countries], recorded)
+
+        country_report = [dict({"country": c}, **coverage_row(totals[country_filters(c)], local_by_country.get(c, 0)))
+                          for c in countries]
+        short: List[Dict[str, Any]] = []
+        for filters, _, _, local_count in coverage:
+            row = coverage_row(totals[filters], local_count)
+            if row["missing"] is None or row["missing"] > 0:
+                short.append(dict(zip(PARTITION_DIMS, filters), **row))
+        self.stats["partitions"] = len(coverage)
+        self.stats["short"] = len(short)
+        return country_report, short
+
+    def describe(self) -> str:
+        s = self.stats
+        return (f"{s['partitions']} partitions vérifiées, {s['short']} en défaut ; "
+                f"{s['reused']} totaux réutilisés, {s['fetched']} sondés, {s['failed']} sondes en échec")
@@ -0,0 +1,187 @@
+"""
+Collecte multi-types : notices rouges, jaunes et ONU en une seule commande
+Chaque type tourne dans son propre thread avec le moteur commun
+(interpol/engine.py) ; client HTTP keep-alive, limiteur de débit, cache et
+base SQLite sont partagés, si bien que --rps borne le débit de l'ensemble.
+Journal de reprise, mode incrémental, moteur asyncio et normalisation
+multi-processus : mêmes options que main.py, un fichier par type.
+
+Exemples :
+  python -m interpol.crawl --types red,yellow,un --rps 10
+  python -m interpol.crawl --types yellow --countries FR,DE --verify --format parquet
+  python -m interpol.crawl --types red --engine asyncio --incremental --resume
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from interpol.age_planner import AgePlanner
+from interpol.engine import DETAIL_ENGINES, GLOBAL_PAGE_CAP, NoticeCrawler
+from interpol.capture import CaptureWriter
+from interpol.crawl_state import CrawlState
+from interpol.http_cache import ResponseCache
+from interpol.dedup import open_seen_ids, preload_keys
+from interpol.http_pool import HTTPClient
+from interpol.notice_index import NoticeIndex
+from interpol.notice_store import PARTITION_DIMS, NoticeStore
+from interpol.notice_types import COUNTRIES, NOTICE_TYPES
+from interpol.rate_limit import RateLimiter
+from interpol.writers import OUTPUT_FORMATS, CsvRowWriter, open_row_writer
+
+HEADERS = {
+    "accept": "*/*",
+    "accept-language": "fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7",
+    "origin": "https://www.interpol.int",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-site",
+    "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36",
+}
+if os.getenv("SCRAPER_COOKIE"):
+    HEADERS["cookie"] = os.getenv("SCRAPER_COOKIE").strip()
+
+
+def crawl_type(crawler: NoticeCrawler, output: str, fmt: str, verify: bool) -> None:
+    nt = crawler.type
+    start = time.time()
+    writer = open_row_writer(output, nt.fieldnames, fmt, nt.typed_columns)
+    try:
+        crawler.run(writer)
+        if verify and crawler.store is not None:
+            _, short = crawler.verify()
+            if short:
+                crawler.catch_up([tuple(p[d] for d in PARTITION_DIMS) for p in short], writer)
+    finally:
+        writer.close()
+        crawler.close_state()
+    if crawler.index is not None:
+        # Notices retirées : seulement après une collecte complète
+        if not crawler.failed and crawler.max_pages is None:
+            removed = crawler.prune_removed()
+            if removed:
+                with CsvRowWriter(f"{output}.removed.csv", nt.fieldnames) as rw:
+                    for row in removed:
+                        rw.write(row)
+                print(f"[Incrémental] {nt.name} : {len(removed)} notices retirées → {output}.removed.csv")
+        st = crawler.index.stats
+        print(f"[Incrémental] {nt.name} : {st['new']} nouvelles, {st['changed']} modifiées, "
+              f"{st['unchanged']} inchangées, {st['not_modified']} 304")
+        crawler.index.close()
+    print(f"[Info] {nt.name} : {crawler.stats['rows']} notices → {output} en {time.time() - start:.1f}s")
+    print(f"[Info] {nt.name} : {crawler.describe()}")
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser("python -m interpol.crawl", description="Collecte Interpol multi-types (red, yellow, un)")
+    p.add_argument("--types", type=str, default="red,yellow,un", help="Types de notices, séparés par des virgules")
+    p.add_argument("--countries", type=str, default=None, help="Pays à parcourir (codes ISO séparés par des virgules, défaut: tous)")
+    p.add_argument("--rps", type=float, default=10.0, help="Débit global de requêtes/seconde, tous types confondus")
+    p.add_argument("--burst", type=float, default=20.0, help="Rafale tolérée par le seau à jetons")
+    p.add_argument("--workers", type=int, default=20, help="Concurrence maximale (plafond du contrôleur AIMD)")
+    p.add_argument("--collect-workers", type=int, default=4, help="Threads de collecte des partitions, par type")
+    p.add_argument("--detail-workers", type=int, default=8, help="Threads de téléchargement des détails, par type")
+    p.add_argument("--count-probes", action="store_true", help="Sonder les totaux avec resultPerPage=1")
+    p.add_argument("--global-pages", type=int, default=0, help="Pages de la liste sans filtre collectées avant les pays (Phase 0, 50 au plus)")
+    p.add_argument("--max-pages", type=int, default=None, help="Limiter la collecte à ce nombre de pages par type (Phase 0, puis tâches de la Phase 1)")
+    p.add_argument("--engine", choices=DETAIL_ENGINES, default="threads", help="Moteur de téléchargement des détails (Phase 2)")
+    p.add_argument("--async-concurrency", type=int, default=200, help="Moteur asyncio : requêtes de détail en vol au maximum, par type")
+    p.add_argument("--normalize-workers", type=int, default=0, help="Processus de normalisation par type (0 = dans les workers réseau)")
+    p.add_argument("--phased", action="store_true", help="Collecter toutes les partitions avant les détails (défaut : streaming)")
+    p.add_argument("--no-state", action="store_true", help="Ne pas tenir de journal de reprise (<sortie>.state.sqlite par type)")
+    p.add_argument("--resume", action="store_true", help="Reprendre un crawl interrompu à partir des journaux")
+    p.add_argument("--incremental", action="store_true", help="Ne télécharger que les notices nouvelles ou modifiées (index interpol_<type>_index.sqlite)")
+    p.add_argument("--dedup", type=str, default=None, help="Index des notices déjà vues, commun aux types : memory, mmap:<fichier> ou sqlite:<fichier>, suffixe +bloom")
+    p.add_argument("--dedup-reset", action="store_true", help="Vider l'index --dedup au démarrage")
+    p.add_argument("--dedup-preload", action="append", default=None, metavar="TYPE=CSV", help="Sortie précédente d'un type dont les entity_id sont marqués comme vus (répétable)")
+    p.add_argument("--store", type=str, default="interpol_notices.sqlite", help="Base SQLite commune à tous les types")
+    p.add_argument("--cache", type=str, default=os.getenv("SCRAPER_CACHE"), help="Cache disque SQLite des réponses JSON")
+    p.add_argument("--capture", type=str, default=os.getenv("SCRAPER_CAPTURE"), help="Dossier de capture brute des réponses, tous types (python -m interpol.capture)")
+    p.add_argument("--output-dir", type=str, default=".", help="Dossier des sorties interpol_<type>_notices.<format>")
+    p.add_argument("--format", choices=OUTPUT_FORMATS, default="csv", help="Format de sortie : csv, parquet ou arrow")
+    p.add_argument("--verify", action="store_true", help="Vérifier la couverture et rattraper les partitions en défaut")
+    p.add_argument("--sequential", action="store_true", help="Traiter les types l'un après l'autre plutôt qu'en parallèle")
+    args = p.parse_args(argv[1:])
+
+    names = [t.strip() for t in args.types.split(",") if t.strip()]
+    unknown = [t for t in names if t not in NOTICE_TYPES]
+    if unknown:
+        p.error(f"Type(s) inconnu(s): {', '.join(unknown)} (choix: {', '.join(NOTICE_TYPES)})")
+    if args.format != "csv":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            p.error(f"--format {args.format} nécessite pyarrow (pip install pyarrow)")
+    countries = [c.strip().upper() for c in args.countries.split(",")] if args.countries else COUNTRIES
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    client = HTTPClient(HEADERS, insecure=os.getenv("SCRAPER_INSECURE") == "1")
+    # Moteur asyncio : le plafond AIMD suit --async-concurrency, comme dans main.py
+    max_concurrency = max(args.workers, args.async_concurrency) if args.engine == "asyncio" else args.workers
+    limiter = RateLimiter(args.rps, args.burst, max_concurrency=max_concurrency)
+    store = NoticeStore(args.store) if args.store else None
+    seen = open_seen_ids(args.dedup, reset=args.dedup_reset)
+    for spec in args.dedup_preload or []:
+        name, _, path = spec.partition("=")
+        if name not in NOTICE_TYPES or not path:
+            p.error(f"--dedup-preload attend TYPE=CSV (ex. red=interpol_red_notices.csv), reçu {spec!r}")
+        print(f"[Info] Dédoublonnage: {preload_keys(seen, [path], prefix=name + ':')} clés {name} reprises de {path}")
+    cache = ResponseCache(args.cache) if args.cache else None
+    capture = CaptureWriter(args.capture) if args.capture else None
+
+    print("🚀 SCRAPER INTERPOL - MULTI-TYPES")
+    print("=" * 60)
+    print(f"📋 Types: {', '.join(names)} ({'séquentiel' if args.sequential else 'en parallèle'})")
+    print(f"🌍 Pays: {len(countries)}")
+    print(f"⏱️  Débit global: {args.rps:g} req/s (rafale {args.burst:g}, concurrence ≤ {args.workers})")
+    print("=" * 60)
+
+    crawlers: Dict[str, NoticeCrawler] = {}
+    threads: List[threading.Thread] = []
+    start = time.time()
+    for name in names:
+        nt = NOTICE_TYPES[name]
+        planner = AgePlanner(os.path.join(args.output_dir, f"interpol_{name}_age_plan.json")) if "age" in nt.split_dims else None
+        output = os.path.join(args.output_dir, f"interpol_{name}_notices.{args.format}")
+        state = None if args.no_state else CrawlState(f"{output}.state.sqlite", resume=args.resume)
+        # Sans page de détail (yellow), rien à éviter : la liste est déjà toute la notice
+        index = None
+        if args.incremental and nt.fetch_details:
+            index = NoticeIndex(os.path.join(args.output_dir, f"interpol_{name}_index.sqlite"))
+        crawlers[name] = NoticeCrawler(nt, client, limiter, HEADERS, store=store, cache=cache, planner=planner,
+                                       countries=countries, collect_workers=args.collect_workers,
+                                       detail_workers=args.detail_workers, count_probes=args.count_probes,
+                                       seen=seen, capture=capture, global_pages=min(args.global_pages, GLOBAL_PAGE_CAP),
+                                       max_pages=args.max_pages, stream=not args.phased, detail_engine=args.engine,
+                                       async_concurrency=args.async_concurrency,
+                                       normalize_workers=args.normalize_workers, state=state, index=index)
+        job = (crawlers[name], output, args.format, args.verify)
+        if args.sequential:
+            crawl_type(*job)
+        else:
+            threads.append(threading.Thread(target=crawl_type, args=job, name=f"crawl-{name}"))
+            threads[-1].start()
+    for t in threads:
+        t.join()
+
+    print("=" * 60)
+    print(f"✅ Terminé en {time.time() - start:.1f}s — {client.requests_sent} requêtes, limiteur {limiter.describe()}")
+    if cache is not None:
+        print(f"💾 Cache: {cache.describe()}")
+        cache.close()
+    if capture is not None:
+        capture.close()
+        print(f"📼 Capture: {capture.describe()}")
+    if store is not None:
+        print(f"🗄️ Base SQLite {store.path}: {store.stats()}")
+        store.close()
+    seen.close()
+    client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
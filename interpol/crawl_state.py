@@ -0,0 +1,145 @@
+"""
+Journal de crawl sur disque (SQLite en mode WAL) pour reprendre après un crash
+- partitions terminées (et leurs sous-partitions)
+- tâches découvertes (notice brute de liste, filtres de sa partition)
+- lignes normalisées déjà écrites
+Les écritures sont groupées et validées toutes les `commit_every` opérations
+ou `commit_interval` secondes : un crash ne coûte que le dernier lot.
+Le journal n'a d'utilité qu'après un arrêt : remove() l'efface en fin de crawl réussi.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT);
+CREATE TABLE IF NOT EXISTS partitions (key TEXT PRIMARY KEY, children TEXT NOT NULL, done_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS tasks (key TEXT PRIMARY KEY, entity_id TEXT, url TEXT, item TEXT NOT NULL, filters TEXT);
+CREATE TABLE IF NOT EXISTS rows (key TEXT PRIMARY KEY, row TEXT NOT NULL);
+"""
+
+# Tâche telle que journalisée : (clé de dédup, notice brute, url de détail, entity_id,
+# filtres de la partition qui l'a renvoyée ou None)
+JournalTask = Tuple[str, Dict[str, Any], str, str, Optional[Sequence[Any]]]
+
+
+class CrawlState:
+    """Journal append-only d'un crawl ; sûr entre threads."""
+
+    def __init__(self, path: str, resume: bool = False, commit_every: int = 200,
+                 commit_interval: float = 2.0):
+        self.path = path
+        if not resume:
+            self.remove()
+        self.resumed = resume and os.path.exists(path)
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        if "filters" not in {col[1] for col in self._conn.execute("PRAGMA table_info(tasks)")}:
+            # Journal d'une version précédente, repris avec --resume
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN filters TEXT")
+        self._conn.commit()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    # --- écriture ---
+    def _maybe_commit(self, ops: int) -> None:
+        self._uncommitted += ops
+        now = time.monotonic()
+        if self._uncommitted >= self.commit_every or now - self._last_commit >= self.commit_interval:
+            self._conn.commit()
+            self._uncommitted = 0
+            self._last_commit = now
+
+    def record_partition(self, key: str, tasks: Sequence[JournalTask], children: Sequence[Any] = ()) -> None:
+        """Enregistre les tâches d'une partition PUIS la partition elle-même.
+
+        Une partition n'est marquée terminée qu'avec ses tâches : au pire, un
+        crash entre les deux la fait rejouer (les tâches sont dédupliquées).
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (key, entity_id, url, item, filters) VALUES (?, ?, ?, ?, ?)",
+                [(k, eid, url, json.dumps(item, ensure_ascii=False), None if filters is None else json.dumps(list(filters)))
+                 for k, item, url, eid, filters in tasks])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO partitions (key, children, done_at) VALUES (?, ?, ?)",
+                (key, json.dumps(list(children)), time.time()))
+            self._maybe_commit(len(tasks) + 1)
+
+    def record_row(self, key: str, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO rows (key, row) VALUES (?, ?)",
+                               (key, json.dumps(row, ensure_ascii=False)))
+            self._maybe_commit(1)
+
+    def record_rows(self, rows: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO rows (key, row) VALUES (?, ?)",
+                                   [(k, json.dumps(r, ensure_ascii=False)) for k, r in rows])
+            self._maybe_commit(len(rows))
+
+    def set_meta(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (k, v) VALUES (?, ?)", (key, json.dumps(value)))
+            self._maybe_commit(1)
+
+    # --- lecture (reprise) ---
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def partition_children(self, key: str) -> Optional[List[Any]]:
+        """Sous-partitions d'une partition déjà terminée, ou None si elle reste à faire."""
+        rows = self._query("SELECT children FROM partitions WHERE key = ?", (key,))
+        if not rows:
+            return None
+        return json.loads(rows[0][0])
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        rows = self._query("SELECT v FROM meta WHERE k = ?", (key,))
+        return json.loads(rows[0][0]) if rows else default
+
+    def task_keys(self) -> List[str]:
+        return [k for (k,) in self._query("SELECT key FROM tasks")]
+
+    def pending_tasks(self) -> Iterator[JournalTask]:
+        """Tâches découvertes dont la ligne n'a pas encore été écrite."""
+        for key, item, url, eid, filters in self._query(
+                "SELECT t.key, t.item, t.url, t.entity_id, t.filters FROM tasks t "
+                "LEFT JOIN rows r ON r.key = t.key WHERE r.key IS NULL"):
+            yield key, json.loads(item), url or "", eid or "", json.loads(filters) if filters else None
+
+    def rows(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for key, row in self._query("SELECT key, row FROM rows"):
+            yield key, json.loads(row)
+
+    def row_entity_ids(self) -> List[str]:
+        """entity_id des tâches dont la ligne est déjà écrite."""
+        return [eid for (eid,) in self._query(
+            "SELECT t.entity_id FROM tasks t JOIN rows r ON r.key = t.key WHERE t.entity_id != ''")]
+
+    def counts(self) -> Dict[str, int]:
+        out = {}
+        for table in ("partitions", "tasks", "rows"):
+            out[table] = self._query(f"SELECT COUNT(*) FROM {table}")[0][0]
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def remove(self) -> None:
+        """Supprime le fichier du journal (et son WAL) : crawl terminé, plus rien à reprendre."""
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
@@ -0,0 +1,391 @@
+"""
+Index de dédoublonnage partageable (notices déjà vues)
+Même interface que SeenIds (add_new / in / len / update / close), sur
+l'empreinte 64 bits de chaque clé :
+- SeenIds (interpol/pipeline.py) : ensemble en mémoire, propre au processus
+- MmapSeenIds : table de hachage (adressage ouvert) dans un fichier mappé en
+  mémoire, partagée entre threads et processus (verrou fcntl), agrandie sur place
+- SqliteSeenIds : table SQLite (WAL), partagée entre processus
+- BloomFront : filtre de Bloom devant un index, pour des réponses négatives
+  sans toucher à l'index ; fichier mappé optionnel pour le partager aussi
+Un index sur disque garde son contenu d'un run à l'autre : c'est ce qui permet
+de découper un crawl entre processus sans télécharger deux fois un détail, ou
+de repartir des sorties précédentes (preload_keys). `reset` repart de zéro.
+
+Spécification en ligne de commande (open_seen_ids) :
+  memory | mmap:<fichier> | sqlite:<fichier>, suffixe « +bloom » optionnel
+  ex. --dedup sqlite:interpol_seen.sqlite+bloom
+"""
+
+import csv
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Union
+
+from interpol.pipeline import SeenIds
+from interpol.records import dedup_digest
+
+try:
+    import fcntl
+except ImportError:  # Windows : partage entre threads seulement
+    fcntl = None
+
+MMAP_MAGIC = b"ISEEN001"
+MMAP_HEADER = struct.Struct("<8sQQ")  # magic, capacité (puissance de 2), nombre de clés
+MMAP_LOAD = 0.7
+BLOOM_MAGIC = b"IBLOOM01"
+BLOOM_HEADER = struct.Struct("<8sQQ")  # magic, nombre de bits, nombre de fonctions de hachage
+
+
+@contextmanager
+def file_lock(fd: int, exclusive: bool = True) -> Iterator[None]:
+    """Verrou consultatif sur un fichier ouvert (sans effet sans fcntl)."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class MmapSeenIds:
+    """Table d'empreintes 64 bits dans un fichier mappé ; sûre entre threads et processus.
+
+    Emplacement vide = 0 (l'empreinte 0 est ramenée à 1). Au-delà de 70 %
+    de remplissage, la table double de taille sur place ; les autres
+    processus remappent le fichier à leur opération suivante.
+    """
+
+    def __init__(self, path: str, capacity: int = 1 << 20, reset: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._mm: Optional[mmap.mmap] = None
+        self._slots: Optional[memoryview] = None
+        self._capacity = 0
+        with self._lock, file_lock(self._fd):
+            size = os.fstat(self._fd).st_size
+            if reset or size < MMAP_HEADER.size:
+                cap = 1 << max(4, (max(capacity, 16) - 1).bit_length())
+                self._format(cap)
+            self._map()
+
+    def _format(self, capacity: int) -> None:
+        os.ftruncate(self._fd, 0)
+        os.ftruncate(self._fd, MMAP_HEADER.size + 8 * capacity)
+        os.pwrite(self._fd, MMAP_HEADER.pack(MMAP_MAGIC, capacity, 0), 0)
+
+    def _unmap(self) -> None:
+        if self._slots is not None:
+            self._slots.release()
+            self._slots = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _map(self) -> None:
+        self._unmap()
+        magic, capacity, _ = MMAP_HEADER.unpack(os.pread(self._fd, MMAP_HEADER.size, 0))
+        if magic != MMAP_MAGIC:
+            raise ValueError(f"{self.path} n'est pas un index de dédoublonnage")
+        self._mm = mmap.mmap(self._fd, MMAP_HEADER.size + 8 * capacity)
+        self._slots = memoryview(self._mm)[MMAP_HEADER.size:].cast("Q")
+        self._capacity = capacity
+
+    def _header(self) -> tuple:
+        return MMAP_HEADER.unpack_from(self._mm, 0)
+
+    def _sync(self) -> None:
+        """Remappe si un autre processus a agrandi la table."""
+        if self._header()[1] != self._capacity:
+            self._map()
+
+    def _find(self, digest: int) -> int:
+        """Emplacement de `digest`, ou premier emplacement vide de sa séquence de sondage."""
+        mask = self._capacity - 1
+        i = digest & mask
+        slots = self._slots
+        while True:
+            value = slots[i]
+            if value == 0 or value == digest:
+                return i
+            i = (i + 1) & mask
+
+    def _grow(self) -> None:
+        entries = [v for v in self._slots if v]
+        self._unmap()
+        self._format(self._capacity * 2)
+        self._map()
+        for digest in entries:
+            self._slots[self._find(digest)] = digest
+        MMAP_HEADER.pack_into(self._mm, 0, MMAP_MAGIC, self._capacity, len(entries))
+
+    def _insert(self, digest: int) -> bool:
+        i = self._find(digest)
+        if self._slots[i] == digest:
+            return False
+        _, capacity, count = self._header()
+        if (count + 1) > capacity * MMAP_LOAD:
+            self._grow()
+            i = self._find(digest)
+        self._slots[i] = digest
+        MMAP_HEADER.pack_into(self._mm, 0, MMAP_MAGIC, self._capacity, count + 1)
+        return True
+
+    def add_digest(self, digest: int) -> bool:
+        digest = digest or 1
+        with self._lock, file_lock(self._fd):
+            self._sync()
+            return self._insert(digest)
+
+    def add_new(self, key: str) -> bool:
+        """Ajoute la clé et retourne True si aucun processus ne l'avait encore vue."""
+        return self.add_digest(dedup_digest(key))
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        digest = dedup_digest(key) or 1
+        with self._lock, file_lock(self._fd, exclusive=False):
+            self._sync()
+            return self._slots[self._find(digest)] == digest
+
+    def __len__(self) -> int:
+        with self._lock, file_lock(self._fd, exclusive=False):
+            return self._header()[2]
+
+    def update(self, keys: Iterable[str]) -> None:
+        digests = [dedup_digest(k) or 1 for k in keys]
+        with self._lock, file_lock(self._fd):
+            self._sync()
+            for digest in digests:
+                self._insert(digest)
+
+    def digests(self) -> List[int]:
+        with self._lock, file_lock(self._fd, exclusive=False):
+            self._sync()
+            return [v for v in self._slots if v]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mm is not None:
+                self._mm.flush()
+            self._unmap()
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+
+
+def _signed(digest: int) -> int:
+    """Empreinte 64 bits non signée → entier signé SQLite."""
+    return digest - (1 << 64) if digest >= (1 << 63) else digest
+
+
+class SqliteSeenIds:
+    """Empreintes dans une table SQLite (WAL) ; partagée entre processus, chaque ajout validé aussitôt."""
+
+    def __init__(self, path: str, reset: bool = False, timeout: float = 30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (digest INTEGER PRIMARY KEY) WITHOUT ROWID")
+        if reset:
+            self._conn.execute("DELETE FROM seen")
+
+    def add_digest(self, digest: int) -> bool:
+        with self._lock:
+            return self._conn.execute("INSERT OR IGNORE INTO seen (digest) VALUES (?)",
+                                      (_signed(digest),)).rowcount == 1
+
+    def add_new(self, key: str) -> bool:
+        return self.add_digest(dedup_digest(key))
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM seen WHERE digest = ?",
+                                      (_signed(dedup_digest(key)),)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def update(self, keys: Iterable[str]) -> None:
+        rows = [(_signed(dedup_digest(k)),) for k in keys]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany("INSERT OR IGNORE INTO seen (digest) VALUES (?)", rows)
+            self._conn.execute("COMMIT")
+
+    def digests(self) -> List[int]:
+        with self._lock:
+            return [d + (1 << 64) if d < 0 else d for (d,) in self._conn.execute("SELECT digest FROM seen")]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class BloomFilter:
+    """Filtre de Bloom sur des empreintes 64 bits ; en mémoire ou dans un fichier mappé partagé.
+
+    Un fichier existant garde ses propres paramètres (en-tête), quelle que
+    soit la capacité demandée par le processus qui l'ouvre.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001, path: Optional[str] = None,
+                 reset: bool = False):
+        capacity = max(1, capacity)
+        self.bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._lock = threading.Lock()
+        self._fd = -1
+        self._mm: Optional[mmap.mmap] = None
+        # Vrai si le filtre part vide (à remplir depuis l'index s'il ne l'est pas)
+        self.created = True
+        if not path:
+            self._data = memoryview(bytearray((self.bits + 7) // 8))
+            return
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        with file_lock(self._fd):
+            self.created = reset or os.fstat(self._fd).st_size < BLOOM_HEADER.size
+            if self.created:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, BLOOM_HEADER.size + (self.bits + 7) // 8)
+                os.pwrite(self._fd, BLOOM_HEADER.pack(BLOOM_MAGIC, self.bits, self.hashes), 0)
+            magic, self.bits, self.hashes = BLOOM_HEADER.unpack(os.pread(self._fd, BLOOM_HEADER.size, 0))
+        if magic != BLOOM_MAGIC:
+            os.close(self._fd)
+            raise ValueError(f"{path} n'est pas un filtre de Bloom")
+        self._mm = mmap.mmap(self._fd, BLOOM_HEADER.size + (self.bits + 7) // 8)
+        self._data = memoryview(self._mm)[BLOOM_HEADER.size:]
+
+    def _positions(self, digest: int) -> List[int]:
+        # Double hachage : deux moitiés de l'empreinte, h1 + i·h2
+        h1, h2 = digest & 0xFFFFFFFF, (digest >> 32) | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def might_contain(self, digest: int) -> bool:
+        data = self._data
+        return all(data[p >> 3] & (1 << (p & 7)) for p in self._positions(digest))
+
+    def add(self, digest: int) -> None:
+        positions = self._positions(digest)
+        # Lire-modifier-écrire d'un octet : verrou pour ne pas perdre le bit d'un autre processus
+        with self._lock, (file_lock(self._fd) if self._fd >= 0 else _no_lock()):
+            data = self._data
+            for p in positions:
+                data[p >> 3] |= 1 << (p & 7)
+
+    def close(self) -> None:
+        self._data.release()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+@contextmanager
+def _no_lock() -> Iterator[None]:
+    yield
+
+
+class BloomFront:
+    """Filtre de Bloom devant un index : `in` répond « non » sans consulter l'index.
+
+    Toute insertion doit passer par un BloomFront partageant le même filtre
+    (même fichier entre processus), sinon des clés ajoutées ailleurs seraient
+    déclarées absentes. add_new reste tranché par l'index.
+    """
+
+    def __init__(self, index: "DedupIndex", bloom: BloomFilter):
+        self.index = index
+        self.bloom = bloom
+        self.stats = {"negative": 0, "lookups": 0}
+
+    def add_new(self, key: str) -> bool:
+        digest = dedup_digest(key)
+        self.bloom.add(digest)
+        return self.index.add_new(key)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        self.stats["lookups"] += 1
+        if not self.bloom.might_contain(dedup_digest(key)):
+            self.stats["negative"] += 1
+            return False
+        return key in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def update(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        for key in keys:
+            self.bloom.add(dedup_digest(key))
+        self.index.update(keys)
+
+    def close(self) -> None:
+        self.bloom.close()
+        close = getattr(self.index, "close", None)
+        if close:
+            close()
+
+
+DedupIndex = Union[SeenIds, MmapSeenIds, SqliteSeenIds, BloomFront]
+
+
+def open_seen_ids(spec: Optional[str] = None, reset: bool = False, capacity: int = 1 << 20,
+                  error_rate: float = 0.001) -> DedupIndex:
+    """Index décrit par `spec` : memory | mmap:<fichier> | sqlite:<fichier>, suffixe « +bloom » optionnel."""
+    spec = (spec or "memory").strip()
+    bloom = spec.endswith("+bloom")
+    if bloom:
+        spec = spec[:-len("+bloom")]
+    kind, _, path = spec.partition(":")
+    if kind == "memory":
+        index: DedupIndex = SeenIds()
+    elif kind == "mmap" and path:
+        index = MmapSeenIds(path, capacity, reset=reset)
+    elif kind == "sqlite" and path:
+        index = SqliteSeenIds(path, reset=reset)
+    else:
+        raise ValueError(f"Index de dédoublonnage inconnu: {spec!r} (memory, mmap:<fichier>, sqlite:<fichier>)")
+    if bloom:
+        # Filtre partagé à côté du fichier de l'index ; en mémoire pour l'index en mémoire
+        front = BloomFilter(capacity, error_rate, f"{path}.bloom" if path else None, reset=reset)
+        if front.created and len(index):
+            # Index déjà rempli par un run sans filtre : le filtre doit tout couvrir
+            for digest in index.digests():
+                front.add(digest)
+        index = BloomFront(index, front)
+    return index
+
+
+def preload_keys(index: DedupIndex, paths: Iterable[str], column: str = "entity_id",
+                 prefix: str = "") -> int:
+    """Marque comme vues les clés de sorties précédentes (CSV : colonne `column`).
+
+    `prefix` (ex. « red: ») reprend la convention de clés du moteur multi-types.
+    Retourne le nombre de clés lues.
+    """
+    total = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            keys = [prefix + row[column] for row in csv.DictReader(f) if row.get(column)]
+        index.update(keys)
+        total += len(keys)
+    return total
@@ -0,0 +1,876 @@
+"""
+Moteur de collecte commun aux types de notices (red, yellow, un)
+Un seul cœur pour tous les points d'accès et toutes les commandes
+(main.py, yelllow_notice.py, python -m interpol.crawl) :
+  Phase 0 — pages de la liste sans filtre (notices rouges : 50 pages au plus)
+  Phase 1 — partitions : pays → sous-fenêtres (sexe, âge, prénom selon le
+            type) jusqu'à passer sous le plafond de 160 résultats ; totaux
+            mémoïsés (ProbeMemo) et page 1 des sondes réutilisée
+  Phase 2 — détails : threads ou coroutines (asyncio) qui puisent dans une
+            file de tâches (TaskFeed), pendant la collecte (stream) ou après ;
+            normalisation sur place ou dans un pool de processus (NormalizeStage)
+Options : journal de reprise (CrawlState), mode incrémental (NoticeIndex et
+GET conditionnels), crawl réparti en baux (LeaseQueue), vérification et
+rattrapage. Client HTTP, limiteur, cache et base SQLite sont fournis par
+l'appelant et peuvent être partagés entre plusieurs moteurs qui tournent en parallèle.
+"""
+
+import asyncio
+import functools
+import json
+import math
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from interpol.age_planner import AgePlanner
+from interpol.async_http import AsyncHTTPClient
+from interpol.capture import CaptureWriter
+from interpol.catchup import API_CAP, MAX_AGE, MIN_AGE, CatchUp, split_window
+from interpol.coverage import CoverageCheck
+from interpol.crawl_state import CrawlState, JournalTask
+from interpol.dedup import DedupIndex
+from interpol.http_cache import ResponseCache
+from interpol.http_pool import HTTPClient
+from interpol.leases import LeaseQueue
+from interpol.metrics import METRICS
+from interpol.normalize_stage import NormalizeStage
+from interpol.notice_index import NoticeIndex, list_hash
+from interpol.notice_store import PARTITION_DIMS, Filters, NoticeStore
+from interpol.notice_types import (COUNTRIES, NoticeType, iter_notices, notice_dedup_key,
+                                   notice_self_url)
+from interpol.pipeline import SeenIds, TaskFeed
+from interpol.probe_memo import ProbeMemo
+from interpol.rate_limit import RateLimiter
+from interpol.records import compact_item
+
+RESULTS_PER_PAGE = 160
+# Plafond de pagination de la liste sans filtre (Phase 0)
+GLOBAL_PAGE_CAP = 50
+GLOBAL_FILTERS: Filters = (None, None, None, None, None, None)
+# Attente entre deux tentatives quand tous les baux restants sont tenus ailleurs
+LEASE_POLL = 2.0
+DETAIL_ENGINES = ("threads", "asyncio")
+
+# Tâche de détail : (notice de liste, filtres de la partition qui l'a renvoyée)
+Task = Tuple[Dict[str, Any], Filters]
+Row = Dict[str, Any]
+RowCallback = Callable[[Optional[Row]], None]
+
+
+def filter_params(filters: Filters, page: int, result_per_page: int = RESULTS_PER_PAGE) -> Dict[str, str]:
+    """Paramètres de requête de liste pour un tuple de filtres."""
+    nationality, age_min, age_max, sex_id, forename, country_of_birth = filters
+    params = {"page": str(page), "resultPerPage": str(result_per_page)}
+    if nationality:
+        params["nationality"] = nationality
+    if age_min is not None:
+        params["ageMin"] = str(age_min)
+    if age_max is not None:
+        params["ageMax"] = str(age_max)
+    if sex_id:
+        params["sexId"] = sex_id
+    if forename:
+        params["forename"] = forename
+    if country_of_birth:
+        params["country_of_birth_id"] = country_of_birth
+    return params
+
+
+def entity_id(item: Dict[str, Any]) -> str:
+    return str(item.get("entity_id") or item.get("id") or "").strip()
+
+
+def task_key(notice_type: str, item: Dict[str, Any]) -> str:
+    """Clé de notice préfixée du type : les numéros (AAAA/NNNNN) se recoupent d'un type à l'autre."""
+    return f"{notice_type}:{notice_dedup_key(item, notice_self_url(item), entity_id(item))}"
+
+
+def partition_key(filters: Sequence[Any]) -> str:
+    """Clé d'une partition dans le journal et dans la file de baux."""
+    return "|".join("" if x is None else str(x) for x in filters)
+
+
+def lease_key(item: List[Any]) -> str:
+    if item[0] == "global":
+        return f"global|page={item[1]}"
+    return partition_key(item)
+
+
+def describe_filters(filters: Sequence[Any]) -> str:
+    return ", ".join(f"{d}={v}" for d, v in zip(PARTITION_DIMS, filters) if v is not None) or "sans filtre"
+
+
+class NoticeCrawler:
+    """Collecte complète d'un type de notice : partitions, détails, base et vérification."""
+
+    def __init__(self, notice_type: NoticeType, client: HTTPClient, limiter: RateLimiter,
+                 headers: Optional[Dict[str, str]] = None, store: Optional[NoticeStore] = None,
+                 cache: Optional[ResponseCache] = None, planner: Optional[AgePlanner] = None,
+                 countries: Sequence[str] = COUNTRIES, collect_workers: int = 4,
+                 detail_workers: int = 8, queue_size: int = 2000, count_probes: bool = False,
+                 seen: Optional[DedupIndex] = None, capture: Optional[CaptureWriter] = None,
+                 global_pages: int = 0, max_pages: Optional[int] = None, stream: bool = True,
+                 detail_engine: str = "threads", async_concurrency: int = 200,
+                 normalize_workers: int = 0, state: Optional[CrawlState] = None,
+                 index: Optional[NoticeIndex] = None):
+        if detail_engine not in DETAIL_ENGINES:
+            raise ValueError(f"moteur de détails inconnu: {detail_engine} (choix: {', '.join(DETAIL_ENGINES)})")
+        self.type = notice_type
+        self.client = client
+        self.limiter = limiter
+        self.headers = dict(headers or {}, referer=notice_type.referer)
+        self.store = store
+        self.cache = cache
+        self.capture = capture
+        self.planner = planner
+        self.countries = list(countries)
+        self.collect_workers = max(1, collect_workers)
+        self.detail_workers = max(1, detail_workers)
+        self.queue_size = queue_size
+        self.count_probes = count_probes
+        # Phase 0 : pages de la liste sans filtre (0 = aucune) ; max_pages borne aussi la Phase 1
+        self.global_pages = global_pages
+        self.max_pages = max_pages
+        # stream : détails téléchargés pendant la collecte (file bornée, contre-pression)
+        self.stream = stream
+        self.detail_engine = detail_engine
+        self.async_concurrency = max(1, async_concurrency)
+        self.normalize_workers = normalize_workers
+        self.state = state
+        self.index = index
+        self.probes = ProbeMemo()
+        # Index partageable entre types (clés préfixées) et entre processus (interpol/dedup.py)
+        self.seen = seen if seen is not None else SeenIds()
+        self.feed: Optional[TaskFeed] = None
+        self.normalizer: Optional[NormalizeStage] = None
+        self._lock = threading.Lock()
+        self.stats = {"partitions": 0, "leaves": 0, "tasks": 0, "rows": 0, "details_failed": 0}
+        # Partitions (ou « global ») en échec : le journal est alors gardé pour une reprise
+        self.failed: List[Any] = []
+        self.timings = {"global": 0.0, "partitions": 0.0, "details": 0.0}
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+
+    # --- HTTP ---
+    def get_json(self, url: str, params: Optional[Dict[str, str]] = None) -> Any:
+        data = self.cache.get(url, params) if self.cache is not None else None
+        if data is None:
+            # 429 / 5xx / timeout : rejouée par le limiteur (attente croissante, Retry-After)
+            data = self.limiter.call(self.client.get_json, url, params, headers=self.headers)
+            if self.cache is not None and data:
+                self.cache.put(url, params, data)
+        if self.capture is not None:
+            self.capture.add(url, params, data)
+        return data
+
+    def fetch_page(self, filters: Filters, page: int, result_per_page: int = RESULTS_PER_PAGE) -> Dict[str, Any]:
+        return self.get_json(self.type.api_url, filter_params(filters, page, result_per_page))
+
+    def total(self, filters: Filters) -> int:
+        """Total annoncé par l'API pour `filters`, sondé au plus une fois ; une sonde en échec lève."""
+        count_probe = (lambda: self.fetch_page(filters, 1, 1)) if self.count_probes else None
+        return self.probes.total(filters, lambda page: self.fetch_page(filters, page), count_probe)
+
+    def count_total(self, filters: Filters) -> int:
+        """Total seul (resultPerPage=1), pour la vérification et le rattrapage."""
+        return self.probes.total(filters, lambda page: self.fetch_page(filters, page),
+                                 lambda: self.fetch_page(filters, 1, 1))
+
+    def recount_total(self, filters: Filters) -> int:
+        """Total re-sondé (resultPerPage=1) sans passer par le mémo, pour la vérification."""
+        return self.probes.recount(filters, lambda: self.fetch_page(filters, 1, 1))
+
+    def detail_url(self, item: Dict[str, Any]) -> str:
+        url = notice_self_url(item)
+        if not url:
+            eid = entity_id(item)
+            url = f"{self.type.api_url}/{eid.replace('/', '-')}" if eid else ""
+        return url
+
+    def fetch_detail(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        url = self.detail_url(item)
+        if not url:
+            return None
+        try:
+            data = self.get_json(url)
+            return data if isinstance(data, dict) else None
+        except Exception:
+            self._count("details_failed")
+            return None
+
+    def fetch_detail_conditional(self, url: str, cond_headers: Dict[str, str]) -> Tuple[int, Any, Optional[Dict[str, Any]]]:
+        """GET conditionnel d'un détail : (statut, en-têtes, détail) ; statut 0 en cas d'échec."""
+        try:
+            status, headers, body = self.limiter.call(self.client.request, url,
+                                                      headers={**self.headers, **cond_headers})
+            if status == 304:
+                return status, headers, None
+            data = json.loads(body.decode("utf-8", errors="replace"))
+            if self.capture is not None:
+                self.capture.add(url, None, data)
+            return status, headers, data if isinstance(data, dict) else None
+        except Exception:
+            self._count("details_failed")
+            return 0, None, None
+
+    # --- Phase 0 : liste sans filtre ---
+    def global_page_count(self) -> int:
+        """Pages de la Phase 0 : total global, plafonné à `global_pages` et à max_pages."""
+        total = self.probes.total(GLOBAL_FILTERS, lambda page: self.fetch_page(GLOBAL_FILTERS, page))
+        pages = min(self.global_pages, math.ceil(total / RESULTS_PER_PAGE))
+        if self.max_pages is not None:
+            pages = min(pages, self.max_pages)
+        print(f"[Info] {self.type.name} : total global {total} notices, collecte sur {pages} pages")
+        return pages
+
+    def global_page(self, page: int, seen: Optional[DedupIndex] = None) -> List[Task]:
+        """Tâches inédites d'une page de la liste sans filtre (page 1 : celle de la sonde)."""
+        fetch = lambda p: self.fetch_page(GLOBAL_FILTERS, p)
+        data = self.probes.first_page(GLOBAL_FILTERS, fetch) if page == 1 else fetch(page)
+        return self.tasks_from_page(data, GLOBAL_FILTERS, seen)[0]
+
+    def collect_global(self, feed: TaskFeed) -> int:
+        """Phase 0 : les tâches partent dans `feed` page après page ; pages déjà journalisées sautées."""
+        start = time.time()
+        pages = self.global_page_count()
+        emitted = 0
+        for page in range(1, pages + 1):
+            page_key = f"global|page={page}"
+            if self.state is not None and self.state.partition_children(page_key) is not None:
+                continue
+            tasks = self.global_page(page)
+            if self.state is not None:
+                self.state.record_partition(page_key, [self.journal_task(t) for t in tasks])
+            feed.put_many(tasks)
+            emitted += len(tasks)
+            eta = (time.time() - start) / page * (pages - page)
+            print(f"[Global] Page {page}/{pages}: +{len(tasks)} tâches | Total Tâches: {feed.produced} "
+                  f"| ETA: {timedelta(seconds=int(eta))}")
+        self.probes.discard_page(GLOBAL_FILTERS)
+        self._count("tasks", emitted)
+        return emitted
+
+    # --- Phase 1 : partitions ---
+    def roots(self) -> List[Filters]:
+        """Partitions racines : un pays par dimension racine du type (nationalité, pays de naissance…)."""
+        out: List[Filters] = []
+        for dim in self.type.root_dims:
+            i = PARTITION_DIMS.index(dim)
+            for country in self.countries:
+                values: List[Any] = [None] * len(PARTITION_DIMS)
+                values[i] = country
+                out.append(tuple(values))  # type: ignore[arg-type]
+        return out
+
+    def complement_root(self, filters: Filters) -> bool:
+        """Racine d'une dimension secondaire (pays de naissance…) : complète la racine principale."""
+        dims = [d for d, v in zip(PARTITION_DIMS, filters) if v is not None]
+        return len(dims) == 1 and dims[0] in self.type.root_dims[1:]
+
+    def children(self, filters: Filters, total: int) -> List[Filters]:
+        """Sous-fenêtres d'une partition trop grosse ; plan d'âge appris quand il s'applique."""
+        nationality, age_min, age_max, sex_id, forename, country_of_birth = filters
+        dims = self.type.split_dims
+        sex_done = sex_id or "sex" not in dims
+        if self.planner is not None and "age" in dims and sex_done and age_min is None and age_max is None:
+            windows = self.planner.plan(nationality, sex_id, total, MIN_AGE, MAX_AGE)
+            if len(windows) > 1:
+                return [(nationality, lo, hi, sex_id, forename, country_of_birth) for lo, hi in windows]
+        return split_window(filters, dims)
+
+    def expand(self, filters: Filters, seen: Optional[DedupIndex] = None) -> Tuple[List[Task], List[Filters]]:
+        """Traite UNE partition : (tâches collectées, sous-partitions à traiter)."""
+        self._count("partitions")
+        total = self.total(filters)
+        nationality, age_min, age_max, sex_id = filters[:4]
+        windowed = age_min is not None and age_max is not None and not filters[4]
+        if total == 0:
+            if windowed and self.planner is not None:
+                self.planner.observe(nationality, sex_id, age_min, age_max, 0)
+            return [], []
+        if total > API_CAP and self.complement_root(filters):
+            # Au-delà du plafond, ses notices sont couvertes par la racine principale
+            self.probes.discard_page(filters)
+            return [], []
+        children = self.children(filters, total) if total > API_CAP else []
+        if children:
+            self.probes.discard_page(filters)
+            return [], children
+        if windowed and self.planner is not None:
+            self.planner.observe(nationality, sex_id, age_min, age_max, total)
+        tasks, _ = self.fetch_leaf(filters, total, seen)
+        return tasks, []
+
+    def run_partition(self, filters: Filters) -> Tuple[List[Task], List[Filters]]:
+        """expand avec journal : une partition déjà terminée n'est pas rejouée."""
+        key = partition_key(filters)
+        if self.state is not None:
+            children = self.state.partition_children(key)
+            if children is not None:
+                return [], [tuple(c) for c in children]  # type: ignore[misc]
+        tasks, children = self.expand(filters)
+        if self.state is not None:
+            self.state.record_partition(key, [self.journal_task(t) for t in tasks], [list(c) for c in children])
+        return tasks, children
+
+    def tasks_from_page(self, data: Dict[str, Any], filters: Filters,
+                        seen: Optional[DedupIndex] = None) -> Tuple[List[Task], List[str]]:
+        """Une page de liste : (tâches inédites, toutes les clés reçues)."""
+        seen = seen if seen is not None else self.seen
+        tasks: List[Task] = []
+        members: List[str] = []
+        for item in iter_notices(data):
+            key = task_key(self.type.name, item)
+            members.append(key)
+            if seen.add_new(key):
+                if self.type.list_fields:
+                    item = compact_item(item, notice_self_url(item), self.type.list_fields)
+                tasks.append((item, filters))
+        return tasks, members
+
+    def fetch_leaf(self, filters: Filters, total: int,
+                   seen: Optional[DedupIndex] = None) -> Tuple[List[Task], List[str]]:
+        """Pages d'une partition feuille : (tâches inédites, toutes les clés reçues)."""
+        tasks: List[Task] = []
+        members: List[str] = []
+        fetch = lambda page: self.fetch_page(filters, page)
+        for page in range(1, math.ceil(min(total, API_CAP) / RESULTS_PER_PAGE) + 1):
+            data = self.probes.first_page(filters, fetch) if page == 1 else fetch(page)
+            page_tasks, page_members = self.tasks_from_page(data, filters, seen)
+            tasks += page_tasks
+            members += page_members
+        self._count("leaves")
+        if self.store is not None:
+            self.store.record_partition(filters, total, members, self.type.name)
+        return tasks, members
+
+    def collect(self, feed: TaskFeed, roots: Optional[List[Filters]] = None) -> int:
+        """Parcours parallèle des partitions ; les tâches partent dans `feed` au fil de l'eau.
+
+        Les sous-partitions sont soumises au même pool dès qu'elles sont
+        produites ; une ligne de progrès est affichée à chaque racine terminée.
+        """
+        roots = roots if roots is not None else self.roots()
+        start = time.time()
+        emitted = 0
+        outstanding: Dict[int, int] = {}
+        per_root: Dict[int, int] = {}
+        roots_done = 0
+        limit = self.max_pages * RESULTS_PER_PAGE if self.max_pages else None
+        with ThreadPoolExecutor(max_workers=self.collect_workers) as executor:
+            pending: Dict[Any, Tuple[Filters, int]] = {}
+
+            def submit(filters: Filters, root: int) -> None:
+                outstanding[root] = outstanding.get(root, 0) + 1
+                pending[executor.submit(self.run_partition, filters)] = (filters, root)
+
+            for i, filters in enumerate(roots):
+                submit(filters, i)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    filters, root = pending.pop(future)
+                    try:
+                        tasks, children = future.result()
+                    except Exception as e:
+                        # Partition non journalisée : rejouée par une reprise
+                        print(f"[Erreur] {self.type.name} {describe_filters(filters)}: {e}")
+                        tasks, children = [], []
+                        with self._lock:
+                            self.failed.append(filters)
+                    feed.put_many(tasks)
+                    emitted += len(tasks)
+                    per_root[root] = per_root.get(root, 0) + len(tasks)
+                    for child in children:
+                        submit(child, root)
+                    outstanding[root] -= 1
+                    if outstanding[root] == 0:
+                        roots_done += 1
+                        eta = (time.time() - start) / roots_done * (len(roots) - roots_done)
+                        print(f"[{roots_done}/{len(roots)}] {self.type.name} {describe_filters(roots[root])}: "
+                              f"+{per_root[root]} tâches | Total Tâches: {feed.produced} "
+                              f"| ETA: {timedelta(seconds=int(eta))}")
+                if limit is not None and feed.produced >= limit:
+                    print(f"[Info] Limite max_pages ({self.max_pages}) atteinte pendant la Phase 1.")
+                    for future in pending:
+                        future.cancel()
+                    break
+        self._count("tasks", emitted)
+        return emitted
+
+    def collect_all(self, feed: TaskFeed) -> None:
+        """Phases 0 & 1, précédées des tâches en attente d'une reprise ; ferme `feed` à la fin."""
+        try:
+            if self.state is not None and self.state.resumed:
+                # Reprise : tâches déjà découvertes connues d'office, celles sans
+                # ligne écrite repartent directement vers la Phase 2.
+                self.seen.update(self.state.task_keys())
+                pending = [(item, tuple(filters) if filters else GLOBAL_FILTERS)
+                           for _, item, _, _, filters in self.state.pending_tasks()]
+                print(f"[Reprise] {self.type.name} : {len(self.seen)} tâches connues, "
+                      f"{len(pending)} détails restant à télécharger")
+                feed.put_many(pending)
+            start = time.time()
+            if self.global_pages:
+                try:
+                    self.collect_global(feed)
+                except Exception as e:
+                    print(f"[Erreur] {self.type.name} phase globale: {e}")
+                    with self._lock:
+                        self.failed.append("global")
+            self.timings["global"] = time.time() - start
+            METRICS.set("interpol_phase_seconds", self.timings["global"], phase="global", type=self.type.name)
+            start = time.time()
+            self.collect(feed)
+            self.timings["partitions"] = time.time() - start
+            METRICS.set("interpol_phase_seconds", self.timings["partitions"], phase="pays", type=self.type.name)
+            print(f"[Sondes] {self.type.name} : {self.probes.describe()}")
+            if self.planner is not None:
+                print(f"[Plan d'âges] {self.planner.describe()}")
+                self.planner.save()
+        finally:
+            feed.close()
+
+    # --- Phase 2 : détails ---
+    def journal_task(self, task: Task) -> JournalTask:
+        item, filters = task
+        return task_key(self.type.name, item), item, notice_self_url(item), entity_id(item), list(filters)
+
+    def map_row(self, item: Dict[str, Any], detail: Optional[Dict[str, Any]], filters: Filters) -> Optional[Row]:
+        try:
+            return self.type.mapper(item, detail, filters)
+        except Exception as e:
+            print(f"[Erreur Normalisation] {self.type.name} {entity_id(item)}: {e}")
+            return None
+
+    def normalize(self, item: Dict[str, Any], detail: Optional[Dict[str, Any]], filters: Filters,
+                  done: RowCallback) -> None:
+        """Ligne d'une notice, sur place ou par lots dans le pool de processus ; done(ligne ou None)."""
+        if self.normalizer is not None:
+            self.normalizer.submit(item, detail, done, filters)
+        else:
+            done(self.map_row(item, detail, filters))
+
+    def _index_row(self, done: RowCallback, eid: str, item_hash: str, status: int, headers: Any,
+                   detail: Optional[Dict[str, Any]], row: Optional[Row]) -> None:
+        """Met l'index à jour avec la ligne d'une notice nouvelle/modifiée, puis la transmet."""
+        # Échec réseau (statut 0) : rien n'est indexé, la notice sera retentée au prochain run
+        if status and row is not None:
+            self.index.store(eid, item_hash, headers.get("ETag"), headers.get("Last-Modified"),
+                             detail, row, status == 304)
+        done(row)
+
+    def unchanged(self, item: Dict[str, Any]) -> Optional[Row]:
+        """Mode incrémental : ligne du run précédent si la notice de liste n'a pas changé."""
+        eid = entity_id(item)
+        self.index.mark_seen(eid)
+        return self.index.unchanged_row(eid, list_hash(item))
+
+    def incremental(self, item: Dict[str, Any], filters: Filters, done: RowCallback,
+                    response: Tuple[int, Any, Optional[Dict[str, Any]]]) -> None:
+        """Suite d'un GET conditionnel : détail en cache si 304, normalisation, index à jour."""
+        eid = entity_id(item)
+        status, headers, detail = response
+        if status == 304:
+            detail = self.index.cached(eid, "detail")
+        self.normalize(item, detail, filters, functools.partial(
+            self._index_row, done, eid, list_hash(item), status, headers, detail))
+
+    def handle(self, task: Task, done: RowCallback) -> None:
+        """Détail (GET conditionnel en mode incrémental) puis normalisation (moteur « threads »)."""
+        item, filters = task
+        eid = entity_id(item)
+        if self.index is not None and eid and self.type.fetch_details:
+            row = self.unchanged(item)
+            if row is not None:
+                done(row)
+                return
+            response = self.fetch_detail_conditional(self.detail_url(item), self.index.conditional_headers(eid))
+            self.incremental(item, filters, done, response)
+            return
+        detail = self.fetch_detail(item) if self.type.fetch_details else None
+        self.normalize(item, detail, filters, done)
+
+    def process(self, task: Task) -> Tuple[str, Optional[Row]]:
+        """Détail et normalisation sur place : (clé, ligne ou None) ; rattrapage et baux."""
+        item, filters = task
+        detail = self.fetch_detail(item) if self.type.fetch_details else None
+        return task_key(self.type.name, item), self.map_row(item, detail, filters)
+
+    def fetch_details_threads(self, feed: TaskFeed, deliver: Callable[[Task, Optional[Row]], None]) -> None:
+        """`detail_workers` threads puisent dans la file jusqu'à sa fermeture."""
+        def worker() -> None:
+            for task in feed:
+                try:
+                    self.handle(task, functools.partial(deliver, task))
+                except Exception as e:
+                    print(f"[Erreur Tâche] {self.type.name} {entity_id(task[0])}: {e}")
+                    deliver(task, None)
+
+        threads = [threading.Thread(target=worker, name=f"detail-{self.type.name}-{i}", daemon=True)
+                   for i in range(self.detail_workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def fetch_details_asyncio(self, feed: TaskFeed, deliver: Callable[[Task, Optional[Row]], None]) -> None:
+        """Détails en coroutines sur un pool keep-alive asynchrone.
+
+        Au plus `async_concurrency` requêtes en vol (sémaphore), détails complets
+        et GET conditionnels confondus ; la normalisation, coûteuse en CPU,
+        tourne dans un pool de threads hors de la boucle (ou dans NormalizeStage).
+        """
+        async def runner() -> None:
+            client = AsyncHTTPClient(self.headers, compress=self.client.compress)
+            # Même vérification TLS que le client synchrone
+            client.ssl_context = self.client.ssl_context
+            loop = asyncio.get_running_loop()
+            fetch_slots = asyncio.Semaphore(self.async_concurrency)
+
+            async def next_task() -> Optional[Task]:
+                try:
+                    return feed.get_nowait()
+                except queue.Empty:
+                    # File vide mais collecte en cours (stream) : attente hors boucle
+                    return await loop.run_in_executor(None, feed.get)
+
+            async def fetch_detail(url: str) -> Optional[Dict[str, Any]]:
+                data = self.cache.get(url) if self.cache is not None else None
+                try:
+                    if data is None:
+                        async with fetch_slots:
+                            data = await self.limiter.acall(client.get_json, url, headers=self.headers)
+                        if self.cache is not None and data:
+                            self.cache.put(url, None, data)
+                    if self.capture is not None:
+                        self.capture.add(url, None, data)
+                    return data if isinstance(data, dict) else None
+                except Exception:
+                    self._count("details_failed")
+                    return None
+
+            async def fetch_conditional(url: str, cond: Dict[str, str]) -> Tuple[int, Any, Optional[Dict[str, Any]]]:
+                try:
+                    async with fetch_slots:
+                        status, headers, body = await self.limiter.acall(
+                            client.request, url, headers={**self.headers, **cond})
+                    if status == 304:
+                        return status, headers, None
+                    data = json.loads(body.decode("utf-8", errors="replace"))
+                    if self.capture is not None:
+                        self.capture.add(url, None, data)
+                    return status, headers, data if isinstance(data, dict) else None
+                except Exception:
+                    self._count("details_failed")
+                    return 0, None, None
+
+            async def handle(task: Task) -> None:
+                item, filters = task
+                eid = entity_id(item)
+                done: RowCallback = functools.partial(deliver, task)
+                if self.index is not None and eid and self.type.fetch_details:
+                    row = self.unchanged(item)
+                    if row is None:
+                        response = await fetch_conditional(self.detail_url(item), self.index.conditional_headers(eid))
+                        if self.normalizer is not None:
+                            self.incremental(item, filters, done, response)
+                        else:
+                            await loop.run_in_executor(cpu_pool, self.incremental, item, filters, done, response)
+                        return
+                    done(row)
+                    return
+                url = self.detail_url(item) if self.type.fetch_details else ""
+                detail = await fetch_detail(url) if url else None
+                if self.normalizer is not None:
+                    self.normalizer.submit(item, detail, done, filters)
+                else:
+                    done(await loop.run_in_executor(cpu_pool, self.map_row, item, detail, filters))
+
+            async def worker() -> None:
+                while True:
+                    task = await next_task()
+                    if task is None:
+                        return
+                    try:
+                        await handle(task)
+                    except Exception as e:
+                        print(f"[Erreur Tâche] {self.type.name} {entity_id(task[0])}: {e}")
+                        deliver(task, None)
+
+            # Deux fois plus de coroutines que de places : pendant qu'une ligne est
+            # normalisée, une autre coroutine garde la place réseau occupée.
+            with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as cpu_pool:
+                try:
+                    await asyncio.gather(*(worker() for _ in range(2 * self.async_concurrency)))
+                finally:
+                    await client.close()
+
+        asyncio.run(runner())
+
+    def _emit(self, rows: List[Tuple[str, Row]], writer: Any) -> None:
+        if writer is not None:
+            for _, row in rows:
+                writer.write(row)
+        self._count("rows", len(rows))
+
+    def run(self, writer: Any) -> int:
+        """Collecte complète ; les lignes partent dans `writer` (et la base, le journal) au fil de l'eau.
+
+        En mode stream, la collecte tourne en tâche de fond et la file est
+        bornée ; sinon les Phases 0 et 1 se terminent avant la Phase 2.
+        """
+        resumed = self.state is not None and self.state.resumed
+        if self.store is not None and not resumed:
+            self.store.clear_partitions(self.type.name)
+        feed = self.feed = TaskFeed(self.queue_size if self.stream else 0)
+        if self.normalize_workers > 0:
+            self.normalizer = NormalizeStage(self.type.mapper, self.normalize_workers)
+            print(f"[Info] {self.type.name} : normalisation dans {self.normalize_workers} processus, "
+                  f"lots de {self.normalizer.chunk_size}")
+        self.register_metrics()
+        if resumed:
+            # La sortie est réécrite : d'abord les lignes déjà journalisées
+            rows = list(self.state.rows())
+            self._emit(rows, writer)
+            if self.store is not None:
+                self.store.upsert_many(rows, self.type.name)
+            if self.index is not None:
+                # Ces notices ne repasseront pas par unchanged() : sans cela,
+                # prune_removed() les prendrait pour des notices retirées
+                for eid in self.state.row_entity_ids():
+                    self.index.mark_seen(eid)
+            print(f"[Reprise] {self.type.name} : {len(rows)} lignes déjà téléchargées réécrites")
+
+        producer: Optional[threading.Thread] = None
+        if self.stream:
+            producer = threading.Thread(target=self.collect_all, args=(feed,), name=f"collect-{self.type.name}",
+                                        daemon=True)
+            producer.start()
+        else:
+            self.collect_all(feed)
+
+        start = time.time()
+        processed = 0
+        progress_lock = threading.Lock()
+
+        def deliver(task: Task, row: Optional[Row]) -> None:
+            nonlocal processed
+            METRICS.inc("interpol_tasks_processed_total", result="ok" if row else "failed", type=self.type.name)
+            if row:
+                key = task_key(self.type.name, task[0])
+                self._emit([(key, row)], writer)
+                if self.state is not None:
+                    self.state.record_row(key, row)
+                if self.store is not None:
+                    self.store.upsert(key, row, self.type.name)
+            with progress_lock:
+                processed += 1
+                done = processed
+            # Progrès tous les 100 traités
+            if done % 100 == 0 or (feed.closed and done == feed.produced):
+                elapsed = time.time() - start
+                if feed.closed:
+                    eta = f"ETA: {timedelta(seconds=int(elapsed / done * (feed.produced - done)))}"
+                else:
+                    eta = f"collecte en cours, {feed.qsize()} en file"
+                print(f"[Progrès] {self.type.name} {done}/{feed.produced} notices traitées "
+                      f"| Total: {self.stats['rows']} | {self.limiter.describe()} | {eta}")
+
+        try:
+            if feed.closed and feed.produced == 0:
+                print(f"[Alerte] {self.type.name} : aucune tâche à traiter.")
+            elif self.detail_engine == "asyncio":
+                self.fetch_details_asyncio(feed, deliver)
+            else:
+                self.fetch_details_threads(feed, deliver)
+        finally:
+            if producer is not None:
+                producer.join()
+            if self.normalizer is not None:
+                # Derniers lots : toutes les lignes doivent passer avant la fermeture de la sortie
+                self.normalizer.close()
+                print(f"[Normalisation] {self.type.name} : {self.normalizer.describe()}")
+            if self.store is not None:
+                self.store.commit()
+            self.timings["details"] = time.time() - start
+            METRICS.set("interpol_phase_seconds", self.timings["details"], phase="details", type=self.type.name)
+        return self.stats["rows"]
+
+    def close_state(self) -> None:
+        """Ferme le journal : effacé après un run sans échec, gardé pour une reprise sinon."""
+        if self.state is None:
+            return
+        self.state.close()
+        if self.failed:
+            print(f"[Info] Journal conservé: {self.state.path} ({len(self.failed)} partitions en échec, "
+                  f"relancer avec --resume)")
+        else:
+            self.state.remove()
+
+    def prune_removed(self) -> List[Row]:
+        """Mode incrémental, après une collecte complète : notices de l'index absentes de ce run.
+
+        Elles sont oubliées de l'index et retirées de la base ; leurs dernières lignes sont retournées.
+        """
+        removed = self.index.removed()
+        eids = [eid for eid, _ in removed]
+        self.index.forget(eids)
+        if self.store is not None:
+            self.store.delete([f"{self.type.name}:{eid}" for eid in eids])
+        return [row for _, row in removed]
+
+    # --- Crawl réparti (baux) ---
+    # Chaque bail est une partition (tuple de filtres) ou une page de la liste
+    # sans filtre ["global", page]. Le worker qui le prend collecte ses tâches,
+    # télécharge leurs détails et remet lignes + sous-baux à la file.
+    def lease_roots(self) -> List[Tuple[str, List[Any]]]:
+        items: List[List[Any]] = [["global", 1]] if self.global_pages else []
+        items += [list(f) for f in self.roots()]
+        return [(lease_key(item), item) for item in items]
+
+    def expand_lease(self, item: List[Any], seen: DedupIndex) -> Tuple[List[Task], List[List[Any]]]:
+        """Traite UN bail : (tâches collectées, sous-baux). La page globale 1 amorce les pages suivantes."""
+        if item[0] != "global":
+            tasks, children = self.expand(tuple(item), seen)  # type: ignore[arg-type]
+            return tasks, [list(c) for c in children]
+        page = item[1]
+        if page > 1:
+            return self.global_page(page, seen), []
+        pages = self.global_page_count()
+        tasks = self.global_page(1, seen)
+        self.probes.discard_page(GLOBAL_FILTERS)
+        return tasks, [["global", p] for p in range(2, pages + 1)]
+
+    def work_leases(self, lease_queue: LeaseQueue, poll: float = LEASE_POLL) -> int:
+        """Prend des baux jusqu'à ce que la file soit terminée ; retourne le nombre de baux traités."""
+        done_leases = 0
+        progress_lock = threading.Lock()
+        details = ThreadPoolExecutor(max_workers=self.detail_workers)
+        self.register_metrics()
+        for status in ("pending", "leased", "done", "failed"):
+            METRICS.collect("interpol_leases", lambda s=status: lease_queue.counts()[s], status=status)
+
+        def lease_worker() -> None:
+            nonlocal done_leases
+            while True:
+                lease = lease_queue.claim()
+                if lease is None:
+                    if lease_queue.finished():
+                        return
+                    time.sleep(poll)
+                    continue
+                key, item, attempt = lease
+                try:
+                    # Bail repris (worker disparu ou échec) : les clés que l'essai
+                    # précédent a marquées vues n'ont peut-être jamais été écrites.
+                    seen = self.seen if attempt == 1 else SeenIds()
+                    tasks, children = self.expand_lease(item, seen)
+                    rows = [(k, row) for k, row in details.map(self.process, tasks) if row]
+                    if not lease_queue.complete(key, rows, [(lease_key(c), c) for c in children]):
+                        print(f"[Avertissement] Bail {key} expiré et repris par un autre worker : résultat écarté")
+                        continue
+                except Exception as e:
+                    print(f"[Erreur] Bail {key} (essai {attempt}): {e}")
+                    lease_queue.release(key)
+                    continue
+                self._count("rows", len(rows))
+                with progress_lock:
+                    done_leases += 1
+                    root = item[0] == "global" or all(v is None for v in item[1:5])
+                    if done_leases % 25 == 0 or root:
+                        print(f"[Bail] {key}: +{len(rows)} notices, {len(children)} sous-baux "
+                              f"| {lease_queue.describe()} | {self.limiter.describe()}")
+
+        lease_queue.start_heartbeat()
+        threads = [threading.Thread(target=lease_worker, name=f"bail-{i}", daemon=True)
+                   for i in range(self.collect_workers)]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            details.shutdown(wait=True)
+            if self.planner is not None:
+                self.planner.save()
+        return done_leases
+
+    # --- Vérification et rattrapage ---
+    def verify(self, workers: int = 4) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(rapport par pays, partitions en défaut) d'après la base ; exige `store`."""
+        check = CoverageCheck(self.store, self.type.name, self.probes.known_total, self.recount_total, workers,
+                              countries=self.countries)
+        report = check.run()
+        print(f"[Info] {self.type.name} : {check.describe()}")
+        return report
+
+    def catch_up(self, windows: List[Filters], writer: Any = None,
+                 label: str = "Rattrapage") -> List[Tuple[str, Row]]:
+        """Couvre des fenêtres incomplètes par des requêtes plus fines ; retourne les nouvelles lignes.
+
+        Elles sont aussi écrites dans `writer` et fusionnées dans la base ;
+        une fenêtre en échec est signalée sans interrompre les suivantes.
+        """
+        # Dédoublonnage d'après la base, indépendant de l'index de la collecte (déjà fermé parfois)
+        seen = SeenIds()
+        seen.update(self.store.keys(self.type.name))
+
+        def fetch_window(filters: Filters) -> Tuple[List[Tuple[str, Row]], List[str]]:
+            tasks, members = self.fetch_leaf(filters, self.total(filters), seen)
+            rows = [(key, row) for key, row in map(self.process, tasks) if row]
+            self._emit(rows, writer)
+            return rows, members
+
+        catchup = CatchUp(self.store, self.type.name, self.count_total, fetch_window,
+                          split_dims=self.type.split_dims)
+        new: List[Tuple[str, Row]] = []
+        for filters in windows:
+            try:
+                rows = catchup.cover(filters)
+            except Exception as e:
+                print(f"[Erreur {label}] {self.type.name} {describe_filters(filters)}: {e}")
+                continue
+            print(f"[OK] {self.type.name} {describe_filters(filters)}: {len(rows)} notices récupérées")
+            new += rows
+        self.store.commit()
+        print(f"[{label}] {self.type.name} : {catchup.describe()}")
+        return new
+
+    # --- Métriques ---
+    def register_metrics(self) -> None:
+        """Valeurs lues à chaque export des métriques : file, limiteur, sondes, cache, normalisation."""
+        name = self.type.name
+        METRICS.collect("interpol_requests_in_flight", lambda: self.limiter.concurrency.in_flight)
+        METRICS.collect("interpol_concurrency_limit", lambda: self.limiter.concurrency.limit)
+        METRICS.collect("interpol_rate_limit_rps", lambda: self.limiter.bucket.rate)
+        METRICS.collect("interpol_rows_written_total", lambda: self.stats["rows"], "counter", type=name)
+        feed = self.feed
+        if feed is not None:
+            METRICS.collect("interpol_task_queue_depth", feed.qsize, type=name)
+            METRICS.collect("interpol_tasks_queued_total", lambda: feed.produced, "counter", type=name)
+        for key in self.probes.stats:
+            METRICS.collect("interpol_probe_events_total", functools.partial(self.probes.stats.get, key),
+                            "counter", event=key, type=name)
+        if self.cache is not None:
+            for key in self.cache.stats:
+                METRICS.collect("interpol_cache_events_total", functools.partial(self.cache.stats.get, key),
+                                "counter", event=key)
+        normalizer = self.normalizer
+        if normalizer is not None:
+            # Normalisation dans d'autres processus : seuls les volumes sont visibles d'ici
+            METRICS.collect("interpol_normalize_chunks_total", lambda: normalizer.chunks, "counter", type=name)
+            METRICS.collect("interpol_normalize_rows_total", lambda: normalizer.rows, "counter", type=name)
+
+    def describe(self) -> str:
+        s = self.stats
+        return (f"{s['partitions']} partitions ({s['leaves']} feuilles), {s['tasks']} tâches, "
+                f"{s['rows']} lignes, {s['details_failed']} détails en échec, "
+                f"{len(self.failed)} partitions en échec ; sondes : {self.probes.describe()}")
@@ -0,0 +1,142 @@
+"""
+Cache disque des réponses JSON (optionnel, sous http_get_json)
+- clé de contenu : empreinte de l'URL et des paramètres triés
+- durée de vie par type d'appel : courte pour les listes / sondes de total,
+  longue pour les détails
+- corps compressés (zlib), éviction LRU au-delà d'une taille maximale
+- compteurs hits / misses / expired / stores / evictions
+Utile pour les re-runs, les tests et l'enchaînement verify → rattrapage.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at);
+"""
+
+LIST_TTL = 3600.0          # 1 h : listes et sondes de total bougent vite
+DETAIL_TTL = 7 * 86400.0   # 7 j : le détail d'une notice change rarement
+MAX_BYTES = 512 * 2 ** 20
+
+# Détail d'une notice : .../red/2020-12345 (entity_id avec « / » remplacé par « - »)
+DETAIL_PATH = re.compile(r"/\d{4}-\d+/?$")
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Empreinte de l'URL et des paramètres (ordre des paramètres indifférent)."""
+    canonical = url
+    if params:
+        canonical = f"{url}?{urlencode(sorted((k, str(v)) for k, v in params.items()))}"
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def is_detail_url(url: str) -> bool:
+    return bool(DETAIL_PATH.search(urlsplit(url).path))
+
+
+class ResponseCache:
+    """Cache SQLite des réponses JSON ; sûr entre threads."""
+
+    def __init__(self, path: str, list_ttl: float = LIST_TTL, detail_ttl: float = DETAIL_TTL,
+                 max_bytes: int = MAX_BYTES, compress_level: int = 6):
+        self.path = path
+        self.list_ttl = list_ttl
+        self.detail_ttl = detail_ttl
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0}
+
+    def ttl_for(self, url: str) -> float:
+        return self.detail_ttl if is_detail_url(url) else self.list_ttl
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Réponse en cache encore valide, ou None."""
+        key = cache_key(url, params)
+        now = time.time()
+        with self._lock:
+            got = self._conn.execute("SELECT stored_at, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if got is None:
+                self.stats["misses"] += 1
+                return None
+            if now - got[0] > self.ttl_for(url):
+                self.stats["expired"] += 1
+                return None
+            self.stats["hits"] += 1
+            # Horodatage d'accès pour l'éviction LRU (validé avec la prochaine écriture)
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(zlib.decompress(got[1]))
+
+    def put(self, url: str, params: Optional[Dict[str, Any]], data: Any) -> None:
+        body = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"), self.compress_level)
+        key = cache_key(url, params)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, stored_at, accessed_at, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (key, url, now, now, len(body), body))
+            self._size += len(body) - (old[0] if old else 0)
+            self.stats["stores"] += 1
+            if self._size > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # Descend à 90 % de la taille maximale pour ne pas évincer à chaque écriture
+        target = self.max_bytes * 0.9
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if self._size <= target:
+                break
+            victims.append((key,))
+            self._size -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.stats["evictions"] += len(victims)
+
+    def entries(self, batch: int = 500) -> Iterator[Tuple[str, Any]]:
+        """Toutes les réponses en cache (url, JSON), expirées comprises, sans toucher aux compteurs."""
+        last = ""
+        while True:
+            with self._lock:
+                chunk = self._conn.execute("SELECT key, url, body FROM responses WHERE key > ? ORDER BY key LIMIT ?",
+                                           (last, batch)).fetchall()
+            if not chunk:
+                return
+            for _, url, body in chunk:
+                yield url, json.loads(zlib.decompress(body))
+            last = chunk[-1][0]
+
+    def describe(self) -> str:
+        s = self.stats
+        looked_up = s["hits"] + s["misses"] + s["expired"]
+        rate = 100.0 * s["hits"] / looked_up if looked_up else 0.0
+        return (f"{s['hits']} hits / {s['misses']} misses / {s['expired']} expirés ({rate:.0f}% de hits), "
+                f"{s['evictions']} évictions, {self._size / 2 ** 20:.1f} Mo")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
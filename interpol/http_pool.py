@@ -0,0 +1,172 @@
+"""
+Client HTTP/1.1 à connexions persistantes (keep-alive)
+- une connexion par (thread, hôte), réutilisée d'un appel à l'autre
+- contexte SSL créé une seule fois
+- décodage gzip/deflate optionnel
+Remplace le couple Request + urlopen (une poignée de main TCP + TLS par appel).
+"""
+
+import gzip
+import http.client
+import io
+import json
+import ssl
+import threading
+import time
+import weakref
+import zlib
+from typing import Any, Dict, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urljoin, urlsplit
+
+from interpol.metrics import METRICS, endpoint_label, observe_request
+
+MAX_REDIRECTS = 5
+
+# Erreurs typiques d'une connexion keep-alive fermée côté serveur entre deux appels :
+# on rouvre alors la connexion et on rejoue la requête une fois.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+def build_url(url: str, params: Optional[Dict[str, str]] = None) -> str:
+    if params:
+        url = f"{url}?{urlencode(params)}"
+    return url
+
+
+def decode_body(body: bytes, encoding: str) -> bytes:
+    encoding = (encoding or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Certains serveurs envoient du deflate « brut » sans en-tête zlib
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+class HTTPClient:
+    """Pool de connexions HTTP/1.1 persistantes, une par thread et par hôte."""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+                 insecure: bool = False, compress: bool = True):
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.compress = compress
+        if insecure:
+            self.ssl_context = ssl._create_unverified_context()
+        else:
+            self.ssl_context = ssl.create_default_context()
+        self._local = threading.local()
+        # Références faibles : les connexions d'un thread terminé disparaissent avec lui
+        self._all: "weakref.WeakSet[http.client.HTTPConnection]" = weakref.WeakSet()
+        self._all_lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def _connection(self, scheme: str, netloc: str, fresh: bool = False) -> http.client.HTTPConnection:
+        pool: Dict[Tuple[str, str], http.client.HTTPConnection] = getattr(self._local, "pool", None)
+        if pool is None:
+            pool = self._local.pool = {}
+        key = (scheme, netloc)
+        conn = pool.get(key)
+        if conn is not None and not fresh:
+            return conn
+        if conn is not None:
+            conn.close()
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(netloc, timeout=self.timeout, context=self.ssl_context)
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=self.timeout)
+        pool[key] = conn
+        with self._all_lock:
+            self._all.add(conn)
+            self.connections_opened += 1
+        return conn
+
+    def _drop(self, scheme: str, netloc: str) -> None:
+        pool = getattr(self._local, "pool", None) or {}
+        conn = pool.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _send(self, url: str, headers: Dict[str, str]) -> Tuple[int, str, http.client.HTTPMessage, bytes]:
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc, fresh=attempt > 0)
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except STALE_CONNECTION_ERRORS:
+                self._drop(parts.scheme, parts.netloc)
+                if attempt == 0:
+                    METRICS.inc("interpol_http_retries_total", endpoint=endpoint_label(url))
+                    continue
+                observe_request(url, "error", time.perf_counter() - start)
+                raise
+            except Exception:
+                self._drop(parts.scheme, parts.netloc)
+                observe_request(url, "error", time.perf_counter() - start)
+                raise
+            observe_request(url, resp.status, time.perf_counter() - start, len(body))
+            with self._all_lock:
+                self.requests_sent += 1
+            if resp.will_close:
+                self._drop(parts.scheme, parts.netloc)
+            return resp.status, resp.reason, resp.headers, body
+        raise http.client.HTTPException(f"connexion impossible: {url}")
+
+    def request(self, url: str, params: Optional[Dict[str, str]] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """GET complet : (statut, en-têtes, corps décodé). Lève HTTPError pour un statut >= 400.
+
+        Un 304 (requête conditionnelle If-None-Match / If-Modified-Since) est
+        retourné tel quel avec un corps vide.
+        """
+        url = build_url(url, params)
+        hdrs = dict(headers if headers is not None else self.headers)
+        if self.compress and not any(k.lower() == "accept-encoding" for k in hdrs):
+            hdrs["accept-encoding"] = "gzip, deflate"
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, resp_headers, body = self._send(url, hdrs)
+            if status in (301, 302, 303, 307, 308) and resp_headers.get("Location"):
+                url = urljoin(url, resp_headers["Location"])
+                continue
+            body = decode_body(body, resp_headers.get("Content-Encoding", ""))
+            if status >= 400:
+                raise HTTPError(url, status, reason, resp_headers, io.BytesIO(body))
+            return status, resp_headers, body
+        raise HTTPError(url, 310, "Trop de redirections", None, None)
+
+    def get(self, url: str, params: Optional[Dict[str, str]] = None,
+            headers: Optional[Dict[str, str]] = None) -> bytes:
+        """GET et retourne le corps décodé ; lève HTTPError pour un statut >= 400."""
+        return self.request(url, params, headers)[2]
+
+    def get_json(self, url: str, params: Optional[Dict[str, str]] = None,
+                 headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        data = self.get(url, params, headers).decode("utf-8", errors="replace")
+        try:
+            return json.loads(data)
+        except Exception:
+            return {}
+
+    def close(self) -> None:
+        with self._all_lock:
+            conns = list(self._all)
+            self._all = weakref.WeakSet()
+        for conn in conns:
+            conn.close()
@@ -0,0 +1,125 @@
+"""
+Classification des infractions d'un mandat d'arrêt en catégories Interpol
+Le moteur est construit une seule fois à l'import :
+- une seule expression régulière (alternance de tous les mots-clés factorisée
+  en arbre de préfixes, dans une assertion avant pour voir les recouvrements)
+- chaque mot-clé connaît les catégories de tous ses préfixes, un match
+  long vaut donc aussi pour les mots-clés plus courts au même endroit
+Sémantique identique à l'ancienne boucle `keyword in text.lower()` : même
+catégorie la plus grave, même départage (ordre des catégories).
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Set
+
+from interpol.metrics import timed
+
+NOT_CLASSIFIED = "Non classé"
+
+INTERPOL_CATEGORIES: Dict[str, List[str]] = {
+    "Terrorisme et sécurité publique": ["terrorism", "terrorist", "armed formation", "explosive", "bomb", "attack", "recruit", "training", "organization", "wmd", "conspiracy to kill", "armed group", "national defence", "terror plot", "bombing", "mass destruction"],
+    "Meurtre, tentative de meurtre et crimes violents": ["murder", "homicide", "attempted murder", "assault", "aggravated assault", "armed robbery", "violence", "robbery", "femicidio", "feminicidio", "asesinato", "agravado", "homicidio", "manslaughter", "kill", "slaying"],
+    "Crimes sexuels aggravés et abus": ["rape", "sexual assault", "sexual abuse", "indecent", "sex offence", "sodomy", "abuso", "viol", "violación", "agression sexuelle", "statutory rape", "harcèlement sexuel", "violence sexuelle", "attentat à la pudeur"],
+    "Exploitation et pornographie infantile": ["child pornography", "pornography", "mineur", "minor", "child", "indecency with a child", "sexual abuse of minor", "exploitation enfant", "abus sur mineur", "child abuse"],
+    "Traite des êtres humains et enlèvements": ["trafficking", "human", "kidnapping", "hostage", "abduction", "slavery", "migrant", "illegal entry", "smuggling", "captivity", "traite", "enlèvement", "séquestration", "aide à l'entrée irrégulière", "migration illégale"],
+    "Criminalité organisée et conspiration": ["organized crime", "criminal organization", "association de malfaiteurs", "conspiracy", "participation", "illicit association", "gang", "group", "asociacion ilicita", "membership of a criminal organisation", "union criminelle"],
+    "Cybercriminalité et crimes technologiques": ["cybercrime", "hacking", "malware", "phishing", "ransomware", "computer", "digital", "data", "cryptology", "encryption", "forgery digital", "piratage", "usurpation", "intrusion", "cryptographie", "refus de remettre clé de chiffrement"],
+    "Trafic de drogues et substances illicites": ["drug", "drugs", "narcotic", "psychotropic", "trafficking", "marijuana", "cocaine", "heroin", "distribution", "stupéfiant", "importation", "transport", "unauthorised", "production", "manufacturing", "cannabis", "substance", "illicit traffic"],
+    "Crimes financiers et corruption": ["fraud", "money laundering", "bribery", "forgery", "financial", "corruption", "laundering", "breach of trust", "false declaration", "market manipulation", "escroquerie", "abus de confiance", "blanchiment", "détournement", "pots-de-vin", "fraude fiscale"],
+    "Trafic d'armes et explosifs": ["firearms", "weapons", "arms", "ammunition", "explosives", "illegal possession", "transport", "acquisition", "armas", "munitions", "fabrication d'explosifs", "arme de guerre", "arms act", "catégorie b", "catégorie c", "catégorie d"],
+    "Crimes environnementaux et patrimoine culturel": ["environment", "wildlife", "pollution", "cultural", "heritage", "artefact", "environmental", "illegal logging", "braconnage", "espèces protégées", "trafic d'ivoire", "musée", "art theft"],
+    "Autres infractions": ["evasion", "escape", "absconding", "custody", "unlawful", "detention", "obstruction", "entrave", "fuite", "détention illégale", "désobéissance"]
+}
+SEVERITY_RANK: Dict[str, int] = {
+    "Terrorisme et sécurité publique": 10, "Meurtre, tentative de meurtre et crimes violents": 9,
+    "Crimes sexuels aggravés et abus": 8, "Exploitation et pornographie infantile": 8,
+    "Traite des êtres humains et enlèvements": 7, "Criminalité organisée et conspiration": 6,
+    "Cybercriminalité et crimes technologiques": 5, "Trafic de drogues et substances illicites": 5,
+    "Crimes financiers et corruption": 4, "Trafic d'armes et explosifs": 4,
+    "Crimes environnementaux et patrimoine culturel": 3, "Autres infractions": 2, "Non classé": 1
+}
+
+
+def trie_regex(keywords: List[str]) -> str:
+    """Alternance factorisée en arbre de préfixes : un échec se décide dès le 1er caractère.
+
+    Les branches plus longues sont essayées en premier, le match retenu à
+    une position est donc toujours le mot-clé le plus long.
+    """
+    trie: Dict[str, dict] = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            body = ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class InfractionClassifier:
+    """Classifieur précompilé ; `word_boundary=True` n'accepte un mot-clé qu'en début de mot."""
+
+    def __init__(self, categories: Dict[str, List[str]] = INTERPOL_CATEGORIES,
+                 severity: Dict[str, int] = SEVERITY_RANK, word_boundary: bool = False):
+        self.categories = list(categories)
+        # Catégorie la plus grave d'abord ; à gravité égale, l'ordre du dictionnaire
+        self._priority = {cat: (-severity.get(cat, 0), i) for i, cat in enumerate(self.categories)}
+        owners: Dict[str, Set[str]] = {}
+        for cat, keywords in categories.items():
+            for kw in keywords:
+                owners.setdefault(kw, set()).add(cat)
+        # Au même endroit, l'alternance ne retient que le mot-clé le plus long :
+        # on lui attache aussi les catégories des mots-clés qui en sont préfixes.
+        self._hits: Dict[str, Set[str]] = {
+            kw: set().union(*(cats for other, cats in owners.items() if kw.startswith(other)))
+            for kw in owners}
+        alternation = trie_regex(list(owners))
+        boundary = r"(?<!\w)" if word_boundary else ""
+        self._pattern: Pattern[str] = re.compile(f"{boundary}(?=({alternation}))")
+        self._top = min(self._priority.values()) if self._priority else None
+
+    def matched_categories(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        for kw in self._pattern.findall(text.lower()):
+            found |= self._hits[kw]
+        return found
+
+    def classify(self, text: str) -> str:
+        if not text:
+            return ""
+        best: Optional[str] = None
+        for m in self._pattern.finditer(text.lower()):
+            for cat in self._hits[m.group(1)]:
+                if best is None or self._priority[cat] < self._priority[best]:
+                    best = cat
+            if best is not None and self._priority[best] == self._top:
+                break
+        return best or NOT_CLASSIFIED
+
+    def classify_many(self, texts: Iterable[str]) -> List[str]:
+        """Classe plusieurs libellés d'un coup (mêmes résultats que classify un par un)."""
+        classify = self.classify
+        return [classify(t) for t in texts]
+
+
+CLASSIFIER = InfractionClassifier()
+
+
+@timed("classify_infraction")
+def classify_infraction(text: str) -> str:
+    return CLASSIFIER.classify(text)
+
+
+@timed("classify_infraction")
+def classify_many(texts: Iterable[str]) -> List[str]:
+    return CLASSIFIER.classify_many(texts)
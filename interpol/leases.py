@@ -0,0 +1,215 @@
+"""
+File de baux (leases) SQLite pour répartir un crawl sur plusieurs processus
+ou plusieurs machines partageant un système de fichiers
+- chaque bail couvre une partition (pays × sexe × tranche d'âge) ou une page
+  de la collecte globale ; la découpe d'une partition ajoute ses
+  sous-partitions à la file, pour que les gros pays se répartissent aussi
+- claim() attribue un bail libre, ou expiré (worker mort ou bloqué)
+- un thread de battement de cœur prolonge les baux tenus par le processus
+- complete() enregistre d'un seul coup les lignes du bail, ses
+  sous-partitions et son statut : un bail est fait entièrement ou pas du tout
+- rows() relit les lignes triées par clé : la fusion ne dépend ni du nombre
+  de workers ni de l'ordre dans lequel ils ont terminé
+Les échéances sont en temps système : les machines doivent être synchronisées
+(NTP) et le système de fichiers partagé doit honorer les verrous POSIX.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    item TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    expires_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    row_count INTEGER,
+    done_at REAL
+);
+CREATE INDEX IF NOT EXISTS leases_status ON leases (status, expires_at);
+CREATE TABLE IF NOT EXISTS rows (key TEXT PRIMARY KEY, lease TEXT NOT NULL, row TEXT NOT NULL);
+"""
+
+# Bail attribué : (clé, élément JSON décodé, numéro de tentative)
+Lease = Tuple[str, Any, int]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaseQueue:
+    """File de baux partagée ; sûre entre threads et entre processus."""
+
+    def __init__(self, path: str, owner: Optional[str] = None, ttl: float = 120.0,
+                 reset: bool = False, timeout: float = 60.0, max_attempts: int = 5):
+        self.path = path
+        self.owner = owner or default_worker_id()
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        if reset:
+            with self._write():
+                self._conn.execute("DELETE FROM leases")
+                self._conn.execute("DELETE FROM rows")
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+        self.stats = {"claimed": 0, "completed": 0, "reclaimed": 0, "lost": 0, "released": 0}
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Transaction d'écriture exclusive (BEGIN IMMEDIATE), validée ou annulée en bloc."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # --- alimentation ---
+    def seed(self, items: Iterable[Tuple[str, Any]]) -> int:
+        """Ajoute des baux (clé, élément) ; une clé déjà présente est ignorée. Retourne le nombre ajouté."""
+        rows = [(key, json.dumps(item, ensure_ascii=False)) for key, item in items]
+        with self._write() as conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO leases (key, item) VALUES (?, ?)", rows)
+            return conn.total_changes - before
+
+    def seed_once(self, items: Iterable[Tuple[str, Any]]) -> int:
+        """Amorce la file si elle est vide (le premier worker arrivé amorce, les autres rejoignent)."""
+        rows = [(key, json.dumps(item, ensure_ascii=False)) for key, item in items]
+        with self._write() as conn:
+            if conn.execute("SELECT 1 FROM leases LIMIT 1").fetchone() is not None:
+                return 0
+            conn.executemany("INSERT OR IGNORE INTO leases (key, item) VALUES (?, ?)", rows)
+            return len(rows)
+
+    # --- cycle de vie d'un bail ---
+    def claim(self) -> Optional[Lease]:
+        """Prend un bail libre ou expiré ; None si aucun n'est disponible pour l'instant."""
+        now = time.time()
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT key, item, status, attempts FROM leases "
+                "WHERE status = 'pending' OR (status = 'leased' AND expires_at < ?) "
+                "ORDER BY status = 'leased', attempts, key LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            key, item, status, attempts = row
+            conn.execute("UPDATE leases SET status = 'leased', owner = ?, expires_at = ?, attempts = attempts + 1 "
+                         "WHERE key = ?", (self.owner, now + self.ttl, key))
+            self.stats["claimed"] += 1
+            if status == "leased":
+                self.stats["reclaimed"] += 1
+        return key, json.loads(item), attempts + 1
+
+    def renew(self) -> int:
+        """Prolonge tous les baux tenus par ce processus ; retourne leur nombre."""
+        with self._write() as conn:
+            return conn.execute("UPDATE leases SET expires_at = ? WHERE owner = ? AND status = 'leased'",
+                                (time.time() + self.ttl, self.owner)).rowcount
+
+    def complete(self, key: str, rows: Sequence[Tuple[str, Dict[str, Any]]],
+                 children: Sequence[Tuple[str, Any]] = ()) -> bool:
+        """Termine un bail : lignes, sous-baux et statut dans la même transaction.
+
+        Retourne False (et n'écrit rien) si le bail a expiré et a été repris
+        par un autre worker entre-temps : c'est son résultat qui comptera.
+        """
+        with self._write() as conn:
+            owned = conn.execute("SELECT 1 FROM leases WHERE key = ? AND owner = ? AND status = 'leased'",
+                                 (key, self.owner)).fetchone()
+            if owned is None:
+                self.stats["lost"] += 1
+                return False
+            conn.executemany("INSERT OR REPLACE INTO rows (key, lease, row) VALUES (?, ?, ?)",
+                             [(k, key, json.dumps(r, ensure_ascii=False)) for k, r in rows])
+            conn.executemany("INSERT OR IGNORE INTO leases (key, item) VALUES (?, ?)",
+                             [(k, json.dumps(item, ensure_ascii=False)) for k, item in children])
+            conn.execute("UPDATE leases SET status = 'done', expires_at = NULL, row_count = ?, done_at = ? "
+                         "WHERE key = ?", (len(rows), time.time(), key))
+            self.stats["completed"] += 1
+        return True
+
+    def release(self, key: str) -> None:
+        """Rend un bail en échec à la file, pour un autre essai (ici ou ailleurs).
+
+        Après `max_attempts` essais, le bail passe en échec définitif ('failed')
+        au lieu de bloquer la fin du crawl.
+        """
+        with self._write() as conn:
+            conn.execute("UPDATE leases SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                         "owner = NULL, expires_at = NULL WHERE key = ? AND owner = ? AND status = 'leased'",
+                         (self.max_attempts, key, self.owner))
+            self.stats["released"] += 1
+
+    # --- battement de cœur ---
+    def start_heartbeat(self, interval: Optional[float] = None) -> None:
+        """Thread qui prolonge les baux de ce processus toutes les `interval` secondes (défaut ttl/3)."""
+        interval = interval or max(1.0, self.ttl / 3)
+
+        def beat() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.renew()
+                except sqlite3.Error as e:
+                    print(f"[Avertissement] Battement de cœur des baux: {e}")
+
+        self._heartbeat = threading.Thread(target=beat, name="baux-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    # --- état ---
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            found = dict(self._conn.execute("SELECT status, COUNT(*) FROM leases GROUP BY status").fetchall())
+        return {s: found.get(s, 0) for s in ("pending", "leased", "done", "failed")}
+
+    def finished(self) -> bool:
+        """Vrai quand la file est amorcée et que plus aucun bail n'est à faire ni en cours."""
+        c = self.counts()
+        return c["done"] + c["failed"] > 0 and c["pending"] == 0 and c["leased"] == 0
+
+    def row_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def rows(self, batch: int = 1000) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Lignes de tous les baux, dans l'ordre des clés (fusion déterministe)."""
+        last = ""
+        while True:
+            with self._lock:
+                chunk = self._conn.execute("SELECT key, row FROM rows WHERE key > ? ORDER BY key LIMIT ?",
+                                           (last, batch)).fetchall()
+            if not chunk:
+                return
+            for key, row in chunk:
+                yield key, json.loads(row)
+            last = chunk[-1][0]
+
+    def describe(self) -> str:
+        c = self.counts()
+        s = self.stats
+        return (f"baux {c['done']} faits / {c['leased']} en cours / {c['pending']} en attente / {c['failed']} en échec ; "
+                f"ce worker: {s['completed']} terminés, {s['reclaimed']} repris après expiration, "
+                f"{s['released']} rendus, {s['lost']} perdus")
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join(timeout=5)
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,344 @@
+"""
+Métriques d'exécution : compteurs, histogrammes de latence, jauges
+- requêtes HTTP par point d'accès (red:list, red:detail…) et code de statut :
+  latence, octets reçus, reprises de connexion
+- cache, files d'attente, requêtes en vol : lus à l'export par des fonctions
+  enregistrées (collect), sans toucher au code des composants
+- temps passé dans clean_text, classify_infraction, normalize_* (@timed)
+- export texte Prometheus : fichier réécrit périodiquement (collecteur
+  « textfile » de node_exporter) ou point d'accès HTTP local /metrics
+  (OpenMetrics si le client le demande) ; résumé JSON en fin de run
+Désactivé par défaut : tant que `METRICS.enabled` est faux, chaque appel
+ne coûte qu'un test de drapeau.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from interpol.profiling import PROFILER
+
+# Bornes (s) des histogrammes de latence HTTP
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    "interpol_http_request_seconds": "Durée des requêtes HTTP par point d'accès et code de statut",
+    "interpol_http_response_bytes_total": "Octets reçus (compressés) par point d'accès",
+    "interpol_http_retries_total": "Requêtes rejouées après une connexion keep-alive fermée",
+    "interpol_request_retries_total": "Requêtes rejouées par le limiteur après un 429, un 5xx ou un timeout",
+    "interpol_function_seconds_total": "Temps cumulé passé dans les fonctions instrumentées",
+    "interpol_function_calls_total": "Appels des fonctions instrumentées",
+    "interpol_phase_seconds": "Durée de chaque phase du dernier run",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint_label(url: str) -> str:
+    """Point d'accès d'une URL de l'API : red:list, red:detail, un:detail… (cardinalité bornée)."""
+    path = urlsplit(url).path.rstrip("/")
+    marker = "/notices/v1/"
+    if marker not in path:
+        return "other"
+    parts = path.split(marker, 1)[1].split("/")
+    if parts[0] == "un" and len(parts) > 1:
+        parts = ["un"] + parts[2:]
+    return f"{parts[0]}:{'detail' if len(parts) > 1 else 'list'}"
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: Labels, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Histogramme cumulatif à bornes fixes (format Prometheus)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimation par interpolation linéaire dans le seau concerné."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else lower
+            if seen + n >= rank and n:
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            lower = upper
+        return lower
+
+
+class Metrics:
+    """Registre de métriques, sûr entre threads."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._hists: Dict[str, Dict[Labels, Histogram]] = {}
+        self._collectors: List[Tuple[str, str, Labels, Callable[[], float]]] = []
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.textfile: Optional[str] = None
+        self.started = time.time()
+
+    # --- enregistrement ---
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges.setdefault(name, {})[_labels(labels)] = float(value)
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._hists.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram(buckets)
+            hist.observe(value)
+
+    def collect(self, name: str, fn: Callable[[], float], kind: str = "gauge", **labels: Any) -> None:
+        """Valeur lue à l'export (profondeur de file, compteurs d'un composant…)."""
+        with self._lock:
+            key = _labels(labels)
+            self._collectors = [c for c in self._collectors if (c[0], c[2]) != (name, key)]
+            self._collectors.append((name, kind, key, fn))
+
+    def timed(self, name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Décorateur : temps et nombre d'appels de la fonction (interpol_function_*)."""
+        def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    elapsed = time.perf_counter() - start
+                    key = (("function", name),)
+                    with self._lock:
+                        seconds = self._counters.setdefault("interpol_function_seconds_total", {})
+                        seconds[key] = seconds.get(key, 0.0) + elapsed
+                        calls = self._counters.setdefault("interpol_function_calls_total", {})
+                        calls[key] = calls.get(key, 0.0) + 1
+            return wrapper
+        return decorate
+
+    # --- export ---
+    def _collected(self) -> Tuple[Dict[str, Dict[Labels, float]], Dict[str, Dict[Labels, float]]]:
+        with self._lock:
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            gauges = {n: dict(s) for n, s in self._gauges.items()}
+            collectors = list(self._collectors)
+        for name, kind, key, fn in collectors:
+            try:
+                value = float(fn())
+            except Exception:
+                continue
+            (counters if kind == "counter" else gauges).setdefault(name, {})[key] = value
+        return counters, gauges
+
+    def prometheus(self, openmetrics: bool = False) -> str:
+        """Format texte Prometheus 0.0.4, ou OpenMetrics 1.0 (`# EOF` final)."""
+        counters, gauges = self._collected()
+        lines: List[str] = []
+
+        def header(name: str, kind: str) -> None:
+            family = name[:-len("_total")] if openmetrics and kind == "counter" and name.endswith("_total") else name
+            if name in HELP:
+                lines.append(f"# HELP {family} {HELP[name]}")
+            lines.append(f"# TYPE {family} {kind}")
+
+        for name in sorted(counters):
+            header(name, "counter")
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_fmt_labels(key)} {_fmt_value(value)}")
+        for name in sorted(gauges):
+            header(name, "gauge")
+            for key, value in sorted(gauges[name].items()):
+                lines.append(f"{name}{_fmt_labels(key)} {_fmt_value(value)}")
+        with self._lock:
+            hists = {n: {k: (h.buckets, list(h.counts), h.sum, h.count) for k, h in s.items()}
+                     for n, s in self._hists.items()}
+        for name in sorted(hists):
+            header(name, "histogram")
+            for key, (buckets, counts, total, count) in sorted(hists[name].items()):
+                cumulative = 0
+                for bound, n in zip(list(buckets) + [float("inf")], counts):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_fmt_labels(key, [('le', _fmt_value(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_fmt_labels(key)} {_fmt_value(total)}")
+                lines.append(f"{name}_count{_fmt_labels(key)} {count}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """Résumé JSON : compteurs, jauges, histogrammes (nombre, moyenne, p50/p95/p99)."""
+        counters, gauges = self._collected()
+
+        def flat(series: Dict[str, Dict[Labels, float]]) -> Dict[str, Any]:
+            return {name: {",".join(f"{k}={v}" for k, v in key) or "": value for key, value in s.items()}
+                    for name, s in series.items()}
+
+        with self._lock:
+            hists = {name: {",".join(f"{k}={v}" for k, v in key): {
+                "count": h.count, "sum": round(h.sum, 6), "mean": round(h.sum / h.count, 6) if h.count else 0.0,
+                "p50": round(h.quantile(0.5), 6), "p95": round(h.quantile(0.95), 6), "p99": round(h.quantile(0.99), 6),
+            } for key, h in s.items()} for name, s in self._hists.items()}
+        return {"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "uptime_s": round(time.time() - self.started, 3),
+                "counters": flat(counters), "gauges": flat(gauges), "histograms": hists}
+
+    def write_textfile(self, path: str) -> None:
+        """Écriture atomique (fichier temporaire puis renommage), lisible à tout moment."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+    def start_textfile(self, path: str, interval: float = 15.0) -> None:
+        """Réécrit `path` toutes les `interval` secondes pendant le run."""
+        self.enabled = True
+        self.textfile = path
+
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.write_textfile(path)
+                except OSError as e:
+                    print(f"[Avertissement] Métriques: écriture de {path} impossible: {e}")
+
+        t = threading.Thread(target=loop, name="metrics-textfile", daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> str:
+        """Point d'accès HTTP local /metrics ; retourne son URL."""
+        self.enabled = True
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] == "/summary.json":
+                    body = json.dumps(registry.summary(), ensure_ascii=False).encode("utf-8")
+                    ctype = "application/json"
+                elif self.path.split("?")[0] in ("/", "/metrics"):
+                    openmetrics = "application/openmetrics-text" in (self.headers.get("Accept") or "")
+                    body = registry.prometheus(openmetrics).encode("utf-8")
+                    ctype = ("application/openmetrics-text; version=1.0.0; charset=utf-8" if openmetrics
+                             else "text/plain; version=0.0.4; charset=utf-8")
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return f"http://{host}:{self._server.server_address[1]}/metrics"
+
+    def close(self, summary_path: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Dernière écriture du fichier Prometheus, résumé JSON, arrêt du serveur."""
+        self._stop.set()
+        if self.textfile:
+            self.write_textfile(self.textfile)
+        if summary_path:
+            payload = dict(extra or {}, metrics=self.summary())
+            with open(summary_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# Registre du processus, partagé par tous les modules
+METRICS = Metrics()
+timed = METRICS.timed
+
+
+def start_exports(path: Optional[str] = None, port: int = 0, summary_path: Optional[str] = None) -> bool:
+    """Active METRICS si un export est demandé (fichier Prometheus, HTTP ou résumé JSON)."""
+    if not (path or port or summary_path):
+        return False
+    METRICS.enabled = True
+    if path:
+        METRICS.start_textfile(path)
+        print(f"[Info] Métriques: {path} (réécrit toutes les 15 s)")
+    if port:
+        print(f"[Info] Métriques: {METRICS.serve(port)}")
+    return True
+
+
+def observe_request(url: str, status: Any, seconds: float, nbytes: int = 0) -> None:
+    """Une requête HTTP terminée (status : code, ou « error » pour une exception)."""
+    if PROFILER.enabled:
+        PROFILER.record(f"http {endpoint_label(url)}", seconds)
+    if not METRICS.enabled:
+        return
+    endpoint = endpoint_label(url)
+    METRICS.observe("interpol_http_request_seconds", seconds, endpoint=endpoint, status=status)
+    if nbytes:
+        METRICS.inc("interpol_http_response_bytes_total", nbytes, endpoint=endpoint)
@@ -0,0 +1,380 @@
+"""
+Serveur local imitant l'API publique Interpol, pour mesurer les scrapers hors ligne
+- points d'accès /notices/v1/red, /yellow et /un/persons, plus les détails
+  (/notices/v1/red/2019-12345) : `total`, `_embedded.notices`, `_links`
+- filtres nationality, sexId, ageMin, ageMax, forename, country_of_birth_id
+- plafonds de l'API réelle : 160 résultats par page et 160 résultats
+  accessibles par requête (au-delà, les pages reviennent vides)
+- jeux de données synthétiques reproductibles (graine) : taille par type,
+  concentration des notices sur quelques pays (loi de Zipf, --skew)
+- pannes injectables : latence (+ gigue), 429 aléatoires ou au-delà d'un
+  débit serveur (avec Retry-After), erreurs 5xx
+- ETag / If-None-Match sur les détails (304), gzip si demandé
+- compteurs consultables sur /_mock/stats, remis à zéro par /_mock/reset
+
+Exemple :
+  python -m interpol.mock_api --port 8080 --size 7000 --latency 0.05 --throttle 0.01
+  SCRAPER_API_BASE=http://127.0.0.1:8080/notices/v1 python main.py --rps 50
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from interpol.notice_types import COUNTRIES
+
+PAGE_CAP = 160      # resultPerPage maximal
+RESULT_CAP = 160    # résultats accessibles par requête, toutes pages confondues
+
+TYPE_PATHS = {"red": "/notices/v1/red", "yellow": "/notices/v1/yellow", "un": "/notices/v1/un/persons"}
+
+_SYLLABLES = ["AL", "BA", "KO", "RI", "MA", "NE", "SO", "TA", "VI", "DU", "LE", "ZO", "PA", "GI", "HU", "YE"]
+_CHARGES = [
+    "Murder", "Drug trafficking", "Fraud and money laundering", "Armed robbery", "Terrorism",
+    "Trafficking in human beings", "Sexual abuse of minors", "Participation in a criminal organisation",
+]
+_LANGS = ["ENG", "FRE", "SPA", "RUS", "ARA", "POR", "GER", "TUR"]
+_EYES = ["BRO", "BLU", "GRE", "BLA"]
+_HAIRS = ["BLA", "BRO", "BLO", "GRY"]
+
+
+def _word(rng: random.Random, syllables: int) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(syllables))
+
+
+def _age(dob: date, today: date) -> int:
+    return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+
+class MockDataset:
+    """Notices synthétiques par type ; même graine, mêmes notices."""
+
+    def __init__(self, sizes: Dict[str, int], seed: int = 1, skew: float = 1.0,
+                 countries: Sequence[str] = COUNTRIES, today: Optional[date] = None):
+        self.seed = seed
+        self.skew = skew
+        self.today = today or date(2025, 1, 1)
+        rng = random.Random(seed)
+        pool = list(countries)
+        rng.shuffle(pool)
+        # Poids de Zipf : le k-ième pays pèse 1/k^skew (skew=0 : répartition uniforme)
+        weights = [1.0 / (k + 1) ** skew for k in range(len(pool))]
+        self.notices: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_id: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.by_nationality: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for name, size in sorted(sizes.items()):
+            records = [self._make(name, i, rng, pool, weights) for i in range(size)]
+            # Ordre de l'API : notices les plus récentes d'abord
+            records.sort(key=lambda r: r["entity_id"], reverse=True)
+            self.notices[name] = records
+            self.by_id[name] = {r["entity_id"]: r for r in records}
+            index: Dict[str, List[Dict[str, Any]]] = {}
+            for r in records:
+                for nat in r["nationalities"]:
+                    index.setdefault(nat, []).append(r)
+            self.by_nationality[name] = index
+
+    def _make(self, notice_type: str, i: int, rng: random.Random, pool: List[str],
+              weights: List[float]) -> Dict[str, Any]:
+        nats = rng.choices(pool, weights)
+        if rng.random() < 0.08:
+            nats = sorted(set(nats + rng.choices(pool, weights)))
+        age = max(0, min(99, int(rng.triangular(12 if notice_type == "yellow" else 18, 80, 35))))
+        dob = date(self.today.year - age - 1, rng.randint(1, 12), rng.randint(1, 28))
+        sex = rng.choices(["M", "F", "U"], [0.5, 0.48, 0.02] if notice_type == "yellow" else [0.86, 0.13, 0.01])[0]
+        year = rng.randint(2000, 2024)
+        r: Dict[str, Any] = {
+            "entity_id": f"{year}/{i + 10000:06d}",
+            "name": _word(rng, rng.randint(2, 4)),
+            "forename": _word(rng, rng.randint(2, 3)),
+            "date_of_birth": dob.strftime("%Y/%m/%d"),
+            "nationalities": nats,
+            "sex_id": sex,
+            "country_of_birth_id": nats[0] if rng.random() < 0.8 else rng.choice(pool),
+            "place_of_birth": _word(rng, 3).title(),
+            "height": round(rng.uniform(1.5, 2.0), 2),
+            "weight": rng.randint(50, 110),
+            "eyes_colors_id": [rng.choice(_EYES)],
+            "hairs_id": [rng.choice(_HAIRS)],
+            "languages_spoken_ids": sorted(set(rng.choices(_LANGS, k=rng.randint(1, 2)))),
+            "distinguishing_marks": "Scar on left arm" if rng.random() < 0.2 else None,
+            "_age": _age(dob, self.today),
+        }
+        if notice_type == "red":
+            r["arrest_warrants"] = [{"charge": ", ".join(rng.sample(_CHARGES, rng.randint(1, 2))),
+                                     "issuing_country_id": rng.choice(pool), "charge_translation": None}
+                                    for _ in range(rng.randint(1, 2))]
+        elif notice_type == "yellow":
+            r.update({"date_of_event": f"{year}/{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}",
+                      "place": _word(rng, 3).title(), "country": nats[0],
+                      "father_forename": _word(rng, 2), "mother_forename": _word(rng, 2),
+                      "mother_name": _word(rng, 3), "birth_name": None})
+        else:
+            r.update({"un_reference": f"QDi.{i + 100:03d}", "un_reference_date": f"{year}/06/01",
+                      "summary": f"Listed pursuant to resolution {1267 + i % 50}"})
+        return r
+
+    def query(self, notice_type: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Notices du type correspondant aux filtres de l'API (ordre de l'API)."""
+        nat = params.get("nationality")
+        rows = self.by_nationality[notice_type].get(nat, []) if nat else self.notices[notice_type]
+        sex = params.get("sexId")
+        age_min = int(params["ageMin"]) if params.get("ageMin") else None
+        age_max = int(params["ageMax"]) if params.get("ageMax") else None
+        forename = (params.get("forename") or "").upper()
+        birth = params.get("country_of_birth_id")
+        if not (sex or age_min is not None or age_max is not None or forename or birth):
+            return rows
+        return [r for r in rows
+                if (not sex or r["sex_id"] == sex)
+                and (age_min is None or r["_age"] >= age_min)
+                and (age_max is None or r["_age"] <= age_max)
+                and (not forename or r["forename"].startswith(forename))
+                and (not birth or r["country_of_birth_id"] == birth)]
+
+    def sizes(self) -> Dict[str, int]:
+        return {name: len(records) for name, records in self.notices.items()}
+
+
+class MockInterpolAPI:
+    """Serveur HTTP local (threads) servant un MockDataset, avec pannes injectables."""
+
+    def __init__(self, dataset: MockDataset, latency: float = 0.0, jitter: float = 0.0,
+                 throttle_rate: float = 0.0, error_rate: float = 0.0, rps_limit: float = 0.0,
+                 retry_after: float = 1.0, seed: int = 1):
+        self.dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.rps_limit = rps_limit
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = rps_limit
+        self._last = time.monotonic()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats = {"requests": 0, "list": 0, "probes": 0, "detail": 0, "not_modified": 0,
+                          "throttled": 0, "errors": 0, "not_found": 0, "bytes": 0}
+            self.started = time.monotonic()
+
+    # --- pannes ---
+    def _fault(self) -> Tuple[float, int]:
+        """(délai, statut forcé ou 0) pour la requête qui arrive."""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            if self.rps_limit > 0:
+                now = time.monotonic()
+                self._tokens = min(self.rps_limit, self._tokens + (now - self._last) * self.rps_limit)
+                self._last = now
+                if self._tokens < 1.0:
+                    self.stats["throttled"] += 1
+                    return delay, 429
+                self._tokens -= 1.0
+            roll = self._rng.random()
+            if roll < self.throttle_rate:
+                self.stats["throttled"] += 1
+                return delay, 429
+            if roll < self.throttle_rate + self.error_rate:
+                self.stats["errors"] += 1
+                return delay, self._rng.choice((500, 502, 503))
+        return delay, 0
+
+    def _count(self, key: str, nbytes: int = 0) -> None:
+        with self._lock:
+            self.stats[key] += 1
+            self.stats["bytes"] += nbytes
+
+    # --- réponses ---
+    def _links(self, base: str, notice_type: str, r: Dict[str, Any]) -> Dict[str, Any]:
+        url = f"{base}{TYPE_PATHS[notice_type]}/{r['entity_id'].replace('/', '-')}"
+        return {"self": {"href": url}, "images": {"href": f"{url}/images"},
+                "thumbnail": {"href": f"{url}/images/thumbnail"}}
+
+    def list_item(self, base: str, notice_type: str, r: Dict[str, Any]) -> Dict[str, Any]:
+        if notice_type == "yellow":
+            # Les notices jaunes de liste portent tous leurs champs
+            item = {k: v for k, v in r.items() if not k.startswith("_")}
+        else:
+            item = {k: r[k] for k in ("entity_id", "name", "forename", "date_of_birth", "nationalities")}
+            if notice_type == "un":
+                item["un_reference"] = r["un_reference"]
+        item["_links"] = self._links(base, notice_type, r)
+        return item
+
+    def list_page(self, base: str, notice_type: str, path: str, params: Dict[str, str]) -> Dict[str, Any]:
+        rows = self.dataset.query(notice_type, params)
+        rpp = max(1, min(PAGE_CAP, int(params.get("resultPerPage") or 20)))
+        page = max(1, int(params.get("page") or 1))
+        reachable = rows[:RESULT_CAP]
+        chunk = reachable[(page - 1) * rpp:page * rpp]
+        last = max(1, -(-len(reachable) // rpp))
+        query = dict(params, page=str(page), resultPerPage=str(rpp))
+
+        def href(p: int) -> Dict[str, str]:
+            return {"href": f"{base}{path}?" + "&".join(f"{k}={v}" for k, v in sorted(dict(query, page=str(p)).items()))}
+
+        links = {"self": href(page), "first": href(1), "last": href(last)}
+        if page < last:
+            links["next"] = href(page + 1)
+        return {"total": len(rows), "query": query,
+                "_embedded": {"notices": [self.list_item(base, notice_type, r) for r in chunk]},
+                "_links": links}
+
+    def detail(self, base: str, notice_type: str, entity_id: str) -> Optional[Dict[str, Any]]:
+        r = self.dataset.by_id[notice_type].get(entity_id)
+        if r is None:
+            return None
+        body = {k: v for k, v in r.items() if not k.startswith("_")}
+        body["_links"] = self._links(base, notice_type, r)
+        return body
+
+    def describe(self) -> str:
+        s = self.stats
+        elapsed = max(1e-9, time.monotonic() - self.started)
+        return (f"{s['requests']} requêtes ({s['requests'] / elapsed:.1f}/s) : {s['list']} listes, "
+                f"{s['probes']} sondes, {s['detail']} détails, {s['not_modified']} 304, "
+                f"{s['throttled']} 429, {s['errors']} 5xx, {s['bytes'] / 1e6:.1f} Mo")
+
+    # --- serveur ---
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Démarre le serveur dans un thread ; retourne la base d'URL (…/notices/v1)."""
+        api = self
+
+        class Handler(MockHandler):
+            pass
+
+        Handler.api = api
+        ThreadingHTTPServer.allow_reuse_address = True
+        ThreadingHTTPServer.request_queue_size = 1024
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="mock-api", daemon=True).start()
+        return self.base_url
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/notices/v1"
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    api: MockInterpolAPI
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+        if body and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body, 5)
+            headers = dict(headers or {}, **{"Content-Encoding": "gzip"})
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        api = self.api
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path.startswith("/_mock/"):
+            if url.path == "/_mock/reset":
+                api.reset()
+            payload = dict(api.stats, elapsed=time.monotonic() - api.started, sizes=api.dataset.sizes())
+            return self._send(200, json.dumps(payload).encode())
+
+        delay, forced = api._fault()
+        if delay:
+            time.sleep(delay)
+        if forced:
+            headers = {"Retry-After": f"{api.retry_after:g}"} if forced == 429 else {}
+            return self._send(forced, b'{"error": "mock"}', headers)
+
+        base = f"http://{self.headers.get('Host')}"
+        path = url.path.rstrip("/")
+        for notice_type, prefix in TYPE_PATHS.items():
+            if path == prefix:
+                data = api.list_page(base, notice_type, prefix, params)
+                body = json.dumps(data).encode()
+                api._count("probes" if params.get("resultPerPage") == "1" else "list", len(body))
+                return self._send(200, body)
+            if path.startswith(prefix + "/") and notice_type in api.dataset.by_id:
+                detail = api.detail(base, notice_type, path[len(prefix) + 1:].replace("-", "/"))
+                if detail is None:
+                    break
+                body = json.dumps(detail).encode()
+                etag = '"%08x"' % zlib.crc32(body)
+                if self.headers.get("If-None-Match") == etag:
+                    api._count("not_modified")
+                    return self._send(304, headers={"ETag": etag})
+                api._count("detail", len(body))
+                return self._send(200, body, {"ETag": etag})
+        api._count("not_found")
+        self._send(404, b'{"error": "not found"}')
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser("python -m interpol.mock_api", description="API Interpol simulée, en local")
+    p.add_argument("--host", type=str, default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080, help="Port d'écoute (0 = port libre, affiché au démarrage)")
+    p.add_argument("--size", type=int, default=7000, help="Nombre de notices rouges")
+    p.add_argument("--yellow-size", type=int, default=None, help="Nombre de notices jaunes (défaut: size/4)")
+    p.add_argument("--un-size", type=int, default=None, help="Nombre de notices ONU (défaut: size/40)")
+    p.add_argument("--seed", type=int, default=1, help="Graine du jeu de données et des pannes")
+    p.add_argument("--skew", type=float, default=1.0, help="Concentration par pays (exposant de Zipf, 0 = uniforme)")
+    p.add_argument("--latency", type=float, default=0.05, help="Latence ajoutée par requête (s)")
+    p.add_argument("--jitter", type=float, default=0.02, help="Gigue uniforme autour de la latence (s)")
+    p.add_argument("--throttle", type=float, default=0.0, help="Proportion de 429 aléatoires")
+    p.add_argument("--errors", type=float, default=0.0, help="Proportion d'erreurs 5xx aléatoires")
+    p.add_argument("--rps-limit", type=float, default=0.0, help="Débit au-delà duquel le serveur répond 429 (0 = aucun)")
+    p.add_argument("--retry-after", type=float, default=1.0, help="Valeur de Retry-After des 429 (s)")
+    args = p.parse_args(argv[1:])
+
+    sizes = {"red": args.size,
+             "yellow": args.size // 4 if args.yellow_size is None else args.yellow_size,
+             "un": args.size // 40 if args.un_size is None else args.un_size}
+    start = time.time()
+    dataset = MockDataset(sizes, seed=args.seed, skew=args.skew)
+    api = MockInterpolAPI(dataset, args.latency, args.jitter, args.throttle, args.errors,
+                          args.rps_limit, args.retry_after, seed=args.seed)
+    base = api.start(args.host, args.port)
+    print(f"[Info] Jeu de données {dataset.sizes()} généré en {time.time() - start:.1f}s (graine {args.seed})")
+    # Ligne attendue par interpol/bench.py : garder ce format
+    print(f"URL {base}", flush=True)
+    try:
+        while True:
+            time.sleep(60)
+            print(f"[Mock] {api.describe()}", flush=True)
+    except KeyboardInterrupt:
+        api.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
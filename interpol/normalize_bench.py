@@ -0,0 +1,173 @@
+"""
+Micro-banc de la normalisation, sans réseau : rejoue un corpus de réponses brutes
+- corpus JSONL : une notice par ligne, {"type": "red", "item": <notice de
+  liste>, "detail": <détail ou null>}
+- construit depuis un cache de réponses (--from-cache, interpol/http_cache.py :
+  notices de liste appariées à leur détail par le lien self) ou généré par le
+  jeu synthétique de l'API simulée (--from-mock, reproductible par la graine)
+- les notices de liste sont réduites comme en file d'attente (compact_item)
+  avant la mesure : seul l'appel à la fonction de normalisation est chronométré
+- rapport : notices/s et µs par notice (meilleure et moyenne des répétitions),
+  par type ; --profile ajoute le profil cProfile de la boucle
+
+Exemples :
+  python -m interpol.normalize_bench corpus.jsonl --from-mock 5000 --repeat 5
+  python -m interpol.normalize_bench corpus.jsonl --from-cache interpol_cache.sqlite
+  python -m interpol.normalize_bench corpus.jsonl --profile profil/normalize
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from interpol.http_cache import ResponseCache, is_detail_url
+from interpol.metrics import endpoint_label
+from interpol.notice_types import NOTICE_TYPES, iter_notices, notice_self_url
+from interpol.profiling import PROFILER
+from interpol.records import compact_item
+
+# (type, notice de liste, détail)
+Sample = Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+# --- construction du corpus ---
+def corpus_from_cache(path: str) -> Iterator[Dict[str, Any]]:
+    """Notices de liste du cache, chacune avec son détail s'il est en cache aussi."""
+    cache = ResponseCache(path)
+    try:
+        details: Dict[str, Any] = {}
+        lists: List[Tuple[str, Dict[str, Any]]] = []
+        for url, data in cache.entries():
+            if is_detail_url(url):
+                details[url] = data
+            elif isinstance(data, dict):
+                notice_type = endpoint_label(url).split(":")[0]
+                if notice_type in NOTICE_TYPES:
+                    lists.extend((notice_type, item) for item in iter_notices(data))
+    finally:
+        cache.close()
+    seen = set()
+    for notice_type, item in lists:
+        nurl = notice_self_url(item)
+        key = nurl or json.dumps(item, sort_keys=True)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield {"type": notice_type, "item": item, "detail": details.get(nurl)}
+
+
+def corpus_from_mock(size: int, notice_type: str, seed: int) -> Iterator[Dict[str, Any]]:
+    """Notices synthétiques de l'API simulée, sans démarrer de serveur."""
+    from interpol.mock_api import MockDataset, MockInterpolAPI
+
+    api = MockInterpolAPI(MockDataset({notice_type: size}, seed=seed))
+    base = "http://127.0.0.1"
+    with_detail = NOTICE_TYPES[notice_type].fetch_details
+    for r in api.dataset.notices[notice_type]:
+        detail = api.detail(base, notice_type, r["entity_id"]) if with_detail else None
+        yield {"type": notice_type, "item": api.list_item(base, notice_type, r), "detail": detail}
+
+
+def write_corpus(path: str, records: Iterable[Dict[str, Any]]) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def load_corpus(path: str) -> List[Sample]:
+    """Lit le corpus et réduit les notices de liste comme le fait la collecte."""
+    samples: List[Sample] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            nt = NOTICE_TYPES[record.get("type", "red")]
+            item = record["item"]
+            if nt.list_fields:
+                item = compact_item(item, notice_self_url(item), nt.list_fields)
+            samples.append((nt.name, item, record.get("detail")))
+    return samples
+
+
+# --- mesure ---
+def replay(samples: List[Sample], repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Durées de normalisation par type, pour chaque répétition."""
+    by_type: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_type.setdefault(sample[0], []).append(sample)
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, group in sorted(by_type.items()):
+        mapper = NOTICE_TYPES[name].mapper
+        runs = []
+        # Première passe non mesurée : caches de regex, chargement des modules
+        for _, item, detail in group[:100]:
+            mapper(item, detail, None)
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            for _, item, detail in group:
+                mapper(item, detail, None)
+            runs.append(time.perf_counter() - start)
+        results[name] = {"notices": len(group), "runs": runs}
+    return results
+
+
+def print_report(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'type':<8}{'notices':>9}{'meilleur s':>12}{'moyen s':>10}{'notices/s':>12}{'µs/notice':>11}")
+    for name, r in results.items():
+        best = min(r["runs"])
+        mean = sum(r["runs"]) / len(r["runs"])
+        rate = r["notices"] / best if best else 0.0
+        print(f"{name:<8}{r['notices']:>9}{best:>12.3f}{mean:>10.3f}{rate:>12.0f}{1e6 * best / r['notices']:>11.1f}")
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser("python -m interpol.normalize_bench",
+                                description="Débit de la normalisation sur un corpus enregistré (sans réseau)")
+    p.add_argument("corpus", help="Corpus JSONL (écrit d'abord si --from-cache ou --from-mock)")
+    p.add_argument("--from-cache", type=str, default=None, help="Construire le corpus depuis ce cache de réponses (--cache)")
+    p.add_argument("--from-mock", type=int, default=0, help="Construire un corpus synthétique de N notices")
+    p.add_argument("--type", choices=sorted(NOTICE_TYPES), default="red", help="Type des notices synthétiques")
+    p.add_argument("--seed", type=int, default=1, help="Graine du corpus synthétique")
+    p.add_argument("--repeat", type=int, default=5, help="Répétitions de la mesure")
+    p.add_argument("--profile", type=str, nargs="?", const="normalize_profile", default=None,
+                   help="Profiler la mesure : <préfixe>.pstats, .folded, .txt")
+    p.add_argument("--top", type=int, default=25, help="Avec --profile : nombre de fonctions du rapport")
+    args = p.parse_args(argv[1:])
+
+    if args.from_cache:
+        count = write_corpus(args.corpus, corpus_from_cache(args.from_cache))
+        print(f"[Info] Corpus: {count} notices depuis {args.from_cache} → {args.corpus}")
+    elif args.from_mock:
+        count = write_corpus(args.corpus, corpus_from_mock(args.from_mock, args.type, args.seed))
+        print(f"[Info] Corpus: {count} notices synthétiques ({args.type}) → {args.corpus}")
+
+    try:
+        samples = load_corpus(args.corpus)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[Erreur] Corpus illisible {args.corpus}: {e}")
+        return 1
+    if not samples:
+        print(f"[Erreur] Corpus vide: {args.corpus}")
+        return 1
+    with_detail = sum(1 for s in samples if s[2])
+    print(f"[Info] {len(samples)} notices ({with_detail} avec détail), {args.repeat} répétitions")
+
+    if args.profile:
+        PROFILER.start()
+    results = replay(samples, args.repeat)
+    print_report(results)
+    if args.profile:
+        print(f"[Info] Profil: {', '.join(PROFILER.write(args.profile, args.top))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
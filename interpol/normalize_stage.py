@@ -0,0 +1,135 @@
+"""
+Étage de normalisation multi-processus (--normalize-workers)
+Les workers réseau ne font plus que télécharger ; les triplets (notice brute,
+détail, filtres de la partition) sont regroupés en lots et normalisés dans un
+ProcessPoolExecutor, hors du GIL du processus principal.
+- lots de `chunk_size` triplets (un seul aller-retour pickle par lot)
+- un lot incomplet part au bout de `flush_interval` secondes
+- au plus `max_pending` lots en cours : au-delà, submit() bloque (contre-pression)
+Les rappels (écriture CSV, journal, index) restent dans le processus principal.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Fonction de normalisation d'un type (notice_types.py) : (notice, détail, filtres) → ligne
+NormalizeFn = Callable[[Dict[str, Any], Optional[Dict[str, Any]], Any], Dict[str, Any]]
+RowCallback = Callable[[Optional[Dict[str, Any]]], None]
+Job = Tuple[Dict[str, Any], Optional[Dict[str, Any]], Any]
+
+
+def normalize_chunk(fn: NormalizeFn, jobs: List[Job]) -> List[Optional[Dict[str, Any]]]:
+    """Exécuté dans un processus fils : une ligne (ou None en cas d'erreur) par triplet."""
+    rows: List[Optional[Dict[str, Any]]] = []
+    for item, detail, filters in jobs:
+        try:
+            rows.append(fn(item, detail, filters))
+        except Exception as e:
+            print(f"[Erreur Normalisation] {item.get('entity_id', '')}: {e}")
+            rows.append(None)
+    return rows
+
+
+class NormalizeStage:
+    """Normalisation par lots dans un pool de processus ; submit() est sûr entre threads."""
+
+    def __init__(self, fn: NormalizeFn, workers: int, chunk_size: int = 64,
+                 flush_interval: float = 0.05, max_pending: Optional[int] = None):
+        self.fn = fn
+        self.chunk_size = max(1, chunk_size)
+        self.flush_interval = flush_interval
+        # « spawn » : un fork au milieu des threads réseau hériterait de verrous pris
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._slots = threading.BoundedSemaphore(max_pending or 4 * workers)
+        self._lock = threading.Lock()
+        self._jobs: List[Job] = []
+        self._callbacks: List[RowCallback] = []
+        self._oldest = 0.0
+        self._in_flight = 0
+        self._idle = threading.Condition(self._lock)
+        self._closed = threading.Event()
+        self.chunks = 0
+        self.rows = 0
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def submit(self, item: Dict[str, Any], detail: Optional[Dict[str, Any]], done: RowCallback,
+               filters: Any = None) -> None:
+        """Met un triplet en lot ; `done(row)` sera appelé depuis un thread du pool."""
+        with self._lock:
+            if not self._jobs:
+                self._oldest = time.monotonic()
+            self._jobs.append((item, detail, filters))
+            self._callbacks.append(done)
+            full = len(self._jobs) >= self.chunk_size
+            batch = self._take() if full else None
+        if batch:
+            self._dispatch(*batch)
+
+    def _take(self) -> Tuple[List[Job], List[RowCallback]]:
+        batch = (self._jobs, self._callbacks)
+        self._jobs, self._callbacks = [], []
+        return batch
+
+    def _dispatch(self, jobs: List[Job], callbacks: List[RowCallback]) -> None:
+        self._slots.acquire()
+        # Compté avant submit : le lot peut se terminer avant le retour de submit()
+        with self._lock:
+            self._in_flight += 1
+            self.chunks += 1
+        try:
+            future = self._pool.submit(normalize_chunk, self.fn, jobs)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._deliver(f, jobs, callbacks))
+
+    def _deliver(self, future: Future, jobs: List[Job], callbacks: List[RowCallback]) -> None:
+        try:
+            rows = future.result()
+        except Exception as e:
+            # Lot perdu (processus fils tombé, pickle…) : on le refait ici
+            print(f"[Avertissement] Lot de normalisation rejoué localement: {e}")
+            rows = normalize_chunk(self.fn, jobs)
+        finally:
+            self._slots.release()
+        try:
+            for done, row in zip(callbacks, rows):
+                try:
+                    done(row)
+                except Exception as e:
+                    print(f"[Erreur Tâche] écriture de ligne: {e}")
+        finally:
+            with self._lock:
+                self.rows += len(rows)
+                self._in_flight -= 1
+                self._idle.notify_all()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                stale = self._jobs and time.monotonic() - self._oldest >= self.flush_interval
+                batch = self._take() if stale else None
+            if batch:
+                self._dispatch(*batch)
+
+    def close(self) -> None:
+        """Envoie le dernier lot, attend tous les rappels puis arrête le pool."""
+        self._closed.set()
+        self._flusher.join()
+        with self._lock:
+            batch = self._take() if self._jobs else None
+        if batch:
+            self._dispatch(*batch)
+        with self._lock:
+            while self._in_flight:
+                self._idle.wait()
+        self._pool.shutdown()
+
+    def describe(self) -> str:
+        return f"{self.rows} lignes normalisées en {self.chunks} lots"
@@ -0,0 +1,154 @@
+"""
+Index local des notices entre deux runs (mode --incremental)
+entity_id → empreinte de la notice de liste, ETag / Last-Modified du détail,
+détail brut (compressé) et ligne normalisée.
+Sert à ne télécharger que les notices nouvelles ou modifiées, et à
+repérer les notices retirées depuis le run précédent.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notices (
+    entity_id TEXT PRIMARY KEY,
+    list_hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    detail BLOB,
+    row TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+"""
+
+# (empreinte de liste, etag, last_modified)
+IndexEntry = Tuple[str, Optional[str], Optional[str]]
+
+
+def list_hash(item: Dict[str, Any]) -> str:
+    """Empreinte stable d'une notice de liste (clés triées, liens de navigation exclus)."""
+    content = {k: v for k, v in item.items() if k != "_links"}
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class NoticeIndex:
+    """Index SQLite des notices connues ; les empreintes sont gardées en mémoire."""
+
+    def __init__(self, path: str, commit_every: int = 500):
+        self.path = path
+        self.commit_every = commit_every
+        self.run_started = time.time()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._entries: Dict[str, IndexEntry] = {
+            eid: (h, etag, lm) for eid, h, etag, lm in
+            self._conn.execute("SELECT entity_id, list_hash, etag, last_modified FROM notices")}
+        self._seen: set = set()
+        self._uncommitted = 0
+        self.stats = {"new": 0, "changed": 0, "unchanged": 0, "not_modified": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, entity_id: str) -> Optional[IndexEntry]:
+        return self._entries.get(entity_id)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def cached(self, entity_id: str, column: str) -> Optional[Any]:
+        with self._lock:
+            got = self._conn.execute(f"SELECT {column} FROM notices WHERE entity_id = ?", (entity_id,)).fetchone()
+        if not got or got[0] is None:
+            return None
+        if column == "detail":
+            return json.loads(zlib.decompress(got[0]))
+        return json.loads(got[0])
+
+    def unchanged_row(self, entity_id: str, item_hash: str) -> Optional[Dict[str, str]]:
+        """Ligne précédente si la notice de liste n'a pas bougé, sinon None."""
+        entry = self._entries.get(entity_id)
+        if entry is None or entry[0] != item_hash:
+            return None
+        row = self.cached(entity_id, "row")
+        if row is not None:
+            self.touch(entity_id)
+            self._count("unchanged")
+        return row
+
+    def conditional_headers(self, entity_id: str) -> Dict[str, str]:
+        entry = self._entries.get(entity_id)
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry[1]:
+                headers["If-None-Match"] = entry[1]
+            if entry[2]:
+                headers["If-Modified-Since"] = entry[2]
+        return headers
+
+    def mark_seen(self, entity_id: str) -> None:
+        """La notice figure dans les listes de ce run (donc n'a pas été retirée)."""
+        with self._lock:
+            self._seen.add(entity_id)
+
+    def touch(self, entity_id: str) -> None:
+        with self._lock:
+            self._seen.add(entity_id)
+            self._conn.execute("UPDATE notices SET last_seen = ? WHERE entity_id = ?", (time.time(), entity_id))
+            self._maybe_commit()
+
+    def store(self, entity_id: str, item_hash: str, etag: Optional[str], last_modified: Optional[str],
+              detail: Optional[Dict[str, Any]], row: Dict[str, str], not_modified: bool = False) -> None:
+        now = time.time()
+        self._count("not_modified" if not_modified else ("changed" if entity_id in self._entries else "new"))
+        previous = self._entries.get(entity_id)
+        if previous is not None:
+            # Un 304 ne renvoie pas toujours les validateurs : on garde les précédents
+            etag = etag or previous[1]
+            last_modified = last_modified or previous[2]
+        blob = zlib.compress(json.dumps(detail, ensure_ascii=False).encode("utf-8")) if detail is not None else None
+        with self._lock:
+            self._seen.add(entity_id)
+            self._conn.execute(
+                "INSERT INTO notices (entity_id, list_hash, etag, last_modified, detail, row, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(entity_id) DO UPDATE SET "
+                "list_hash=excluded.list_hash, etag=excluded.etag, last_modified=excluded.last_modified, "
+                "detail=excluded.detail, row=excluded.row, last_seen=excluded.last_seen",
+                (entity_id, item_hash, etag, last_modified, blob, json.dumps(row, ensure_ascii=False), now, now))
+            self._entries[entity_id] = (item_hash, etag, last_modified)
+            self._maybe_commit()
+
+    def _maybe_commit(self) -> None:
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def removed(self) -> List[Tuple[str, Dict[str, str]]]:
+        """Notices connues de l'index mais absentes de ce run : (entity_id, dernière ligne)."""
+        with self._lock:
+            missing = [eid for eid in self._entries if eid not in self._seen]
+        return [(eid, self.cached(eid, "row") or {"entity_id": eid}) for eid in missing]
+
+    def forget(self, entity_ids: List[str]) -> None:
+        with self._lock:
+            self._conn.executemany("DELETE FROM notices WHERE entity_id = ?", [(e,) for e in entity_ids])
+            for eid in entity_ids:
+                self._entries.pop(eid, None)
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,385 @@
+"""
+Base SQLite locale des notices (puits de sortie et surface de requête)
+- une ligne par notice, upsert sur entity_id (à défaut la clé de dédup)
+- colonnes indexées : type, nationalité, pays du mandat, sexe, âge
+- table fille notice_values (notice, champ, valeur) pour les champs
+  multi-valués : infractions, langues, nationalités…
+Les vérifications de complétude, dédoublonnages et fusions deviennent des
+requêtes SQL indexées au lieu de relectures complètes des CSV.
+
+Requêtes en ligne de commande :
+  python -m interpol.notice_store interpol_red.sqlite stats
+  python -m interpol.notice_store interpol_red.sqlite count --by infraction
+  python -m interpol.notice_store interpol_red.sqlite find --nationality France --limit 5
+  python -m interpol.notice_store interpol_red.sqlite sql "SELECT sex, COUNT(*) FROM notices GROUP BY sex"
+"""
+
+import csv
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notices (
+    key TEXT PRIMARY KEY,
+    notice_type TEXT NOT NULL,
+    entity_id TEXT,
+    name TEXT,
+    forename TEXT,
+    date_of_birth TEXT,
+    age INTEGER,
+    sex TEXT,
+    nationality TEXT,
+    warrant_country TEXT,
+    row TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notices_type ON notices (notice_type);
+CREATE INDEX IF NOT EXISTS notices_nationality ON notices (nationality);
+CREATE INDEX IF NOT EXISTS notices_warrant_country ON notices (warrant_country);
+CREATE INDEX IF NOT EXISTS notices_sex ON notices (sex);
+CREATE INDEX IF NOT EXISTS notices_age ON notices (age);
+CREATE TABLE IF NOT EXISTS notice_values (
+    key TEXT NOT NULL REFERENCES notices (key) ON DELETE CASCADE,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (key, field, value)
+);
+CREATE INDEX IF NOT EXISTS notice_values_lookup ON notice_values (field, value);
+CREATE TABLE IF NOT EXISTS partitions (
+    partition TEXT PRIMARY KEY,
+    notice_type TEXT NOT NULL,
+    nationality TEXT,
+    age_min INTEGER,
+    age_max INTEGER,
+    sex TEXT,
+    forename TEXT,
+    country_of_birth TEXT,
+    api_total INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS partitions_nationality ON partitions (nationality);
+CREATE TABLE IF NOT EXISTS partition_members (
+    partition TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (partition, key)
+);
+"""
+
+# Champs multi-valués par type de notice : champ de la ligne → séparateur.
+# Le champ « infractions » est exposé sous le nom « infraction » dans notice_values.
+MULTI_VALUED = {
+    "red": {"infractions": " | ", "languages": ", "},
+    "yellow": {"nationalities": ";", "languages": ";", "eyes_colors": ";", "hairs": ";"},
+    "un": {"nationalities": ";"},
+}
+VALUE_NAMES = {"infractions": "infraction", "nationalities": "nationality", "languages": "language"}
+
+# Partition feuille collectée : mêmes filtres, dans le même ordre, que les
+# sondes de total (nationalité, âge min, âge max, sexe, prénom, pays de naissance)
+PARTITION_DIMS = ("nationality", "age_min", "age_max", "sex", "forename", "country_of_birth")
+Filters = Tuple[Optional[str], Optional[int], Optional[int], Optional[str], Optional[str], Optional[str]]
+
+# Dimensions de `count --by` : colonne indexée ou champ de notice_values
+COLUMN_DIMENSIONS = ("nationality", "warrant_country", "sex", "age", "notice_type")
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def row_age(row: Dict[str, Any]) -> Optional[int]:
+    """Colonne `age` (notices rouges), à défaut l'âge approché d'après l'année de naissance."""
+    age = _to_int(row.get("age"))
+    if age is not None:
+        return age
+    year = _to_int(str(row.get("date_of_birth") or "")[:4])
+    return time.localtime().tm_year - year if year else None
+
+
+def partition_id(filters: Filters, notice_type: str = "red") -> str:
+    """Identifiant de partition ; préfixé du type pour qu'une base partagée ne mélange pas les types."""
+    return notice_type + ":" + "|".join("" if x is None else str(x) for x in filters)
+
+
+class NoticeStore:
+    """Base SQLite des notices ; sûr entre threads, écritures validées par lots."""
+
+    def __init__(self, path: str, commit_every: int = 500, commit_interval: float = 2.0):
+        self.path = path
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self.upserts = 0
+
+    # --- écriture ---
+    def _maybe_commit(self, ops: int) -> None:
+        self._uncommitted += ops
+        now = time.monotonic()
+        if self._uncommitted >= self.commit_every or now - self._last_commit >= self.commit_interval:
+            self._conn.commit()
+            self._uncommitted = 0
+            self._last_commit = now
+
+    def _upsert(self, key: str, row: Dict[str, Any], notice_type: str) -> None:
+        self._conn.execute(
+            "INSERT INTO notices (key, notice_type, entity_id, name, forename, date_of_birth, age, sex, "
+            "nationality, warrant_country, row, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET notice_type=excluded.notice_type, entity_id=excluded.entity_id, "
+            "name=excluded.name, forename=excluded.forename, date_of_birth=excluded.date_of_birth, "
+            "age=excluded.age, sex=excluded.sex, nationality=excluded.nationality, "
+            "warrant_country=excluded.warrant_country, row=excluded.row, updated_at=excluded.updated_at",
+            (key, notice_type, row.get("entity_id") or None, row.get("name"), row.get("forename"),
+             row.get("date_of_birth"), row_age(row), row.get("sex") or None,
+             row.get("nationality") or None, row.get("warrant_country") or None,
+             json.dumps(row, ensure_ascii=False), time.time()))
+        self._conn.execute("DELETE FROM notice_values WHERE key = ?", (key,))
+        values = []
+        for field, sep in MULTI_VALUED.get(notice_type, {}).items():
+            name = VALUE_NAMES.get(field, field)
+            for value in str(row.get(field) or "").split(sep):
+                if value.strip():
+                    values.append((key, name, value.strip()))
+        self._conn.executemany("INSERT OR IGNORE INTO notice_values (key, field, value) VALUES (?, ?, ?)", values)
+
+    def upsert(self, key: str, row: Dict[str, Any], notice_type: str = "red") -> None:
+        with self._lock:
+            self._upsert(key, row, notice_type)
+            self.upserts += 1
+            self._maybe_commit(1)
+
+    def upsert_many(self, rows: Iterable[Tuple[str, Dict[str, Any]]], notice_type: str = "red") -> int:
+        n = 0
+        with self._lock:
+            for key, row in rows:
+                self._upsert(key, row, notice_type)
+                n += 1
+            self.upserts += n
+            self._maybe_commit(n)
+        return n
+
+    def delete(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            self._conn.executemany("DELETE FROM notices WHERE key = ?", [(k,) for k in keys])
+            self._maybe_commit(len(keys))
+
+    def record_partition(self, filters: Filters, api_total: int, keys: Iterable[str],
+                         notice_type: str = "red") -> None:
+        """Partition feuille collectée : total annoncé par l'API et clés reçues (doublons compris)."""
+        pid = partition_id(filters, notice_type)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO partitions (partition, notice_type, nationality, age_min, age_max, sex, "
+                "forename, country_of_birth, api_total, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (pid, notice_type) + tuple(filters) + (api_total, time.time()))
+            self._conn.execute("DELETE FROM partition_members WHERE partition = ?", (pid,))
+            rows = [(pid, key) for key in keys]
+            self._conn.executemany("INSERT OR IGNORE INTO partition_members (partition, key) VALUES (?, ?)", rows)
+            self._maybe_commit(len(rows) + 1)
+
+    def add_members(self, filters: Filters, keys: Iterable[str], notice_type: str = "red") -> None:
+        """Ajoute à une partition les clés reçues par des requêtes plus fines (rattrapage)."""
+        pid = partition_id(filters, notice_type)
+        with self._lock:
+            rows = [(pid, key) for key in keys]
+            self._conn.executemany("INSERT OR IGNORE INTO partition_members (partition, key) VALUES (?, ?)", rows)
+            self._maybe_commit(len(rows))
+
+    def clear_partitions(self, notice_type: str) -> None:
+        """Oublie le découpage d'un run précédent (nouveau run complet)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM partition_members WHERE partition IN "
+                               "(SELECT partition FROM partitions WHERE notice_type = ?)", (notice_type,))
+            self._conn.execute("DELETE FROM partitions WHERE notice_type = ?", (notice_type,))
+            self._conn.commit()
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    # --- lecture ---
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def keys(self, notice_type: Optional[str] = None) -> List[str]:
+        if notice_type:
+            return [k for (k,) in self.query("SELECT key FROM notices WHERE notice_type = ?", (notice_type,))]
+        return [k for (k,) in self.query("SELECT key FROM notices")]
+
+    def rows(self, notice_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        sql = "SELECT row FROM notices" + (" WHERE notice_type = ?" if notice_type else "") + " ORDER BY key"
+        for (row,) in self.query(sql, (notice_type,) if notice_type else ()):
+            yield json.loads(row)
+
+    def count_by(self, dimension: str, notice_type: Optional[str] = None) -> Dict[Any, int]:
+        """Effectifs par valeur d'une dimension, en une requête GROUP BY indexée."""
+        type_filter = " AND n.notice_type = ?" if notice_type else ""
+        params: Tuple = (notice_type,) if notice_type else ()
+        if dimension in COLUMN_DIMENSIONS:
+            sql = f"SELECT n.{dimension}, COUNT(*) FROM notices n WHERE 1=1{type_filter} GROUP BY n.{dimension}"
+        else:
+            sql = ("SELECT v.value, COUNT(*) FROM notice_values v JOIN notices n ON n.key = v.key "
+                   f"WHERE v.field = ?{type_filter} GROUP BY v.value")
+            params = (dimension,) + params
+        return {value: count for value, count in self.query(sql, params)}
+
+    def find(self, notice_type: Optional[str] = None, limit: Optional[int] = None,
+             **filters: Any) -> List[Dict[str, Any]]:
+        """Notices filtrées : colonnes indexées, âge min/max et champs multi-valués."""
+        where, params = [], []
+        if notice_type:
+            where.append("n.notice_type = ?")
+            params.append(notice_type)
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name == "age_min":
+                where.append("n.age >= ?")
+            elif name == "age_max":
+                where.append("n.age <= ?")
+            elif name in COLUMN_DIMENSIONS:
+                where.append(f"n.{name} = ?")
+            else:
+                where.append("n.key IN (SELECT key FROM notice_values WHERE field = ? AND value = ?)")
+                params.append(name)
+            params.append(value)
+        sql = "SELECT n.row FROM notices n" + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY n.key"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [json.loads(row) for (row,) in self.query(sql, params)]
+
+    def partition_coverage(self, notice_type: str) -> List[Tuple[Filters, int, float, int]]:
+        """(filtres, total API enregistré, date de collecte, clés reçues) par partition, en un GROUP BY."""
+        dims = ", ".join(f"p.{d}" for d in PARTITION_DIMS)
+        sql = (f"SELECT {dims}, p.api_total, p.fetched_at, COUNT(m.key) FROM partitions p "
+               "LEFT JOIN partition_members m ON m.partition = p.partition "
+               "WHERE p.notice_type = ? GROUP BY p.partition ORDER BY p.partition")
+        return [(tuple(r[:6]), r[6], r[7], r[8]) for r in self.query(sql, (notice_type,))]
+
+    def members_by(self, dimension: str, notice_type: str) -> Dict[Any, int]:
+        """Clés distinctes reçues par valeur d'une dimension de partition (ex. par nationalité)."""
+        if dimension not in PARTITION_DIMS:
+            raise ValueError(f"Dimension de partition inconnue: {dimension}")
+        sql = (f"SELECT p.{dimension}, COUNT(DISTINCT m.key) FROM partitions p "
+               "JOIN partition_members m ON m.partition = p.partition "
+               f"WHERE p.notice_type = ? AND p.{dimension} IS NOT NULL GROUP BY p.{dimension}")
+        return {value: count for value, count in self.query(sql, (notice_type,))}
+
+    def matching_keys(self, filters: Filters, notice_type: str) -> List[str]:
+        """Clés des notices déjà en base qui tombent dans une combinaison de filtres de l'API.
+
+        L'âge est approché d'après l'année de naissance : le résultat sert à
+        éviter des téléchargements, pas à prouver la complétude.
+        """
+        nationality, age_min, age_max, sex, forename, country_of_birth = filters
+        where, params = ["n.notice_type = ?"], [notice_type]
+        if nationality:
+            where.append("(n.nationality = ? OR n.key IN "
+                         "(SELECT key FROM notice_values WHERE field = 'nationality' AND value = ?))")
+            params += [nationality, nationality]
+        if age_min is not None:
+            where.append("n.age >= ?")
+            params.append(age_min)
+        if age_max is not None:
+            where.append("n.age <= ?")
+            params.append(age_max)
+        if sex:
+            where.append("n.sex = ?")
+            params.append(sex)
+        if forename:
+            where.append("UPPER(n.forename) LIKE ?")
+            params.append(forename.upper() + "%")
+        if country_of_birth:
+            where.append("json_extract(n.row, '$.country_of_birth') = ?")
+            params.append(country_of_birth)
+        return [k for (k,) in self.query("SELECT n.key FROM notices n WHERE " + " AND ".join(where), params)]
+
+    def stats(self) -> Dict[str, int]:
+        return {t: c for t, c in self.query("SELECT notice_type, COUNT(*) FROM notices GROUP BY notice_type")}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+def read_only_query(path: str, sql: str) -> List[Tuple]:
+    """Requête libre sur une connexion en lecture seule : une écriture échoue au lieu d'être validée."""
+    conn = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def main(argv: List[str]) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser("python -m interpol.notice_store", description="Requêtes sur la base SQLite des notices")
+    p.add_argument("db", help="Base SQLite (--store de main.py, interpol_yellow.sqlite…)")
+    p.add_argument("--type", dest="notice_type", default=None, help="Restreindre à un type de notice (red, yellow)")
+    sub = p.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Nombre de notices par type")
+    c = sub.add_parser("count", help="Effectifs par dimension")
+    c.add_argument("--by", required=True, help="nationality, warrant_country, sex, age, infraction, language…")
+    f = sub.add_parser("find", help="Notices filtrées (CSV sur la sortie standard)")
+    for dim in ("nationality", "warrant_country", "sex", "infraction", "language"):
+        f.add_argument(f"--{dim.replace('_', '-')}", dest=dim, default=None)
+    f.add_argument("--age-min", type=int, default=None)
+    f.add_argument("--age-max", type=int, default=None)
+    f.add_argument("--limit", type=int, default=None)
+    q = sub.add_parser("sql", help="Requête SQL libre (lecture seule)")
+    q.add_argument("sql")
+    args = p.parse_args(argv[1:])
+
+    if args.command == "sql":
+        try:
+            records = read_only_query(args.db, args.sql)
+        except sqlite3.Error as e:
+            print(f"[Erreur] {e}", file=sys.stderr)
+            return 1
+        for record in records:
+            print("\t".join("" if v is None else str(v) for v in record))
+        return 0
+
+    store = NoticeStore(args.db)
+    try:
+        if args.command == "stats":
+            for notice_type, count in sorted(store.stats().items()):
+                print(f"{notice_type}\t{count}")
+        elif args.command == "count":
+            counts = store.count_by(args.by, args.notice_type)
+            for value, count in sorted(counts.items(), key=lambda kv: (-kv[1], str(kv[0]))):
+                print(f"{'' if value is None else value}\t{count}")
+        elif args.command == "find":
+            filters = {k: getattr(args, k) for k in ("nationality", "warrant_country", "sex", "infraction",
+                                                     "language", "age_min", "age_max")}
+            rows = store.find(args.notice_type, args.limit, **filters)
+            if rows:
+                writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]), extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(rows)
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,455 @@
+"""
+Types de notices de l'API Interpol (red, yellow, un) et leurs correspondances de champs
+- point d'accès, en-tête referer et colonnes de sortie de chaque type
+- une fonction de normalisation par type : (notice de liste, détail, filtres) → ligne
+- dimensions de découpage acceptées par le point d'accès
+Partagé par main.py, yelllow_notice.py et le moteur multi-types (interpol/engine.py).
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from interpol.infractions import classify_many
+from interpol.metrics import timed
+from interpol.notice_store import Filters
+from interpol.profiling import cpu_stage
+from interpol.records import RED_LIST_FIELDS
+from interpol.text import clean_text
+
+# SCRAPER_API_BASE : autre serveur (ex. python -m interpol.mock_api pour les mesures hors ligne)
+API_BASE = os.getenv("SCRAPER_API_BASE") or "https://ws-public.interpol.int/notices/v1"
+
+# Dictionnaire ISO → noms complets
+COUNTRY_NAMES = {
+    "AD": "Andorre", "AE": "Émirats arabes unis", "AF": "Afghanistan", "AG": "Antigua-et-Barbuda",
+    "AI": "Anguilla", "AL": "Albanie", "AM": "Arménie", "AO": "Angola", "AQ": "Antarctique",
+    "AR": "Argentine", "AS": "Samoa américaines", "AT": "Autriche", "AU": "Australie",
+    "AW": "Aruba", "AX": "Åland", "AZ": "Azerbaïdjan", "BA": "Bosnie-Herzégovine",
+    "BB": "Barbade", "BD": "Bangladesh", "BE": "Belgique", "BF": "Burkina Faso",
+    "BG": "Bulgarie", "BH": "Bahreïn", "BI": "Burundi", "BJ": "Bénin", "BL": "Saint-Barthélemy",
+    "BM": "Bermudes", "BN": "Brunei", "BO": "Bolivie", "BQ": "Bonaire", "BR": "Brésil",
+    "BS": "Bahamas", "BT": "Bhoutan", "BV": "Bouvet", "BW": "Botswana", "BY": "Biélorussie",
+    "BZ": "Belize", "CA": "Canada", "CC": "Îles Cocos", "CD": "Congo (RDC)", "CF": "République centrafricaine",
+    "CG": "Congo", "CH": "Suisse", "CI": "Côte d'Ivoire", "CK": "Îles Cook", "CL": "Chili",
+    "CM": "Cameroun", "CN": "Chine", "CO": "Colombie", "CR": "Costa Rica", "CU": "Cuba",
+    "CV": "Cap-Vert", "CW": "Curaçao", "CX": "Île Christmas", "CY": "Chypre", "CZ": "Tchéquie",
+    "DE": "Allemagne", "DJ": "Djibouti", "DK": "Danemark", "DM": "Dominique", "DO": "République dominicaine",
+    "DZ": "Algérie", "EC": "Équateur", "EE": "Estonie", "EG": "Égypte", "EH": "Sahara occidental",
+    "ER": "Érythrée", "ES": "Espagne", "ET": "Éthiopie", "FI": "Finlande", "FJ": "Fidji",
+    "FK": "Îles Malouines", "FM": "Micronésie", "FO": "Îles Féroé", "FR": "France",
+    "GA": "Gabon", "GB": "Royaume-Uni", "GD": "Grenade", "GE": "Géorgie", "GF": "Guyane française",
+    "GG": "Guernesey", "GH": "Ghana", "GI": "Gibraltar", "GL": "Groenland", "GM": "Gambie",
+    "GN": "Guinée", "GP": "Guadeloupe", "GQ": "Guinée équatoriale", "GR": "Grèce",
+    "GS": "Géorgie du Sud", "GT": "Guatemala", "GU": "Guam", "GW": "Guinée-Bissau",
+    "GY": "Guyana", "HK": "Hong Kong", "HM": "Heard-et-MacDonald", "HN": "Honduras",
+    "HR": "Croatie", "HT": "Haïti", "HU": "Hongrie", "ID": "Indonésie", "IE": "Irlande",
+    "IL": "Israël", "IM": "Île de Man", "IN": "Inde", "IO": "Territoire britannique de l'océan Indien",
+    "IQ": "Irak", "IR": "Iran", "IS": "Islande", "IT": "Italie", "JE": "Jersey",
+    "JM": "Jamaïque", "JO": "Jordanie", "JP": "Japon", "KE": "Kenya", "KG": "Kirghizistan",
+    "KH": "Cambodge", "KI": "Kiribati", "KM": "Comores", "KN": "Saint-Christophe-et-Niévès",
+    "KP": "Corée du Nord", "KR": "Corée du Sud", "KW": "Koweït", "KY": "Îles Caïmans",
+    "KZ": "Kazakhstan", "LA": "Laos", "LB": "Liban", "LC": "Sainte-Lucie", "LI": "Liechtenstein",
+    "LK": "Sri Lanka", "LR": "Liberia", "LS": "Lesotho", "LT": "Lituanie", "LU": "Luxembourg",
+    "LV": "Lettonie", "LY": "Libye", "MA": "Maroc", "MC": "Monaco", "MD": "Moldavie",
+    "ME": "Monténégro", "MF": "Saint-Martin", "MG": "Madagascar", "MH": "Îles Marshall",
+    "MK": "Macédoine du Nord", "ML": "Mali", "MM": "Myanmar", "MN": "Mongolie", "MO": "Macao",
+    "MP": "Îles Mariannes du Nord", "MQ": "Martinique", "MR": "Mauritanie", "MS": "Montserrat",
+    "MT": "Malte", "MU": "Maurice", "MV": "Maldives", "MW": "Malawi", "MX": "Mexique",
+    "MY": "Malaisie", "MZ": "Mozambique", "NA": "Namibie", "NC": "Nouvelle-Calédonie",
+    "NE": "Niger", "NF": "Île Norfolk", "NG": "Nigeria", "NI": "Nicaragua", "NL": "Pays-Bas",
+    "NO": "Norvège", "NP": "Népal", "NR": "Nauru", "NU": "Niue", "NZ": "Nouvelle-Zélande",
+    "OM": "Oman", "PA": "Panama", "PE": "Pérou", "PF": "Polynésie française", "PG": "Papouasie-Nouvelle-Guinée",
+    "PH": "Philippines", "PK": "Pakistan", "PL": "Pologne", "PM": "Saint-Pierre-et-Miquelon",
+    "PN": "Pitcairn", "PR": "Porto Rico", "PS": "Palestine", "PT": "Portugal", "PW": "Palaos",
+    "PY": "Paraguay", "QA": "Qatar", "RE": "La Réunion", "RO": "Roumanie", "RS": "Serbie",
+    "RU": "Russie", "RW": "Rwanda", "SA": "Arabie saoudite", "SB": "Îles Salomon",
+    "SC": "Seychelles", "SD": "Soudan", "SE": "Suède", "SG": "Singapour", "SH": "Sainte-Hélène",
+    "SI": "Slovénie", "SJ": "Svalbard et Jan Mayen", "SK": "Slovaquie", "SL": "Sierra Leone",
+    "SM": "Saint-Marin", "SN": "Sénégal", "SO": "Somalie", "SR": "Suriname", "SS": "Soudan du Sud",
+    "ST": "Sao Tomé-et-Principe", "SV": "Salvador", "SX": "Saint-Martin", "SY": "Syrie",
+    "SZ": "Eswatini", "TC": "Îles Turques-et-Caïques", "TD": "Tchad", "TF": "Terres australes françaises",
+    "TG": "Togo", "TH": "Thaïlande", "TJ": "Tadjikistan", "TK": "Tokelau", "TL": "Timor oriental",
+    "TM": "Turkménistan", "TN": "Tunisie", "TO": "Tonga", "TR": "Turquie", "TT": "Trinité-et-Tobago",
+    "TV": "Tuvalu", "TW": "Taïwan", "TZ": "Tanzanie", "UA": "Ukraine", "UG": "Ouganda",
+    "UM": "Îles mineures éloignées des États-Unis", "US": "États-Unis", "UY": "Uruguay",
+    "UZ": "Ouzbékistan", "VA": "Vatican", "VC": "Saint-Vincent-et-les-Grenadines",
+    "VE": "Venezuela", "VG": "Îles Vierges britanniques", "VI": "Îles Vierges américaines",
+    "VN": "Vietnam", "VU": "Vanuatu", "WF": "Wallis-et-Futuna", "WS": "Samoa", "YE": "Yémen",
+    "YT": "Mayotte", "ZA": "Afrique du Sud", "ZM": "Zambie", "ZW": "Zimbabwe"
+}
+
+def convert_country_code(code: str) -> str:
+    if not code:
+        return ""
+    code_upper = code.strip().upper()
+    return COUNTRY_NAMES.get(code_upper, code)
+
+
+def extract_age_from_dob(dob: str) -> str:
+    if not dob or len(dob) < 4 or not dob[:4].isdigit():
+        return ""
+    try:
+        year = int(dob[:4])
+        age = datetime.now().year - year
+        return str(age) if 0 <= age <= 120 else ""
+    except Exception:
+        return ""
+
+def iter_notices(data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    emb = data.get("_embedded", {})
+    if isinstance(emb, dict):
+        arr = emb.get("notices", [])
+        if isinstance(arr, list):
+            for item in arr:
+                if isinstance(item, dict):
+                    yield item
+
+def extract_infractions(obj: Optional[Dict[str, Any]]) -> List[str]:
+    out: List[str] = []
+    if not obj:
+        return out
+    aws = obj.get("arrest_warrants")
+    if not isinstance(aws, list):
+        return out
+    # Tous les libellés d'abord (charge, charges, charge_translation), classés en un appel
+    texts: List[str] = []
+    for aw in aws:
+        if not isinstance(aw, dict):
+            continue
+        ch = aw.get("charge")
+        if ch:
+            texts.append(str(ch))
+        chs = aw.get("charges")
+        if isinstance(chs, list):
+            texts.extend(str(c) for c in chs)
+        tr = aw.get("charge_translation")
+        if tr:
+            texts.append(str(tr))
+    for classified in classify_many(texts):
+        if classified and classified not in out:
+            out.append(classified)
+    return out
+
+def extract_list_value(value: Any) -> str:
+    if not value:
+        return ""
+    if isinstance(value, list):
+        if len(value) > 0:
+            return clean_text(str(value[0]))
+        return ""
+    value_str = str(value).strip()
+    if value_str.startswith('[') and value_str.endswith(']'):
+        value_str = value_str[1:-1].strip()
+        value_str = value_str.strip("'\"")
+        if ',' in value_str:
+            value_str = value_str.split(',')[0].strip("'\" ")
+        return clean_text(value_str)
+    return clean_text(value_str)
+
+def extract_distinguishing_marks(detail: Optional[Dict[str, Any]]) -> str:
+    if not detail:
+        return ""
+    marks = detail.get("distinguishing_marks")
+    if marks:
+        return clean_text(str(marks))
+    return ""
+
+
+def notice_self_url(item: Dict[str, Any]) -> str:
+    links = item.get("_links")
+    if isinstance(links, dict):
+        sl = links.get("self")
+        if isinstance(sl, dict):
+            return str(sl.get("href") or "").strip()
+        if isinstance(sl, str):
+            return sl.strip()
+    return ""
+
+def notice_dedup_key(item: Dict[str, Any], nurl: str, eid: str) -> str:
+    key = eid
+    if not key:
+        key = str(item.get("notice_id") or "").strip()
+    if not key:
+        key = nurl
+    if not key:
+        name = str(item.get('name', '')).strip()
+        forename = str(item.get('forename', '')).strip()
+        dob = str(item.get('date_of_birth', '')).strip()
+        sex = str(item.get('sex_id', '')).strip()
+        key = f"{name}|{forename}|{dob}|{sex}"
+    return key
+
+
+@timed("normalize_red")
+@cpu_stage
+def normalize_red(raw: Dict[str, Any], detail: Optional[Dict[str, Any]], filters: Optional[Filters] = None) -> Dict[str, str]:
+    name = clean_text(str(raw.get("name") or ""))
+    forename = clean_text(str(raw.get("forename") or ""))
+    
+    dob = str(raw.get("date_of_birth") or "").strip()
+    if not dob and detail:
+        dob = str(detail.get("date_of_birth") or "").strip()
+    age = extract_age_from_dob(dob)
+    
+    sex = clean_text(str(raw.get("sex_id") or raw.get("sex") or ""))
+    if not sex and detail:
+        sex = clean_text(str(detail.get("sex_id") or detail.get("sex") or ""))
+
+    place_of_birth = clean_text(str(raw.get("place_of_birth") or ""))
+    if not place_of_birth and detail:
+        place_of_birth = clean_text(str(detail.get("place_of_birth") or ""))
+
+    height = ""
+    weight = ""
+    hair_color = ""
+    eye_color = ""
+    
+    if detail and detail.get("height"):
+        height = clean_text(str(detail.get("height")))
+    elif raw.get("height"):
+        height = clean_text(str(raw.get("height")))
+    
+    if detail and detail.get("weight"):
+        weight = clean_text(str(detail.get("weight")))
+    elif raw.get("weight"):
+        weight = clean_text(str(raw.get("weight")))
+    
+    if detail and detail.get("hairs_id"):
+        hair_color = extract_list_value(detail.get("hairs_id"))
+    elif detail and detail.get("hair_color"):
+        hair_color = extract_list_value(detail.get("hair_color"))
+    elif raw.get("hairs_id"):
+        hair_color = extract_list_value(raw.get("hairs_id"))
+    elif raw.get("hair_color"):
+        hair_color = extract_list_value(raw.get("hair_color"))
+    
+    if detail and detail.get("eyes_colors_id"):
+        eye_color = extract_list_value(detail.get("eyes_colors_id"))
+    elif detail and detail.get("eye_color"):
+        eye_color = extract_list_value(detail.get("eye_color"))
+    elif raw.get("eyes_colors_id"):
+        eye_color = extract_list_value(raw.get("eyes_colors_id"))
+    elif raw.get("eye_color"):
+        eye_color = extract_list_value(raw.get("eye_color"))
+    
+    distinguishing_marks = extract_distinguishing_marks(detail)
+    
+    languages = ""
+    if detail and detail.get("languages_spoken_ids"):
+        langs = detail.get("languages_spoken_ids", [])
+        if isinstance(langs, list):
+            languages = ", ".join([clean_text(str(lang)) for lang in langs])
+    elif detail and detail.get("languages_spoken"):
+        langs = detail.get("languages_spoken", [])
+        if isinstance(langs, list):
+            languages = ", ".join([clean_text(str(lang)) for lang in langs])
+
+    nat = ""
+    nats = raw.get("nationalities")
+    if isinstance(nats, list) and nats:
+        nat_code = clean_text(str(nats[0]))
+        nat = convert_country_code(nat_code)
+    elif nats:
+        nat_code = clean_text(str(nats))
+        nat = convert_country_code(nat_code)
+    
+    if not nat and detail:
+        nats = detail.get("nationalities")
+        if isinstance(nats, list) and nats:
+            nat_code = clean_text(str(nats[0]))
+            nat = convert_country_code(nat_code)
+
+    entity_id = str(raw.get("entity_id") or raw.get("id") or "").strip()
+    notice_id = str(raw.get("notice_id") or "").strip()
+
+    url = ""
+    links = raw.get("_links")
+    if isinstance(links, dict):
+        sl = links.get("self")
+        if isinstance(sl, dict):
+            url = str(sl.get("href") or "").strip()
+        elif isinstance(sl, str):
+            url = sl.strip()
+
+    warrant_country = ""
+    for source in (raw, detail):
+        if isinstance(source, dict):
+            aws = source.get("arrest_warrants")
+            if isinstance(aws, list):
+                for aw in aws:
+                    if isinstance(aw, dict):
+                        wc = aw.get("issuing_country_id") or aw.get("issuing_country")
+                        if wc:
+                            wc_code = clean_text(str(wc))
+                            warrant_country = convert_country_code(wc_code)
+                            break
+        if warrant_country:
+            break
+
+    infractions: List[str] = []
+    infractions += extract_infractions(raw)
+    infractions += extract_infractions(detail)
+    seen: Set[str] = set()
+    infractions = [x for x in infractions if not (x in seen or seen.add(x))]
+    infractions_joined = " | ".join(infractions)
+
+    return {
+        "name": name, "forename": forename, "date_of_birth": dob, "age": age, "sex": sex,
+        "place_of_birth": place_of_birth, "nationality": nat, "height": height, "weight": weight,
+        "hair_color": hair_color, "eye_color": eye_color, "distinguishing_marks": distinguishing_marks,
+        "languages": languages, "entity_id": entity_id, "notice_id": notice_id,
+        "warrant_country": warrant_country, "url": url, "infractions": infractions_joined,
+    }
+
+
+# --- Notices jaunes ---
+YELLOW_FIELDNAMES = [
+    "name", "forename", "birth_name", "date_of_birth", "place_of_birth",
+    "country_of_birth", "nationality", "nationalities", "sex", "height",
+    "weight", "eyes_colors", "hairs", "distinguishing_marks", "date_of_event",
+    "place", "country", "languages", "father_forename", "mother_forename",
+    "mother_name", "age_min", "age_max", "entity_id", "url", "images_url", "thumbnail_url"
+]
+
+
+@timed("normalize_yellow")
+@cpu_stage
+def normalize_yellow(item: Dict[str, Any], detail: Optional[Dict[str, Any]] = None,
+                     filters: Optional[Filters] = None) -> Dict[str, Any]:
+    """Ligne d'une notice jaune ; nationalité, sexe et tranche d'âge viennent des filtres de la requête."""
+    nationality, age_min, age_max, sex_id = (filters or (None,) * 6)[:4]
+    source = dict(item, **detail) if detail else item
+    links = item.get("_links", {})
+    return {
+        "name": source.get("name", ""),
+        "forename": source.get("forename", ""),
+        "birth_name": source.get("birth_name", ""),
+        "date_of_birth": source.get("date_of_birth", ""),
+        "place_of_birth": source.get("place_of_birth", ""),
+        "country_of_birth": source.get("country_of_birth_id", ""),
+        "nationality": nationality or "",
+        "nationalities": ";".join(source.get("nationalities") or []),
+        "sex": sex_id or source.get("sex_id", ""),
+        "height": source.get("height", ""),
+        "weight": source.get("weight", ""),
+        "eyes_colors": ";".join(source.get("eyes_colors_id") or []),
+        "hairs": ";".join(source.get("hairs_id") or []),
+        "distinguishing_marks": source.get("distinguishing_marks", ""),
+        "date_of_event": source.get("date_of_event", ""),
+        "place": source.get("place", ""),
+        "country": source.get("country", ""),
+        "languages": ";".join(source.get("languages_spoken_ids") or []),
+        "father_forename": source.get("father_forename", ""),
+        "mother_forename": source.get("mother_forename", ""),
+        "mother_name": source.get("mother_name", ""),
+        "age_min": age_min if age_min is not None else "",
+        "age_max": age_max if age_max is not None else "",
+        "entity_id": str(item.get("entity_id") or item.get("id") or "").strip(),
+        "url": links.get("self", {}).get("href", ""),
+        "images_url": links.get("images", {}).get("href", ""),
+        "thumbnail_url": links.get("thumbnail", {}).get("href", ""),
+    }
+
+
+# --- Notices spéciales ONU (personnes) ---
+UN_FIELDNAMES = [
+    "name", "forename", "date_of_birth", "age", "sex", "place_of_birth", "nationality",
+    "nationalities", "un_reference", "un_reference_date", "summary", "entity_id", "url",
+]
+
+
+@timed("normalize_un")
+@cpu_stage
+def normalize_un(item: Dict[str, Any], detail: Optional[Dict[str, Any]] = None,
+                 filters: Optional[Filters] = None) -> Dict[str, Any]:
+    source = dict(item, **detail) if detail else item
+    codes = [clean_text(str(c)) for c in (source.get("nationalities") or [])]
+    dob = str(source.get("date_of_birth") or "").strip()
+    return {
+        "name": clean_text(str(source.get("name") or "")),
+        "forename": clean_text(str(source.get("forename") or "")),
+        "date_of_birth": dob,
+        "age": extract_age_from_dob(dob),
+        "sex": clean_text(str(source.get("sex_id") or "")),
+        "place_of_birth": clean_text(str(source.get("place_of_birth") or "")),
+        "nationality": convert_country_code(codes[0]) if codes else "",
+        "nationalities": ";".join(codes),
+        "un_reference": clean_text(str(source.get("un_reference") or "")),
+        "un_reference_date": str(source.get("un_reference_date") or "").strip(),
+        "summary": clean_text(str(source.get("summary") or "")),
+        "entity_id": str(item.get("entity_id") or item.get("id") or "").strip(),
+        "url": notice_self_url(item),
+    }
+
+
+# Pays parcourus (un pays = une partition racine)
+COUNTRIES = [
+    "AD", "AE", "AF", "AG", "AI", "AL", "AM", "AO", "AQ", "AR", "AS", "AT", "AU", "AW", "AX", "AZ",
+    "BA", "BB", "BD", "BE", "BF", "BG", "BH", "BI", "BJ", "BL", "BM", "BN", "BO", "BQ", "BR", "BS", "BT", "BV", "BW", "BY", "BZ",
+    "CA", "CC", "CD", "CF", "CG", "CH", "CI", "CK", "CL", "CM", "CN", "CO", "CR", "CU", "CV", "CW", "CX", "CY", "CZ",
+    "DE", "DJ", "DK", "DM", "DO", "DZ", "EC", "EE", "EG", "EH", "ER", "ES", "ET", "FI", "FJ", "FK", "FM", "FO", "FR",
+    "GA", "GB", "GD", "GE", "GF", "GG", "GH", "GI", "GL", "GM", "GN", "GP", "GQ", "GR", "GS", "GT", "GU", "GW", "GY",
+    "HK", "HM", "HN", "HR", "HT", "HU", "ID", "IE", "IL", "IM", "IN", "IO", "IQ", "IR", "IS", "IT",
+    "JE", "JM", "JO", "JP", "KE", "KG", "KH", "KI", "KM", "KN", "KP", "KR", "KW", "KY", "KZ",
+    "LA", "LB", "LC", "LI", "LK", "LR", "LS", "LT", "LU", "LV", "LY",
+    "MA", "MC", "MD", "ME", "MF", "MG", "MH", "MK", "ML", "MM", "MN", "MO", "MP", "MQ", "MR", "MS", "MT", "MU", "MV", "MW", "MX", "MY", "MZ",
+    "NA", "NC", "NE", "NF", "NG", "NI", "NL", "NO", "NP", "NR", "NU", "NZ",
+    "OM", "PA", "PE", "PF", "PG", "PH", "PK", "PL", "PM", "PN", "PR", "PS", "PT", "PW", "PY",
+    "QA", "RE", "RO", "RS", "RU", "RW", "SA", "SB", "SC", "SD", "SE", "SG", "SH", "SI", "SJ", "SK", "SL", "SM", "SN", "SO", "SR", "SS", "ST", "SV", "SX", "SY", "SZ",
+    "TC", "TD", "TF", "TG", "TH", "TJ", "TK", "TL", "TM", "TN", "TO", "TR", "TT", "TV", "TW", "TZ",
+    "UA", "UG", "UM", "US", "UY", "UZ", "VA", "VC", "VE", "VG", "VI", "VN", "VU", "WF", "WS", "YE", "YT", "ZA", "ZM", "ZW"
+]
+
+RED_FIELDNAMES = [
+    "name", "forename", "date_of_birth", "age", "sex", "place_of_birth", "nationality",
+    "height", "weight", "hair_color", "eye_color", "distinguishing_marks", "languages",
+    "entity_id", "notice_id", "warrant_country", "url", "infractions"
+]
+
+# Schéma typé des sorties --format parquet|arrow (même ordre que RED_FIELDNAMES)
+RED_TYPED_COLUMNS = [
+    ("name", "string"), ("forename", "string"), ("date_of_birth", "date"), ("age", "int"),
+    ("sex", "dict"), ("place_of_birth", "string"), ("nationality", "dict"),
+    ("height", "float"), ("weight", "float"), ("hair_color", "dict"), ("eye_color", "dict"),
+    ("distinguishing_marks", "string"), ("languages", "list:,"), ("entity_id", "string"),
+    ("notice_id", "string"), ("warrant_country", "dict"), ("url", "string"), ("infractions", "list:|"),
+]
+
+
+Mapper = Callable[[Dict[str, Any], Optional[Dict[str, Any]], Optional[Filters]], Dict[str, Any]]
+
+
+class NoticeType:
+    """Description d'un type de notice pour le moteur de collecte."""
+
+    def __init__(self, name: str, api_url: str, referer: str, fieldnames: List[str], mapper: Mapper,
+                 fetch_details: bool = True, split_dims: Tuple[str, ...] = ("sex", "age", "forename"),
+                 typed_columns: Optional[List[Tuple[str, str]]] = None,
+                 list_fields: Optional[Tuple[str, ...]] = None,
+                 root_dims: Tuple[str, ...] = ("nationality",)):
+        self.name = name
+        self.api_url = api_url
+        self.referer = referer
+        self.fieldnames = fieldnames
+        self.mapper = mapper
+        # Les notices jaunes de liste portent déjà tous leurs champs : pas de détail
+        self.fetch_details = fetch_details
+        # Dimensions de découpage acceptées par le point d'accès, dans l'ordre d'essai
+        self.split_dims = split_dims
+        self.typed_columns = typed_columns
+        # Champs de la notice de liste gardés en file d'attente (None = notice entière)
+        self.list_fields = list_fields
+        # Dimensions des partitions racines, une par pays (nationalité, pays de naissance)
+        self.root_dims = root_dims
+
+
+NOTICE_TYPES: Dict[str, NoticeType] = {
+    "red": NoticeType("red", f"{API_BASE}/red", "https://www.interpol.int/",
+                      RED_FIELDNAMES, normalize_red, typed_columns=RED_TYPED_COLUMNS, list_fields=RED_LIST_FIELDS),
+    "yellow": NoticeType("yellow", f"{API_BASE}/yellow", "https://www.interpol.int/en/How-we-work/Notices/View-Yellow-Notices",
+                         YELLOW_FIELDNAMES, normalize_yellow, fetch_details=False,
+                         root_dims=("nationality", "country_of_birth")),
+    "un": NoticeType("un", f"{API_BASE}/un/persons", "https://www.interpol.int/How-we-work/Notices/View-UN-Notices",
+                     UN_FIELDNAMES, normalize_un, split_dims=("forename",)),
+}
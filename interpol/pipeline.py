@@ -0,0 +1,109 @@
+"""
+Pipeline producteur/consommateur entre la collecte des tâches (Phases 0 & 1)
+et le téléchargement des détails (Phase 2).
+"""
+
+import queue
+import threading
+from typing import Any, Iterable, Iterator, Optional, Set
+
+from interpol.records import dedup_digest
+
+
+class TaskFeed:
+    """File de tâches bornée : la collecte y pousse, les workers de détail y puisent.
+
+    Avec maxsize > 0, put() bloque quand les consommateurs sont en retard
+    (contre-pression), ce qui borne la mémoire des tâches en attente.
+    """
+
+    _END = object()
+
+    def __init__(self, maxsize: int = 0):
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self.produced = 0
+        self.closed = False
+
+    def put(self, task: Any) -> None:
+        self._queue.put(task)
+        with self._lock:
+            self.produced += 1
+
+    def put_many(self, tasks: Iterable[Any]) -> None:
+        for task in tasks:
+            self.put(task)
+
+    def close(self) -> None:
+        """Signale la fin de la production (à appeler une seule fois)."""
+        self.closed = True
+        self._queue.put(self._END)
+
+    def _unwrap(self, item: Any) -> Optional[Any]:
+        if item is self._END:
+            # Remis en file pour que chaque consommateur voie la fin
+            self._queue.put(self._END)
+            return None
+        return item
+
+    def get(self) -> Optional[Any]:
+        """Prochaine tâche, en bloquant ; None quand la file est close et vide."""
+        return self._unwrap(self._queue.get())
+
+    def get_nowait(self) -> Optional[Any]:
+        """Comme get() sans bloquer ; lève queue.Empty si rien n'est encore disponible."""
+        return self._unwrap(self._queue.get_nowait())
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            task = self.get()
+            if task is None:
+                return
+            yield task
+
+
+class SeenIds:
+    """Ensemble d'identifiants déjà vus, sûr entre threads.
+
+    Seule l'empreinte 64 bits de chaque clé est gardée (largeur fixe, quelle
+    que soit la longueur de la clé de repli).
+    """
+
+    def __init__(self) -> None:
+        self._ids: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def add_new(self, key: str) -> bool:
+        """Ajoute la clé et retourne True si elle n'avait jamais été vue."""
+        digest = dedup_digest(key)
+        with self._lock:
+            if digest in self._ids:
+                return False
+            self._ids.add(digest)
+            return True
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        digest = dedup_digest(key)
+        with self._lock:
+            return digest in self._ids
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids)
+
+    def update(self, keys: Iterable[str]) -> None:
+        digests = [dedup_digest(k) for k in keys]
+        with self._lock:
+            self._ids.update(digests)
+
+    def digests(self) -> Iterable[int]:
+        with self._lock:
+            return list(self._ids)
+
+    def close(self) -> None:
+        """Rien à libérer (même interface que les index sur disque, interpol/dedup.py)."""
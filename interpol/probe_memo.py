@@ -0,0 +1,118 @@
+"""
+Mémo des sondes de total du planificateur de partitions
+- le total de chaque combinaison de filtres n'est demandé qu'une fois
+- la page 1 récupérée pour lire le total est gardée et resservie comme
+  première page de données (au lieu d'être re-téléchargée)
+- option « comptage seul » : sonde avec resultPerPage=1 quand la partition
+  sera de toute façon découpée
+- seul un total lu dans une vraie réponse de liste est mémorisé : une sonde
+  en échec (réponse vide, erreur) lève ProbeError et sera refaite
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+PageFetcher = Callable[[int], Dict[str, Any]]
+
+
+class ProbeError(ValueError):
+    """Réponse de sonde sans champ `total` (requête en échec ou réponse inattendue)."""
+
+
+def has_total(data: Any) -> bool:
+    """Vrai si `data` est une réponse de liste qui annonce son total."""
+    return isinstance(data, dict) and "total" in data
+
+
+def total_of(data: Dict[str, Any]) -> int:
+    """Champ `total` d'une réponse de liste, ou à défaut le nombre de notices reçues."""
+    if not data:
+        return 0
+    try:
+        total = int(data.get("total", 0))
+    except (TypeError, ValueError):
+        total = 0
+    if total <= 0:
+        emb = data.get("_embedded", {})
+        notices = emb.get("notices", []) if isinstance(emb, dict) else []
+        total = len(notices) if isinstance(notices, list) else 0
+    return total
+
+
+class ProbeMemo:
+    """Totaux et pages 1 par tuple de filtres ; sûr entre threads."""
+
+    def __init__(self) -> None:
+        self._totals: Dict[Hashable, int] = {}
+        self._first_pages: Dict[Hashable, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"probes": 0, "count_probes": 0, "memo_hits": 0, "pages_reused": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def known_total(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            return self._totals.get(key)
+
+    def total(self, key: Hashable, fetch_page: PageFetcher,
+              fetch_count: Optional[Callable[[], Dict[str, Any]]] = None) -> int:
+        """Total pour `key`, sondé au plus une fois.
+
+        Avec `fetch_count` (requête resultPerPage=1), seul le total est lu ;
+        sinon la page 1 complète est gardée pour first_page(). Lève
+        ProbeError, sans rien mémoriser, si la réponse n'annonce pas de total.
+        """
+        with self._lock:
+            known = self._totals.get(key)
+        if known is not None:
+            self._count("memo_hits")
+            return known
+        if fetch_count is not None:
+            data = fetch_count()
+            page = None
+            self._count("count_probes")
+        else:
+            data = page = fetch_page(1)
+            self._count("probes")
+        if not has_total(data):
+            raise ProbeError(f"sonde sans total pour {key}")
+        total = total_of(data)
+        with self._lock:
+            self._totals[key] = total
+            # Une page vide n'a pas d'intérêt ; inutile de garder celles d'une
+            # partition qui sera découpée, mais on ne le sait qu'après coup.
+            if page and total > 0:
+                self._first_pages[key] = page
+        return total
+
+    def recount(self, key: Hashable, fetch_count: Callable[[], Dict[str, Any]]) -> int:
+        """Sonde de comptage toujours refaite (vérification) ; le mémo est mis à jour."""
+        data = fetch_count()
+        self._count("count_probes")
+        if not has_total(data):
+            raise ProbeError(f"sonde sans total pour {key}")
+        total = total_of(data)
+        with self._lock:
+            self._totals[key] = total
+        return total
+
+    def first_page(self, key: Hashable, fetch_page: PageFetcher) -> Dict[str, Any]:
+        """Page 1 déjà récupérée par la sonde (consommée une seule fois), sinon téléchargée."""
+        with self._lock:
+            page = self._first_pages.pop(key, None)
+        if page is not None:
+            self._count("pages_reused")
+            return page
+        return fetch_page(1)
+
+    def discard_page(self, key: Hashable) -> None:
+        """Libère la page 1 d'une partition découpée (elle ne sera pas lue)."""
+        with self._lock:
+            self._first_pages.pop(key, None)
+
+    def describe(self) -> str:
+        s = self.stats
+        return (f"{s['probes']} sondes page 1, {s['count_probes']} sondes de comptage, "
+                f"{s['memo_hits']} totaux resservis, {s['pages_reused']} pages 1 réutilisées")
@@ -0,0 +1,244 @@
+"""
+Profilage intégré (--profile) : le temps d'un crawl part-il dans le réseau ou dans le CPU ?
+- échantillonneur de piles : toutes les `interval` s, la pile de chaque thread
+  (sys._current_frames) ; attentes réseau et calcul y apparaissent ensemble,
+  en temps horloge → fichier « folded » (`thread;f1;f2 N`, une pile par
+  ligne) lu par flamegraph.pl, speedscope ou inferno
+- cProfile sur l'étape CPU : les fonctions décorées par @cpu_stage
+  (normalize_*) sont profilées dans chaque thread, puis les profils fusionnés
+  → .pstats (snakeviz, gprof2dot) et rapport des N fonctions les plus coûteuses ;
+  à partir de Python 3.12, cProfile ne peut plus être actif dans plusieurs
+  threads à la fois : un seul profil couvre alors tout le processus
+- intervalles horloge des attentes d'E/S (requêtes HTTP, limiteur de débit)
+  → .trace.json (format Chrome trace : Perfetto, chrome://tracing) et totaux
+Désactivé par défaut : tant que `PROFILER.enabled` est faux, @cpu_stage et
+span() ne coûtent qu'un test de drapeau.
+"""
+
+import cProfile
+import contextlib
+import functools
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SAMPLE_INTERVAL = 0.005
+# Au-delà, les intervalles ne sont plus gardés pour la trace (les totaux, si)
+MAX_SPANS = 200_000
+
+# « ThreadPoolExecutor-0_12 » → « ThreadPoolExecutor-0 » : un seul nœud par pool
+_THREAD_SUFFIX = re.compile(r"_\d+$")
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def _frame_label(code: Any) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+
+
+class Profiler:
+    """Échantillonneur de piles + cProfile de l'étape CPU + intervalles d'E/S."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.interval = SAMPLE_INTERVAL
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles: List[cProfile.Profile] = []
+        # Python >= 3.12 : un profil cProfile couvre tous les threads (sys.monitoring)
+        self._shared: Optional[cProfile.Profile] = None
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._spans: List[Tuple[str, int, float, float]] = []
+        self._span_totals: Dict[str, List[float]] = {}
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self.started = 0.0
+        self.wall = 0.0
+
+    # --- démarrage / arrêt ---
+    def start(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.enabled = True
+        if sys.version_info >= (3, 12):
+            self._shared = cProfile.Profile()
+            self._shared.enable()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profil-echantillons", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=5)
+        if self._shared is not None:
+            self._shared.disable()
+        self.wall = time.perf_counter() - self.started
+
+    # --- échantillonnage des piles ---
+    def _sample_loop(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: _THREAD_SUFFIX.sub("", t.name) for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                codes.reverse()
+                self._stacks[(names.get(tid, str(tid)), tuple(codes))] += 1
+            self._samples += 1
+
+    # --- étape CPU ---
+    def cpu_stage(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Décorateur : appels profilés par cProfile (profil propre à chaque thread)."""
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not self.enabled or self._shared is not None:
+                return fn(*args, **kwargs)
+            local = self._local
+            if getattr(local, "active", False):
+                return fn(*args, **kwargs)
+            prof = getattr(local, "profile", None)
+            if prof is None:
+                prof = local.profile = cProfile.Profile()
+                with self._lock:
+                    self._profiles.append(prof)
+            local.active = True
+            prof.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof.disable()
+                local.active = False
+        return wrapper
+
+    # --- attentes d'E/S ---
+    def span(self, name: str) -> Any:
+        """Contexte chronométré (horloge murale) ; utilisable autour d'un await."""
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def record(self, name: str, seconds: float) -> None:
+        """Intervalle terminé à l'instant, d'une durée de `seconds`."""
+        if not self.enabled:
+            return
+        end = time.perf_counter()
+        with self._lock:
+            total = self._span_totals.setdefault(name, [0, 0.0])
+            total[0] += 1
+            total[1] += seconds
+            if len(self._spans) < MAX_SPANS:
+                self._spans.append((name, threading.get_ident(), end - seconds, end))
+
+    # --- sorties ---
+    def folded(self) -> List[str]:
+        """Piles au format « folded » (flamegraph.pl, speedscope), triées par fréquence."""
+        labels: Dict[Any, str] = {}
+        lines = []
+        for (thread, codes), n in self._stacks.most_common():
+            frames = [thread] + [labels.get(c) or labels.setdefault(c, _frame_label(c)) for c in codes]
+            lines.append(f"{';'.join(f.replace(';', ',') for f in frames)} {n}")
+        return lines
+
+    def stats(self) -> Optional[pstats.Stats]:
+        profiles = [self._shared] if self._shared is not None else list(self._profiles)
+        stats = None
+        for prof in profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(prof)
+                else:
+                    stats.add(prof)
+            except TypeError:
+                # Profil jamais activé : rien à fusionner
+                continue
+        return stats
+
+    def trace_events(self) -> List[Dict[str, Any]]:
+        """Intervalles en événements asynchrones Chrome trace (b/e) : ils peuvent se chevaucher."""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        for i, (name, tid, start, end) in enumerate(self._spans):
+            common = {"name": name, "cat": "io", "id": i, "pid": pid, "tid": tid}
+            events.append(dict(common, ph="b", ts=round((start - self.started) * 1e6, 1)))
+            events.append(dict(common, ph="e", ts=round((end - self.started) * 1e6, 1)))
+        return events
+
+    def report(self, top: int = 25, stats: Optional[pstats.Stats] = None) -> str:
+        out = [f"[Profil] {self.wall:.1f}s d'horloge, {self._samples} échantillons "
+               f"(toutes les {self.interval * 1000:g} ms)"]
+        if self._span_totals:
+            out.append("Attentes d'E/S (cumul, attentes simultanées additionnées) :")
+            for name, (count, total) in sorted(self._span_totals.items(), key=lambda kv: -kv[1][1]):
+                out.append(f"  {name:<28}{int(count):>8} ×  {total:>9.2f}s  ({1000 * total / count:.1f} ms en moyenne)")
+        leaves: Counter = Counter()
+        for (thread, codes), n in self._stacks.items():
+            if codes:
+                leaves[_frame_label(codes[-1])] += n
+        if leaves:
+            samples = sum(leaves.values())
+            out.append(f"Fonctions en cours (échantillons, tous threads, top {top}) :")
+            for label, n in leaves.most_common(top):
+                out.append(f"  {100 * n / samples:6.1f}%  {label}")
+        if stats is not None:
+            buf = io.StringIO()
+            stats.stream = buf
+            stats.sort_stats("tottime").print_stats(top)
+            body = buf.getvalue().strip().splitlines()
+            out.append(f"Étape CPU (cProfile, temps propre, top {top}) :")
+            out.extend(f"  {line}" for line in body if line.strip())
+        return "\n".join(out)
+
+    def write(self, prefix: str, top: int = 25) -> List[str]:
+        """Arrête le profilage et écrit <prefix>.folded, .pstats, .trace.json ; affiche le rapport."""
+        self.stop()
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        written = []
+        with open(f"{prefix}.folded", "w", encoding="utf-8") as f:
+            f.write("\n".join(self.folded()) + "\n")
+        written.append(f"{prefix}.folded")
+        stats = self.stats()
+        if stats is not None:
+            stats.dump_stats(f"{prefix}.pstats")
+            written.append(f"{prefix}.pstats")
+        with open(f"{prefix}.trace.json", "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+        written.append(f"{prefix}.trace.json")
+        report = self.report(top, stats)
+        with open(f"{prefix}.txt", "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        written.append(f"{prefix}.txt")
+        print(report)
+        return written
+
+
+# Profileur du processus, partagé par tous les modules
+PROFILER = Profiler()
+cpu_stage = PROFILER.cpu_stage
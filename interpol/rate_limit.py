@@ -0,0 +1,322 @@
+"""
+Limitation de débit commune à tous les appels HTTP
+- TokenBucket : débit moyen (req/s) avec rafale autorisée
+- AdaptiveConcurrency : contrôleur AIMD du nombre de requêtes en vol
+- RateLimiter : les deux réunis, utilisé sous http_get_json
+- call() / acall() : une requête sous le limiteur, rejouée (nombre borné de
+  tentatives, attente exponentielle, au moins Retry-After) après un 429, un
+  5xx ou un timeout, au lieu d'être perdue
+"""
+
+import asyncio
+import random
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Iterator, Optional, TypeVar
+from urllib.error import HTTPError, URLError
+
+from interpol.metrics import METRICS
+from interpol.profiling import PROFILER
+
+T = TypeVar("T")
+
+# Tentatives supplémentaires après une erreur de saturation, et attente de base (doublée à chaque fois)
+RETRIES = 4
+RETRY_BACKOFF = 0.5
+RETRY_BACKOFF_MAX = 30.0
+
+
+class TokenBucket:
+    """Seau à jetons partagé entre threads : `rate` jetons/s, au plus `burst` en réserve."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Réserve `tokens` jetons et retourne l'attente nécessaire (s) avant de les utiliser.
+
+        Le solde peut devenir négatif : les appelants suivants attendent
+        d'autant plus, ce qui garde un ordre FIFO sans file explicite.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait_s = max(0.0, -self._tokens / self.rate)
+            return max(wait_s, self._paused_until - now)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        wait_s = self.reserve(tokens)
+        if wait_s > 0:
+            time.sleep(wait_s)
+
+    def pause(self, seconds: float) -> None:
+        """Suspend toute émission pendant `seconds` (ex. en-tête Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def set_rate(self, rate: float, burst: Optional[float] = None) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+            if burst is not None:
+                self.burst = float(burst)
+            self._tokens = min(self._tokens, self.burst)
+
+
+class AdaptiveConcurrency:
+    """Contrôleur AIMD du nombre de requêtes simultanées.
+
+    - démarrage rapide : +1 par succès (la limite double à chaque « fenêtre »)
+      jusqu'au premier signal de saturation
+    - ensuite hausse additive (+1 par fenêtre de `limit` succès rapides)
+    - baisse multiplicative sur 429 ou latence dégradée (× `backoff`), plus
+      douce sur 5xx ou timeout (× `error_backoff`) : une panne isolée ne doit
+      pas diviser le débit par deux
+    - au plus une baisse par période de refroidissement (`cooldown`)
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64,
+                 backoff: float = 0.5, latency_tolerance: float = 2.5, cooldown: float = 1.0,
+                 error_backoff: float = 0.9):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.backoff = backoff
+        self.error_backoff = error_backoff
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.latency_floor: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.slow_start = True
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, ok: bool, latency: float, throttled: bool = True) -> bool:
+        """Fin d'une requête ; `throttled` : échec signalé par un 429 (sinon 5xx ou timeout).
+
+        Retourne True si la limite vient d'être baissée.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            decreased = False
+            if ok:
+                self.successes += 1
+                self._observe_latency(latency)
+                if self._latency_healthy(latency):
+                    step = 1.0 if self.slow_start else 1.0 / self.limit
+                    self.limit = min(self.maximum, self.limit + step)
+                else:
+                    decreased = self._decrease(self.backoff)
+            else:
+                self.failures += 1
+                decreased = self._decrease(self.backoff if throttled else self.error_backoff)
+            self._cond.notify_all()
+            return decreased
+
+    def _observe_latency(self, latency: float) -> None:
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = 0.9 * self.latency_ewma + 0.1 * latency
+        # Plancher : meilleure latence moyenne observée, qui remonte lentement
+        # pour suivre un serveur dont le temps de réponse de base évolue.
+        if self.latency_floor is None or self.latency_ewma < self.latency_floor:
+            self.latency_floor = self.latency_ewma
+        else:
+            self.latency_floor *= 1.001
+
+    def _latency_healthy(self, latency: float) -> bool:
+        if self.latency_floor is None or self.successes < 10:
+            return True
+        return latency <= self.latency_floor * self.latency_tolerance
+
+    def _decrease(self, factor: float) -> bool:
+        # Une seule baisse par période de refroidissement : les requêtes déjà
+        # en vol au moment de la saturation ne doivent pas la compter N fois.
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return False
+        self._last_decrease = now
+        self.slow_start = False
+        self.limit = max(float(self.minimum), self.limit * factor)
+        return True
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """Vrai pour les erreurs qui signalent un serveur saturé (429, 5xx, timeout)."""
+    if isinstance(exc, HTTPError):
+        return exc.code == 429 or exc.code >= 500
+    if isinstance(exc, (socket.timeout, TimeoutError, ConnectionError)):
+        return True
+    if isinstance(exc, URLError):
+        return isinstance(exc.reason, (socket.timeout, TimeoutError, ConnectionError))
+    return False
+
+
+def retry_after_seconds(exc: BaseException) -> float:
+    if isinstance(exc, HTTPError) and exc.headers is not None:
+        value = exc.headers.get("Retry-After")
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return 0.0
+    return 0.0
+
+
+def overload_reason(exc: BaseException) -> str:
+    """Étiquette courte d'une erreur de saturation : 429, 5xx ou timeout."""
+    if isinstance(exc, HTTPError):
+        return "429" if exc.code == 429 else "5xx"
+    return "timeout"
+
+
+def retry_delay(attempt: int, exc: BaseException, base: float = RETRY_BACKOFF,
+                cap: float = RETRY_BACKOFF_MAX) -> float:
+    """Attente avant de rejouer la tentative `attempt` (0, 1…) : exponentielle avec gigue, au moins Retry-After."""
+    delay = min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.0)
+    return max(delay, retry_after_seconds(exc))
+
+
+class RateLimiter:
+    """Couche unique de limitation : seau à jetons + concurrence adaptative."""
+
+    def __init__(self, rps: float, burst: Optional[float] = None, initial_concurrency: int = 4,
+                 min_concurrency: int = 1, max_concurrency: int = 64, retries: int = RETRIES):
+        self.bucket = TokenBucket(rps, burst)
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, min_concurrency, max_concurrency)
+        self.retries = max(0, retries)
+        self.retried = 0
+        self._async_waiters: Deque["asyncio.Future[None]"] = deque()
+
+    def _release(self, exc: Optional[BaseException], start: float) -> None:
+        overload = exc is not None and is_overload_error(exc)
+        throttled = overload and isinstance(exc, HTTPError) and exc.code == 429
+        decreased = self.concurrency.release(not overload, time.monotonic() - start, throttled)
+        # Retry-After suspend tout le seau, mais une seule fois par baisse : les
+        # autres 429 de la même fenêtre n'attendent que pour leur propre reprise
+        if throttled and decreased:
+            pause = retry_after_seconds(exc)
+            if pause:
+                self.bucket.pause(pause)
+
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        with PROFILER.span("attente limiteur"):
+            self.concurrency.acquire()
+            self.bucket.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self._release(e, start)
+            raise
+        self._release(None, start)
+
+    @asynccontextmanager
+    async def arequest(self) -> AsyncIterator[None]:
+        """Équivalent de request() pour asyncio : attend sans bloquer la boucle."""
+        with PROFILER.span("attente limiteur"):
+            while not self.concurrency.try_acquire():
+                fut = asyncio.get_running_loop().create_future()
+                self._async_waiters.append(fut)
+                try:
+                    # Délai de garde : une place libérée par un thread ne réveille pas la boucle
+                    await asyncio.wait_for(fut, 0.1)
+                except asyncio.TimeoutError:
+                    pass
+            wait_s = self.bucket.reserve()
+            if wait_s > 0:
+                await asyncio.sleep(wait_s)
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self._release(e, start)
+            self._wake_async()
+            raise
+        self._release(None, start)
+        self._wake_async()
+
+    def _should_retry(self, attempt: int, exc: BaseException) -> bool:
+        if attempt >= self.retries or not is_overload_error(exc):
+            return False
+        self.retried += 1
+        METRICS.inc("interpol_request_retries_total", reason=overload_reason(exc))
+        return True
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """fn(*args, **kwargs) sous le limiteur ; rejouée après un 429, un 5xx ou un timeout.
+
+        Chaque échec compte pour le contrôleur AIMD (la concurrence baisse) ;
+        au-delà de `retries` tentatives supplémentaires, l'erreur remonte.
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.request():
+                    return fn(*args, **kwargs)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                with PROFILER.span("attente reprise"):
+                    time.sleep(retry_delay(attempt, e))
+            attempt += 1
+
+    async def acall(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Équivalent de call() pour une coroutine."""
+        attempt = 0
+        while True:
+            try:
+                async with self.arequest():
+                    return await fn(*args, **kwargs)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                with PROFILER.span("attente reprise"):
+                    await asyncio.sleep(retry_delay(attempt, e))
+            attempt += 1
+
+    def _wake_async(self) -> None:
+        while self._async_waiters:
+            fut = self._async_waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+
+    def describe(self) -> str:
+        c = self.concurrency
+        retried = f", {self.retried} reprises" if self.retried else ""
+        return f"{self.bucket.rate:g} req/s, concurrence {int(c.limit)}/{c.maximum}{retried}"
@@ -0,0 +1,49 @@
+"""
+Représentation compacte des tâches, pour borner la mémoire
+- compact_item : la notice de liste gardée en file est réduite aux champs
+  lus par la normalisation (plus d'arbre `_links` complet)
+- codes pays / sexe internés : une seule chaîne par code pour tout le run
+- dedup_digest : clé de dédoublonnage à largeur fixe (empreinte 64 bits)
+  au lieu de longues clés de repli `nom|prénom|naissance|sexe`
+"""
+
+import hashlib
+import sys
+from typing import Any, Dict, Sequence
+
+# Champs d'une notice rouge de liste lus par normalize_red (et par l'empreinte
+# du mode incrémental) ; le reste de la notice de liste n'est pas gardé.
+RED_LIST_FIELDS = (
+    "entity_id", "id", "notice_id", "name", "forename", "date_of_birth", "sex_id", "sex",
+    "place_of_birth", "height", "weight", "hairs_id", "hair_color", "eyes_colors_id", "eye_color",
+    "nationalities", "arrest_warrants",
+)
+# Codes courts répétés d'une notice à l'autre (pays, sexe, couleurs…)
+CODE_FIELDS = ("sex_id", "sex", "nationalities", "hairs_id", "eyes_colors_id")
+
+
+def intern_code(value: Any) -> Any:
+    """Chaîne (ou liste de chaînes) internée ; les autres valeurs sont rendues telles quelles."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [sys.intern(v) if isinstance(v, str) else v for v in value]
+    return value
+
+
+def dedup_digest(key: str) -> int:
+    """Empreinte 64 bits d'une clé de dédoublonnage (collision négligeable à l'échelle d'Interpol)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def compact_item(item: Dict[str, Any], nurl: str = "", fields: Sequence[str] = RED_LIST_FIELDS) -> Dict[str, Any]:
+    """Notice de liste réduite à `fields`, codes internés et lien `self` seul (sous forme de chaîne)."""
+    out = {}
+    for name in fields:
+        value = item.get(name)
+        if value is not None and value != "":
+            out[name] = intern_code(value) if name in CODE_FIELDS else value
+    if nurl:
+        out["_links"] = {"self": nurl}
+    return out
+
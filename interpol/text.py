@@ -0,0 +1,72 @@
+"""
+Nettoyage des champs texte des notices (clean_text)
+Même résultat que l'ancien BeautifulSoup(...).get_text(separator=" ") suivi
+de la normalisation des espaces, mais sans construire d'arbre :
+- texte sans balise (l'immense majorité) : entités décodées (html.unescape),
+  espaces normalisés
+- balises simples : découpeur en flux sur html.parser (le même tokenizer
+  que bs4), chaque balise valant un séparateur, entités décodées au passage
+- commentaires, CDATA, déclarations, contenus bruts <script>/<style>… :
+  repli sur BeautifulSoup, importé seulement à ce moment-là
+tests/test_text.py compare les deux chemins sur un corpus de cas limites.
+"""
+
+import html
+from html.parser import HTMLParser
+from typing import List
+
+from interpol.metrics import timed
+
+# Constructions dont le rendu bs4 n'est pas reproduit par le découpeur
+# (commentaires, CDATA, déclarations, contenus bruts script/style…)
+_FALLBACK_MARKERS = ("<!", "<?", "<script", "<style", "<textarea", "<title", "<xmp", "<plaintext")
+
+
+class _TextCollector(HTMLParser):
+    """Accumule le texte ; chaque balise ouvrante/fermante sépare deux morceaux."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+
+    def handle_data(self, data: str) -> None:
+        self.parts.append(data)
+
+    def handle_starttag(self, tag, attrs) -> None:
+        self.parts.append(" ")
+
+    def handle_endtag(self, tag) -> None:
+        self.parts.append(" ")
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        self.parts.append(" ")
+
+
+def clean_text_bs4(text: str) -> str:
+    """Implémentation de référence (BeautifulSoup), utilisée en repli."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(f"<div>{text}</div>", "html.parser")
+    return " ".join(soup.get_text(separator=" ").split())
+
+
+def strip_tags(text: str) -> str:
+    collector = _TextCollector()
+    collector.feed(f"<div>{text}</div>")
+    collector.close()
+    return " ".join("".join(collector.parts).split())
+
+
+@timed("clean_text")
+def clean_text(text: str) -> str:
+    if not text:
+        return ""
+    if "<" not in text:
+        if "&" in text:
+            text = html.unescape(text)
+        return " ".join(text.split())
+    lowered = text.lower()
+    if any(marker in lowered for marker in _FALLBACK_MARKERS):
+        return clean_text_bs4(text)
+    return strip_tags(text)
+
@@ -0,0 +1,191 @@
+"""
+Écriture des lignes normalisées au fil de l'eau.
+- CsvRowWriter : CSV, une ligne à la fois
+- ColumnarRowWriter : Parquet / Arrow IPC typés, par groupes de lignes (pyarrow)
+"""
+
+import csv
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CsvRowWriter:
+    """Écrit les lignes dans un CSV dès qu'elles arrivent (sûr entre threads)."""
+
+    def __init__(self, path: str, fieldnames: List[str], encoding: str = "utf-8-sig",
+                 flush_every: int = 500):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.flush_every = flush_every
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "w", encoding=encoding, newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+        self._writer.writeheader()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._writer.writerow({k: row.get(k, "") for k in self.fieldnames})
+            self.count += 1
+            if self.count % self.flush_every == 0:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "CsvRowWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# --- Sorties colonnes (Parquet / Arrow IPC), pyarrow optionnel ---
+# Type d'une colonne : "string", "dict" (chaîne encodée en dictionnaire),
+# "int", "float", "date" (AAAA/MM/JJ ou AAAA-MM-JJ) ou "list:<séparateur>".
+ColumnSpec = Tuple[str, str]
+
+
+def _to_int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: str) -> Optional[float]:
+    try:
+        return float(str(value).replace(",", "."))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_date(value: str) -> Optional[date]:
+    parts = str(value or "").strip().replace("-", "/").split("/")
+    if len(parts) != 3:
+        return None  # date partielle (année seule…) : gardée dans la colonne brute
+    try:
+        return date(int(parts[0]), int(parts[1]), int(parts[2]))
+    except ValueError:
+        return None
+
+
+def _to_list(value: str, sep: str) -> List[str]:
+    return [v.strip() for v in str(value or "").split(sep) if v.strip()]
+
+
+class ColumnarRowWriter:
+    """Écrit les lignes en Parquet ou Arrow IPC, typées, par groupes de lignes (sûr entre threads).
+
+    Les lignes normalisées (chaînes) sont converties selon `columns` ; une
+    colonne "date" garde aussi sa valeur texte dans `<nom>_raw`.
+    """
+
+    def __init__(self, path: str, columns: List[ColumnSpec], fmt: str = "parquet",
+                 row_group_size: int = 10000):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise RuntimeError(f"--format {fmt} nécessite pyarrow (pip install pyarrow)") from None
+        self._pa = pa
+        self.path = path
+        self.fmt = fmt
+        self.columns = columns
+        self.row_group_size = row_group_size
+        self.count = 0
+        self._lock = threading.Lock()
+        self._buffer: List[Dict[str, Any]] = []
+        # Colonnes "dict" : valeur → code, partagé par tous les groupes de lignes
+        self._dictionaries: Dict[str, Dict[str, int]] = {}
+        self.schema = pa.schema(self._fields())
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        elif fmt == "arrow":
+            # Le fichier IPC refuse un dictionnaire remplacé d'un lot à l'autre ; étendu, il part en delta
+            self._writer = pa.ipc.new_file(path, self.schema,
+                                           options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+        else:
+            raise ValueError(f"format inconnu: {fmt}")
+
+    def _fields(self) -> List[Any]:
+        pa = self._pa
+        types = {"string": pa.string(), "dict": pa.dictionary(pa.int32(), pa.string()),
+                 "int": pa.int16(), "float": pa.float32(), "date": pa.date32()}
+        fields = []
+        for name, kind in self.columns:
+            if kind.startswith("list:"):
+                fields.append(pa.field(name, pa.list_(pa.string())))
+            else:
+                fields.append(pa.field(name, types[kind]))
+            if kind == "date":
+                fields.append(pa.field(f"{name}_raw", pa.string()))
+        return fields
+
+    def _column(self, name: str, kind: str, rows: List[Dict[str, Any]]) -> List[Any]:
+        values = [row.get(name, "") for row in rows]
+        if kind in ("string", "dict"):
+            return [str(v) if v not in (None, "") else None for v in values]
+        if kind == "int":
+            return [_to_int(v) for v in values]
+        if kind == "float":
+            return [_to_float(v) for v in values]
+        if kind == "date":
+            return [_to_date(v) for v in values]
+        return [_to_list(v, kind[len("list:"):]) for v in values]
+
+    def _dictionary(self, name: str, values: List[Optional[str]]) -> Any:
+        """Colonne encodée dont le dictionnaire ne fait que s'allonger d'un groupe de lignes au suivant."""
+        pa = self._pa
+        codes = self._dictionaries.setdefault(name, {})
+        indices = [None if v is None else codes.setdefault(v, len(codes)) for v in values]
+        return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), pa.array(list(codes), pa.string()))
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        arrays = []
+        for name, kind in self.columns:
+            arrays.append(self._column(name, kind, rows))
+            if kind == "date":
+                arrays.append([str(row.get(name, "") or "") or None for row in rows])
+        pa = self._pa
+        table = pa.Table.from_arrays(
+            [self._dictionary(f.name, a) if pa.types.is_dictionary(f.type) else pa.array(a, type=f.type)
+             for a, f in zip(arrays, self.schema)], schema=self.schema)
+        self._writer.write_table(table)
+
+    def write(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._buffer.append(row)
+            self.count += 1
+            if len(self._buffer) >= self.row_group_size:
+                self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._flush()
+                self._writer.close()
+                self._writer = None
+
+    def __enter__(self) -> "ColumnarRowWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+OUTPUT_FORMATS = ("csv", "parquet", "arrow")
+
+
+def open_row_writer(path: str, fieldnames: List[str], fmt: str = "csv",
+                    columns: Optional[List[ColumnSpec]] = None):
+    """CsvRowWriter ou ColumnarRowWriter selon `fmt` (mêmes méthodes write/close/count)."""
+    if fmt == "csv":
+        return CsvRowWriter(path, fieldnames)
+    return ColumnarRowWriter(path, columns or [(f, "string") for f in fieldnames], fmt)
@@ -1,36 +1,64 @@
 #!/usr/bin/env python3
 """
-Scraper Interpol Red Notices - VERSION PARALLÈLE
-- Stratégie de collecte de tâches (Phase 0 & 1)
-- Exécution parallèle du téléchargement des détails (Phase 2)
-- Cible : 100% des notices, plus rapidement.
+Scraper Interpol Red Notices - interface en ligne de commande de NoticeCrawler
+- Collecte, détails, reprise et mode incrémental : moteur commun (interpol/engine.py)
+- Ici : options, limiteur partagé, fichiers de sortie et rapport de fin de run
+- Mode réparti (--leases) : un worker de la file de baux par processus
 """
 
 import os
 import sys
-import csv
-import json
 import time
-import math
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Iterable, Set, Tuple
-from urllib.request import Request, urlopen
-import ssl
-from urllib.parse import urlencode
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-from bs4 import BeautifulSoup
-
-API_URL = "https://ws-public.interpol.int/notices/v1/red"
+from typing import Dict, Any, List, Optional
+
+from interpol.age_planner import AgePlanner
+from interpol.capture import CaptureWriter
+from interpol.crawl_state import CrawlState
+from interpol.engine import GLOBAL_PAGE_CAP, NoticeCrawler
+from interpol.http_cache import ResponseCache
+from interpol.http_pool import HTTPClient
+from interpol.notice_index import NoticeIndex
+from interpol.notice_store import NoticeStore
+from interpol.notice_types import COUNTRIES, NOTICE_TYPES, RED_FIELDNAMES as FIELDNAMES, RED_TYPED_COLUMNS as TYPED_COLUMNS
+from interpol.dedup import open_seen_ids, preload_keys
+from interpol.leases import LeaseQueue
+from interpol.metrics import METRICS, start_exports
+from interpol.profiling import PROFILER
+from interpol.rate_limit import RateLimiter
+from interpol.writers import OUTPUT_FORMATS, CsvRowWriter, open_row_writer
+
+NOTICE_TYPE = NOTICE_TYPES["red"]
+API_URL = NOTICE_TYPE.api_url
 
 RESULTS_PER_PAGE = 160  # Stable et testé
-DELAY = float(os.getenv("SCRAPER_DELAY") or "0.5")
+# Ancien réglage (délai entre appels), conservé : s'il est fourni il fixe le débit à 1/DELAY
+DELAY: Optional[float] = float(os.environ["SCRAPER_DELAY"]) if os.getenv("SCRAPER_DELAY") else None
+
+# Débit global (toutes requêtes confondues : listes ET détails) et rafale tolérée.
+# La concurrence effective est ensuite ajustée en AIMD entre 1 et MAX_WORKERS.
+RATE_RPS = float(os.getenv("SCRAPER_RPS") or "10")
+RATE_BURST = float(os.getenv("SCRAPER_BURST") or "20")
 
-# Nombre de "travailleurs" pour télécharger les détails en parallèle
-# AUGMENTER = plus rapide, mais plus risqué (blocage IP)
-# DIMINUER = plus lent, mais plus sûr
+# Nombre de "travailleurs" pour télécharger les détails en parallèle.
+# C'est un plafond : le contrôleur AIMD réduit la concurrence réelle dès que
+# l'API renvoie des 429/5xx/timeouts ou que la latence se dégrade.
 MAX_WORKERS = 20
 
+# Nombre de threads pour la collecte par pays (Phase 1). Le débit réel est
+# plafonné par le limiteur global (voir LIMITER).
+COLLECT_WORKERS = 8
+
+# Moteur asyncio (--engine asyncio) : nombre maximal de détails en vol simultanément
+ASYNC_CONCURRENCY = 200
+
+# Mode --stream : nombre maximal de tâches en attente entre collecte et détails
+STREAM_QUEUE_SIZE = 2000
+
+# --count-probes : sonder avec resultPerPage=1 (réponses minuscules, mais
+# la page 1 d'une petite partition doit alors être téléchargée à part)
+COUNT_PROBES = False
+
 HEADERS = {
     "accept": "*/*",
     "accept-language": "fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7",
@@ -48,733 +76,249 @@ HEADERS = {
 if os.getenv("SCRAPER_COOKIE"):
     HEADERS["cookie"] = os.getenv("SCRAPER_COOKIE").strip()
 
-# Dictionnaire ISO → noms complets
-COUNTRY_NAMES = {
-    "AD": "Andorre", "AE": "Émirats arabes unis", "AF": "Afghanistan", "AG": "Antigua-et-Barbuda",
-    "AI": "Anguilla", "AL": "Albanie", "AM": "Arménie", "AO": "Angola", "AQ": "Antarctique",
-    "AR": "Argentine", "AS": "Samoa américaines", "AT": "Autriche", "AU": "Australie",
-    "AW": "Aruba", "AX": "Åland", "AZ": "Azerbaïdjan", "BA": "Bosnie-Herzégovine",
-    "BB": "Barbade", "BD": "Bangladesh", "BE": "Belgique", "BF": "Burkina Faso",
-    "BG": "Bulgarie", "BH": "Bahreïn", "BI": "Burundi", "BJ": "Bénin", "BL": "Saint-Barthélemy",
-    "BM": "Bermudes", "BN": "Brunei", "BO": "Bolivie", "BQ": "Bonaire", "BR": "Brésil",
-    "BS": "Bahamas", "BT": "Bhoutan", "BV": "Bouvet", "BW": "Botswana", "BY": "Biélorussie",
-    "BZ": "Belize", "CA": "Canada", "CC": "Îles Cocos", "CD": "Congo (RDC)", "CF": "République centrafricaine",
-    "CG": "Congo", "CH": "Suisse", "CI": "Côte d'Ivoire", "CK": "Îles Cook", "CL": "Chili",
-    "CM": "Cameroun", "CN": "Chine", "CO": "Colombie", "CR": "Costa Rica", "CU": "Cuba",
-    "CV": "Cap-Vert", "CW": "Curaçao", "CX": "Île Christmas", "CY": "Chypre", "CZ": "Tchéquie",
-    "DE": "Allemagne", "DJ": "Djibouti", "DK": "Danemark", "DM": "Dominique", "DO": "République dominicaine",
-    "DZ": "Algérie", "EC": "Équateur", "EE": "Estonie", "EG": "Égypte", "EH": "Sahara occidental",
-    "ER": "Érythrée", "ES": "Espagne", "ET": "Éthiopie", "FI": "Finlande", "FJ": "Fidji",
-    "FK": "Îles Malouines", "FM": "Micronésie", "FO": "Îles Féroé", "FR": "France",
-    "GA": "Gabon", "GB": "Royaume-Uni", "GD": "Grenade", "GE": "Géorgie", "GF": "Guyane française",
-    "GG": "Guernesey", "GH": "Ghana", "GI": "Gibraltar", "GL": "Groenland", "GM": "Gambie",
-    "GN": "Guinée", "GP": "Guadeloupe", "GQ": "Guinée équatoriale", "GR": "Grèce",
-    "GS": "Géorgie du Sud", "GT": "Guatemala", "GU": "Guam", "GW": "Guinée-Bissau",
-    "GY": "Guyana", "HK": "Hong Kong", "HM": "Heard-et-MacDonald", "HN": "Honduras",
-    "HR": "Croatie", "HT": "Haïti", "HU": "Hongrie", "ID": "Indonésie", "IE": "Irlande",
-    "IL": "Israël", "IM": "Île de Man", "IN": "Inde", "IO": "Territoire britannique de l'océan Indien",
-    "IQ": "Irak", "IR": "Iran", "IS": "Islande", "IT": "Italie", "JE": "Jersey",
-    "JM": "Jamaïque", "JO": "Jordanie", "JP": "Japon", "KE": "Kenya", "KG": "Kirghizistan",
-    "KH": "Cambodge", "KI": "Kiribati", "KM": "Comores", "KN": "Saint-Christophe-et-Niévès",
-    "KP": "Corée du Nord", "KR": "Corée du Sud", "KW": "Koweït", "KY": "Îles Caïmans",
-    "KZ": "Kazakhstan", "LA": "Laos", "LB": "Liban", "LC": "Sainte-Lucie", "LI": "Liechtenstein",
-    "LK": "Sri Lanka", "LR": "Liberia", "LS": "Lesotho", "LT": "Lituanie", "LU": "Luxembourg",
-    "LV": "Lettonie", "LY": "Libye", "MA": "Maroc", "MC": "Monaco", "MD": "Moldavie",
-    "ME": "Monténégro", "MF": "Saint-Martin", "MG": "Madagascar", "MH": "Îles Marshall",
-    "MK": "Macédoine du Nord", "ML": "Mali", "MM": "Myanmar", "MN": "Mongolie", "MO": "Macao",
-    "MP": "Îles Mariannes du Nord", "MQ": "Martinique", "MR": "Mauritanie", "MS": "Montserrat",
-    "MT": "Malte", "MU": "Maurice", "MV": "Maldives", "MW": "Malawi", "MX": "Mexique",
-    "MY": "Malaisie", "MZ": "Mozambique", "NA": "Namibie", "NC": "Nouvelle-Calédonie",
-    "NE": "Niger", "NF": "Île Norfolk", "NG": "Nigeria", "NI": "Nicaragua", "NL": "Pays-Bas",
-    "NO": "Norvège", "NP": "Népal", "NR": "Nauru", "NU": "Niue", "NZ": "Nouvelle-Zélande",
-    "OM": "Oman", "PA": "Panama", "PE": "Pérou", "PF": "Polynésie française", "PG": "Papouasie-Nouvelle-Guinée",
-    "PH": "Philippines", "PK": "Pakistan", "PL": "Pologne", "PM": "Saint-Pierre-et-Miquelon",
-    "PN": "Pitcairn", "PR": "Porto Rico", "PS": "Palestine", "PT": "Portugal", "PW": "Palaos",
-    "PY": "Paraguay", "QA": "Qatar", "RE": "La Réunion", "RO": "Roumanie", "RS": "Serbie",
-    "RU": "Russie", "RW": "Rwanda", "SA": "Arabie saoudite", "SB": "Îles Salomon",
-    "SC": "Seychelles", "SD": "Soudan", "SE": "Suède", "SG": "Singapour", "SH": "Sainte-Hélène",
-    "SI": "Slovénie", "SJ": "Svalbard et Jan Mayen", "SK": "Slovaquie", "SL": "Sierra Leone",
-    "SM": "Saint-Marin", "SN": "Sénégal", "SO": "Somalie", "SR": "Suriname", "SS": "Soudan du Sud",
-    "ST": "Sao Tomé-et-Principe", "SV": "Salvador", "SX": "Saint-Martin", "SY": "Syrie",
-    "SZ": "Eswatini", "TC": "Îles Turques-et-Caïques", "TD": "Tchad", "TF": "Terres australes françaises",
-    "TG": "Togo", "TH": "Thaïlande", "TJ": "Tadjikistan", "TK": "Tokelau", "TL": "Timor oriental",
-    "TM": "Turkménistan", "TN": "Tunisie", "TO": "Tonga", "TR": "Turquie", "TT": "Trinité-et-Tobago",
-    "TV": "Tuvalu", "TW": "Taïwan", "TZ": "Tanzanie", "UA": "Ukraine", "UG": "Ouganda",
-    "UM": "Îles mineures éloignées des États-Unis", "US": "États-Unis", "UY": "Uruguay",
-    "UZ": "Ouzbékistan", "VA": "Vatican", "VC": "Saint-Vincent-et-les-Grenadines",
-    "VE": "Venezuela", "VG": "Îles Vierges britanniques", "VI": "Îles Vierges américaines",
-    "VN": "Vietnam", "VU": "Vanuatu", "WF": "Wallis-et-Futuna", "WS": "Samoa", "YE": "Yémen",
-    "YT": "Mayotte", "ZA": "Afrique du Sud", "ZM": "Zambie", "ZW": "Zimbabwe"
-}
-
-def convert_country_code(code: str) -> str:
-    if not code:
-        return ""
-    code_upper = code.strip().upper()
-    return COUNTRY_NAMES.get(code_upper, code)
-
-def http_get_json(url: str, params: Optional[Dict[str, str]] = None, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
-    if params:
-        url = f"{url}?{urlencode(params)}"
-    req = Request(url, headers=(headers or HEADERS))
-    ctx: Optional[ssl.SSLContext] = None
-    if os.getenv("SCRAPER_INSECURE") == "1":
-        ctx = ssl._create_unverified_context()
-    with urlopen(req, timeout=30, context=ctx) as resp:
-        data = resp.read().decode("utf-8", errors="replace")
-    try:
-        return json.loads(data)
-    except Exception:
-        return {}
-
-def clean_text(text: str) -> str:
-    if not text:
-        return ""
-    soup = BeautifulSoup(f"<div>{text}</div>", "html.parser")
-    cleaned = soup.get_text(separator=" ")
-    return " ".join(cleaned.split())
-
-def classify_infraction(text: str) -> str:
-    if not text:
-        return ""
-    text_lower = text.lower()
-    interpol_categories = {
-        "Terrorisme et sécurité publique": ["terrorism", "terrorist", "armed formation", "explosive", "bomb", "attack", "recruit", "training", "organization", "wmd", "conspiracy to kill", "armed group", "national defence", "terror plot", "bombing", "mass destruction"],
-        "Meurtre, tentative de meurtre et crimes violents": ["murder", "homicide", "attempted murder", "assault", "aggravated assault", "armed robbery", "violence", "robbery", "femicidio", "feminicidio", "asesinato", "agravado", "homicidio", "manslaughter", "kill", "slaying"],
-        "Crimes sexuels aggravés et abus": ["rape", "sexual assault", "sexual abuse", "indecent", "sex offence", "sodomy", "abuso", "viol", "violación", "agression sexuelle", "statutory rape", "harcèlement sexuel", "violence sexuelle", "attentat à la pudeur"],
-        "Exploitation et pornographie infantile": ["child pornography", "pornography", "mineur", "minor", "child", "indecency with a child", "sexual abuse of minor", "exploitation enfant", "abus sur mineur", "child abuse"],
-        "Traite des êtres humains et enlèvements": ["trafficking", "human", "kidnapping", "hostage", "abduction", "slavery", "migrant", "illegal entry", "smuggling", "captivity", "traite", "enlèvement", "séquestration", "aide à l'entrée irrégulière", "migration illégale"],
-        "Criminalité organisée et conspiration": ["organized crime", "criminal organization", "association de malfaiteurs", "conspiracy", "participation", "illicit association", "gang", "group", "asociacion ilicita", "membership of a criminal organisation", "union criminelle"],
-        "Cybercriminalité et crimes technologiques": ["cybercrime", "hacking", "malware", "phishing", "ransomware", "computer", "digital", "data", "cryptology", "encryption", "forgery digital", "piratage", "usurpation", "intrusion", "cryptographie", "refus de remettre clé de chiffrement"],
-        "Trafic de drogues et substances illicites": ["drug", "drugs", "narcotic", "psychotropic", "trafficking", "marijuana", "cocaine", "heroin", "distribution", "stupéfiant", "importation", "transport", "unauthorised", "production", "manufacturing", "cannabis", "substance", "illicit traffic"],
-        "Crimes financiers et corruption": ["fraud", "money laundering", "bribery", "forgery", "financial", "corruption", "laundering", "breach of trust", "false declaration", "market manipulation", "escroquerie", "abus de confiance", "blanchiment", "détournement", "pots-de-vin", "fraude fiscale"],
-        "Trafic d'armes et explosifs": ["firearms", "weapons", "arms", "ammunition", "explosives", "illegal possession", "transport", "acquisition", "armas", "munitions", "fabrication d'explosifs", "arme de guerre", "arms act", "catégorie b", "catégorie c", "catégorie d"],
-        "Crimes environnementaux et patrimoine culturel": ["environment", "wildlife", "pollution", "cultural", "heritage", "artefact", "environmental", "illegal logging", "braconnage", "espèces protégées", "trafic d'ivoire", "musée", "art theft"],
-        "Autres infractions": ["evasion", "escape", "absconding", "custody", "unlawful", "detention", "obstruction", "entrave", "fuite", "détention illégale", "désobéissance"]
-    }
-    severity_rank = {
-        "Terrorisme et sécurité publique": 10, "Meurtre, tentative de meurtre et crimes violents": 9,
-        "Crimes sexuels aggravés et abus": 8, "Exploitation et pornographie infantile": 8,
-        "Traite des êtres humains et enlèvements": 7, "Criminalité organisée et conspiration": 6,
-        "Cybercriminalité et crimes technologiques": 5, "Trafic de drogues et substances illicites": 5,
-        "Crimes financiers et corruption": 4, "Trafic d'armes et explosifs": 4,
-        "Crimes environnementaux et patrimoine culturel": 3, "Autres infractions": 2, "Non classé": 1
-    }
-    matched = []
-    for category, keywords in interpol_categories.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                matched.append(category)
-                break
-    if not matched:
-        return "Non classé"
-    best_category = max(matched, key=lambda cat: severity_rank.get(cat, 0))
-    return best_category
-
-def extract_age_from_dob(dob: str) -> str:
-    if not dob or len(dob) < 4 or not dob[:4].isdigit():
-        return ""
-    try:
-        year = int(dob[:4])
-        age = datetime.now().year - year
-        return str(age) if 0 <= age <= 120 else ""
-    except Exception:
-        return ""
-
-def iter_notices(data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
-    emb = data.get("_embedded", {})
-    if isinstance(emb, dict):
-        arr = emb.get("notices", [])
-        if isinstance(arr, list):
-            for item in arr:
-                if isinstance(item, dict):
-                    yield item
-
-def extract_infractions(obj: Optional[Dict[str, Any]]) -> List[str]:
-    out: List[str] = []
-    if not obj:
-        return out
-    aws = obj.get("arrest_warrants")
-    if not isinstance(aws, list):
-        return out
-    for aw in aws:
-        if not isinstance(aw, dict):
-            continue
-        ch = aw.get("charge")
-        if ch:
-            classified = classify_infraction(str(ch))
-            if classified and classified not in out:
-                out.append(classified)
-        chs = aw.get("charges")
-        if isinstance(chs, list):
-            for c in chs:
-                classified = classify_infraction(str(c))
-                if classified and classified not in out:
-                    out.append(classified)
-        tr = aw.get("charge_translation")
-        if tr:
-            classified = classify_infraction(str(tr))
-            if classified and classified not in out:
-                out.append(classified)
-    return out
-
-def extract_list_value(value: Any) -> str:
-    if not value:
-        return ""
-    if isinstance(value, list):
-        if len(value) > 0:
-            return clean_text(str(value[0]))
-        return ""
-    value_str = str(value).strip()
-    if value_str.startswith('[') and value_str.endswith(']'):
-        value_str = value_str[1:-1].strip()
-        value_str = value_str.strip("'\"")
-        if ',' in value_str:
-            value_str = value_str.split(',')[0].strip("'\" ")
-        return clean_text(value_str)
-    return clean_text(value_str)
-
-def extract_distinguishing_marks(detail: Optional[Dict[str, Any]]) -> str:
-    if not detail:
-        return ""
-    marks = detail.get("distinguishing_marks")
-    if marks:
-        return clean_text(str(marks))
-    return ""
-
-def fetch_detail(url: str) -> Optional[Dict[str, Any]]:
-    if not url:
-        return None
-    try:
-        # Note : le time.sleep(0.1) est maintenant moins bloquant
-        # car il s'exécute dans un thread séparé.
-        time.sleep(0.1) 
-        data = http_get_json(url, headers=HEADERS)
-        return data if isinstance(data, dict) else None
-    except Exception:
-        return None
-
-def fetch_detail_by_entity_id(entity_id: str) -> Optional[Dict[str, Any]]:
-    if not entity_id:
-        return None
-    detail_url = f"https://ws-public.interpol.int/notices/v1/red/{entity_id}"
-    try:
-        time.sleep(0.1)
-        data = http_get_json(detail_url, headers=HEADERS)
-        return data if isinstance(data, dict) else None
-    except Exception:
-        return None
-
-def normalize_notice(raw: Dict[str, Any], detail: Optional[Dict[str, Any]]) -> Dict[str, str]:
-    name = clean_text(str(raw.get("name") or ""))
-    forename = clean_text(str(raw.get("forename") or ""))
-    
-    dob = str(raw.get("date_of_birth") or "").strip()
-    if not dob and detail:
-        dob = str(detail.get("date_of_birth") or "").strip()
-    age = extract_age_from_dob(dob)
-    
-    sex = clean_text(str(raw.get("sex_id") or raw.get("sex") or ""))
-    if not sex and detail:
-        sex = clean_text(str(detail.get("sex_id") or detail.get("sex") or ""))
-
-    place_of_birth = clean_text(str(raw.get("place_of_birth") or ""))
-    if not place_of_birth and detail:
-        place_of_birth = clean_text(str(detail.get("place_of_birth") or ""))
-
-    height = ""
-    weight = ""
-    hair_color = ""
-    eye_color = ""
-    
-    if detail and detail.get("height"):
-        height = clean_text(str(detail.get("height")))
-    elif raw.get("height"):
-        height = clean_text(str(raw.get("height")))
-    
-    if detail and detail.get("weight"):
-        weight = clean_text(str(detail.get("weight")))
-    elif raw.get("weight"):
-        weight = clean_text(str(raw.get("weight")))
-    
-    if detail and detail.get("hairs_id"):
-        hair_color = extract_list_value(detail.get("hairs_id"))
-    elif detail and detail.get("hair_color"):
-        hair_color = extract_list_value(detail.get("hair_color"))
-    elif raw.get("hairs_id"):
-        hair_color = extract_list_value(raw.get("hairs_id"))
-    elif raw.get("hair_color"):
-        hair_color = extract_list_value(raw.get("hair_color"))
-    
-    if detail and detail.get("eyes_colors_id"):
-        eye_color = extract_list_value(detail.get("eyes_colors_id"))
-    elif detail and detail.get("eye_color"):
-        eye_color = extract_list_value(detail.get("eye_color"))
-    elif raw.get("eyes_colors_id"):
-        eye_color = extract_list_value(raw.get("eyes_colors_id"))
-    elif raw.get("eye_color"):
-        eye_color = extract_list_value(raw.get("eye_color"))
-    
-    distinguishing_marks = extract_distinguishing_marks(detail)
-    
-    languages = ""
-    if detail and detail.get("languages_spoken_ids"):
-        langs = detail.get("languages_spoken_ids", [])
-        if isinstance(langs, list):
-            languages = ", ".join([clean_text(str(lang)) for lang in langs])
-    elif detail and detail.get("languages_spoken"):
-        langs = detail.get("languages_spoken", [])
-        if isinstance(langs, list):
-            languages = ", ".join([clean_text(str(lang)) for lang in langs])
-
-    nat = ""
-    nats = raw.get("nationalities")
-    if isinstance(nats, list) and nats:
-        nat_code = clean_text(str(nats[0]))
-        nat = convert_country_code(nat_code)
-    elif nats:
-        nat_code = clean_text(str(nats))
-        nat = convert_country_code(nat_code)
-    
-    if not nat and detail:
-        nats = detail.get("nationalities")
-        if isinstance(nats, list) and nats:
-            nat_code = clean_text(str(nats[0]))
-            nat = convert_country_code(nat_code)
-
-    entity_id = str(raw.get("entity_id") or raw.get("id") or "").strip()
-    notice_id = str(raw.get("notice_id") or "").strip()
-
-    url = ""
-    links = raw.get("_links")
-    if isinstance(links, dict):
-        sl = links.get("self")
-        if isinstance(sl, dict):
-            url = str(sl.get("href") or "").strip()
-        elif isinstance(sl, str):
-            url = sl.strip()
-
-    warrant_country = ""
-    for source in (raw, detail):
-        if isinstance(source, dict):
-            aws = source.get("arrest_warrants")
-            if isinstance(aws, list):
-                for aw in aws:
-                    if isinstance(aw, dict):
-                        wc = aw.get("issuing_country_id") or aw.get("issuing_country")
-                        if wc:
-                            wc_code = clean_text(str(wc))
-                            warrant_country = convert_country_code(wc_code)
-                            break
-        if warrant_country:
-            break
-
-    infractions: List[str] = []
-    infractions += extract_infractions(raw)
-    infractions += extract_infractions(detail)
-    seen: Set[str] = set()
-    infractions = [x for x in infractions if not (x in seen or seen.add(x))]
-    infractions_joined = " | ".join(infractions)
-
-    return {
-        "name": name, "forename": forename, "date_of_birth": dob, "age": age, "sex": sex,
-        "place_of_birth": place_of_birth, "nationality": nat, "height": height, "weight": weight,
-        "hair_color": hair_color, "eye_color": eye_color, "distinguishing_marks": distinguishing_marks,
-        "languages": languages, "entity_id": entity_id, "notice_id": notice_id,
-        "warrant_country": warrant_country, "url": url, "infractions": infractions_joined,
-    }
-
-def fetch_page(page: int) -> Dict[str, Any]:
-    params = {"page": str(page), "resultPerPage": str(RESULTS_PER_PAGE)}
-    return http_get_json(API_URL, params=params, headers=HEADERS)
-
-def fetch_page_with_filters(page: int, nationality: Optional[str] = None, age_min: Optional[int] = None, age_max: Optional[int] = None, sex_id: Optional[str] = None) -> Dict[str, Any]:
-    params = {"page": str(page), "resultPerPage": str(RESULTS_PER_PAGE)}
-    if nationality:
-        params["nationality"] = nationality
-    if age_min is not None:
-        params["ageMin"] = str(age_min)
-    if age_max is not None:
-        params["ageMax"] = str(age_max)
-    if sex_id:
-        params["sexId"] = sex_id
-    return http_get_json(API_URL, params=params, headers=HEADERS)
-
-def get_total_with_filters(nationality: Optional[str] = None, age_min: Optional[int] = None, age_max: Optional[int] = None, sex_id: Optional[str] = None) -> int:
-    try:
-        data = fetch_page_with_filters(1, nationality, age_min, age_max, sex_id)
-        if not data:
-            return 0
-        total = int(data.get("total", 0))
-        if total <= 0:
-            notices = list(iter_notices(data))
-            total = len(notices)
-        return total
-    except Exception:
-        return 0
-
-# --- MODIFIÉ ---
-# Renommé et modifié pour retourner une liste de TÂCHES (tuples)
-# au lieu de lignes CSV finales.
-def fetch_all_pages_for_filters_TASKS(
-    nationality: Optional[str], 
-    age_min: Optional[int], 
-    age_max: Optional[int], 
-    sex_id: Optional[str], 
-    seen_ids: Set[str], 
-    delay: float
-) -> List[Tuple[Dict, str, str]]:
-    
-    tasks: List[Tuple[Dict, str, str]] = []
-    total = get_total_with_filters(nationality, age_min, age_max, sex_id)
-    if total == 0:
-        return tasks
-    
-    num_pages = math.ceil(total / RESULTS_PER_PAGE)
-    
-    for page in range(1, num_pages + 1):
-        if page > 1:
-            time.sleep(delay)
-        data = fetch_page_with_filters(page, nationality, age_min, age_max, sex_id)
-        notices = list(iter_notices(data))
-        
-        for item in notices:
-            eid = str(item.get("entity_id") or item.get("id") or "").strip()
-            nurl = ""
-            links = item.get("_links")
-            if isinstance(links, dict):
-                sl = links.get("self")
-                if isinstance(sl, dict):
-                    nurl = str(sl.get("href") or "").strip()
-                elif isinstance(sl, str):
-                    nurl = sl.strip()
-            
-            key = eid
-            if not key:
-                notice_id = str(item.get("notice_id") or "").strip()
-                key = notice_id
-            if not key:
-                key = nurl
-            if not key:
-                name = str(item.get('name', '')).strip()
-                forename = str(item.get('forename', '')).strip()
-                dob = str(item.get('date_of_birth', '')).strip()
-                sex = str(item.get('sex_id', '')).strip()
-                key = f"{name}|{forename}|{dob}|{sex}"
-            
-            if key in seen_ids:
-                continue
-            seen_ids.add(key)
-            
-            # --- CHANGEMENT CLÉ ---
-            # N'appelle pas fetch_detail ou normalize_notice
-            # Ajoute juste la tâche (notice brute, url, eid)
-            tasks.append((item, nurl, eid))
-            
-    return tasks
-
-# --- MODIFIÉ ---
-# Renommé et modifié pour retourner une liste de TÂCHES (tuples)
-def recursive_age_split_TASKS(
-    country: str, 
-    sex_id: Optional[str], 
-    age_min: int, 
-    age_max: int, 
-    seen_ids: Set[str], 
-    delay: float, 
-    depth: int = 0
-) -> List[Tuple[Dict, str, str]]:
-    
-    all_tasks: List[Tuple[Dict, str, str]] = []
-    MAX_DEPTH = 10
-    if depth > MAX_DEPTH:
-        return all_tasks
-    
-    total = get_total_with_filters(country, age_min, age_max, sex_id)
-    if total == 0:
-        return all_tasks
-    
-    if total >= 160 and (age_max - age_min) > 0:
-        mid = (age_min + age_max) // 2
-        tasks1 = recursive_age_split_TASKS(country, sex_id, age_min, mid, seen_ids, delay, depth + 1)
-        tasks2 = recursive_age_split_TASKS(country, sex_id, mid + 1, age_max, seen_ids, delay, depth + 1)
-        all_tasks.extend(tasks1)
-        all_tasks.extend(tasks2)
-        return all_tasks
-    
-    if (age_max - age_min) <= 1 and total >= 160:
-        if sex_id is None:
-            for sx in ["M", "F", "U"]:
-                all_tasks.extend(recursive_age_split_TASKS(country, sx, age_min, age_max, seen_ids, delay, depth + 1))
-            return all_tasks
-            
-    # Appelle la version _TASKS
-    all_tasks.extend(fetch_all_pages_for_filters_TASKS(country, age_min, age_max, sex_id, seen_ids, delay))
-    return all_tasks
-
-# --- MODIFIÉ ---
-# Renommé et modifié pour retourner une liste de TÂCHES (tuples)
-def smart_fetch_country_TASKS(country: str, seen_ids: Set[str], delay: float) -> List[Tuple[Dict, str, str]]:
-    all_tasks: List[Tuple[Dict, str, str]] = []
-    try:
-        total_country = get_total_with_filters(country)
-        if total_country == 0:
-            return all_tasks
-        
-        if total_country <= 160:
-            # Appelle la version _TASKS
-            tasks = fetch_all_pages_for_filters_TASKS(country, None, None, None, seen_ids, delay)
-            all_tasks.extend(tasks)
-        else:
-            sex_ids = ["M", "F", "U"]
-            for sex_id in sex_ids:
-                total_sex = get_total_with_filters(country, None, None, sex_id)
-                if total_sex == 0:
-                    continue
-                if total_sex <= 160:
-                    # Appelle la version _TASKS
-                    tasks = fetch_all_pages_for_filters_TASKS(country, None, None, sex_id, seen_ids, delay)
-                    all_tasks.extend(tasks)
-                else:
-                    # Appelle la version _TASKS
-                    tasks = recursive_age_split_TASKS(country, sex_id, 0, 120, seen_ids, delay, 0)
-                    all_tasks.extend(tasks)
-    except Exception as e:
-        print(f"[Erreur] {country}: {e}")
-    return all_tasks
-
-# --- FONCTION RUN ENTIÈREMENT MODIFIÉE ---
-def run(max_pages: Optional[int], output_csv: str, delay: float) -> None:
+# Couche unique de limitation (seau à jetons + concurrence AIMD) sous toutes les requêtes,
+# reconfigurée dans run() à partir des options --rps / --burst / --workers.
+LIMITER = RateLimiter(RATE_RPS, RATE_BURST, max_concurrency=MAX_WORKERS)
+
+# Connexions keep-alive réutilisées (une par thread et par hôte), contexte SSL unique
+CLIENT = HTTPClient(HEADERS, insecure=os.getenv("SCRAPER_INSECURE") == "1")
+
+
+def configure_limiter(rps: Optional[float], delay: Optional[float], burst: Optional[float],
+                      max_concurrency: int) -> RateLimiter:
+    """Limiteur global : --rps, sinon l'ancien --delay (1 requête / delay), sinon RATE_RPS."""
+    global LIMITER
+    if rps is None:
+        rps = 1.0 / delay if delay else RATE_RPS
+    LIMITER = RateLimiter(rps, burst if burst is not None else max(RATE_BURST, rps), max_concurrency=max_concurrency)
+    return LIMITER
+
+
+def open_dedup(dedup: Optional[str], reset: bool, preload: Optional[List[str]]):
+    """Index des notices déjà vues : en mémoire, ou fichier partagé entre processus (--dedup)."""
+    seen_ids = open_seen_ids(dedup, reset=reset)
+    if preload:
+        # Clés du moteur : préfixées du type de notice
+        count = preload_keys(seen_ids, preload, prefix=f"{NOTICE_TYPE.name}:")
+        print(f"[Info] Dédoublonnage: {count} clés reprises de {', '.join(preload)}")
+    return seen_ids
+
+
+def run(max_pages: Optional[int], output_csv: str, delay: Optional[float] = None, rps: Optional[float] = None,
+        collect_workers: int = COLLECT_WORKERS, burst: Optional[float] = None,
+        engine: str = "threads", async_concurrency: int = ASYNC_CONCURRENCY, stream: bool = False,
+        state_path: Optional[str] = None, resume: bool = False, index_path: Optional[str] = None,
+        cache_path: Optional[str] = None, age_plan_path: Optional[str] = None,
+        normalize_workers: int = 0, output_format: str = "csv", store_path: Optional[str] = None,
+        dedup: Optional[str] = None, dedup_reset: bool = False, dedup_preload: Optional[List[str]] = None,
+        capture_path: Optional[str] = None) -> Dict[str, Any]:
+    """Crawl complet ; retourne le résumé du run (notices, requêtes, durées par phase en secondes)."""
     start_time = time.time()
     start_datetime = datetime.now()
-    
+
     print("\n" + "="*60)
     print(f"🕐 DÉMARRAGE: {start_datetime.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"⚡ Mode: Parallèle (Max Workers: {MAX_WORKERS})")
-    print("="*60)
-    
-    # Liste pour stocker les tâches : (notice_brute, url_detail, entity_id)
-    tasks_to_fetch: List[Tuple[Dict, str, str]] = []
-    seen_ids: Set[str] = set()
-    
-    # --- PHASE 0: COLLECTE GLOBALE DES TÂCHES ---
-    phase0_start = time.time()
-    print("\n" + "="*60)
-    print("🌐 PHASE 0: COLLECTE GLOBALE DES TÂCHES")
-    print("="*60)
-    
-    try:
-        data = http_get_json(API_URL, {"page": "1", "resultPerPage": "1"}, headers=HEADERS)
-        total_global = int(data.get("total", 0))
-        print(f"[Info] Total global: {total_global} notices")
-        
-        # Calcule le nombre de pages en fonction de RESULTS_PER_PAGE
-        num_pages_total = math.ceil(total_global / RESULTS_PER_PAGE)
-        # Limite à 50 pages (limite API) ou max_pages si fourni
-        num_pages_global = min(50, num_pages_total)
-        if max_pages is not None:
-             num_pages_global = min(num_pages_global, max_pages)
-
-        print(f"[Info] Collecte sur {num_pages_global} pages...")
-        
-        for page in range(1, num_pages_global + 1):
-            if page > 1:
-                time.sleep(delay)
-            
-            page_start = time.time()
-            data = fetch_page(page)
-            notices = list(iter_notices(data))
-            
-            new_tasks_count = 0
-            for item in notices:
-                eid = str(item.get("entity_id") or item.get("id") or "").strip()
-                nurl = ""
-                links = item.get("_links")
-                if isinstance(links, dict):
-                    sl = links.get("self")
-                    if isinstance(sl, dict):
-                        nurl = str(sl.get("href") or "").strip()
-                    elif isinstance(sl, str):
-                        nurl = sl.strip()
-                
-                key = eid
-                if not key:
-                    notice_id = str(item.get("notice_id") or "").strip()
-                    key = notice_id
-                if not key:
-                    key = nurl
-                if not key:
-                    name = str(item.get('name', '')).strip()
-                    forename = str(item.get('forename', '')).strip()
-                    dob = str(item.get('date_of_birth', '')).strip()
-                    sex = str(item.get('sex_id', '')).strip()
-                    key = f"{name}|{forename}|{dob}|{sex}"
-                
-                if key in seen_ids:
-                    continue
-                seen_ids.add(key)
-                
-                tasks_to_fetch.append((item, nurl, eid))
-                new_tasks_count += 1
-            
-            elapsed = time.time() - phase0_start
-            eta = (elapsed / page) * (num_pages_global - page)
-            print(f"[Global] Page {page}/{num_pages_global}: +{new_tasks_count} tâches | Total Tâches: {len(tasks_to_fetch)} | ETA: {timedelta(seconds=int(eta))}")
-        
-        phase0_duration = time.time() - phase0_start
-        print(f"\n✅ Phase 0: {len(tasks_to_fetch)} tâches collectées")
-        print(f"⏱️  Durée Phase 0: {timedelta(seconds=int(phase0_duration))}")
-    except Exception as e:
-        print(f"[Erreur] Phase globale: {e}")
-        phase0_duration = time.time() - phase0_start
-
-    # --- PHASE 1: COLLECTE DES TÂCHES PAR PAYS ---
-    phase1_start = time.time()
-    print("\n" + "="*60)
-    print("🌍 PHASE 1: COLLECTE PAR PAYS (compléments)")
+    print(f"⚡ Mode: Parallèle (moteur {engine}, Max Workers: {async_concurrency if engine == 'asyncio' else MAX_WORKERS})")
+    if stream:
+        print("🔀 Pipeline: streaming (détails téléchargés pendant la collecte)")
     print("="*60)
-    
-    countries = [
-        "AD", "AE", "AF", "AG", "AI", "AL", "AM", "AO", "AQ", "AR", "AS", "AT", "AU", "AW", "AX", "AZ",
-        "BA", "BB", "BD", "BE", "BF", "BG", "BH", "BI", "BJ", "BL", "BM", "BN", "BO", "BQ", "BR", "BS", "BT", "BV", "BW", "BY", "BZ",
-        "CA", "CC", "CD", "CF", "CG", "CH", "CI", "CK", "CL", "CM", "CN", "CO", "CR", "CU", "CV", "CW", "CX", "CY", "CZ",
-        "DE", "DJ", "DK", "DM", "DO", "DZ", "EC", "EE", "EG", "EH", "ER", "ES", "ET", "FI", "FJ", "FK", "FM", "FO", "FR",
-        "GA", "GB", "GD", "GE", "GF", "GG", "GH", "GI", "GL", "GM", "GN", "GP", "GQ", "GR", "GS", "GT", "GU", "GW", "GY",
-        "HK", "HM", "HN", "HR", "HT", "HU", "ID", "IE", "IL", "IM", "IN", "IO", "IQ", "IR", "IS", "IT",
-        "JE", "JM", "JO", "JP", "KE", "KG", "KH", "KI", "KM", "KN", "KP", "KR", "KW", "KY", "KZ",
-        "LA", "LB", "LC", "LI", "LK", "LR", "LS", "LT", "LU", "LV", "LY",
-        "MA", "MC", "MD", "ME", "MF", "MG", "MH", "MK", "ML", "MM", "MN", "MO", "MP", "MQ", "MR", "MS", "MT", "MU", "MV", "MW", "MX", "MY", "MZ",
-        "NA", "NC", "NE", "NF", "NG", "NI", "NL", "NO", "NP", "NR", "NU", "NZ",
-        "OM", "PA", "PE", "PF", "PG", "PH", "PK", "PL", "PM", "PN", "PR", "PS", "PT", "PW", "PY",
-        "QA", "RE", "RO", "RS", "RU", "RW", "SA", "SB", "SC", "SD", "SE", "SG", "SH", "SI", "SJ", "SK", "SL", "SM", "SN", "SO", "SR", "SS", "ST", "SV", "SX", "SY", "SZ",
-        "TC", "TD", "TF", "TG", "TH", "TJ", "TK", "TL", "TM", "TN", "TO", "TR", "TT", "TV", "TW", "TZ",
-        "UA", "UG", "UM", "US", "UY", "UZ", "VA", "VC", "VE", "VG", "VI", "VN", "VU", "WF", "WS", "YE", "YT", "ZA", "ZM", "ZW"
-    ]
-    
-    print(f"[Info] Pays à traiter: {len(countries)}")
-    
-    total_countries = len(countries)
-    for i, country in enumerate(countries, 1):
-        country_name = convert_country_code(country)
-        country_start = time.time()
-        
-        try:
-            # Appelle la version _TASKS
-            new_tasks = smart_fetch_country_TASKS(country, seen_ids, delay)
-            tasks_to_fetch.extend(new_tasks)
-            
-            elapsed = time.time() - phase1_start
-            eta = (elapsed / i) * (total_countries - i)
-            
-            print(f"[{i}/{total_countries}] {country_name}: +{len(new_tasks)} tâches | Total Tâches: {len(tasks_to_fetch)} | ETA: {timedelta(seconds=int(eta))}")
-            
-            if max_pages and len(tasks_to_fetch) >= max_pages * RESULTS_PER_PAGE:
-                 print(f"[Info] Limite max_pages ({max_pages}) atteinte pendant la Phase 1.")
-                 break
-        except Exception as e:
-            print(f"[Erreur] {country_name}: {e}")
-            continue
-        
-        if i < total_countries:
-            time.sleep(delay)
-    
-    phase1_duration = time.time() - phase1_start
-    print(f"\n✅ Phase 1: {len(tasks_to_fetch)} tâches totales collectées")
-    print(f"⏱️  Durée Phase 1: {timedelta(seconds=int(phase1_duration))}")
 
-    # --- NOUVELLE PHASE 2: TÉLÉCHARGEMENT PARALLÈLE ---
-    phase2_start = time.time()
+    seen_ids = open_dedup(dedup, dedup_reset, dedup_preload)
+    if dedup:
+        print(f"[Info] Dédoublonnage: {dedup} ({len(seen_ids)} clés connues)")
+
+    # La concurrence démarre bas et monte en AIMD jusqu'à MAX_WORKERS (ou --async-concurrency)
+    max_concurrency = async_concurrency if engine == "asyncio" else MAX_WORKERS
+    configure_limiter(rps, delay, burst, max(max_concurrency, collect_workers))
+
+    # Journal de reprise : sans --resume, un nouveau journal remplace l'ancien
+    state = CrawlState(state_path, resume=resume) if state_path else None
+    if state is not None:
+        print(f"[Info] Journal: {state_path} ({'reprise' if state.resumed else 'nouveau'})")
+
+    # Mode incrémental : seules les notices nouvelles ou modifiées sont re-téléchargées
+    index = NoticeIndex(index_path) if index_path else None
+    if index is not None:
+        print(f"[Info] Mode incrémental: {len(index)} notices connues dans {index_path}")
+
+    # Base SQLite indexée, en plus du fichier de sortie (upsert par clé de notice)
+    store = NoticeStore(store_path) if store_path else None
+    if store is not None:
+        print(f"[Info] Base SQLite: {store_path}")
+
+    # Sans --age-plan : distribution a priori, rien n'est lu ni écrit
+    planner = AgePlanner(age_plan_path)
+    if planner.histograms:
+        print(f"[Info] Plan d'âges: {len(planner.histograms)} distributions apprises ({age_plan_path})")
+
+    cache = ResponseCache(cache_path) if cache_path else None
+    if cache is not None:
+        print(f"[Info] Cache HTTP: {cache_path}")
+    capture = CaptureWriter(capture_path) if capture_path else None
+    if capture is not None:
+        print(f"[Info] Capture brute: {capture_path} (segment {capture.segment})")
+
+    crawler = NoticeCrawler(NOTICE_TYPE, CLIENT, LIMITER, HEADERS, store=store, cache=cache, planner=planner,
+                            countries=COUNTRIES, collect_workers=collect_workers, detail_workers=MAX_WORKERS,
+                            queue_size=STREAM_QUEUE_SIZE, count_probes=COUNT_PROBES, seen=seen_ids,
+                            capture=capture, global_pages=GLOBAL_PAGE_CAP, max_pages=max_pages, stream=stream,
+                            detail_engine=engine, async_concurrency=async_concurrency,
+                            normalize_workers=normalize_workers, state=state, index=index)
+
     print("\n" + "="*60)
-    print(f"🚀 PHASE 2: TÉLÉCHARGEMENT PARALLÈLE ({MAX_WORKERS} workers)")
+    print(f"🌐 PHASES 0 & 1: COLLECTE DES TÂCHES (global puis {len(COUNTRIES)} pays, {collect_workers} threads)")
+    if engine == "asyncio":
+        print(f"🚀 PHASE 2: TÉLÉCHARGEMENT ASYNCIO ({async_concurrency} requêtes en vol max)")
+    else:
+        print(f"🚀 PHASE 2: TÉLÉCHARGEMENT PARALLÈLE ({MAX_WORKERS} workers)")
     print("="*60)
-    
-    all_rows: List[Dict[str, str]] = []
 
-    # Petite fonction pour traiter une seule tâche dans un thread
-    def process_task(task_data: Tuple[Dict, str, str]) -> Optional[Dict[str, str]]:
-        item, nurl, eid = task_data
-        try:
-            detail = None
-            if nurl:
-                detail = fetch_detail(nurl)
-            elif eid:
-                detail = fetch_detail_by_entity_id(eid)
-            
-            row = normalize_notice(item, detail)
-            return row
-        except Exception as e:
-            print(f"[Erreur Tâche] {eid}: {e}")
-            return None
-
-    count = 0
-    total_tasks = len(tasks_to_fetch)
-    
-    if total_tasks == 0:
-        print("[Alerte] Aucune tâche à traiter. Le script va se terminer.")
-    else:
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Soumettre toutes les tâches au pool de threads
-            future_to_task = {executor.submit(process_task, task): task for task in tasks_to_fetch}
-            
-            for future in as_completed(future_to_task):
-                row = future.result()
-                if row:
-                    all_rows.append(row)
-                
-                count += 1
-                # Afficher le progrès tous les 100 traités
-                if count % 100 == 0 or count == total_tasks:
-                    elapsed = time.time() - phase2_start
-                    eta_seconds = 0
-                    if count > 0:
-                        eta_seconds = (elapsed / count) * (total_tasks - count)
-                    
-                    print(f"[Progrès] {count}/{total_tasks} notices traitées | Total: {len(all_rows)} | ETA: {timedelta(seconds=int(eta_seconds))}")
-
-    phase2_duration = time.time() - phase2_start
-    print(f"\n✅ Phase 2: {len(all_rows)} notices normalisées")
+    # Les lignes normalisées partent directement dans la sortie : plus de liste all_rows
+    writer = open_row_writer(output_csv, FIELDNAMES, output_format, TYPED_COLUMNS)
+    try:
+        crawler.run(writer)
+    finally:
+        csv_start = time.time()
+        writer.close()
+        csv_duration = time.time() - csv_start
+        # Run complet : le journal ne servirait plus ; sinon il reste pour --resume
+        crawler.close_state()
+        seen_ids.close()
+
+    phase0_duration = crawler.timings["global"]
+    phase1_duration = crawler.timings["partitions"]
+    phase2_duration = crawler.timings["details"]
+    METRICS.set("interpol_phase_seconds", csv_duration, phase="ecriture", type=NOTICE_TYPE.name)
+    print(f"\n✅ Phase 2: {writer.count} notices normalisées")
     print(f"⏱️  Durée Phase 2: {timedelta(seconds=int(phase2_duration))}")
 
+    CLIENT.close()
+    if cache is not None:
+        print(f"[Cache] {cache.describe()}")
+        cache.close()
+    if capture is not None:
+        capture.close()
+        print(f"[Capture] {capture.describe()}")
+
+    removed_count = 0
+    if index is not None:
+        # Notices retirées : seulement si la collecte a été complète
+        if max_pages is None and not crawler.failed:
+            removed = crawler.prune_removed()
+            removed_count = len(removed)
+            if removed:
+                removed_csv = f"{output_csv}.removed.csv"
+                with CsvRowWriter(removed_csv, FIELDNAMES) as rw:
+                    for row in removed:
+                        rw.write(row)
+                print(f"[Incrémental] {removed_count} notices retirées → {removed_csv}")
+        index.close()
 
-    # --- ÉCRITURE CSV ---
-    csv_start = time.time()
-    fieldnames = [
-        "name", "forename", "date_of_birth", "age", "sex", "place_of_birth", "nationality",
-        "height", "weight", "hair_color", "eye_color", "distinguishing_marks", "languages",
-        "entity_id", "notice_id", "warrant_country", "url", "infractions"
-    ]
-    with open(output_csv, "w", encoding="utf-8-sig", newline="") as f:
-        wr = csv.DictWriter(f, fieldnames=fieldnames)
-        wr.writeheader()
-        for r in all_rows:
-            wr.writerow({k: r.get(k, "") for k in fieldnames})
-    csv_duration = time.time() - csv_start
-    
     # --- RAPPORT FINAL ---
     total_duration = time.time() - start_time
     end_datetime = datetime.now()
-    
+
     print("\n" + "="*60)
     print("🎉 SCRAPING TERMINÉ")
     print("="*60)
     print(f"📁 Fichier: {output_csv}")
-    print(f"📊 Notices: {len(all_rows):,}")
-    print(f"📋 Colonnes: {len(fieldnames)}")
+    print(f"📊 Notices: {writer.count:,}")
+    print(f"📋 Colonnes: {len(FIELDNAMES)}")
+    print(f"🧮 Collecte: {crawler.describe()}")
+    if store is not None:
+        print(f"🗄️  Base SQLite: {store_path} ({store.stats().get('red', 0):,} notices rouges)")
+        store.close()
+    if index is not None:
+        st = index.stats
+        print(f"🔁 Incrémental: {st['new']} nouvelles, {st['changed']} modifiées, "
+              f"{st['unchanged']} inchangées (sans appel), {st['not_modified']} 304, {removed_count} retirées")
     print()
     print("⏱️  TEMPS D'EXÉCUTION:")
     print(f"   - Phase 0 (Collecte): {timedelta(seconds=int(phase0_duration))}")
     print(f"   - Phase 1 (Collecte): {timedelta(seconds=int(phase1_duration))}")
-    print(f"   - Phase 2 (Parallèle): {timedelta(seconds=int(phase2_duration))}")
-    print(f"   - Écriture CSV: {csv_duration:.1f}s")
+    print(f"   - Phase 2 (Parallèle{', chevauche la collecte' if stream else ''}): {timedelta(seconds=int(phase2_duration))}")
+    print(f"   - Écriture {output_format.upper()} (fermeture): {csv_duration:.1f}s")
     print(f"   - TOTAL: {timedelta(seconds=int(total_duration))}")
     print()
     print(f"🕐 Début: {start_datetime.strftime('%H:%M:%S')}")
     print(f"🕐 Fin: {end_datetime.strftime('%H:%M:%S')}")
     print()
     if total_duration > 0:
-        print(f"⚡ Vitesse: {len(all_rows) / (total_duration / 60):.0f} notices/minute")
-        print(f"⚡ Vitesse: {len(all_rows) / (total_duration / 3600):.0f} notices/heure")
+        print(f"⚡ Vitesse: {writer.count / (total_duration / 60):.0f} notices/minute")
+        print(f"⚡ Vitesse: {writer.count / (total_duration / 3600):.0f} notices/heure")
     print("="*60)
+    return {"rows": writer.count, "tasks": crawler.feed.produced, "requests": CLIENT.requests_sent,
+            "phase0": phase0_duration, "phase1": phase1_duration, "phase2": phase2_duration,
+            "write": csv_duration, "total": total_duration}
+
+# --- MODE RÉPARTI (--leases) ---
+# La file de baux remplace les Phases 0/1/2 d'un seul processus (NoticeCrawler.work_leases) :
+# chaque bail est une partition ou une page de la collecte globale ["global", page].
+
+def run_leases(lease_path: str, output_csv: str, worker_id: Optional[str] = None, lease_ttl: float = 120.0,
+               coordinator: bool = False, merge: bool = False, max_pages: Optional[int] = None,
+               rps: Optional[float] = None, delay: Optional[float] = None, burst: Optional[float] = None,
+               collect_workers: int = COLLECT_WORKERS, cache_path: Optional[str] = None,
+               age_plan_path: Optional[str] = None, output_format: str = "csv", store_path: Optional[str] = None,
+               dedup: Optional[str] = None, dedup_preload: Optional[List[str]] = None,
+               capture_path: Optional[str] = None) -> None:
+    """Worker d'un crawl réparti : prend des baux jusqu'à ce que la file soit vide, puis fusionne (--merge)."""
+    start_time = time.time()
+
+    # --coordinator : nouveau crawl, la file (et l'index de dédoublonnage) repartent de zéro
+    lease_queue = LeaseQueue(lease_path, worker_id, lease_ttl, reset=coordinator)
+    # Index partagé par tous les workers ; par défaut dans le fichier de la file
+    seen_ids = open_dedup(dedup or f"sqlite:{lease_path}", coordinator, dedup_preload)
+    configure_limiter(rps, delay, burst, max(MAX_WORKERS, collect_workers))
+    planner = AgePlanner(age_plan_path)
+    cache = ResponseCache(cache_path) if cache_path else None
+    capture = CaptureWriter(capture_path) if capture_path else None
+    crawler = NoticeCrawler(NOTICE_TYPE, CLIENT, LIMITER, HEADERS, cache=cache, planner=planner,
+                            countries=COUNTRIES, collect_workers=collect_workers, detail_workers=MAX_WORKERS,
+                            count_probes=COUNT_PROBES, seen=seen_ids, capture=capture,
+                            global_pages=GLOBAL_PAGE_CAP, max_pages=max_pages)
+    seeded = lease_queue.seed_once(crawler.lease_roots())
+
+    print("\n" + "="*60)
+    print(f"🧩 MODE RÉPARTI: file {lease_path}, worker {lease_queue.owner}")
+    print(f"[Info] {'File amorcée: ' + str(seeded) + ' baux racines' if seeded else 'File existante rejointe'} | {lease_queue.describe()}")
+    print("="*60)
+    if coordinator:
+        lease_queue.close()
+        seen_ids.close()
+        print("[Info] Coordinateur: file prête, lancer les workers avec --leases " + lease_path)
+        return
+
+    try:
+        crawler.work_leases(lease_queue)
+    finally:
+        seen_ids.close()
+        CLIENT.close()
+        if cache is not None:
+            print(f"[Cache] {cache.describe()}")
+            cache.close()
+        if capture is not None:
+            capture.close()
+            print(f"[Capture] {capture.describe()}")
+    print(f"\n✅ File terminée: {lease_queue.describe()}")
+    print(f"⏱️  Durée du worker: {timedelta(seconds=int(time.time() - start_time))} ({CLIENT.requests_sent} requêtes)")
+
+    if merge:
+        # Fusion déterministe : lignes de tous les baux triées par clé de notice
+        writer = open_row_writer(output_csv, FIELDNAMES, output_format, TYPED_COLUMNS)
+        store = NoticeStore(store_path) if store_path else None
+        try:
+            for key, row in lease_queue.rows():
+                writer.write(row)
+                if store is not None:
+                    store.upsert(key, row, NOTICE_TYPE.name)
+        finally:
+            writer.close()
+            if store is not None:
+                store.commit()
+                store.close()
+        print(f"📁 Fusion: {writer.count:,} notices → {output_csv}")
+    lease_queue.close()
 
 # --- BLOC MAIN ET IF __NAME__ CORRIGÉS ---
 
@@ -783,18 +327,78 @@ def main(argv: List[str]) -> int:
     import argparse
     
     # Doit être déclaré global AVANT d'être utilisé dans 'default'
-    global MAX_WORKERS
+    global MAX_WORKERS, COUNT_PROBES
     
     p = argparse.ArgumentParser("Interpol Red Notices - VERSION PARALLÈLE")
     p.add_argument("--max-pages", type=int, default=None, help="Limiter le nombre de pages (pour la Phase 0)")
-    p.add_argument("--delay", type=float, default=DELAY, help="Délai entre appels de collecte (s)")
-    p.add_argument("--output", type=str, default="interpol_parallel.csv", help="CSV de sortie")
+    p.add_argument("--delay", type=float, default=DELAY, help="Ancien réglage : équivaut à --rps 1/delay si --rps est absent")
+    p.add_argument("--rps", type=float, default=None, help=f"Débit global de requêtes/seconde, toutes phases (défaut {RATE_RPS:g})")
+    p.add_argument("--burst", type=float, default=None, help=f"Rafale tolérée par le seau à jetons (défaut {RATE_BURST:g})")
+    p.add_argument("--engine", choices=["threads", "asyncio"], default="threads", help="Moteur de téléchargement des détails (Phase 2)")
+    p.add_argument("--async-concurrency", type=int, default=ASYNC_CONCURRENCY, help="Moteur asyncio : requêtes de détail en vol au maximum")
+    p.add_argument("--normalize-workers", type=int, default=0, help="Processus de normalisation (0 = dans les threads réseau, comme avant)")
+    p.add_argument("--stream", action="store_true", help="Pipeline streaming : télécharge les détails pendant la collecte (Phases 0/1)")
+    p.add_argument("--state", type=str, default=None, help="Journal de reprise SQLite (défaut: <output>.state.sqlite), effacé en fin de run réussi")
+    p.add_argument("--no-state", action="store_true", help="Ne pas tenir de journal de reprise")
+    p.add_argument("--resume", action="store_true", help="Reprendre un crawl interrompu à partir du journal")
+    p.add_argument("--incremental", action="store_true", help="Ne télécharger que les notices nouvelles ou modifiées depuis le dernier run")
+    p.add_argument("--index", type=str, default="interpol_red_index.sqlite", help="Index local des runs précédents (mode --incremental)")
+    p.add_argument("--cache", type=str, default=os.getenv("SCRAPER_CACHE"), help="Cache disque SQLite des réponses JSON (défaut: $SCRAPER_CACHE, désactivé sinon)")
+    p.add_argument("--no-gzip", action="store_true", help="Ne pas demander de réponses compressées (gzip/deflate)")
+    p.add_argument("--age-plan", type=str, default=None, help="Fichier de la distribution des âges apprise, relu et mis à jour pour planifier les tranches du run suivant (sans : distribution a priori, rien n'est écrit)")
+    p.add_argument("--count-probes", action="store_true", help="Sonder les totaux avec resultPerPage=1 (moins d'octets, une requête de plus par petite partition)")
+    p.add_argument("--collect-workers", type=int, default=COLLECT_WORKERS, help="Nombre de threads de collecte par pays (Phase 1)")
+    p.add_argument("--output", type=str, default="interpol_parallel.csv", help="Fichier de sortie (extension adaptée à --format)")
+    p.add_argument("--store", type=str, default=None, help="Base SQLite indexée alimentée en plus de la sortie (requêtes : python -m interpol.notice_store)")
+    p.add_argument("--dedup", type=str, default=None, help="Index des notices déjà vues : memory, mmap:<fichier> ou sqlite:<fichier>, suffixe +bloom (partageable entre processus)")
+    p.add_argument("--dedup-reset", action="store_true", help="Vider l'index --dedup au démarrage (nouveau crawl)")
+    p.add_argument("--dedup-preload", action="append", default=None, help="CSV de sortie précédent dont les entity_id sont marqués comme vus (répétable)")
+    p.add_argument("--format", choices=OUTPUT_FORMATS, default="csv", help="Format de sortie : csv, parquet ou arrow (typés, nécessitent pyarrow)")
+    p.add_argument("--metrics-file", type=str, default=os.getenv("SCRAPER_METRICS_FILE"), help="Métriques au format texte Prometheus, réécrites toutes les 15 s (collecteur textfile)")
+    p.add_argument("--metrics-port", type=int, default=int(os.getenv("SCRAPER_METRICS_PORT") or 0), help="Point d'accès HTTP local /metrics (Prometheus/OpenMetrics) sur ce port")
+    p.add_argument("--metrics-json", type=str, default=os.getenv("SCRAPER_METRICS_JSON"), help="Résumé JSON du run (phases, requêtes par point d'accès, latences, temps de normalisation)")
+    p.add_argument("--capture", type=str, default=os.getenv("SCRAPER_CAPTURE"), help="Dossier de capture brute des réponses (segments gzip + index), renormalisable sans réseau : python -m interpol.capture")
+    p.add_argument("--profile", type=str, nargs="?", const="interpol_profile", default=None, help="Profiler le run : <préfixe>.folded (flamegraph), .pstats (cProfile de la normalisation), .trace.json (attentes d'E/S), .txt (rapport)")
+    p.add_argument("--profile-top", type=int, default=25, help="Avec --profile : nombre de fonctions du rapport")
+    p.add_argument("--leases", type=str, default=None, help="Crawl réparti : file de baux SQLite partagée entre workers (processus ou machines)")
+    p.add_argument("--coordinator", action="store_true", help="Avec --leases : (ré)initialise la file pour un nouveau crawl puis quitte")
+    p.add_argument("--merge", action="store_true", help="Avec --leases : une fois la file terminée, fusionne toutes les lignes dans --output")
+    p.add_argument("--worker-id", type=str, default=None, help="Avec --leases : nom du worker (défaut: <hôte>-<pid>)")
+    p.add_argument("--lease-ttl", type=float, default=120.0, help="Avec --leases : durée d'un bail sans battement de cœur avant réattribution (s)")
     # 'default' lit maintenant la variable globale sans erreur
-    p.add_argument("--workers", type=int, default=MAX_WORKERS, help="Nombre de workers parallèles")
+    p.add_argument("--workers", type=int, default=MAX_WORKERS, help="Concurrence maximale (plafond du contrôleur AIMD)")
     args = p.parse_args(argv[1:])
 
     # Assigne la valeur de l'argument à la variable globale
     MAX_WORKERS = args.workers
+    if args.format != "csv":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            p.error(f"--format {args.format} nécessite pyarrow (pip install pyarrow)")
+    if args.format != "csv" and args.output.endswith(".csv"):
+        args.output = args.output[:-len(".csv")] + f".{args.format}"
+    COUNT_PROBES = args.count_probes
+    CLIENT.compress = not args.no_gzip
+    if args.leases and (args.incremental or args.resume):
+        p.error("--leases tient son propre état : incompatible avec --incremental et --resume")
+    start_exports(args.metrics_file, args.metrics_port, args.metrics_json)
+    if args.profile:
+        if args.normalize_workers:
+            print("[Avertissement] --profile: la normalisation tourne dans des sous-processus (--normalize-workers), absente du profil CPU")
+        PROFILER.start()
+
+    if args.leases:
+        run_leases(args.leases, args.output, worker_id=args.worker_id, lease_ttl=args.lease_ttl,
+                   coordinator=args.coordinator, merge=args.merge, max_pages=args.max_pages,
+                   rps=args.rps, delay=args.delay, burst=args.burst, collect_workers=args.collect_workers,
+                   cache_path=args.cache, age_plan_path=args.age_plan, output_format=args.format,
+                   store_path=args.store, dedup=args.dedup, dedup_preload=args.dedup_preload,
+                   capture_path=args.capture)
+        METRICS.close(args.metrics_json, {"mode": "leases", "args": vars(args)})
+        if args.profile:
+            print(f"[Info] Profil: {', '.join(PROFILER.write(args.profile, args.profile_top))}")
+        return 0
 
     print("🚀 SCRAPER INTERPOL - VERSION PARALLÈLE")
     print("=" * 60)
@@ -802,15 +406,27 @@ def main(argv: List[str]) -> int:
     print("✅ Téléchargement parallèle des détails (Phase 2)")
     print("✅ 18 colonnes + conversion ISO → noms")
     print("=" * 60)
-    print(f"⏱️  Délai collecte: {args.delay}s")
-    print(f"⚡ Workers parallèles: {args.workers}")
+    print(f"⏱️  Débit: {args.rps or (1.0 / args.delay if args.delay else RATE_RPS):g} req/s")
+    print(f"⚡ Workers parallèles: {args.workers} (moteur {args.engine})")
+    print(f"🔌 Compression: {'non' if args.no_gzip else 'gzip/deflate'}")
+    print(f"🌍 Threads de collecte: {args.collect_workers}")
     print(f"📄 Sortie: {args.output}")
     print("=" * 60)
 
-    run(max_pages=args.max_pages, output_csv=args.output, delay=args.delay)
+    summary = run(max_pages=args.max_pages, output_csv=args.output, delay=args.delay,
+        rps=args.rps, collect_workers=args.collect_workers, burst=args.burst,
+        engine=args.engine, async_concurrency=args.async_concurrency, stream=args.stream,
+        state_path=None if args.no_state else (args.state or f"{args.output}.state.sqlite"),
+        resume=args.resume, index_path=args.index if args.incremental else None,
+        cache_path=args.cache, age_plan_path=args.age_plan, normalize_workers=args.normalize_workers, output_format=args.format,
+        store_path=args.store, dedup=args.dedup, dedup_reset=args.dedup_reset, dedup_preload=args.dedup_preload,
+        capture_path=args.capture)
+    METRICS.close(args.metrics_json, {"run": summary, "args": vars(args)})
+    if args.profile:
+        print(f"[Info] Profil: {', '.join(PROFILER.write(args.profile, args.profile_top))}")
     
     # 'return' doit être À L'INTÉRIEUR de la fonction main
     return 0
 
 if __name__ == "__main__":
-    sys.exit(main(sys.argv))
\ No newline at end of file
+    sys.exit(main(sys.argv))
@@ -0,0 +1,46 @@
+"""Fixtures communes : API Interpol simulée en local (interpol/mock_api.py)."""
+
+import copy
+from datetime import date
+
+import pytest
+
+from interpol.mock_api import MockDataset, MockInterpolAPI
+from interpol.notice_types import API_BASE, NOTICE_TYPES
+
+
+@pytest.fixture
+def mock_api():
+    """Serveur local sur un port libre ; pannes réglables par les attributs de l'instance."""
+    api = MockInterpolAPI(MockDataset({"red": 400, "yellow": 100, "un": 10}, seed=3))
+    api.start()
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def crowded_api():
+    """Serveur dont le premier pays (AD) dépasse le plafond de 160 : partitions découpées.
+
+    Âges calculés à la date du jour, comme ceux de la base locale.
+    """
+    api = MockInterpolAPI(MockDataset({"red": 800, "yellow": 800}, seed=3, skew=1.5, today=date.today()))
+    api.start()
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def mock_type():
+    """mock_type(api, "red") : type de notice pointé sur un serveur simulé."""
+    def make(api, name):
+        nt = copy.copy(NOTICE_TYPES[name])
+        nt.api_url = f"{api.base_url}{nt.api_url[len(API_BASE):]}"
+        return nt
+    return make
+
+
+@pytest.fixture
+def red_type(mock_api, mock_type):
+    """Type « red » pointé sur le serveur simulé."""
+    return mock_type(mock_api, "red")
@@ -0,0 +1,87 @@
+"""Plan d'âges : regroupement des âges, histogramme appris et partitions évitées."""
+
+import json
+
+from interpol.age_planner import MAX_AGE, AgePlanner, pack_windows
+from interpol.engine import NoticeCrawler
+from interpol.http_pool import HTTPClient
+from interpol.rate_limit import RateLimiter
+
+
+def test_pack_windows():
+    assert pack_windows([10.0] * 10, 20, 30) == [(20, 22), (23, 25), (26, 28), (29, 29)]
+    # Un âge seul au-dessus du budget garde sa propre fenêtre
+    assert pack_windows([5.0, 50.0, 5.0], 0, 20) == [(0, 0), (1, 1), (2, 2)]
+    assert pack_windows([1.0] * 121, 0, 1000) == [(0, 120)]
+
+
+def test_complete():
+    planner = AgePlanner()
+    assert planner._complete([(0, 60, 5), (61, 120, 3)])
+    # Chevauchement toléré, trou refusé, borne haute exigée
+    assert planner._complete([(61, 120, 3), (0, 70, 5)])
+    assert not planner._complete([(0, 40, 5), (42, 120, 3)])
+    assert not planner._complete([(0, 119, 5)])
+    assert not planner._complete([(1, 120, 5)])
+
+
+def test_prior_plan_fills_below_cap():
+    planner = AgePlanner(cap=160, prior_fill=0.6)
+    windows = planner.plan("FR", "M", 400)
+    assert windows[0][0] == 0 and windows[-1][1] == MAX_AGE
+    assert all(a[1] + 1 == b[0] for a, b in zip(windows, windows[1:]))
+    assert planner.stats["planned_prior"] == 1 and planner.stats["windows"] == len(windows)
+    # Petit total : une seule fenêtre, la bissection n'a pas lieu d'être
+    assert planner.plan("FR", "M", 50) == [(0, MAX_AGE)]
+
+
+def test_learned_histogram_is_rescaled(tmp_path):
+    path = tmp_path / "plan.json"
+    planner = AgePlanner(str(path), cap=100, learned_fill=1.0)
+    planner.observe("FR", "M", 0, 29, 0)
+    planner.observe("FR", "M", 30, 39, 90)
+    planner.observe("FR", "M", 40, 120, 90)
+    # (pays, sexe) incomplet : pas sauvegardé
+    planner.observe("DE", "F", 0, 50, 10)
+    planner.save()
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert list(saved["histograms"]) == ["FR|M"]
+
+    learned = AgePlanner(str(path), cap=100, learned_fill=1.0)
+    # Même forme, volume doublé : 18 notices par âge de 30 à 39 ans, budget de 100
+    windows = learned.plan("FR", "M", 360)
+    assert learned.stats["planned_learned"] == 1
+    assert windows[:2] == [(0, 34), (35, 43)]
+    assert windows[-1][1] == MAX_AGE
+    assert learned.plan("DE", "F", 360) and learned.stats["planned_prior"] == 1
+
+
+def test_unreadable_plan_falls_back_to_prior(tmp_path, capsys):
+    path = tmp_path / "plan.json"
+    path.write_text("{", encoding="utf-8")
+    planner = AgePlanner(str(path))
+    assert planner.histograms == {}
+    assert "[Avertissement]" in capsys.readouterr().out
+
+
+def test_learned_plan_saves_partitions(crowded_api, mock_type, tmp_path):
+    red = mock_type(crowded_api, "red")
+
+    def crawl(planner):
+        crowded_api.reset()
+        crawler = NoticeCrawler(red, HTTPClient({}), RateLimiter(1000, 1000), countries=["AD"], planner=planner)
+        crawler.run(None)
+        return crawler
+
+    blind = crawl(None)
+    path = str(tmp_path / "plan.json")
+    partitions = [blind.stats["partitions"]]
+    for _ in range(2):
+        planner = AgePlanner(path)
+        crawler = crawl(planner)
+        assert crawler.stats["rows"] == blind.stats["rows"]
+        partitions.append(crawler.stats["partitions"])
+    # A priori déjà mieux que la bissection, puis mieux encore avec l'histogramme appris
+    assert partitions[0] > partitions[1] > partitions[2]
+    assert planner.stats["planned_learned"] == 1
+    assert crowded_api.stats["list"] == partitions[2]
@@ -0,0 +1,62 @@
+"""Client HTTP asyncio : keep-alive, délais et erreurs reconnues par le limiteur."""
+
+import asyncio
+import socket
+
+import pytest
+
+from interpol.async_http import AsyncHTTPClient
+from interpol.rate_limit import is_overload_error
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_get_json_reuses_connection(mock_api):
+    async def fetch():
+        client = AsyncHTTPClient()
+        try:
+            first = await client.get_json(f"{mock_api.base_url}/red", {"resultPerPage": "1"})
+            second = await client.get_json(f"{mock_api.base_url}/red", {"page": "2"})
+        finally:
+            await client.close()
+        return first, second, client.connections_opened
+
+    first, second, opened = run(fetch())
+    assert first["total"] == 400 and len(first["_embedded"]["notices"]) == 1
+    assert second["total"] == 400
+    assert opened == 1
+
+
+def test_connect_timeout_is_a_socket_timeout(monkeypatch):
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(asyncio, "open_connection", hang)
+
+    async def fetch():
+        client = AsyncHTTPClient(timeout=0.05)
+        await client.get_json("http://192.0.2.1/notices/v1/red")
+
+    with pytest.raises(socket.timeout) as e:
+        run(fetch())
+    assert is_overload_error(e.value)
+
+
+def test_read_timeout_is_a_socket_timeout():
+    async def silent(reader, writer):
+        await asyncio.sleep(60)
+
+    async def fetch():
+        server = await asyncio.start_server(silent, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = AsyncHTTPClient(timeout=0.05)
+        try:
+            await client.get_json(f"http://127.0.0.1:{port}/")
+        finally:
+            server.close()
+
+    with pytest.raises(socket.timeout) as e:
+        run(fetch())
+    assert is_overload_error(e.value)
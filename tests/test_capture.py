@@ -0,0 +1,109 @@
+"""Capture brute des réponses et replay : même sortie que le crawl, sans réseau."""
+
+import os
+
+import pytest
+
+from interpol import capture
+from interpol.capture import CaptureReader, CaptureWriter, classify_url, filters_from_params, replay, show
+from interpol.crawl import crawl_type
+from interpol.engine import NoticeCrawler
+from interpol.http_pool import HTTPClient
+from interpol.rate_limit import RateLimiter
+
+BASE = "https://ws-public.interpol.int/notices/v1"
+
+
+def lines(path):
+    with open(path, encoding="utf-8-sig") as f:
+        return f.read().splitlines()
+
+
+@pytest.fixture
+def captured(mock_api, mock_type, tmp_path):
+    """Crawl red + yellow capturé en petits blocs et petits segments ; sorties CSV du crawl."""
+    directory = str(tmp_path / "capture")
+    writer = CaptureWriter(directory, block_bytes=20000, segment_bytes=4000)
+    for name in ("red", "yellow"):
+        crawler = NoticeCrawler(mock_type(mock_api, name), HTTPClient({}), RateLimiter(1000, 1000),
+                                countries=["AD", "DE"], capture=writer)
+        crawl_type(crawler, str(tmp_path / f"{name}.csv"), "csv", verify=False)
+    writer.close()
+    return directory
+
+
+def test_classify_url_and_filters():
+    assert classify_url(f"{BASE}/red") == ("red", "list")
+    assert classify_url(f"{BASE}/red/2024-12345") == ("red", "detail")
+    assert classify_url(f"{BASE}/un/persons") == ("un", "list")
+    assert filters_from_params({"nationality": "FR", "ageMin": "20", "ageMax": "", "sexId": "F"}) == \
+        ("FR", 20, None, "F", None, None)
+    assert filters_from_params(None) is None
+
+
+def test_writer_skips_foreign_urls_and_empty_data(tmp_path):
+    directory = str(tmp_path / "capture")
+    writer = CaptureWriter(directory)
+    writer.add("https://example.org/other", None, {"total": 1})
+    writer.add(f"{BASE}/red", None, {})
+    writer.close()
+    assert writer.stats["responses"] == 0
+    # Session sans réponse : pas de segment vide laissé derrière
+    assert [f for f in os.listdir(directory) if f.startswith("seg-")] == []
+
+
+def test_capture_is_indexed(captured):
+    reader = CaptureReader(captured)
+    counts = reader.counts()
+    reader.close()
+    assert counts["notices"] == {"red:detail": 81, "red:list": 81, "yellow:list": 27}
+    assert counts["blocks"] > 1 and counts["segments"] > 1
+
+
+@pytest.mark.parametrize("name", ["red", "yellow"])
+def test_replay_matches_crawl(captured, tmp_path, name):
+    crawled = lines(tmp_path / f"{name}.csv")
+    outputs = []
+    for workers in (1, 2):
+        out = str(tmp_path / f"{name}_replay{workers}.csv")
+        assert replay(captured, name, out, workers=workers) == len(crawled) - 1
+        outputs.append(lines(out))
+    # Mêmes lignes que le crawl ; même ordre quel que soit le nombre de processus
+    assert outputs[0][0] == crawled[0]
+    assert sorted(outputs[0]) == sorted(crawled)
+    assert outputs[0] == outputs[1]
+
+
+def test_last_session_wins(mock_api, captured, tmp_path):
+    eid = next(r["entity_id"] for r in mock_api.dataset.notices["red"] if "AD" in r["nationalities"])
+    first = show(captured, eid, "red")
+    assert [f["kind"] for f in first] == ["list", "detail"]
+    # Deuxième session : même notice re-capturée, avec un détail modifié
+    writer = CaptureWriter(captured)
+    changed = dict(first[1]["data"], distinguishing_marks="RENOMME")
+    writer.add(first[1]["url"], None, changed)
+    writer.close()
+    assert show(captured, eid, "red")[1]["data"]["distinguishing_marks"] == "RENOMME"
+    out = str(tmp_path / "red_v2.csv")
+    replay(captured, "red", out, workers=1)
+    assert sum("RENOMME" in line for line in lines(out)) == 1
+
+
+def test_unflushed_block_is_lost_only(tmp_path):
+    directory = str(tmp_path / "capture")
+    writer = CaptureWriter(directory, block_bytes=1)
+    writer.add(f"{BASE}/red/2024-1", None, {"entity_id": "2024/1"})
+    # Arrêt brutal : le bloc en cours n'est jamais écrit
+    writer.block_bytes = 10 ** 6
+    writer.add(f"{BASE}/red/2024-2", None, {"entity_id": "2024/2"})
+    assert [f["data"]["entity_id"] for f in show(directory, "2024/1")] == ["2024/1"]
+    assert show(directory, "2024/2") == []
+    writer.close()
+
+
+def test_cli(captured, capsys):
+    assert capture.main(["capture", captured, "stats"]) == 0
+    assert "red:detail" in capsys.readouterr().out
+    assert capture.main(["capture", captured, "show", "0000/00000"]) == 1
+    assert capture.main(["capture", os.path.dirname(captured), "stats"]) == 1
+    assert "[Erreur]" in capsys.readouterr().out
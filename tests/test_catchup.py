@@ -0,0 +1,81 @@
+"""Rattrapage ciblé : découpe des fenêtres et couverture des seules fenêtres incomplètes."""
+
+import pytest
+
+from interpol.catchup import FORENAME_INITIALS, CatchUp, split_window
+from interpol.coverage import country_filters
+from interpol.engine import NoticeCrawler
+from interpol.http_pool import HTTPClient
+from interpol.notice_store import NoticeStore
+from interpol.rate_limit import RateLimiter
+
+
+def test_split_window_order():
+    root = country_filters("FR")
+    by_sex = split_window(root)
+    assert by_sex == [("FR", None, None, s, None, None) for s in ("M", "F", "U")]
+    # Sexe fixé : bissection de 0–120, puis des moitiés
+    assert split_window(by_sex[0]) == [("FR", 0, 60, "M", None, None), ("FR", 61, 120, "M", None, None)]
+    assert split_window(("FR", 61, 62, "M", None, None)) == [("FR", 61, 61, "M", None, None),
+                                                             ("FR", 62, 62, "M", None, None)]
+    # Un seul âge : initiale du prénom
+    by_initial = split_window(("FR", 61, 61, "M", None, None))
+    assert [f[4] for f in by_initial] == list(FORENAME_INITIALS)
+    assert split_window(("FR", 61, 61, "M", "A", None)) == []
+
+
+def test_split_window_respects_dims():
+    root = country_filters("FR")
+    assert split_window(root, ("forename",))[0] == ("FR", None, None, None, "A", None)
+    assert split_window(root, ("age",))[0] == ("FR", 0, 60, None, None, None)
+    assert split_window(root, ()) == []
+
+
+def test_indivisible_window_counts_unreachable(tmp_path):
+    store = NoticeStore(str(tmp_path / "notices.sqlite"))
+    leaf = ("FR", 40, 40, "M", "A", None)
+    received = [f"yellow:{i}" for i in range(160)]
+    catchup = CatchUp(store, "yellow", lambda f: 200,
+                      lambda f: ([(k, {"entity_id": k}) for k in received], received))
+    assert len(catchup.cover(leaf)) == 160
+    assert catchup.stats["unreachable"] == 40
+    assert store.stats() == {"yellow": 160}
+    store.close()
+
+
+def test_failed_window_propagates(tmp_path):
+    store = NoticeStore(str(tmp_path / "notices.sqlite"))
+
+    def count(filters):
+        raise OSError("délai dépassé")
+
+    with pytest.raises(OSError):
+        CatchUp(store, "yellow", count, lambda f: ([], [])).cover(country_filters("FR"))
+    store.close()
+
+
+def test_only_windows_with_missing_notices_are_fetched(crowded_api, mock_type, tmp_path):
+    store = NoticeStore(str(tmp_path / "notices.sqlite"))
+    crawler = NoticeCrawler(mock_type(crowded_api, "yellow"), HTTPClient({}), RateLimiter(1000, 1000),
+                            countries=["AD"], store=store)
+    crawler.run(None)
+    leaves = crawler.stats["leaves"]
+    assert leaves > 1
+    keys = sorted(store.matching_keys(country_filters("AD"), "yellow"))
+    lost = keys[::40]
+    store.delete(lost)
+    store.commit()
+
+    crowded_api.reset()
+    new = crawler.catch_up([country_filters("AD")])
+    assert sorted(k for k, _ in new) == lost
+    assert sorted(store.matching_keys(country_filters("AD"), "yellow")) == keys
+    # Fenêtres complètes sautées : moins de pages que de feuilles, aucune sonde hors mémo
+    assert 0 < crowded_api.stats["list"] < leaves
+    assert crowded_api.stats["probes"] == 0
+
+    # Base de nouveau complète : plus rien à télécharger
+    crowded_api.reset()
+    assert crawler.catch_up([country_filters("AD")]) == []
+    assert crowded_api.stats["requests"] == 0
+    store.close()
@@ -0,0 +1,69 @@
+"""Vérification de complétude : rapport par pays et partitions en défaut."""
+
+from interpol.coverage import CoverageCheck, country_filters, coverage_row
+from interpol.notice_store import NoticeStore
+
+
+def make_store(tmp_path):
+    store = NoticeStore(str(tmp_path / "notices.sqlite"))
+    # FR collecté en entier, DE à moitié ; rien pour IT
+    store.record_partition(country_filters("FR"), 2, ["yellow:1", "yellow:2"], "yellow")
+    store.record_partition(country_filters("DE"), 4, ["yellow:3", "yellow:4"], "yellow")
+    store.commit()
+    return store
+
+
+def test_coverage_row():
+    assert coverage_row(10, 5) == {"total_api": 10, "local_count": 5, "missing": 5, "coverage_%": 50.0}
+    assert coverage_row(0, 0)["coverage_%"] == 100.0
+    assert coverage_row(None, 3) == {"total_api": None, "local_count": 3, "missing": None, "coverage_%": None}
+
+
+def test_country_without_rows_is_reported(tmp_path):
+    store = make_store(tmp_path)
+    api = {"FR": 2, "DE": 4, "IT": 7, "ES": 0}
+    check = CoverageCheck(store, "yellow", lambda f: None, lambda f: api[f[0]],
+                          countries=["FR", "DE", "IT", "ES"])
+    report, short = check.run()
+    # Totaux de FR et DE repris de la base, IT et ES sondés
+    assert check.stats["reused"] == 2 and check.stats["fetched"] == 2
+    by_country = {r["country"]: r for r in report}
+    assert set(by_country) == {"DE", "ES", "FR", "IT"}
+    assert by_country["IT"]["local_count"] == 0 and by_country["IT"]["missing"] == 7
+    assert by_country["ES"]["coverage_%"] == 100.0
+    assert [p["nationality"] for p in short] == ["DE"]
+    store.close()
+
+
+def test_failed_probe_counts_as_short(tmp_path):
+    store = make_store(tmp_path)
+
+    def fetch(filters):
+        if filters[0] == "DE":
+            raise OSError("délai dépassé")
+        return 2
+
+    # max_age négatif : totaux enregistrés en base ignorés, tout est re-sondé
+    check = CoverageCheck(store, "yellow", lambda f: None, fetch, max_age=-1, countries=["FR", "DE"])
+    report, short = check.run()
+    assert {r["country"]: r["missing"] for r in report} == {"DE": None, "FR": 0}
+    assert [p["nationality"] for p in short] == ["DE"]
+    # Partition racine et ligne du pays : même filtre, sondé une seule fois
+    assert check.stats["failed"] == 1
+    store.close()
+
+
+def test_known_totals_are_reused_but_zero_is_reprobed(tmp_path):
+    store = make_store(tmp_path)
+    probed = []
+
+    def fetch(filters):
+        probed.append(filters[0])
+        return 2
+
+    known = {"FR": 2, "DE": 0}
+    check = CoverageCheck(store, "yellow", lambda f: known.get(f[0]), fetch, max_age=-1, countries=["FR", "DE"])
+    check.run()
+    assert probed == ["DE"]
+    assert check.stats["reused"] == 1
+    store.close()
@@ -0,0 +1,156 @@
+"""Index de dédoublonnage : backends mémoire, mmap, SQLite, filtre de Bloom et partage entre crawls."""
+
+import pytest
+
+from interpol.dedup import (BloomFilter, BloomFront, MmapSeenIds, SqliteSeenIds, open_seen_ids,
+                            preload_keys)
+from interpol.engine import NoticeCrawler
+from interpol.http_pool import HTTPClient
+from interpol.pipeline import SeenIds
+from interpol.rate_limit import RateLimiter
+from interpol.records import dedup_digest
+
+SPECS = ["memory", "mmap:{d}/seen.bin", "sqlite:{d}/seen.sqlite", "memory+bloom", "mmap:{d}/seen.bin+bloom",
+         "sqlite:{d}/seen.sqlite+bloom"]
+
+
+@pytest.fixture(params=SPECS)
+def spec(request, tmp_path):
+    return request.param.format(d=tmp_path)
+
+
+def test_add_new_contains_update(spec):
+    seen = open_seen_ids(spec)
+    assert seen.add_new("red:2020/1")
+    assert not seen.add_new("red:2020/1")
+    assert "red:2020/1" in seen and "red:2020/2" not in seen
+    assert 1 not in seen
+    seen.update(["red:2020/2", "red:2020/3", "red:2020/1"])
+    assert len(seen) == 3
+    assert not seen.add_new("red:2020/3")
+    seen.close()
+
+
+def test_disk_index_survives_reopen_unless_reset(spec):
+    if spec.startswith("memory"):
+        pytest.skip("index en mémoire")
+    seen = open_seen_ids(spec)
+    seen.update(["a", "b"])
+    seen.close()
+    seen = open_seen_ids(spec)
+    assert "a" in seen and len(seen) == 2
+    seen.close()
+    seen = open_seen_ids(spec, reset=True)
+    assert "a" not in seen and len(seen) == 0
+    seen.close()
+
+
+@pytest.mark.parametrize("spec", ["", "disk:x", "mmap", "sqlite:", "mmap:+bloom"])
+def test_open_seen_ids_rejects_bad_specs(spec):
+    if not spec:
+        assert isinstance(open_seen_ids(spec), SeenIds)
+        return
+    with pytest.raises(ValueError):
+        open_seen_ids(spec)
+
+
+def test_open_seen_ids_backends(tmp_path):
+    assert isinstance(open_seen_ids(f"mmap:{tmp_path}/a"), MmapSeenIds)
+    assert isinstance(open_seen_ids(f"sqlite:{tmp_path}/b"), SqliteSeenIds)
+    front = open_seen_ids(f" sqlite:{tmp_path}/b+bloom ")
+    assert isinstance(front, BloomFront) and isinstance(front.index, SqliteSeenIds)
+    assert (tmp_path / "b.bloom").exists()
+
+
+def test_mmap_grows_and_is_shared(tmp_path):
+    path = str(tmp_path / "seen.bin")
+    first = MmapSeenIds(path, capacity=16)
+    other = MmapSeenIds(path)
+    keys = [f"red:{i}" for i in range(100)]
+    first.update(keys[:50])
+    for key in keys[50:]:
+        assert first.add_new(key)
+    # Table agrandie par `first` : `other` la remappe à sa prochaine opération
+    assert len(other) == 100
+    assert all(key in other for key in keys)
+    assert not other.add_new("red:7")
+    assert sorted(other.digests()) == sorted(dedup_digest(k) for k in keys)
+    first.close()
+    other.close()
+
+
+def test_mmap_rejects_foreign_file(tmp_path):
+    path = tmp_path / "x.bin"
+    path.write_bytes(b"pas un index" * 10)
+    with pytest.raises(ValueError):
+        MmapSeenIds(str(path))
+
+
+def test_sqlite_digests_round_trip(tmp_path):
+    seen = SqliteSeenIds(str(tmp_path / "seen.sqlite"))
+    # Empreintes au-delà de 2^63 : stockées signées, relues non signées
+    digests = [1, (1 << 63) + 5, (1 << 64) - 1]
+    for digest in digests:
+        assert seen.add_digest(digest)
+    assert not seen.add_digest((1 << 64) - 1)
+    assert sorted(seen.digests()) == digests
+    seen.close()
+
+
+def test_bloom_front_answers_negatives_without_index(tmp_path):
+    front = open_seen_ids(f"sqlite:{tmp_path}/seen.sqlite+bloom")
+    front.update([f"k{i}" for i in range(200)])
+    assert all(f"k{i}" in front for i in range(200))
+    absent = sum(f"x{i}" not in front for i in range(1000))
+    assert absent == 1000
+    assert front.stats["negative"] >= 990
+    front.close()
+
+
+def test_bloom_rebuilt_from_existing_index(tmp_path):
+    seen = open_seen_ids(f"mmap:{tmp_path}/seen.bin")
+    seen.update(["a", "b"])
+    seen.close()
+    # Premier run avec filtre sur un index déjà rempli : le filtre doit tout couvrir
+    front = open_seen_ids(f"mmap:{tmp_path}/seen.bin+bloom")
+    assert front.bloom.created
+    assert "a" in front and "b" in front
+    front.close()
+
+
+def test_bloom_file_keeps_its_parameters(tmp_path):
+    path = str(tmp_path / "f.bloom")
+    bloom = BloomFilter(1000, path=path)
+    bloom.add(42)
+    bits = bloom.bits
+    bloom.close()
+    reopened = BloomFilter(10, path=path)
+    assert not reopened.created and reopened.bits == bits
+    assert reopened.might_contain(42)
+    reopened.close()
+
+
+def test_preload_keys(tmp_path):
+    csv_path = tmp_path / "old.csv"
+    csv_path.write_text("entity_id,name\n2020/1,A\n,B\n2020/2,C\n", encoding="utf-8-sig")
+    seen = SeenIds()
+    assert preload_keys(seen, [str(csv_path)], prefix="red:") == 2
+    assert "red:2020/1" in seen and "2020/1" not in seen
+
+
+def test_shared_index_splits_work_between_crawls(mock_api, red_type, tmp_path):
+    spec = f"sqlite:{tmp_path}/seen.sqlite+bloom"
+
+    def crawl():
+        seen = open_seen_ids(spec)
+        crawler = NoticeCrawler(red_type, HTTPClient({}), RateLimiter(1000, 1000), countries=["AD", "DE"],
+                                seen=seen)
+        crawler.run(None)
+        seen.close()
+        return crawler
+
+    assert crawl().stats["rows"] == 81
+    details = mock_api.stats["detail"]
+    # Deuxième processus sur le même index : aucune notice re-téléchargée
+    assert crawl().stats["rows"] == 0
+    assert mock_api.stats["detail"] == details
@@ -0,0 +1,45 @@
+"""Mode incrémental : index des runs précédents, reprise et notices retirées."""
+
+from interpol.crawl_state import CrawlState
+from interpol.engine import NoticeCrawler
+from interpol.http_pool import HTTPClient
+from interpol.notice_index import NoticeIndex
+from interpol.rate_limit import RateLimiter
+
+COUNTRIES = ["DE", "FR", "US"]
+
+
+def crawl(nt, tmp_path, state=None):
+    crawler = NoticeCrawler(nt, HTTPClient({}), RateLimiter(1000, 1000), countries=COUNTRIES, state=state,
+                            index=NoticeIndex(str(tmp_path / "index.sqlite")))
+    crawler.run(None)
+    return crawler
+
+
+def test_second_run_reuses_index(red_type, tmp_path):
+    first = crawl(red_type, tmp_path)
+    assert first.stats["rows"] > 0 and first.prune_removed() == []
+    first.index.close()
+    second = crawl(red_type, tmp_path)
+    assert second.stats["rows"] == first.stats["rows"]
+    assert second.index.stats["unchanged"] == first.stats["rows"]
+    assert second.prune_removed() == []
+    second.index.close()
+
+
+def test_resumed_rows_are_not_pruned(red_type, tmp_path):
+    crawl(red_type, tmp_path).index.close()
+    # Run interrompu après avoir journalisé toutes ses lignes
+    state = CrawlState(str(tmp_path / "state.sqlite"))
+    interrupted = crawl(red_type, tmp_path, state)
+    state.close()
+    interrupted.index.close()
+
+    state = CrawlState(str(tmp_path / "state.sqlite"), resume=True)
+    resumed = crawl(red_type, tmp_path, state)
+    assert resumed.stats["rows"] == interrupted.stats["rows"]
+    assert resumed.index.stats["unchanged"] == 0
+    assert resumed.prune_removed() == []
+    assert len(resumed.index) == interrupted.stats["rows"]
+    resumed.index.close()
+    state.close()
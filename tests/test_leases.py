@@ -0,0 +1,120 @@
+"""File de baux : attribution, expiration et reprise, fin atomique et crawl réparti."""
+
+import threading
+import time
+
+import pytest
+
+from interpol.engine import NoticeCrawler
+from interpol.http_pool import HTTPClient
+from interpol.leases import LeaseQueue
+from interpol.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "leases.sqlite")
+
+
+def test_seed_once_and_claim_order(path):
+    queue = LeaseQueue(path, "a")
+    assert queue.seed_once([("FR", ["FR"]), ("DE", ["DE"])]) == 2
+    # Deuxième worker : file existante rejointe, rien d'ajouté
+    assert LeaseQueue(path, "b").seed_once([("IT", ["IT"])]) == 0
+    assert queue.seed([("DE", ["DE"]), ("IT", ["IT"])]) == 1
+    assert [queue.claim()[0] for _ in range(3)] == ["DE", "FR", "IT"]
+    assert queue.claim() is None
+    assert queue.counts() == {"pending": 0, "leased": 3, "done": 0, "failed": 0}
+    queue.close()
+
+
+def test_expired_lease_is_reclaimed_and_late_result_dropped(path):
+    dead = LeaseQueue(path, "mort", ttl=0.05)
+    dead.seed([("FR", ["FR"])])
+    assert dead.claim() == ("FR", ["FR"], 1)
+    alive = LeaseQueue(path, "vivant")
+    assert alive.claim() is None
+    time.sleep(0.1)
+    assert alive.claim() == ("FR", ["FR"], 2)
+    assert alive.stats["reclaimed"] == 1
+    # Le premier worker revient trop tard : son résultat est écarté
+    assert not dead.complete("FR", [("red:1", {"name": "A"})])
+    assert dead.stats["lost"] == 1
+    assert alive.complete("FR", [("red:2", {"name": "B"})])
+    assert list(alive.rows()) == [("red:2", {"name": "B"})]
+    dead.close()
+    alive.close()
+
+
+def test_renew_keeps_lease(path):
+    queue = LeaseQueue(path, "a", ttl=0.2)
+    queue.seed([("FR", ["FR"])])
+    queue.claim()
+    time.sleep(0.1)
+    assert queue.renew() == 1
+    time.sleep(0.15)
+    # Prolongé : toujours tenu, pas encore repris
+    assert LeaseQueue(path, "b").claim() is None
+    queue.close()
+
+
+def test_complete_adds_children_and_finishes(path):
+    queue = LeaseQueue(path, "a")
+    queue.seed([("AD", ["AD"])])
+    key, _, _ = queue.claim()
+    assert not queue.finished()
+    assert queue.complete(key, [("red:2", {"n": 2}), ("red:1", {"n": 1})], [("AD|M", ["AD", "M"])])
+    assert not queue.finished()
+    child, item, _ = queue.claim()
+    assert (child, item) == ("AD|M", ["AD", "M"])
+    assert queue.complete(child, [("red:0", {"n": 0})])
+    assert queue.finished()
+    # Fusion triée par clé, par lots
+    assert [k for k, _ in queue.rows(batch=2)] == ["red:0", "red:1", "red:2"]
+    assert queue.row_count() == 3
+    queue.close()
+
+
+def test_release_until_failed(path):
+    queue = LeaseQueue(path, "a", max_attempts=2)
+    queue.seed([("FR", ["FR"])])
+    for attempt in (1, 2):
+        assert queue.claim() == ("FR", ["FR"], attempt)
+        queue.release("FR")
+    assert queue.claim() is None
+    assert queue.counts()["failed"] == 1
+    assert queue.finished()
+    queue.close()
+
+
+def test_reset(path):
+    queue = LeaseQueue(path, "a")
+    queue.seed([("FR", ["FR"])])
+    queue.close()
+    queue = LeaseQueue(path, "a", reset=True)
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+    queue.close()
+
+
+def test_workers_share_the_crawl(mock_api, red_type, path):
+    def crawler():
+        return NoticeCrawler(red_type, HTTPClient({}), RateLimiter(1000, 1000), countries=["AD", "DE", "FR"],
+                             collect_workers=2)
+
+    queue = LeaseQueue(path, "w0", reset=True)
+    assert queue.seed_once(crawler().lease_roots()) == 3
+    # Bail pris par un worker disparu : repris après expiration
+    dead = LeaseQueue(path, "mort", ttl=0.05)
+    assert dead.claim() is not None
+    workers = [LeaseQueue(path, f"w{i}", ttl=5) for i in (1, 2)]
+    threads = [threading.Thread(target=crawler().work_leases, args=(q, 0.02)) for q in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+    assert queue.finished()
+    assert sum(q.stats["reclaimed"] for q in workers) == 1
+    assert queue.row_count() == 81
+    assert mock_api.stats["detail"] == 81
+    for q in workers + [dead, queue]:
+        q.close()
@@ -0,0 +1,64 @@
+"""Base SQLite des notices : upsert, requêtes indexées, partitions et CLI."""
+
+import sqlite3
+
+import pytest
+
+from interpol.notice_store import NoticeStore, main, read_only_query
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = NoticeStore(str(tmp_path / "notices.sqlite"))
+    s.upsert("red:1", {"entity_id": "1", "name": "DUPONT", "nationality": "FR", "sex": "M", "age": "40",
+                       "infractions": "Meurtre | Vol", "languages": "French, English"})
+    s.upsert("red:2", {"entity_id": "2", "name": "MULLER", "nationality": "DE", "sex": "F", "age": "25",
+                       "infractions": "Vol", "languages": "German"})
+    s.upsert("yellow:1", {"entity_id": "1", "nationality": "FR", "nationalities": "FR;BE"}, "yellow")
+    s.commit()
+    yield s
+    s.close()
+
+
+def test_upsert_replaces_row_and_values(store):
+    store.upsert("red:1", {"entity_id": "1", "name": "DUPONT", "nationality": "FR", "infractions": "Fraude"})
+    assert store.stats() == {"red": 2, "yellow": 1}
+    assert store.count_by("infraction", "red") == {"Fraude": 1, "Vol": 1}
+
+
+def test_count_and_find(store):
+    assert store.count_by("nationality", "red") == {"DE": 1, "FR": 1}
+    # Nationalité secondaire : trouvée par les valeurs multiples
+    assert store.matching_keys(("BE", None, None, None, None, None), "yellow") == ["yellow:1"]
+    assert [r["name"] for r in store.find("red", infraction="Vol")] == ["DUPONT", "MULLER"]
+    assert [r["name"] for r in store.find("red", age_min=30)] == ["DUPONT"]
+    assert [r["name"] for r in store.find("red", language="German")] == ["MULLER"]
+
+
+def test_partitions_are_prefixed_by_type(store):
+    fr = ("FR", None, None, None, None, None)
+    store.record_partition(fr, 3, ["red:1", "red:1", "red:3"], "red")
+    store.record_partition(fr, 1, ["yellow:1"], "yellow")
+    assert store.partition_coverage("red")[0][0] == fr
+    assert [(c[1], c[3]) for c in store.partition_coverage("red")] == [(3, 2)]
+    assert store.members_by("nationality", "yellow") == {"FR": 1}
+    store.clear_partitions("red")
+    assert store.partition_coverage("red") == []
+    assert store.members_by("nationality", "yellow") == {"FR": 1}
+
+
+def test_delete_cascades_to_values(store):
+    store.delete(["red:2"])
+    assert store.count_by("language", "red") == {"English": 1, "French": 1}
+
+
+def test_sql_is_read_only(store, capsys):
+    store.commit()
+    assert read_only_query(store.path, "SELECT COUNT(*) FROM notices") == [(3,)]
+    with pytest.raises(sqlite3.OperationalError):
+        read_only_query(store.path, "DELETE FROM notices")
+    assert main(["notice_store", store.path, "sql", "DELETE FROM notices"]) == 1
+    assert "[Erreur]" in capsys.readouterr().err
+    assert store.stats() == {"red": 2, "yellow": 1}
+    assert main(["notice_store", store.path, "sql", "SELECT key FROM notices WHERE notice_type = 'yellow'"]) == 0
+    assert capsys.readouterr().out == "yellow:1\n"
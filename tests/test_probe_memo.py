@@ -0,0 +1,80 @@
+"""Mémo des sondes : un total par filtre, page 1 resservie, sondes en échec refaites."""
+
+import pytest
+
+from interpol.engine import NoticeCrawler
+from interpol.http_pool import HTTPClient
+from interpol.probe_memo import ProbeError, ProbeMemo, total_of
+from interpol.rate_limit import RateLimiter
+
+
+def page(total, notices=()):
+    return {"total": total, "_embedded": {"notices": list(notices)}}
+
+
+def test_total_of():
+    assert total_of({}) == 0
+    assert total_of(page(12)) == 12
+    # Total absent ou nul : nombre de notices reçues
+    assert total_of(page(0, [{}, {}])) == 2
+    assert total_of({"total": "x", "_embedded": []}) == 0
+
+
+def test_total_probed_once_and_first_page_reused():
+    memo = ProbeMemo()
+    fetched = []
+
+    def fetch(n):
+        fetched.append(n)
+        return page(3, [{"entity_id": "1"}])
+
+    assert memo.total("FR", fetch) == 3
+    assert memo.total("FR", fetch) == 3
+    assert memo.first_page("FR", fetch)["_embedded"]["notices"] == [{"entity_id": "1"}]
+    # Page 1 consommée : la suivante est re-téléchargée
+    memo.first_page("FR", fetch)
+    assert fetched == [1, 1]
+    assert memo.stats == {"probes": 1, "count_probes": 0, "memo_hits": 1, "pages_reused": 1}
+
+
+def test_count_probe_keeps_no_page():
+    memo = ProbeMemo()
+    assert memo.total("FR", lambda n: pytest.fail("page 1 demandée"), lambda: page(500)) == 500
+    assert memo.known_total("FR") == 500
+    assert memo.first_page("FR", lambda n: page(500, [{}])) == page(500, [{}])
+    assert memo.stats["pages_reused"] == 0
+
+
+def test_failed_probe_is_not_memoized():
+    memo = ProbeMemo()
+    with pytest.raises(ProbeError):
+        memo.total("FR", lambda n: {})
+    assert memo.known_total("FR") is None
+    assert memo.total("FR", lambda n: page(0)) == 0
+    # Page vide : rien à resservir
+    assert memo.first_page("FR", lambda n: page(0, [{}])) == page(0, [{}])
+
+
+def test_recount_and_discard():
+    memo = ProbeMemo()
+    memo.total("FR", lambda n: page(5, [{}]))
+    assert memo.recount("FR", lambda: page(6)) == 6
+    assert memo.known_total("FR") == 6
+    memo.discard_page("FR")
+    assert memo.first_page("FR", lambda n: page(6)) == page(6)
+    with pytest.raises(ProbeError):
+        memo.recount("FR", lambda: None)
+
+
+@pytest.mark.parametrize("count_probes", [False, True])
+def test_crawl_requests_each_list_page_once(mock_api, red_type, count_probes):
+    crawler = NoticeCrawler(red_type, HTTPClient({}), RateLimiter(1000, 1000), countries=["AD", "DE", "FR"],
+                            count_probes=count_probes)
+    crawler.run(None)
+    # AD et DE tiennent sur une page, FR est vide
+    assert crawler.stats["rows"] == 81
+    if count_probes:
+        assert (mock_api.stats["probes"], mock_api.stats["list"]) == (3, 2)
+    else:
+        assert (mock_api.stats["probes"], mock_api.stats["list"]) == (0, 3)
+        assert crawler.probes.stats["pages_reused"] == 2
@@ -0,0 +1,157 @@
+"""Limiteur : seau à jetons, contrôleur AIMD et reprises après saturation."""
+
+import asyncio
+import io
+import socket
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+from interpol import rate_limit
+from interpol.rate_limit import (AdaptiveConcurrency, RateLimiter, TokenBucket, is_overload_error,
+                                 retry_delay)
+
+
+def http_error(code, retry_after=None):
+    headers = {"Retry-After": retry_after} if retry_after else {}
+    return HTTPError("http://x", code, "erreur", headers, io.BytesIO(b""))
+
+
+@pytest.fixture
+def no_wait(monkeypatch):
+    monkeypatch.setattr(rate_limit, "retry_delay", lambda attempt, exc: 0.0)
+
+
+def test_bucket_burst_then_rate():
+    bucket = TokenBucket(10, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    # Solde négatif : l'appelant suivant attend derrière le précédent
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+
+def test_bucket_pause():
+    bucket = TokenBucket(100, burst=10)
+    bucket.pause(0.5)
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
+
+
+def test_slow_start_then_additive_increase():
+    c = AdaptiveConcurrency(initial=4, maximum=64)
+    for _ in range(4):
+        c.try_acquire()
+        c.release(True, 0.01)
+    assert c.limit == 8
+    c.try_acquire()
+    c.release(False, 0.01)
+    assert not c.slow_start
+    limit = c.limit
+    c.try_acquire()
+    c.release(True, 0.01)
+    assert c.limit == pytest.approx(limit + 1 / limit)
+
+
+def test_error_cuts_less_than_throttle():
+    c = AdaptiveConcurrency(initial=20, maximum=64, cooldown=0.0)
+    c.try_acquire()
+    assert c.release(False, 0.01, throttled=False)
+    assert c.limit == pytest.approx(18)
+    c.try_acquire()
+    assert c.release(False, 0.01, throttled=True)
+    assert c.limit == pytest.approx(9)
+
+
+def test_one_cut_per_cooldown():
+    c = AdaptiveConcurrency(initial=32, maximum=64, cooldown=60.0)
+    for _ in range(5):
+        c.try_acquire()
+    assert c.release(False, 0.01)
+    # Requêtes déjà en vol au moment de la saturation : pas de nouvelle baisse
+    assert not any(c.release(False, 0.01) for _ in range(4))
+    assert c.limit == 16
+    assert c.failures == 5
+
+
+def test_limit_never_below_minimum():
+    c = AdaptiveConcurrency(initial=2, minimum=2, cooldown=0.0)
+    for _ in range(3):
+        c.try_acquire()
+        c.release(False, 0.01)
+    assert c.limit == 2
+
+
+def test_overload_errors():
+    assert is_overload_error(http_error(429))
+    assert is_overload_error(http_error(503))
+    assert is_overload_error(socket.timeout())
+    assert is_overload_error(URLError(ConnectionRefusedError()))
+    assert not is_overload_error(http_error(404))
+    assert not is_overload_error(ValueError())
+
+
+def test_retry_delay_honours_retry_after():
+    assert retry_delay(0, http_error(429, "3")) == 3.0
+    assert 0.25 <= retry_delay(0, http_error(503)) <= 0.5
+    assert retry_delay(10, http_error(503), cap=2.0) <= 2.0
+
+
+def test_call_retries_overload(no_wait):
+    limiter = RateLimiter(1000, retries=3)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise http_error(503)
+        return "ok"
+
+    assert limiter.call(flaky) == "ok"
+    assert len(attempts) == 3
+    assert limiter.retried == 2
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_call_gives_up_and_skips_client_errors(no_wait):
+    limiter = RateLimiter(1000, retries=2)
+    calls = []
+
+    def always(exc):
+        calls.append(exc)
+        raise exc
+
+    with pytest.raises(HTTPError):
+        limiter.call(always, http_error(502))
+    assert len(calls) == 3
+    calls.clear()
+    with pytest.raises(HTTPError):
+        limiter.call(always, http_error(404))
+    assert len(calls) == 1
+
+
+def test_throttle_pauses_bucket_once_per_cut():
+    limiter = RateLimiter(1000, burst=1000)
+    limiter.concurrency.cooldown = 60.0
+    # Trois requêtes en vol reçoivent un 429 : une seule baisse, une seule pause
+    in_flight = [limiter.request() for _ in range(3)]
+    for ctx in in_flight:
+        ctx.__enter__()
+    for ctx, delay in zip(in_flight, ("0.3", "5", "5")):
+        err = http_error(429, delay)
+        assert not ctx.__exit__(HTTPError, err, None)
+    assert limiter.bucket.reserve() == pytest.approx(0.3, abs=0.05)
+    assert limiter.concurrency.limit == 2
+
+
+def test_acall_retries(no_wait):
+    limiter = RateLimiter(1000, retries=2)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise socket.timeout()
+        return 42
+
+    assert asyncio.run(limiter.acall(flaky)) == 42
+    assert len(attempts) == 2
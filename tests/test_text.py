@@ -0,0 +1,107 @@
+"""Nettoyage du texte : chemins rapides comparés au rendu BeautifulSoup de référence."""
+
+import pytest
+
+from interpol.text import clean_text, clean_text_bs4, strip_tags
+
+# Cas limites et rendu de référence, relevé avec clean_text_bs4 (beautifulsoup4) :
+# les chemins rapides doivent donner exactement le même texte
+FAST_CORPUS = [
+    ('', ''),
+    (' ', ''),
+    ('\x00a', '\x00a'),
+    ('a\xa0b', 'a b'),
+    ('\x0c', ''),
+    ('DUPONT', 'DUPONT'),
+    ('  Jean   Pierre ', 'Jean Pierre'),
+    ("O'NEILL", "O'NEILL"),
+    ('1.85', '1.85'),
+    ('FR', 'FR'),
+    ('\tligne\nsuivante\r\n', 'ligne suivante'),
+    ('Al Hassan', 'Al Hassan'),
+    ('Ñandú', 'Ñandú'),
+    ('李小龍', '李小龍'),
+    ('a < b', 'a < b'),
+    ('a<b', 'a'),
+    ('a <3 b', 'a <3 b'),
+    ('x > y', 'x > y'),
+    ('<>', '<>'),
+    ('< >', '< >'),
+    ('a<', 'a<'),
+    ('<b>GRAS</b>', 'GRAS'),
+    ('a<b>b</b>c', 'a b c'),
+    ('a<br>b', 'a b'),
+    ('a<br/>b', 'a b'),
+    ('<p>un</p><p>deux</p>', 'un deux'),
+    ('<i></i>', ''),
+    ('<div>imbriqué <span>dans</span> div</div>', 'imbriqué dans div'),
+    ('fin</div>après', 'fin après'),
+    ('</p>orphelin', 'orphelin'),
+    ('<a href="x?a=1&b=2">lien</a>', 'lien'),
+    ("<img src=x alt='y'>texte", 'texte'),
+    ('<b>non fermé', 'non fermé'),
+    ('texte <b', 'texte'),
+    ('<B>MAJ</B>', 'MAJ'),
+    ('a&amp;b', 'a&b'),
+    ('&lt;b&gt;', '<b>'),
+    ('AT&T', 'AT&T'),
+    ('&#233;t&#xE9;', 'été'),
+    ('&nbsp;x', 'x'),
+    ('<b>a&amp;b</b>', 'a&b'),
+]
+
+# Constructions traitées par le repli bs4 (commentaires, CDATA, script/style…)
+FALLBACK_CORPUS = [
+    ('<!-- commentaire -->visible', 'visible'),
+    ('<script>var a=1;</script>après', 'après'),
+    ('<style>p{}</style>x', 'x'),
+    ('<![CDATA[brut]]>', 'brut'),
+    ("<?xml version='1.0'?>doc", 'doc'),
+    ('<!DOCTYPE html>doc', 'doc'),
+    ('<title>t</title>x', 't x'),
+]
+DIFFERENTIAL_CORPUS = FAST_CORPUS + FALLBACK_CORPUS
+
+
+@pytest.mark.parametrize("text, expected", FAST_CORPUS)
+def test_same_as_bs4(text, expected):
+    assert clean_text(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", FALLBACK_CORPUS)
+def test_fallback_same_as_bs4(text, expected):
+    pytest.importorskip("bs4")
+    assert clean_text(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", DIFFERENTIAL_CORPUS)
+def test_reference_still_matches_bs4(text, expected):
+    # Contrôle facultatif : le rendu relevé correspond toujours au bs4 installé
+    pytest.importorskip("bs4")
+    assert clean_text_bs4(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("  Jean   Pierre ", "Jean Pierre"),
+    ("a&amp;b", "a&b"),
+    ("&lt;b&gt;", "<b>"),
+    ("AT&T", "AT&T"),
+    # Entité inconnue gardée telle quelle (bs4 en retire le « ; »)
+    ("&foo;", "&foo;"),
+    ("<b>&foo;</b>", "&foo;"),
+    ("&#233;t&#xE9;", "été"),
+    ("&nbsp;x", "x"),
+])
+def test_entities_without_bs4(text, expected):
+    # Texte sans balise : décodé par html.unescape, jamais par le repli bs4
+    assert clean_text(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("a<b>b</b>c", "a b c"),
+    ("<b>a&amp;b</b>", "a&b"),
+    ('<a href="x?a=1&b=2">lien</a>', "lien"),
+])
+def test_strip_tags(text, expected):
+    assert strip_tags(text) == expected
+    assert clean_text(text) == expected
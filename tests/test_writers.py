@@ -0,0 +1,139 @@
+"""Sorties : CSV au fil de l'eau, Parquet / Arrow typés (pyarrow facultatif)."""
+
+import csv
+import threading
+from datetime import date
+
+import pytest
+
+from interpol.crawl import crawl_type
+from interpol.engine import NoticeCrawler
+from interpol.http_pool import HTTPClient
+from interpol.notice_types import RED_TYPED_COLUMNS
+from interpol.rate_limit import RateLimiter
+from interpol.writers import (ColumnarRowWriter, CsvRowWriter, _to_date, _to_float, _to_int, _to_list,
+                              open_row_writer)
+
+COLUMNS = [("name", "string"), ("sex", "dict"), ("age", "int"), ("height", "float"),
+           ("date_of_birth", "date"), ("languages", "list:,")]
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_writer_fills_and_filters_fields(tmp_path):
+    path = tmp_path / "out.csv"
+    with CsvRowWriter(str(path), ["name", "age"]) as writer:
+        writer.write({"name": "DUPONT", "age": "40", "extra": "ignoré"})
+        writer.write({"name": "MULLER"})
+    assert writer.count == 2
+    assert path.read_bytes().startswith(b"\xef\xbb\xbfname,age\r\n")
+    assert read_csv(path) == [{"name": "DUPONT", "age": "40"}, {"name": "MULLER", "age": ""}]
+    writer.close()
+
+
+def test_csv_writer_is_thread_safe(tmp_path):
+    path = tmp_path / "out.csv"
+    writer = CsvRowWriter(str(path), ["entity_id"], flush_every=7)
+
+    def write(start):
+        for i in range(start, start + 250):
+            writer.write({"entity_id": str(i)})
+
+    threads = [threading.Thread(target=write, args=(i * 250,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.close()
+    assert sorted(int(r["entity_id"]) for r in read_csv(path)) == list(range(1000))
+
+
+def test_converters():
+    assert (_to_int("42"), _to_int(""), _to_int(None)) == (42, None, None)
+    assert (_to_float("1,85"), _to_float("1.7"), _to_float("grand")) == (1.85, 1.7, None)
+    assert _to_date("1980/05/17") == _to_date("1980-05-17") == date(1980, 5, 17)
+    # Date partielle ou impossible : gardée seulement dans la colonne brute
+    assert (_to_date("1980"), _to_date("1980/02/31"), _to_date(None)) == (None, None, None)
+    assert _to_list("French, English,", ",") == ["French", "English"]
+    assert _to_list("", ";") == []
+
+
+def test_open_row_writer_csv(tmp_path):
+    writer = open_row_writer(str(tmp_path / "out.csv"), ["name"])
+    assert isinstance(writer, CsvRowWriter)
+    writer.close()
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_round_trip(tmp_path, fmt):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"out.{fmt}")
+    with open_row_writer(path, [], fmt, COLUMNS) as writer:
+        assert isinstance(writer, ColumnarRowWriter)
+        # Deux groupes de lignes : le dictionnaire de « sex » doit rester le même
+        writer.row_group_size = 2
+        writer.write({"name": "DUPONT", "sex": "M", "age": "40", "height": "1,80",
+                      "date_of_birth": "1984/03/02", "languages": "French, English"})
+        writer.write({"name": "", "sex": "F", "age": "?", "date_of_birth": "1990"})
+        writer.write({"name": "MULLER", "sex": "M", "age": "25", "height": "1.65"})
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        assert pq.ParquetFile(path).metadata.num_row_groups == 2
+    else:
+        with pa.ipc.open_file(path) as reader:
+            table = reader.read_all()
+    assert table.num_rows == writer.count == 3
+    assert table.schema.field("age").type == pa.int16()
+    assert pa.types.is_dictionary(table.schema.field("sex").type)
+    data = table.to_pydict()
+    assert data["name"] == ["DUPONT", None, "MULLER"]
+    assert data["age"] == [40, None, 25]
+    assert data["height"] == [pytest.approx(1.8), None, pytest.approx(1.65)]
+    assert data["date_of_birth"] == [date(1984, 3, 2), None, None]
+    assert data["date_of_birth_raw"] == ["1984/03/02", "1990", None]
+    assert data["languages"] == [["French", "English"], [], []]
+
+
+def test_columnar_rejects_unknown_format(tmp_path):
+    pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError):
+        ColumnarRowWriter(str(tmp_path / "out.x"), COLUMNS, "orc")
+
+
+def test_columnar_needs_pyarrow(tmp_path, monkeypatch):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def no_pyarrow(name, *args, **kwargs):
+        if name.startswith("pyarrow"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_pyarrow)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        ColumnarRowWriter(str(tmp_path / "out.parquet"), COLUMNS)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_crawl_output(mock_api, red_type, tmp_path, fmt):
+    if fmt != "csv":
+        pytest.importorskip("pyarrow")
+    crawler = NoticeCrawler(red_type, HTTPClient({}), RateLimiter(1000, 1000), countries=["AD", "DE"])
+    path = str(tmp_path / f"red.{fmt}")
+    crawl_type(crawler, path, fmt, verify=False)
+    if fmt == "csv":
+        rows = read_csv(path)
+        assert list(rows[0]) == red_type.fieldnames
+    else:
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        assert [f.name for f in table.schema][:3] == [name for name, _ in RED_TYPED_COLUMNS][:3]
+        rows = table.to_pylist()
+        assert all(isinstance(r["age"], int) for r in rows)
+    assert len(rows) == 81
+    assert len({r["entity_id"] for r in rows}) == 81
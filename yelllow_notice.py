@@ -1,30 +1,44 @@
-CODE YELLOW NOTICE V1 
-
 #!/usr/bin/env python3
 """
 Scraper Interpol Yellow Notices - version complète avec auto-vérification et rattrapage
 -------------------------------------------------------------------------------------
-✅ Scrape tous les pays (AA-ZZ)
-✅ Dépasse la limite de 160 notices via découpage (sexe + âge)
+✅ Scrape tous les pays (AA-ZZ), par nationalité et par pays de naissance
+✅ Dépasse la limite de 160 notices via découpage (sexe + âge + prénom)
 ✅ Écrit un CSV complet avec toutes les fiches
 ✅ Vérifie la complétude (via l'API officielle)
-✅ Relance automatiquement les pays incomplets sans filtre
+✅ Relance automatiquement les fenêtres incomplètes, plus finement
+Collecte, vérification et rattrapage : moteur commun (interpol/engine.py).
 """
 
 
-import os, sys, csv, json, time, math, ssl, string, pandas as pd
+import os, sys, csv, time, string, pandas as pd
 from itertools import product
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
-from urllib.parse import urlencode
-from typing import Dict, Any, List, Optional, Iterable, Set
+from typing import Dict, List, Optional
+
+from interpol.age_planner import AgePlanner
+from interpol.capture import CaptureWriter
+from interpol.coverage import country_filters
+from interpol.crawl_state import CrawlState
+from interpol.dedup import open_seen_ids
+from interpol.engine import NoticeCrawler, describe_filters
+from interpol.http_cache import ResponseCache
+from interpol.http_pool import HTTPClient
+from interpol.metrics import METRICS, start_exports
+from interpol.notice_store import PARTITION_DIMS, NoticeStore
+from interpol.notice_types import NOTICE_TYPES, YELLOW_FIELDNAMES
+from interpol.rate_limit import RateLimiter
+from interpol.writers import CsvRowWriter
 
 
 # ⚠️ CHANGEMENT PRINCIPAL: API URL pour Yellow Notices
-API_URL = "https://ws-public.interpol.int/notices/v1/yellow"
-RESULTS_PER_PAGE = 160
+NOTICE_TYPE = NOTICE_TYPES["yellow"]
+API_URL = NOTICE_TYPE.api_url
 DELAY = 1.0
 
+# Limiteur unique sous toutes les requêtes (remplace les time.sleep dispersés) :
+# 1 requête / DELAY en régime établi, petite rafale tolérée.
+LIMITER = RateLimiter(rps=1.0 / DELAY, burst=3, max_concurrency=4)
+
 
 HEADERS = {
    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
@@ -33,374 +47,252 @@ HEADERS = {
    "accept-language": "fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7",
 }
 
+# Connexions keep-alive réutilisées ; le contexte SSL (non vérifié, comme
+# auparavant) est créé une seule fois au lieu d'un par appel.
+CLIENT = HTTPClient(HEADERS, insecure=True)
+
+# Cache disque optionnel (SCRAPER_CACHE=<fichier>) : la chaîne
+# verify_scraping → auto_rattrapage relit alors surtout le disque.
+CACHE = ResponseCache(os.environ["SCRAPER_CACHE"]) if os.getenv("SCRAPER_CACHE") else None
+# Capture brute optionnelle (SCRAPER_CAPTURE=<dossier>) : renormalisable hors ligne
+# avec python -m interpol.capture <dossier> replay --type yellow
+CAPTURE = CaptureWriter(os.environ["SCRAPER_CAPTURE"]) if os.getenv("SCRAPER_CAPTURE") else None
+
+# Distribution des âges apprise d'un run à l'autre (plan des fenêtres d'âge) ;
+# persistée seulement si YELLOW_AGE_PLAN désigne un fichier
+AGE_PLANNER = AgePlanner(os.getenv("YELLOW_AGE_PLAN"))
+
+COUNTRIES = [a + b for a, b in product(string.ascii_uppercase, repeat=2)]
+OUTPUT_CSV = "interpol_yellow_smart_all.csv"
+
+# Journal de reprise : partitions terminées, fiches découvertes et écrites
+STATE_FILE = "interpol_yellow_smart_all.state.sqlite"
+
+# Base SQLite indexée : vérification, dédoublonnage et fusions des rattrapages
+# s'y font en SQL (python -m interpol.notice_store interpol_yellow.sqlite …) ;
+# ouverte au premier besoin, pas à l'import
+STORE: Optional[NoticeStore] = None
+
+# Moteur de la dernière collecte ; ses totaux sondés servent à la vérification
+CRAWLER: Optional[NoticeCrawler] = None
+
+
+def open_store() -> NoticeStore:
+   """Base des Yellow Notices (YELLOW_STORE, sinon interpol_yellow.sqlite), ouverte une seule fois."""
+   global STORE
+   if STORE is None:
+       STORE = NoticeStore(os.getenv("YELLOW_STORE") or "interpol_yellow.sqlite")
+   return STORE
 
-# ---------- UTILITAIRES HTTP ----------
-def http_get_json(url: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
-   if params:
-       url = f"{url}?{urlencode(params)}"
-   req = Request(url, headers=HEADERS)
-   ctx = ssl._create_unverified_context()
-   try:
-       with urlopen(req, timeout=30, context=ctx) as resp:
-           data = resp.read().decode("utf-8", errors="replace")
-       return json.loads(data)
-   except (HTTPError, URLError) as e:
-       print(f"[Erreur HTTP] {e} ({url})")
-   except Exception as e:
-       print(f"[Erreur inconnue] {e}")
-   return {}
-
-
-def iter_notices(data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
-   emb = data.get("_embedded", {})
-   arr = emb.get("notices", []) if isinstance(emb, dict) else []
-   for item in arr:
-       if isinstance(item, dict):
-           yield item
-
-
-# ---------- REQUÊTES FILTRÉES ----------
-def fetch_page_with_filters(page: int,
-                          nationality: Optional[str] = None,
-                          age_min: Optional[int] = None,
-                          age_max: Optional[int] = None,
-                          sex_id: Optional[str] = None,
-                          forename: Optional[str] = None,
-                          country_of_birth: Optional[str] = None) -> Dict[str, Any]:
-   params = {"page": str(page), "resultPerPage": str(RESULTS_PER_PAGE)}
-   if nationality: params["nationality"] = nationality
-   if age_min is not None: params["ageMin"] = str(age_min)
-   if age_max is not None: params["ageMax"] = str(age_max)
-   if sex_id: params["sexId"] = sex_id
-   if forename: params["forename"] = forename
-   if country_of_birth: params["country_of_birth_id"] = country_of_birth
-   return http_get_json(API_URL, params=params)
-
-
-def get_total_with_filters(nationality=None, age_min=None, age_max=None, sex_id=None, forename=None, country_of_birth=None) -> int:
-   data = fetch_page_with_filters(1, nationality, age_min, age_max, sex_id, forename, country_of_birth)
-   total = int(data.get("total", 0))
-   if total <= 0:
-       total = len(list(iter_notices(data)))
-   return total
-
-
-def fetch_all_pages_for_filters(nationality, age_min, age_max, sex_id, seen_ids: Set[str], delay: float,
-                               forename=None, country_of_birth=None) -> List[Dict[str, Any]]:
-   rows: List[Dict[str, Any]] = []
-   total = get_total_with_filters(nationality, age_min, age_max, sex_id, forename, country_of_birth)
-   if total == 0:
-       return rows
-  
-   num_pages = math.ceil(total / RESULTS_PER_PAGE)
-  
-   for page in range(1, num_pages + 1):
-       data = fetch_page_with_filters(page, nationality, age_min, age_max, sex_id, forename, country_of_birth)
-       for item in iter_notices(data):
-           eid = str(item.get("entity_id") or item.get("id") or "").strip()
-           nurl = item.get("_links", {}).get("self", {}).get("href", "")
-           key = eid or nurl or f"{nationality}|{sex_id}|{age_min}|{page}|{item.get('name','')}"
-          
-           if key in seen_ids:
-               continue
-           seen_ids.add(key)
-          
-           # 🔄 CHAMPS SPÉCIFIQUES AUX YELLOW NOTICES
-           rows.append({
-               "name": item.get("name", ""),
-               "forename": item.get("forename", ""),
-               "birth_name": item.get("birth_name", ""),  # Nouveau pour Yellow
-               "date_of_birth": item.get("date_of_birth", ""),  # Nouveau pour Yellow
-               "place_of_birth": item.get("place_of_birth", ""),  # Nouveau pour Yellow
-               "country_of_birth": item.get("country_of_birth_id", ""),  # Nouveau pour Yellow
-               "nationality": nationality or "",
-               "nationalities": ";".join(item.get("nationalities", [])),  # Nouveau pour Yellow
-               "sex": sex_id or item.get("sex_id", ""),
-               "height": item.get("height", ""),  # Nouveau pour Yellow
-               "weight": item.get("weight", ""),  # Nouveau pour Yellow
-               "eyes_colors": ";".join(item.get("eyes_colors_id", [])),  # Nouveau pour Yellow
-               "hairs": ";".join(item.get("hairs_id", [])),  # Nouveau pour Yellow
-               "distinguishing_marks": item.get("distinguishing_marks", ""),  # Nouveau pour Yellow
-               "date_of_event": item.get("date_of_event", ""),  # Nouveau pour Yellow
-               "place": item.get("place", ""),  # Nouveau pour Yellow
-               "country": item.get("country", ""),  # Nouveau pour Yellow
-               "languages": ";".join(item.get("languages_spoken_ids", [])),  # Nouveau pour Yellow
-               "father_forename": item.get("father_forename", ""),  # Nouveau pour Yellow
-               "mother_forename": item.get("mother_forename", ""),  # Nouveau pour Yellow
-               "mother_name": item.get("mother_name", ""),  # Nouveau pour Yellow
-               "age_min": age_min if age_min is not None else "",
-               "age_max": age_max if age_max is not None else "",
-               "entity_id": eid,
-               "url": nurl,
-               "images_url": item.get("_links", {}).get("images", {}).get("href", ""),  # Nouveau pour Yellow
-               "thumbnail_url": item.get("_links", {}).get("thumbnail", {}).get("href", "")  # Nouveau pour Yellow
-           })
-      
-       if page < num_pages:
-           time.sleep(delay)
-  
-   return rows
-
-
-# ---------- LOGIQUE PAYS → SEXE → ÂGE ----------
-def smart_fetch_country(country: str, seen_ids: Set[str], delay: float) -> List[Dict[str, str]]:
-   all_rows: List[Dict[str, str]] = []
-  
-   # Test par nationalité d'abord
-   total_country = get_total_with_filters(nationality=country)
-   print(f"[Info] {country} (nationalité): total={total_country}")
-  
-   if total_country <= 160:
-       all_rows.extend(fetch_all_pages_for_filters(country, None, None, None, seen_ids, delay))
-   else:
-       print(f"[Info] {country}: >160, test par genre")
-       for sex_id in ["M", "F", "U"]:
-           total_sex = get_total_with_filters(country, None, None, sex_id)
-           print(f"[Info] {country} sex[{sex_id}]: total={total_sex}")
-          
-           if total_sex == 0:
-               continue
-           if total_sex <= 160:
-               all_rows.extend(fetch_all_pages_for_filters(country, None, None, sex_id, seen_ids, delay))
-           else:
-               print(f"[Info] {country} sex[{sex_id}]: >160, utilisation tranches d'âge")
-               for age_min in range(0, 120):
-                   age_max = age_min + 1
-                   total_age = get_total_with_filters(country, age_min, age_max, sex_id)
-                   if total_age > 0:
-                       all_rows.extend(fetch_all_pages_for_filters(country, age_min, age_max, sex_id, seen_ids, delay))
-  
-   # 🆕 AUSSI TESTER PAR PAYS DE NAISSANCE pour Yellow Notices
-   total_birth_country = get_total_with_filters(country_of_birth=country)
-   print(f"[Info] {country} (pays naissance): total={total_birth_country}")
-  
-   if total_birth_country > 0 and total_birth_country <= 160:
-       all_rows.extend(fetch_all_pages_for_filters(None, None, None, None, seen_ids, delay, country_of_birth=country))
-  
-   return all_rows
+
+def new_crawler(**options) -> NoticeCrawler:
+   """Moteur Yellow Notices sur le limiteur courant (LIMITER peut être remplacé avant run())."""
+   return NoticeCrawler(NOTICE_TYPE, CLIENT, LIMITER, HEADERS, store=open_store(), cache=CACHE,
+                        planner=AGE_PLANNER, countries=COUNTRIES, capture=CAPTURE,
+                        collect_workers=LIMITER.concurrency.maximum, detail_workers=2, **options)
+
+
+def open_crawler() -> NoticeCrawler:
+   """Moteur de la dernière collecte, sinon un nouveau (vérification ou rattrapage seuls)."""
+   global CRAWLER
+   if CRAWLER is None:
+       CRAWLER = new_crawler()
+   return CRAWLER
 
 
 # ---------- SCRAPING PRINCIPAL ----------
-def run():
-   countries = [a + b for a, b in product(string.ascii_uppercase, repeat=2)]
-   all_rows: List[Dict[str, str]] = []
-   seen_ids: Set[str] = set()
-  
-   print(f"[Info] Scraping intelligent Yellow Notices pour {len(countries)} pays (~676 combinaisons)")
-  
-   for i, country in enumerate(countries, 1):
-       try:
-           rows = smart_fetch_country(country, seen_ids, DELAY)
-           all_rows.extend(rows)
-           print(f"[OK] {country}: +{len(rows)} notices (total={len(all_rows)})")
-       except Exception as e:
-           print(f"[Erreur] {country}: {e}")
-      
-       time.sleep(DELAY * 2)
-      
-       # Sauvegarde périodique
-       if i % 5 == 0:
-           fieldnames = [
-               "name", "forename", "birth_name", "date_of_birth", "place_of_birth",
-               "country_of_birth", "nationality", "nationalities", "sex", "height",
-               "weight", "eyes_colors", "hairs", "distinguishing_marks", "date_of_event",
-               "place", "country", "languages", "father_forename", "mother_forename",
-               "mother_name", "age_min", "age_max", "entity_id", "url", "images_url", "thumbnail_url"
-           ]
-          
-           with open("interpol_yellow_smart_all.csv", "w", encoding="utf-8", newline="") as f:
-               w = csv.DictWriter(f, fieldnames=fieldnames)
-               w.writeheader()
-               w.writerows(all_rows)
-           print(f"[Sauvegarde] {len(all_rows)} notices (checkpoint {i})")
-  
-   # Sauvegarde finale
-   fieldnames = [
-       "name", "forename", "birth_name", "date_of_birth", "place_of_birth",
-       "country_of_birth", "nationality", "nationalities", "sex", "height",
-       "weight", "eyes_colors", "hairs", "distinguishing_marks", "date_of_event",
-       "place", "country", "languages", "father_forename", "mother_forename",
-       "mother_name", "age_min", "age_max", "entity_id", "url", "images_url", "thumbnail_url"
-   ]
-  
-   with open("interpol_yellow_smart_all.csv", "w", encoding="utf-8", newline="") as f:
-       w = csv.DictWriter(f, fieldnames=fieldnames)
-       w.writeheader()
-       w.writerows(all_rows)
-  
-   print(f"\n✅ [OK] {len(all_rows)} Yellow Notices écrites dans interpol_yellow_smart_all.csv")
+def run(resume: bool = False):
+   global CRAWLER
+   # YELLOW_DEDUP : index partagé entre processus (ex. sqlite:interpol_yellow_seen.sqlite)
+   seen_ids = open_seen_ids(os.getenv("YELLOW_DEDUP"))
+   state = CrawlState(STATE_FILE, resume=resume)
+   if state.resumed:
+       print(f"[Reprise] Journal {STATE_FILE}")
+   CRAWLER = new_crawler(seen=seen_ids, state=state)
+
+   print(f"[Info] Scraping intelligent Yellow Notices pour {len(COUNTRIES)} pays (nationalité et pays de naissance)")
+   # Fiches écrites au fil de l'eau (plus de liste en mémoire)
+   writer = CsvRowWriter(OUTPUT_CSV, YELLOW_FIELDNAMES, encoding="utf-8")
+   try:
+       CRAWLER.run(writer)
+   finally:
+       writer.close()
+       # Journal inutile après un run complet ; gardé pour --resume si des partitions ont échoué
+       CRAWLER.close_state()
+       seen_ids.close()
+   METRICS.inc("interpol_notices_collected_total", writer.count, type="yellow")
+   print(f"[Info] {CRAWLER.describe()}")
+   print(f"\n✅ [OK] {writer.count} Yellow Notices écrites dans {OUTPUT_CSV}")
+
+
+def export_store(path: str) -> int:
+   """Exporte toutes les Yellow Notices de la base (déjà dédoublonnées) en CSV."""
+   store = open_store()
+   store.commit()
+   with CsvRowWriter(path, YELLOW_FIELDNAMES, encoding="utf-8") as w:
+       for row in store.rows("yellow"):
+           w.write(row)
+       return w.count
 
 
 # ---------- VÉRIFICATION COMPLÉTUDE ----------
-def verify_scraping(input_file="interpol_yellow_smart_all.csv"):
+REPORT_FIELDS = ["country", "total_api", "local_count", "missing", "coverage_%"]
+PARTITION_REPORT_FIELDS = list(PARTITION_DIMS) + REPORT_FIELDS[1:]
+
+
+def verify_scraping():
    print("\n[Info] Vérification de la complétude par pays...")
-  
-   df = pd.read_csv(input_file)
-   countries = sorted(df["nationality"].dropna().unique())
-   report = []
-  
-   for country in countries:
-       local_count = len(df[df["nationality"] == country])
-       data = http_get_json(API_URL, {"page": "1", "resultPerPage": "1", "nationality": country})
-       api_total = int(data.get("total", 0))
-       missing = api_total - local_count
-       percent = 0 if api_total == 0 else round(local_count / api_total * 100, 1)
-      
-       report.append({
-           "country": country,
-           "total_api": api_total,
-           "local_count": local_count,
-           "missing": max(missing, 0),
-           "coverage_%": percent
-       })
-      
-       status = "✅ OK" if missing <= 0 else "⚠️ INCOMPLET"
-       print(f"[{status}] {country}: {local_count}/{api_total} ({percent}%)")
-       time.sleep(0.3)
-  
-   report_df = pd.DataFrame(report)
+
+   # Effectifs locaux en un GROUP BY sur les partitions de la base ; totaux
+   # déjà sondés réutilisés, les autres re-sondés en parallèle
+   report, short_partitions = open_crawler().verify(workers=LIMITER.concurrency.maximum)
+   if not report:
+       print("[Avertissement] Aucune partition enregistrée en base : relancer la collecte")
+
+   for r in report:
+       if r["missing"] is None:
+           status = "❓ INCONNU"
+       else:
+           status = "✅ OK" if r["missing"] <= 0 else "⚠️ INCOMPLET"
+       print(f"[{status}] {r['country']}: {r['local_count']}/{r['total_api']} ({r['coverage_%']}%)")
+   for p in short_partitions:
+       window = describe_filters(tuple(p[d] for d in PARTITION_DIMS))
+       print(f"[⚠️ Partition] {window}: {p['local_count']}/{'?' if p['total_api'] is None else p['total_api']}")
+
+   report_df = pd.DataFrame(report, columns=REPORT_FIELDS)
    report_df.to_csv("yellow_missing_report.csv", index=False, encoding="utf-8")
-   print("\n✅ Rapport sauvegardé dans yellow_missing_report.csv")
+   # Fenêtres exactes à reprendre par le rattrapage
+   with CsvRowWriter("yellow_missing_partitions.csv", PARTITION_REPORT_FIELDS, encoding="utf-8") as w:
+       for p in short_partitions:
+           w.write({k: "" if v is None else v for k, v in p.items()})
+   print("\n✅ Rapport sauvegardé dans yellow_missing_report.csv (partitions : yellow_missing_partitions.csv)")
    return report_df
 
 
+def read_short_partitions(path="yellow_missing_partitions.csv") -> List[tuple]:
+   """Filtres des partitions en défaut relevées par verify_scraping."""
+   if not os.path.exists(path):
+       return []
+   with open(path, encoding="utf-8-sig", newline="") as f:
+       out = []
+       for rec in csv.DictReader(f):
+           values = [rec.get(d) or None for d in PARTITION_DIMS]
+           for i in (1, 2):
+               values[i] = int(values[i]) if values[i] is not None else None
+           out.append(tuple(values))
+       return out
+
+
 # ---------- AUTO-RATTRAPAGE ----------
-def auto_rattrapage(input_csv="interpol_yellow_smart_all.csv", threshold=100):
+def catch_up(windows: List[tuple], label: str) -> List[Dict[str, str]]:
+   """Rattrapage ciblé : chaque fenêtre est affinée (sexe, âge, initiale du prénom)
+   jusqu'à passer sous 160 résultats ; seules les sous-fenêtres où la base n'a pas
+   toutes les fiches sont téléchargées, puis fusionnées dans la base au fil de l'eau."""
+   return [row for _, row in open_crawler().catch_up(windows, label=label)]
+
+
+def incomplete_countries(threshold=100) -> Optional[List[str]]:
    if not os.path.exists("yellow_missing_report.csv"):
+       return None
+   df = pd.read_csv("yellow_missing_report.csv")
+   # Couverture vide : total inconnu (sonde en échec), pays repris aussi
+   return df[(df["coverage_%"] < threshold) | df["coverage_%"].isna()]["country"].tolist()
+
+
+def auto_rattrapage(threshold=100):
+   missing_countries = incomplete_countries(threshold)
+   if missing_countries is None:
        print("[Erreur] yellow_missing_report.csv introuvable — lance d'abord la vérification.")
        return
-  
-   df = pd.read_csv("yellow_missing_report.csv")
-   missing_countries = df[df["coverage_%"] < threshold]["country"].tolist()
-  
-   if not missing_countries:
+
+   # Partitions en défaut, plus les pays incomplets sans détail de partition (pays entier)
+   short_partitions = read_short_partitions()
+   detailed = {filters[0] for filters in short_partitions}
+   windows = short_partitions + [country_filters(c) for c in missing_countries if c not in detailed]
+
+   if not windows:
        print("[OK] Tous les pays sont complets.")
        return
-  
-   print(f"[Auto-rattrapage] {len(missing_countries)} pays à compléter : {', '.join(missing_countries[:10])}...")
-  
-   seen_ids = set()
-   completed_rows = []
-  
-   for country in missing_countries:
-       print(f"\n[Retry] {country} : tentative sans filtre")
-       try:
-           rows = fetch_all_pages_for_filters(country, None, None, None, seen_ids, delay=1.5)
-           print(f"[OK] {country}: {len(rows)} notices récupérées en rattrapage")
-           completed_rows.extend(rows)
-       except Exception as e:
-           print(f"[Erreur rattrapage] {country}: {e}")
-  
+
+   print(f"[Auto-rattrapage] {len(windows)} fenêtres à compléter ({len(missing_countries)} pays incomplets)")
+   completed_rows = catch_up(windows, "Rattrapage")
+
    if completed_rows:
        print(f"[Sauvegarde] {len(completed_rows)} nouvelles notices récupérées.")
        df_new = pd.DataFrame(completed_rows)
        df_new.to_csv("interpol_yellow_rattrapage.csv", index=False, encoding="utf-8")
-      
-       df_old = pd.read_csv(input_csv)
-       df_all = pd.concat([df_old, df_new], ignore_index=True).drop_duplicates(subset=["entity_id","url"])
-       df_all.to_csv("interpol_yellow_smart_all_corrected.csv", index=False, encoding="utf-8")
+       export_store("interpol_yellow_smart_all_corrected.csv")
        print("\n✅ Fichier fusionné : interpol_yellow_smart_all_corrected.csv")
 
 
 # ---------- NIVEAU 2 : RATTRAPAGE PAR PAYS DE NAISSANCE ----------
-def rattrapage_par_pays_naissance(input_csv="interpol_yellow_smart_all_corrected.csv", threshold=100):
+def rattrapage_par_pays_naissance(threshold=100):
    """
    Niveau 2 : tente de compléter les notices manquantes en recherchant
    par pays de naissance ('country_of_birth_id') spécifique aux Yellow Notices.
+   Même moteur ciblé que le niveau 1 : une sonde de comptage par fenêtre, et
+   seules les fenêtres où il manque des fiches en base sont téléchargées.
    """
-   if not os.path.exists("yellow_missing_report.csv"):
+   countries_to_retry = incomplete_countries(threshold)
+   if countries_to_retry is None:
        print("[Erreur] yellow_missing_report.csv introuvable — lance d'abord la vérification précédente.")
        return
 
-
-   df_missing = pd.read_csv("yellow_missing_report.csv")
-   df_missing = df_missing[df_missing["coverage_%"] < threshold]
-  
-   if df_missing.empty:
+   if not countries_to_retry:
        print("[OK] Tous les pays sont complets, pas de rattrapage par pays de naissance nécessaire.")
        return
 
-
-   countries_to_retry = df_missing["country"].tolist()
    print(f"[Niveau 2] Rattrapage par pays de naissance pour {len(countries_to_retry)} pays : {', '.join(countries_to_retry[:10])}...")
-
-
-   seen_ids = set()
-   rows_total: List[Dict[str, str]] = []
-
-
-   for country in countries_to_retry:
-       print(f"\n[Retry/Birth] {country} : tentative via 'country_of_birth_id'")
-       try:
-           data = http_get_json(API_URL, {"country_of_birth_id": country, "resultPerPage": str(RESULTS_PER_PAGE), "page": "1"})
-           total = int(data.get("total", 0))
-           print(f"[Info] {country} via pays naissance: total={total}")
-          
-           if total == 0:
-               continue
-         
-           num_pages = math.ceil(total / RESULTS_PER_PAGE)
-           for page in range(1, num_pages + 1):
-               data = http_get_json(API_URL, {"country_of_birth_id": country, "resultPerPage": str(RESULTS_PER_PAGE), "page": str(page)})
-               notices = list(iter_notices(data))
-              
-               for item in notices:
-                   eid = str(item.get("entity_id") or item.get("id") or "").strip()
-                   nurl = item.get("_links", {}).get("self", {}).get("href", "")
-                   key = eid or nurl
-                  
-                   if not key or key in seen_ids:
-                       continue
-                   seen_ids.add(key)
-                  
-                   rows_total.append({
-                       "name": item.get("name", ""),
-                       "forename": item.get("forename", ""),
-                       "birth_name": item.get("birth_name", ""),
-                       "date_of_birth": item.get("date_of_birth", ""),
-                       "place_of_birth": item.get("place_of_birth", ""),
-                       "country_of_birth": country,
-                       "nationality": "UNK",
-                       "entity_id": eid,
-                       "url": nurl
-                   })
-              
-               time.sleep(0.5)
-          
-           print(f"[OK] {country}: +{len(rows_total)} notices ajoutées via pays naissance")
-       except Exception as e:
-           print(f"[Erreur birth] {country}: {e}")
-
+   rows_total = catch_up([(None, None, None, None, None, c) for c in countries_to_retry], "Rattrapage naissance")
 
    if rows_total:
        print(f"\n[Sauvegarde] {len(rows_total)} nouvelles notices via pays de naissance.")
        df_new = pd.DataFrame(rows_total)
        df_new.to_csv("interpol_yellow_rattrapage_birth.csv", index=False, encoding="utf-8")
-     
-       if os.path.exists(input_csv):
-           df_old = pd.read_csv(input_csv)
-           df_all = pd.concat([df_old, df_new], ignore_index=True).drop_duplicates(subset=["entity_id", "url"])
-           df_all.to_csv("interpol_yellow_smart_all_final.csv", index=False, encoding="utf-8")
-           print("\n✅ Fichier final fusionné : interpol_yellow_smart_all_final.csv")
-       else:
-           df_new.to_csv("interpol_yellow_smart_all_final.csv", index=False, encoding="utf-8")
-           print("\n✅ Fichier final créé : interpol_yellow_smart_all_final.csv")
+       export_store("interpol_yellow_smart_all_final.csv")
+       print("\n✅ Fichier final fusionné : interpol_yellow_smart_all_final.csv")
    else:
        print("[OK] Aucun nouvel enregistrement trouvé via pays de naissance.")
 
 
+# ---------- MÉTRIQUES ----------
+def timed_phase(name: str, fn, *args, **kwargs):
+   """Exécute une étape du pipeline et publie sa durée (interpol_phase_seconds)."""
+   start = time.time()
+   try:
+       return fn(*args, **kwargs)
+   finally:
+       METRICS.set("interpol_phase_seconds", time.time() - start, phase=name)
+
+
 # ---------- MAIN ----------
 if __name__ == "__main__":
    print("🟡 Démarrage du scraper Yellow Notices Interpol")
    print("=" * 60)
-  
-   run()
-   verify_scraping()
-   auto_rattrapage()
-   rattrapage_par_pays_naissance()  # Niveau 2 adapté pour Yellow Notices
-  
+   # Mêmes variables que main.py : SCRAPER_METRICS_FILE, SCRAPER_METRICS_PORT, SCRAPER_METRICS_JSON ;
+   # file, limiteur, sondes et cache du moteur sont enregistrés par run()
+   start_exports(os.getenv("SCRAPER_METRICS_FILE"), int(os.getenv("SCRAPER_METRICS_PORT") or 0),
+                 os.getenv("SCRAPER_METRICS_JSON"))
+
+   # --resume : reprend la collecte à partir du journal au lieu de tout refaire
+   timed_phase("collecte", run, resume="--resume" in sys.argv[1:])
+   timed_phase("verification", verify_scraping)
+   timed_phase("rattrapage", auto_rattrapage)
+   timed_phase("rattrapage_naissance", rattrapage_par_pays_naissance)  # Niveau 2 adapté pour Yellow Notices
+
    print("\n🎯 Scraping Yellow Notices terminé!")
    print("📁 Fichiers générés:")
-   print("   - interpol_yellow_smart_all.csv (données principales)")
+   print(f"   - {OUTPUT_CSV} (données principales)")
    print("   - yellow_missing_report.csv (rapport de complétude)")
-   print("   - interpol_yellow_smart_all_final.csv (données finales)")
\ No newline at end of file
+   print("   - interpol_yellow_smart_all_final.csv (données finales)")
+   print(f"[Sondes] {open_crawler().probes.describe()}")
+   if STORE is not None:
+       print(f"[Base] {STORE.path}: {STORE.stats().get('yellow', 0)} Yellow Notices")
+       STORE.close()
+   if CACHE is not None:
+       print(f"[Cache] {CACHE.describe()}")
+       CACHE.close()
+   if CAPTURE is not None:
+       CAPTURE.close()
+       print(f"[Capture] {CAPTURE.describe()}")
+   METRICS.close(os.getenv("SCRAPER_METRICS_JSON"), {"scraper": "yellow"})